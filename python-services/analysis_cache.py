@@ -0,0 +1,235 @@
+"""
+Analysis Cache - 컬럼 분석 결과 캐시
+
+PDF 바이트 또는 정규화된 헤더 + 샘플 행의 해시를 키로 하여
+검증된 ColumnAnalysisResult를 저장합니다.
+
+- 메모리 LRU (TTL 적용)
+- 선택적 디스크 저장소 (재시작 후에도 유지)
+- 선택적 워커 간 공유 저장소 (shared_store.SharedStore, 멀티 워커 실행 시)
+- 히트/미스 카운터
+
+이벤트 루프에서는 aget/aset을 사용합니다. (디스크/SQLite 입출력은 스레드에서 실행)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from shared_store import SharedStore
+
+# 캐시 키 버전 - 프롬프트/결과 스키마가 바뀌면 올려서 기존 항목을 무효화
+CACHE_KEY_VERSION = "v2"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_cell(value: str) -> str:
+    """셀 값 정규화 (앞뒤 공백 제거, 연속 공백 축약)"""
+    return _WHITESPACE_RE.sub(" ", str(value or "")).strip()
+
+
+def pdf_cache_key(content: bytes) -> str:
+    """PDF 바이트 기반 캐시 키"""
+    return pdf_digest_cache_key(hashlib.sha256(content).hexdigest())
+
+
+def pdf_digest_cache_key(sha256_hex: str) -> str:
+    """스트리밍 중 계산한 PDF SHA-256 기반 캐시 키"""
+    return f"{CACHE_KEY_VERSION}:pdf:{sha256_hex}"
+
+
+def table_cache_key(headers: list[str], sample_rows: list[list[str]]) -> str:
+    """정규화된 헤더 + 샘플 행 기반 캐시 키
+
+    LLM에 전달되는 샘플과 동일한 행을 넘겨야 같은 프롬프트가 같은 키를 갖습니다.
+    """
+    payload = {
+        "headers": [_normalize_cell(h) for h in headers],
+        "rows": [[_normalize_cell(c) for c in row] for row in sample_rows],
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(encoded).hexdigest()
+    return f"{CACHE_KEY_VERSION}:table:{digest}"
+
+
+class AnalysisCache:
+    """메모리 LRU + 선택적 디스크 저장소 + 선택적 워커 간 공유 저장소
+
+    값은 검증된 ColumnAnalysisResult의 dict 형태로 저장합니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        disk_dir: Optional[str] = None,
+        shared_store: Optional["SharedStore"] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.shared_store = shared_store
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.shared_hits = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds
+
+    def _disk_path(self, key: str) -> str:
+        filename = hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+        return os.path.join(self.disk_dir, filename)
+
+    def _read_disk(self, key: str) -> Optional[tuple[float, dict]]:
+        """디스크에서 항목 조회 (만료/손상 시 삭제)"""
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._remove_disk(path)
+            return None
+
+        if record.get("key") != key or self._is_expired(record.get("storedAt", 0)):
+            self._remove_disk(path)
+            return None
+        return record["storedAt"], record["result"]
+
+    def _write_disk(self, key: str, stored_at: float, value: dict) -> None:
+        """디스크에 원자적으로 저장 (임시 파일 작성 후 교체)"""
+        path = self._disk_path(key)
+        record = {"key": key, "storedAt": stored_at, "result": value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove_disk(tmp_path)
+
+    @staticmethod
+    def _remove_disk(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    @property
+    def _persistent(self) -> bool:
+        return bool(self.disk_dir) or self.shared_store is not None
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        value = self._get_memory(key)
+        return value if value is not None else self._get_persistent(key)
+
+    async def aget(self, key: str) -> Optional[dict]:
+        """캐시 조회 (메모리 미스일 때만 디스크/공유 저장소 조회를 스레드에서 실행)"""
+        value = self._get_memory(key)
+        if value is not None:
+            return value
+        if not self._persistent:
+            return self._get_persistent(key)  # 미스 기록만
+        return await asyncio.to_thread(self._get_persistent, key)
+
+    def _get_memory(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self._is_expired(stored_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+        return None
+
+    def _get_persistent(self, key: str) -> Optional[dict]:
+        """디스크 → 공유 저장소 순서로 조회 (없으면 미스로 기록)"""
+        if self.disk_dir:
+            record = self._read_disk(key)
+            if record is not None:
+                with self._lock:
+                    self._store_memory(key, *record)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return record[1]
+
+        if self.shared_store is not None:
+            value = self.shared_store.get_result(key)
+            if value is not None:
+                with self._lock:
+                    self._store_memory(key, time.time(), value)
+                    self.hits += 1
+                    self.shared_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store_memory(self, key: str, stored_at: float, value: dict) -> None:
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key: str, value: dict) -> None:
+        """캐시 저장"""
+        stored_at = time.time()
+        with self._lock:
+            self._store_memory(key, stored_at, value)
+        self._set_persistent(key, stored_at, value)
+
+    async def aset(self, key: str, value: dict) -> None:
+        """캐시 저장 (디스크/공유 저장소 쓰기는 스레드에서 실행)"""
+        stored_at = time.time()
+        with self._lock:
+            self._store_memory(key, stored_at, value)
+        if self._persistent:
+            await asyncio.to_thread(self._set_persistent, key, stored_at, value)
+
+    def _set_persistent(self, key: str, stored_at: float, value: dict) -> None:
+        if self.disk_dir:
+            self._write_disk(key, stored_at, value)
+        if self.shared_store is not None:
+            self.shared_store.set_result(key, value)
+
+    def clear(self) -> None:
+        """메모리 캐시 비우기 (디스크 항목은 TTL로 만료)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "diskEnabled": bool(self.disk_dir),
+                "hits": self.hits,
+                "diskHits": self.disk_hits,
+                "sharedEnabled": self.shared_store is not None,
+                "sharedHits": self.shared_hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,121 @@
+"""
+Balance Check - 잔액 연속성으로 컬럼 매핑 검증
+
+"이전 잔액 ± 금액 = 현재 잔액" 관계가 몇 행에서 성립하는지 벡터 연산 한 번으로 계산합니다.
+제안된 매핑이 틀린 경우(입금/출금 컬럼 뒤바뀜, 입출금 구분 방식 오판 등)
+대안 해석을 모두 시험해 가장 잘 맞는 매핑을 LLM 재호출 없이 찾습니다.
+"""
+
+import copy
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from normalizer import normalize_rows, resolve_layout
+
+# 잔액 비교 허용 오차 (원 단위 반올림)
+BALANCE_TOLERANCE = 0.5
+# 검증에 사용할 최대 데이터 행 수
+MAX_CHECK_ROWS = 5000
+
+
+@dataclass
+class CandidateScore:
+    """매핑 해석 후보별 점수"""
+    label: str
+    match_rate: float
+    compared_rows: int
+    order: str  # ascending (과거→최근) | descending (최근→과거)
+    analysis: dict = field(repr=False, default_factory=dict)
+
+
+@dataclass
+class BalanceCheckResult:
+    """잔액 검증 결과"""
+    original: CandidateScore
+    best: CandidateScore
+    candidates: list[CandidateScore]
+
+    @property
+    def corrected(self) -> bool:
+        return self.best.label != self.original.label
+
+
+def balance_match_rate(amount: np.ndarray, balance: np.ndarray) -> tuple[float, int, str]:
+    """잔액 연속성 일치율 (일치율, 비교 행 수, 정렬 방향)
+
+    과거→최근 순서면 balance[i] = balance[i-1] + amount[i],
+    최근→과거 순서면 balance[i] = balance[i+1] + amount[i] 를 확인합니다.
+    """
+    if len(amount) < 2:
+        return 0.0, 0, "ascending"
+
+    comparable = ~np.isnan(balance[1:]) & ~np.isnan(balance[:-1])
+    compared = int(comparable.sum())
+    if compared == 0:
+        return 0.0, 0, "ascending"
+
+    ascending = np.abs(balance[:-1] + amount[1:] - balance[1:]) <= BALANCE_TOLERANCE
+    descending = np.abs(balance[1:] + amount[:-1] - balance[:-1]) <= BALANCE_TOLERANCE
+    asc_rate = float((ascending & comparable).sum()) / compared
+    desc_rate = float((descending & comparable).sum()) / compared
+    if desc_rate > asc_rate:
+        return desc_rate, compared, "descending"
+    return asc_rate, compared, "ascending"
+
+
+def _alternatives(analysis: dict) -> list[tuple[str, dict]]:
+    """대안 해석 목록 (원본 포함)"""
+    mapping = analysis["columnMapping"]
+    method = analysis["transactionTypeDetection"]["method"]
+    candidates = [("as_is", analysis)]
+
+    def variant(label: str, new_method: Optional[str] = None, **mapping_changes) -> None:
+        alt = copy.deepcopy(analysis)
+        alt["columnMapping"].update(mapping_changes)
+        if new_method:
+            alt["transactionTypeDetection"] = {"method": new_method, "details": f"잔액 검증으로 보정 ({label})"}
+        candidates.append((label, alt))
+
+    # 입금/출금 컬럼 뒤바뀜
+    if mapping.get("입금금액") and mapping.get("출금금액"):
+        variant("swapped_columns", 입금금액=mapping["출금금액"], 출금금액=mapping["입금금액"])
+
+    # 단일 금액 컬럼의 입출금 구분 방식 재해석
+    if mapping.get("금액"):
+        readings = ["amount_sign"]
+        if mapping.get("구분"):
+            readings = ["sign_in_type", "type_column", "amount_sign"]
+        for reading in readings:
+            if reading != method:
+                variant(f"method:{reading}", reading)
+    return candidates
+
+
+def check_balance(headers: list[str], rows: list[list[str]], analysis: dict) -> Optional[BalanceCheckResult]:
+    """제안된 매핑과 대안 해석의 잔액 일치율 계산
+
+    Returns:
+        BalanceCheckResult, 잔액 컬럼이 없거나 비교할 행이 없으면 None
+    """
+    if not analysis["columnMapping"].get("잔액"):
+        return None
+
+    header_row, row_offset = resolve_layout(headers, rows, analysis)
+    data_rows = rows[row_offset:row_offset + MAX_CHECK_ROWS]
+
+    scores = []
+    for label, candidate in _alternatives(analysis):
+        normalized = normalize_rows(header_row, data_rows, candidate, row_offset)
+        amount = np.asarray(normalized.amount, dtype=np.float64)
+        balance = np.array([np.nan if b is None else b for b in normalized.balance], dtype=np.float64)
+        rate, compared, order = balance_match_rate(amount, balance)
+        scores.append(CandidateScore(label, round(rate, 4), compared, order, candidate))
+
+    original = scores[0]
+    if original.compared_rows == 0:
+        return None
+    # 동점이면 원래 매핑 유지
+    best = max(scores, key=lambda c: (c.match_rate, c is original))
+    return BalanceCheckResult(original=original, best=best, candidates=scores)
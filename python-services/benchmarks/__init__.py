@@ -0,0 +1,9 @@
+"""
+Benchmarks - 오프라인 성능 측정 도구
+
+- statement_generator: 4가지 입출금 구분 방식의 합성 거래내역서 (테이블/PDF)
+- load_driver: 엔드포인트별 동시 부하 + 지연 백분위 측정, 기준선 비교
+
+python-services 디렉터리에서 `python -m benchmarks.load_driver`로 실행합니다.
+LLM은 fake_llm.FakeLlmClient(LLM_PROVIDER=fake)를 사용하므로 네트워크가 필요 없습니다.
+"""
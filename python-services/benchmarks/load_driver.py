@@ -0,0 +1,406 @@
+"""
+Load Driver - 엔드포인트별 동시 부하 측정 + 기준선 비교
+
+합성 거래내역서(statement_generator)로 요청을 만들어 시나리오별로 동시에 보내고
+처리량과 p50/p95/p99 지연을 보고합니다. 저장된 기준선(baseline.json)보다
+허용 오차 이상 느려지거나 처리량/성공률이 떨어지면 종료 코드 1로 실패합니다.
+
+기준선의 지연은 측정한 머신 기준이므로, 시나리오 전후에 고정 CPU 작업(보정 작업)을 실행해
+기준선 대비 속도 비율(CPU 계수)을 구하고 기준선 지연의 CPU 처리 부분에 곱해 비교합니다.
+가짜 LLM 대기 시간은 CPU 속도와 무관하므로 계수를 적용하지 않습니다.
+
+기본은 서비스를 같은 프로세스에서 가짜 LLM(LLM_PROVIDER=fake)으로 띄워 측정하며,
+--base-url을 주면 실행 중인 서비스로 보냅니다. (이 경우 서비스도 LLM_PROVIDER=fake로 실행,
+보정 작업은 부하 드라이버에서 실행하므로 서비스와 같은 머신에서 측정해야 CPU 계수가 의미 있음)
+
+    python -m benchmarks.load_driver                          # 측정 + 기준선 비교
+    python -m benchmarks.load_driver --update-baseline        # 기준선 갱신
+    python -m benchmarks.load_driver --scenarios analyze_table_llm,analyze_pdf --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+
+from benchmarks.statement_generator import STYLES, generate_statement, write_pdf
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 인프로세스 측정 시 서비스 import 전에 적용할 기본 환경 (이미 설정된 값은 유지)
+DEFAULT_ENV = {
+    "LLM_PROVIDER": "fake",
+    "FAKE_LLM_LATENCY_MS": "50",
+    "FAKE_LLM_JITTER_MS": "10",
+    "FAKE_LLM_SEED": "7",
+    # 서비스 자체 처리량을 측정하도록 LLM 속도 제한은 끔
+    "LLM_REQUESTS_PER_MINUTE": "0",
+    "LLM_TOKENS_PER_MINUTE": "0",
+}
+
+# 기준선과 비교할 때 같아야 하는 측정 조건
+COMPARABLE_SETTINGS = ("concurrency", "requests", "rows", "fakeLatencyMs", "fakeErrorRate")
+
+# 보정 작업 반복 횟수 (다른 부하의 영향을 줄이도록 최솟값 사용)
+CALIBRATION_SAMPLES = 5
+
+
+@dataclass
+class Scenario:
+    """부하 시나리오 (build(i)는 i번째 요청의 httpx 인자)"""
+    name: str
+    method: str
+    path: str
+    build: Callable[[int], dict]
+    setup: Optional[Callable[[object], Awaitable[None]]] = None
+    llm_calls: int = 0  # 요청당 가짜 LLM 호출 수 (CPU 계수를 적용하지 않는 대기 시간)
+
+
+@dataclass
+class ScenarioResult:
+    """시나리오 측정 결과"""
+    name: str
+    requests: int
+    errors: int
+    elapsed: float
+    latencies: list[float]
+    calibration_ms: float = 0.0
+    llm_wait_ms: float = 0.0
+
+    def summary(self) -> dict:
+        ms = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "errorRate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "throughput": round(self.requests / self.elapsed, 2) if self.elapsed > 0 else 0.0,
+            "p50Ms": round(float(p50), 2),
+            "p95Ms": round(float(p95), 2),
+            "p99Ms": round(float(p99), 2),
+            "meanMs": round(float(ms.mean()), 2),
+            "maxMs": round(float(ms.max()), 2),
+            "calibrationMs": self.calibration_ms,
+            "llmWaitMs": self.llm_wait_ms,
+        }
+
+
+def build_scenarios(rows: int, pdf_dir: str) -> list[Scenario]:
+    """기본 시나리오 목록 (요청마다 seed를 바꿔 캐시를 피함, *_cached 제외)"""
+    from column_mapper import map_columns
+
+    statements = {style: generate_statement(style, rows, seed=0) for style in STYLES}
+    analyses = {style: map_columns(s.headers, s.rows) for style, s in statements.items()}
+    pdfs = {}
+    try:
+        for style, statement in statements.items():
+            with open(write_pdf(statement, os.path.join(pdf_dir, f"{style}.pdf")), "rb") as f:
+                pdfs[style] = f.read()
+    except ImportError as e:
+        print(f"[benchmark] PDF 시나리오 생략: {e}", file=sys.stderr)
+
+    def style_of(i: int) -> str:
+        return STYLES[i % len(STYLES)]
+
+    def table(i: int, obscure: bool = False) -> dict:
+        return generate_statement(style_of(i), rows, seed=i + 1, obscure=obscure).table()
+
+    def pdf_file(i: int) -> dict:
+        style = style_of(i)
+        return {"files": {"file": (f"{style}.pdf", pdfs[style], "application/pdf")}}
+
+    def mapping_payload(i: int) -> dict:
+        style = style_of(i)
+        return {"json": {"table": statements[style].table(), "analysis": analyses[style]}}
+
+    async def load_templates(client) -> None:
+        templates = []
+        for n in range(200):
+            s = generate_statement(STYLES[n % len(STYLES)], 1, seed=n, obscure=n % 2 == 1)
+            columns = {f"c{j}": {"header": f"{h}{n % 7 or ''}"} for j, h in enumerate(s.headers)}
+            templates.append({
+                "id": f"bench-{n}", "name": f"{s.bank_name} {n}", "bankName": s.bank_name,
+                "identifiers": [s.bank_name], "columnSchema": {"columns": columns},
+            })
+        response = await client.post("/templates/refresh", json={"templates": templates, "replace": True})
+        response.raise_for_status()
+
+    scenarios = [
+        Scenario("analyze_table_rule", "POST", "/analyze/table?bypassCache=true", lambda i: {"json": table(i)}),
+        Scenario(
+            "analyze_table_llm", "POST", "/analyze/table?bypassCache=true&maxTier=fast",
+            lambda i: {"json": table(i, obscure=True)}, llm_calls=1,
+        ),
+        Scenario(
+            "analyze_table_cached", "POST", "/analyze/table?maxTier=fast",
+            lambda i: {"json": generate_statement(style_of(i), rows, seed=0, obscure=True).table()},
+        ),
+        Scenario("normalize", "POST", "/normalize", mapping_payload),
+        Scenario("validate_mapping", "POST", "/validate/mapping", mapping_payload),
+        Scenario(
+            "templates_match", "POST", "/templates/match",
+            lambda i: {"json": {"headers": statements[style_of(i)].headers, "pageText": "국민은행 거래내역"}},
+            setup=load_templates,
+        ),
+    ]
+    if pdfs:
+        scenarios += [
+            Scenario("analyze_pdf", "POST", "/analyze/pdf?bypassCache=true&maxTier=fast", pdf_file, llm_calls=1),
+            Scenario("extract_pdf", "POST", "/extract/pdf", pdf_file),
+        ]
+    return scenarios
+
+
+def calibrate(statements: list, samples: int = CALIBRATION_SAMPLES) -> float:
+    """보정 작업 소요 시간 (ms, 반복 중 최솟값)
+
+    서비스의 CPU 경로(규칙 매핑, 벡터 정규화, JSON 직렬화)를 단일 스레드로 고정 횟수 실행합니다.
+    """
+    from column_mapper import map_columns
+    from normalizer import normalize_table
+
+    timings = []
+    for _ in range(samples):
+        t0 = time.perf_counter()
+        for _ in range(10):
+            for s in statements:
+                analysis = map_columns(s.headers, s.rows)
+                normalized = normalize_table(s.headers, s.rows, analysis)
+                json.dumps([analysis, normalized.amount, normalized.memo], ensure_ascii=False)
+        timings.append(time.perf_counter() - t0)
+    return round(min(timings) * 1000, 2)
+
+
+def cpu_factor(current: dict, base: dict) -> float:
+    """기준선 대비 CPU 계수 (>1이면 현재 측정 환경이 느림, 보정값이 없으면 1)"""
+    if not base.get("calibrationMs") or not current.get("calibrationMs"):
+        return 1.0
+    return current["calibrationMs"] / base["calibrationMs"]
+
+
+def is_error(status: int, body: bytes) -> bool:
+    """HTTP 오류 또는 success=false 응답"""
+    if status >= 400:
+        return True
+    if body[:1] == b"{" and b'"success":false' in body.replace(b" ", b""):
+        return True
+    return False
+
+
+async def run_scenario(
+    client, scenario: Scenario, requests: int, concurrency: int, warmup: int, calibration: Callable[[], float]
+) -> ScenarioResult:
+    """워밍업 후 requests개를 concurrency만큼 동시에 보내고 지연 수집
+
+    측정 전후에 보정 작업을 실행해 느린 쪽을 기록합니다 (측정 중 머신 속도 변화 반영).
+    """
+    if scenario.setup is not None:
+        await scenario.setup(client)
+    for i in range(warmup):
+        await client.request(scenario.method, scenario.path, **scenario.build(requests + i))
+    calibration_ms = calibration()
+
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index, errors
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            kwargs = scenario.build(i)
+            t0 = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, scenario.path, **kwargs)
+                failed = is_error(response.status_code, response.content)
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - t0)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    calibration_ms = max(calibration_ms, calibration())
+    llm_wait_ms = scenario.llm_calls * float(os.environ.get("FAKE_LLM_LATENCY_MS", "0"))
+    return ScenarioResult(scenario.name, requests, errors, elapsed, latencies, calibration_ms, llm_wait_ms)
+
+
+async def wait_ready(client, timeout: float) -> None:
+    """워밍업이 끝날 때까지 /readyz 확인 (콜드 스타트를 측정에 섞지 않음)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/readyz")).status_code == 200:
+                return
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"서비스가 {timeout:.0f}초 안에 준비되지 않았습니다")
+        await asyncio.sleep(0.2)
+
+
+def scaled_latency(base_ms: float, factor: float, llm_wait_ms: float) -> float:
+    """기준선 지연을 현재 머신 기준으로 환산 (가짜 LLM 대기 시간은 그대로, 나머지에 CPU 계수 적용)"""
+    fixed = min(llm_wait_ms, base_ms)
+    return fixed + (base_ms - fixed) * factor
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float, min_slack_ms: float) -> list[str]:
+    """기준선 대비 회귀 목록 (기준선 지연은 CPU 계수로 환산, p99는 변동이 커서 허용 오차 2배)"""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        factor = cpu_factor(current, base)
+        wait = base.get("llmWaitMs", 0.0)
+        for key, scale in (("p50Ms", 1), ("p95Ms", 1), ("p99Ms", 2)):
+            expected = scaled_latency(base[key], factor, wait)
+            limit = expected * (1 + tolerance * scale) + min_slack_ms
+            if current[key] > limit:
+                regressions.append(
+                    f"{name}: {key} {current[key]:.1f}ms > 허용 {limit:.1f}ms (기준 {base[key]:.1f}ms, 환산 {expected:.1f}ms)"
+                )
+        # 처리량은 평균 지연에 반비례
+        slowdown = scaled_latency(base["meanMs"], factor, wait) / base["meanMs"] if base["meanMs"] else factor
+        floor = base["throughput"] / slowdown * (1 - tolerance)
+        if current["throughput"] < floor:
+            regressions.append(
+                f"{name}: 처리량 {current['throughput']:.1f}/s < 허용 {floor:.1f}/s (기준 {base['throughput']:.1f}/s)"
+            )
+        if current["errorRate"] > base["errorRate"] + 0.01:
+            regressions.append(f"{name}: 오류율 {current['errorRate']:.2%} (기준 {base['errorRate']:.2%})")
+    return regressions
+
+
+def print_report(results: dict) -> None:
+    header = f"{'scenario':<22}{'req':>6}{'err':>5}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'cal':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<22}{r['requests']:>6}{r['errors']:>5}{r['throughput']:>9.1f}"
+            f"{r['p50Ms']:>9.1f}{r['p95Ms']:>9.1f}{r['p99Ms']:>9.1f}{r['maxMs']:>9.1f}{r['calibrationMs']:>9.1f}"
+        )
+
+
+async def run(args) -> dict:
+    import httpx
+
+    settings = {
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "rows": args.rows,
+        "fakeLatencyMs": float(os.environ.get("FAKE_LLM_LATENCY_MS", "0")),
+        "fakeErrorRate": float(os.environ.get("FAKE_LLM_ERROR_RATE", "0")),
+    }
+    with tempfile.TemporaryDirectory(prefix="column-analyzer-bench-") as pdf_dir:
+        scenarios = build_scenarios(args.rows, pdf_dir)
+        if args.scenarios:
+            wanted = set(args.scenarios.split(","))
+            scenarios = [s for s in scenarios if s.name in wanted]
+        calibration_statements = [generate_statement(style, args.rows, seed=0) for style in STYLES]
+
+        async def measure(client) -> dict:
+            results = {}
+            for scenario in scenarios:
+                result = await run_scenario(
+                    client, scenario, args.requests, args.concurrency, args.warmup,
+                    lambda: calibrate(calibration_statements),
+                )
+                results[scenario.name] = result.summary()
+            return results
+
+        timeout = httpx.Timeout(args.timeout)
+        if args.base_url:
+            async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout) as client:
+                await wait_ready(client, args.timeout)
+                results = await measure(client)
+        else:
+            import column_analyzer_service as service
+
+            async with service.lifespan(service.app):
+                transport = httpx.ASGITransport(app=service.app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+                    await wait_ready(client, args.timeout)
+                    results = await measure(client)
+
+    return {
+        "settings": settings,
+        "environment": {"python": platform.python_version(), "cpus": os.cpu_count(), "target": args.base_url or "in-process"},
+        "scenarios": results,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Column Analyzer 오프라인 부하 측정")
+    parser.add_argument("--base-url", help="실행 중인 서비스 주소 (없으면 인프로세스 + 가짜 LLM)")
+    parser.add_argument("--scenarios", help="쉼표로 구분한 시나리오 이름 (기본: 전체)")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=60, help="합성 거래내역서 행 수")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="측정 결과를 기준선으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 회귀 비율 (0.25 = 25%%)")
+    parser.add_argument("--min-slack-ms", type=float, default=5.0, help="지연 비교 시 추가 허용치 (ms)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    if not args.base_url:
+        for key, value in DEFAULT_ENV.items():
+            os.environ.setdefault(key, value)
+
+    report = asyncio.run(run(args))
+    print_report(report["scenarios"])
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\n기준선 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n기준선 없음 ({args.baseline}), --update-baseline으로 생성하세요")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    mismatched = [
+        k for k in COMPARABLE_SETTINGS if baseline.get("settings", {}).get(k) != report["settings"].get(k)
+    ]
+    if mismatched:
+        print(f"\n측정 조건이 기준선과 달라 비교할 수 없습니다: {', '.join(mismatched)}")
+        return 2
+
+    factors = {
+        name: cpu_factor(current, baseline.get("scenarios", {}).get(name, {}))
+        for name, current in report["scenarios"].items()
+    }
+    print("\nCPU 계수 (기준선 대비): " + ", ".join(f"{name} {f:.2f}" for name, f in factors.items()))
+    regressions = compare_with_baseline(report["scenarios"], baseline, args.tolerance, args.min_slack_ms)
+    if regressions:
+        print("\n성능 회귀:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\n기준선 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
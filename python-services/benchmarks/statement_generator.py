@@ -0,0 +1,208 @@
+"""
+Statement Generator - 합성 한국 은행 거래내역서
+
+transactionTypeDetection의 4가지 방식별로 잔액이 맞는 거래내역을 만듭니다.
+- separate_columns: 출금금액/입금금액 분리 (은행 Type 1/2)
+- type_column: 구분 컬럼(입금/출금) + 금액
+- sign_in_type: 거래구분에 [+]/[-] 기호 (카카오페이 Type 3)
+- amount_sign: 금액 자체의 부호 (+/-)
+
+테이블(headers/rows, TableData와 동일)과 PDF(reportlab 필요)로 출력합니다.
+
+    python -m benchmarks.statement_generator --out /tmp/statements --rows 120
+"""
+
+import argparse
+import json
+import os
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+STYLES = ("separate_columns", "type_column", "sign_in_type", "amount_sign")
+
+_BANKS = ("국민은행", "신한은행", "우리은행", "하나은행", "농협은행", "카카오뱅크")
+_NAMES = ("홍길동", "김철수", "이영희", "박민수", "최지우", "정하늘", "강서연", "윤도현")
+_MEMOS = ("급여", "관리비", "카드대금", "통신요금", "보험료", "월세", "이체", "현금입금", "ATM출금", "체크카드")
+_BRANCHES = ("본점", "강남", "여의도", "판교", "인터넷", "모바일")
+
+# 스타일별 헤더 (LLM 단계를 거치게 하려면 obscure=True로 규칙 매퍼가 모르는 헤더 사용)
+_HEADERS = {
+    "separate_columns": ["거래일자", "적요", "출금금액", "입금금액", "잔액", "취급점"],
+    "type_column": ["거래일시", "구분", "거래금액", "잔액", "내용"],
+    "sign_in_type": ["No", "거래일시", "거래구분", "거래금액", "거래후잔액", "은행", "계좌정보/결제정보"],
+    "amount_sign": ["거래일자", "거래내용", "거래금액", "잔액", "메모"],
+}
+
+
+@dataclass
+class SyntheticStatement:
+    """합성 거래내역서"""
+    style: str
+    bank_name: str
+    headers: list[str]
+    rows: list[list[str]]
+    expected: dict = field(default_factory=dict)  # transactionTypeDetection.method, 컬럼 매핑
+
+    def table(self) -> dict:
+        """TableData 형식"""
+        return {"headers": self.headers, "rows": self.rows}
+
+
+def _amount(rng: random.Random) -> int:
+    return rng.choice((1, 2, 3, 5, 10, 12, 15, 20, 30, 50, 100, 250)) * rng.choice((1000, 1000, 10000))
+
+
+def _expected_mapping(style: str, headers: list[str]) -> dict:
+    h = headers
+    if style == "separate_columns":
+        mapping = {"거래일자": h[0], "출금금액": h[2], "입금금액": h[3], "잔액": h[4], "비고": h[1]}
+    elif style == "type_column":
+        mapping = {"거래일자": h[0], "구분": h[1], "금액": h[2], "잔액": h[3], "비고": h[4]}
+    elif style == "sign_in_type":
+        mapping = {"거래일자": h[1], "구분": h[2], "금액": h[3], "잔액": h[4], "비고": h[6]}
+    else:
+        mapping = {"거래일자": h[0], "금액": h[2], "잔액": h[3], "비고": h[4]}
+    return {"method": style, "columnMapping": mapping}
+
+
+def generate_statement(style: str, rows: int = 50, seed: int = 0, obscure: bool = False) -> SyntheticStatement:
+    """잔액 연속성이 맞는 합성 거래내역서 생성
+
+    Args:
+        style: STYLES 중 하나
+        seed: 같은 seed면 같은 내용 (요청마다 다른 seed로 캐시 회피)
+        obscure: 규칙 매퍼가 인식하지 못하는 헤더 사용 (LLM 경로 측정용)
+    """
+    if style not in STYLES:
+        raise ValueError(f"알 수 없는 스타일: {style} (가능: {', '.join(STYLES)})")
+    rng = random.Random(f"{style}:{seed}")
+    headers = [f"항목{i + 1}" for i in range(len(_HEADERS[style]))] if obscure else list(_HEADERS[style])
+    balance = rng.randint(100, 5000) * 10000
+    when = datetime(2024, 1, 1, 9, 0) + timedelta(days=rng.randint(0, 300))
+    data: list[list[str]] = []
+
+    for i in range(rows):
+        when += timedelta(hours=rng.randint(1, 30), minutes=rng.randint(0, 59))
+        deposit = rng.random() < 0.45
+        amount = _amount(rng)
+        if not deposit and amount > balance:
+            deposit = True
+        balance += amount if deposit else -amount
+        name, memo = rng.choice(_NAMES), rng.choice(_MEMOS)
+        date = when.strftime("%Y-%m-%d")
+        date_time = when.strftime("%Y.%m.%d %H:%M:%S")
+
+        if style == "separate_columns":
+            data.append([
+                date, f"{memo} {name}", "" if deposit else f"{amount:,}", f"{amount:,}" if deposit else "",
+                f"{balance:,}", rng.choice(_BRANCHES),
+            ])
+        elif style == "type_column":
+            data.append([date_time, "입금" if deposit else "출금", f"{amount:,}", f"{balance:,}", f"{memo} {name}"])
+        elif style == "sign_in_type":
+            data.append([
+                str(i + 1), date_time, f"[+] {'입금' if deposit else '환불'}" if deposit else f"[-] {'송금' if i % 2 else '결제'}",
+                f"{amount:,}", f"{balance:,}", rng.choice(_BANKS),
+                f"{name} {rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(100000, 999999)}",
+            ])
+        else:
+            data.append([date, f"{memo}", f"{'+' if deposit else '-'}{amount:,}", f"{balance:,}", name])
+
+    return SyntheticStatement(
+        style=style,
+        bank_name=rng.choice(_BANKS),
+        headers=headers,
+        rows=data,
+        expected=_expected_mapping(style, headers),
+    )
+
+
+def write_pdf(statement: SyntheticStatement, path: str, rows_per_page: int = 40, cover_pages: int = 1) -> str:
+    """텍스트 레이어가 있는 PDF로 저장 (앞쪽 안내 페이지 + 헤더 + 거래 행)
+
+    reportlab이 필요합니다 (pip install reportlab).
+    """
+    try:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+        from reportlab.pdfgen import canvas
+    except ImportError as e:
+        raise ImportError("PDF 생성에는 reportlab이 필요합니다 (pip install reportlab)") from e
+
+    font = "HYGothic-Medium"
+    if font not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(UnicodeCIDFont(font))
+
+    # 컬럼 폭: 가장 긴 셀 기준 (한글은 두 배 폭으로 계산)
+    def width(text: str) -> int:
+        return sum(2 if ord(ch) > 127 else 1 for ch in text)
+
+    widths = [max(width(h), *(width(r[i]) for r in statement.rows)) for i, h in enumerate(statement.headers)]
+    size = 7
+    positions, x = [], 20.0
+    for w in widths:
+        positions.append(x)
+        x += w * size * 0.55 + 12
+
+    c = canvas.Canvas(path, pagesize=(max(x + 20, 595), 842))
+    for p in range(cover_pages):
+        c.setFont(font, 10)
+        c.drawString(40, 800, f"{statement.bank_name} 거래내역 조회 ({p + 1}/{cover_pages})")
+        c.drawString(40, 780, f"예금주 {_NAMES[0]}  계좌번호 123-456-789012")
+        c.showPage()
+
+    for start in range(0, max(len(statement.rows), 1), rows_per_page):
+        c.setFont(font, size)
+        y = 800.0
+        for px, header in zip(positions, statement.headers):
+            c.drawString(px, y, header)
+        for row in statement.rows[start:start + rows_per_page]:
+            y -= 18
+            for px, cell in zip(positions, row):
+                c.drawString(px, y, cell)
+        c.showPage()
+    c.save()
+    return path
+
+
+def generate_corpus(
+    out_dir: str,
+    rows: int = 50,
+    per_style: int = 1,
+    seed: int = 0,
+    pdf: bool = True,
+    obscure: bool = False,
+) -> list[dict]:
+    """스타일별 거래내역서를 JSON(+PDF)으로 저장하고 목록 반환"""
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for style in STYLES:
+        for n in range(per_style):
+            statement = generate_statement(style, rows, seed + n, obscure)
+            base = os.path.join(out_dir, f"{style}_{seed + n}")
+            with open(f"{base}.json", "w", encoding="utf-8") as f:
+                json.dump(asdict(statement), f, ensure_ascii=False, indent=2)
+            entry = {"style": style, "json": f"{base}.json", "pdf": None}
+            if pdf:
+                entry["pdf"] = write_pdf(statement, f"{base}.pdf")
+            written.append(entry)
+    return written
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="합성 거래내역서 생성")
+    parser.add_argument("--out", required=True, help="출력 디렉터리")
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--per-style", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-pdf", action="store_true", help="JSON 테이블만 생성")
+    parser.add_argument("--obscure", action="store_true", help="규칙 매퍼가 모르는 헤더 사용")
+    args = parser.parse_args(argv)
+    for entry in generate_corpus(args.out, args.rows, args.per_style, args.seed, not args.no_pdf, args.obscure):
+        print(f"{entry['style']}: {entry['json']}" + (f", {entry['pdf']}" if entry["pdf"] else ""))
+
+
+if __name__ == "__main__":
+    main()
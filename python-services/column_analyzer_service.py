@@ -4,18 +4,146 @@ Column Analyzer Service - LLM 기반 거래내역서 컬럼 분석
 FastAPI 서비스로 구현하여 Next.js에서 호출
 """
 
+import time
+_IMPORT_STARTED = time.perf_counter()  # 시작 프로파일: 모듈 import 시간
+
 import os
 import json
-import tempfile
-from typing import Optional
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+import asyncio
+import contextvars
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional, Union
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, ValidationError
+from starlette.routing import Match
 from dotenv import load_dotenv
 
+from analysis_cache import AnalysisCache, pdf_digest_cache_key, table_cache_key
+from column_mapper import map_columns
+from fake_llm import FakeLlmClient
+from json_stream import IncrementalJsonParser, JsonStreamError, parse_json_stream
+from llm_client import LlmClientManager
+from pdf_chunks import PdfChunk, plan_chunks, run_chunk_pipeline, write_chunk_pdf
+from pdf_pages import select_table_pages
+from pdf_table_extractor import (
+    ExtractedTable, TableAssembler, extract_page_lines, extract_table, extract_table_segments, iter_page_lines, page_count,
+)
+from normalizer import iter_normalized_chunks, normalize_table
+from balance_check import check_balance
+from model_cascade import (
+    FAST, HEURISTIC, STRONG, TIERS, AnalysisBudget, CascadeResult, ModelTier, TierAttempt, run_cascade,
+)
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, LLM_BUCKETS, STAGE_BUCKETS, MetricsRegistry, error_class
+from prompt_compactor import CompactTable, compact_table, estimate_tokens
+from rate_limiter import THROTTLED, LlmOverloadedError, LlmRateLimiter, classify_error
+from keyword_automaton import ClassificationRule, RuleSetCache
+from job_queue import TERMINAL_STATUSES, Job, JobQueue, ProgressCallback, QueueFullError, sse_event
+from ndjson import ndjson_line, ndjson_response, wants_ndjson
+from shared_store import JobSnapshotWriter, SharedStore, WorkerLeases
+from single_flight import SingleFlight
+from startup_profile import StartupProfile
+from table_segments import TRANSACTIONS, TableSegment, split_table
+from template_index import TemplateIndex
+from upload_utils import (
+    MULTIPART_OVERHEAD_BYTES,
+    InvalidUploadError,
+    SpooledUpload,
+    TooManyFilesError,
+    UploadTooLargeError,
+    remove_file,
+    spooled_upload,
+    spooled_uploads,
+)
+
 load_dotenv()
 
-app = FastAPI(title="Column Analyzer Service")
+# 시작 프로파일 (워밍업이 끝나야 /readyz 성공)
+startup = StartupProfile(started=_IMPORT_STARTED)
+startup.record("imports", time.perf_counter() - _IMPORT_STARTED)
+# 준비 완료 시 프로파일 출력 ("-": 표준 출력, 그 외 JSON 파일 경로, {pid}는 워커 PID)
+STARTUP_PROFILE_PATH = os.environ.get("STARTUP_PROFILE_PATH") or None
+# 워밍업 시 미리 연결할 LLM 제공자 주소 (비우면 생략)
+LLM_WARMUP_URL = os.environ.get("LLM_WARMUP_URL", "")
+
+# Emergent LLM Key
+EMERGENT_LLM_KEY = os.environ.get("EMERGENT_LLM_KEY", "sk-emergent-21606D0AeC4F526Fc0")
+
+# LLM 제공자 (fake: 오프라인 벤치마크/개발용 가짜 제공자, FAKE_LLM_* 환경 변수로 지연/오류율 설정)
+LLM_PROVIDER = os.environ.get("LLM_PROVIDER", "emergent").lower()
+
+# 장기 유지 LLM 클라이언트 (애플리케이션 시작 시 로드)
+if LLM_PROVIDER == "fake":
+    llm_client = FakeLlmClient.from_env(model=os.environ.get("LLM_MODEL", "gemini-2.5-flash"))
+else:
+    llm_client = LlmClientManager(
+        api_key=EMERGENT_LLM_KEY,
+        provider=os.environ.get("LLM_MODEL_PROVIDER", "gemini"),
+        model=os.environ.get("LLM_MODEL", "gemini-2.5-flash"),
+        request_timeout=float(os.environ.get("LLM_REQUEST_TIMEOUT_SECONDS", "120")),
+        connect_timeout=float(os.environ.get("LLM_CONNECT_TIMEOUT_SECONDS", "10")),
+        max_connections=int(os.environ.get("LLM_MAX_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.environ.get("LLM_KEEPALIVE_SECONDS", "60")),
+    )
+
+# LLM 호출 속도 제한 (0이면 제한 없음, 멀티 워커 실행 시 워커 수로 나눔)
+LLM_RATE_SHARE = max(int(os.environ.get("SERVICE_WORKERS", "1")), 1)
+# 토큰 예약 시 응답 토큰 추정치 (응답 후 실제 길이로 보정), PDF 페이지당 입력 토큰 추정치
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.environ.get("LLM_EXPECTED_OUTPUT_TOKENS", "400"))
+LLM_PDF_TOKENS_PER_PAGE = int(os.environ.get("LLM_PDF_TOKENS_PER_PAGE", "258"))
+llm_limiter = LlmRateLimiter(
+    requests_per_minute=float(os.environ.get("LLM_REQUESTS_PER_MINUTE", "600")) / LLM_RATE_SHARE,
+    tokens_per_minute=float(os.environ.get("LLM_TOKENS_PER_MINUTE", "1000000")) / LLM_RATE_SHARE,
+    max_concurrency=int(os.environ.get("LLM_MAX_CONCURRENCY", os.environ.get("LLM_MAX_CONNECTIONS", "20"))),
+    min_concurrency=int(os.environ.get("LLM_MIN_CONCURRENCY", "1")),
+    latency_target=float(os.environ.get("LLM_LATENCY_TARGET_SECONDS", "30")),
+    max_waiting=int(os.environ.get("LLM_MAX_WAITING", "100")),
+    max_attempts=int(os.environ.get("LLM_RETRY_MAX_ATTEMPTS", "4")),
+    backoff_base=float(os.environ.get("LLM_RETRY_BASE_SECONDS", "1")),
+    backoff_max=float(os.environ.get("LLM_RETRY_MAX_SECONDS", "30")),
+)
+# 작업 워커에서 실행 중인 분석은 LLM 대기열 한도를 적용하지 않음 (작업 대기열이 이미 제한)
+llm_queue_exempt: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_queue_exempt", default=False)
+
+# 텍스트 레이어 테이블 추출용 프로세스 풀 (페이지 병렬 파싱)
+PDF_EXTRACT_WORKERS = int(os.environ.get("PDF_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+pdf_extract_pool: Optional[ProcessPoolExecutor] = None
+# 동시에 파싱을 진행할 페이지 묶음 수 (스트리밍 시 선행 작업량 제한)
+PDF_EXTRACT_WINDOW = max(PDF_EXTRACT_WORKERS * 2, 1)
+
+# NDJSON 스트리밍 시 한 줄에 담을 최대 행 수
+NDJSON_CHUNK_ROWS = int(os.environ.get("NDJSON_CHUNK_ROWS", "5000"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 수명 주기 (추출 프로세스 풀, 작업 워커 시작, 백그라운드 워밍업/종료)"""
+    global pdf_extract_pool
+    if PDF_EXTRACT_WORKERS > 1:
+        # 이벤트 루프 스레드를 복제하지 않도록 spawn 사용
+        pdf_extract_pool = ProcessPoolExecutor(
+            max_workers=PDF_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    job_queue.start()
+    # 워밍업 중에도 /livez는 응답하도록 백그라운드에서 실행 (끝나면 /readyz 성공)
+    warm_up_task = asyncio.create_task(warm_up())
+    yield
+    startup.draining = True
+    warm_up_task.cancel()
+    await job_queue.close()
+    if job_snapshots is not None:
+        await job_snapshots.flush()
+    await llm_client.close()
+    if pdf_extract_pool is not None:
+        pdf_extract_pool.shutdown(wait=False, cancel_futures=True)
+        pdf_extract_pool = None
+
+
+app = FastAPI(title="Column Analyzer Service", lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -26,8 +154,275 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Emergent LLM Key
-EMERGENT_LLM_KEY = os.environ.get("EMERGENT_LLM_KEY", "sk-emergent-21606D0AeC4F526Fc0")
+# 워커 간 공유 저장소 (멀티 워커 실행 시 결과/진행 중 임대/작업 상태/템플릿 공유)
+SHARED_STORE_PATH = os.environ.get("SHARED_STORE_PATH") or None
+SHARED_LEASE_SECONDS = float(os.environ.get("SHARED_LEASE_SECONDS", "30"))
+shared_store = (
+    SharedStore(SHARED_STORE_PATH, ttl_seconds=float(os.environ.get("ANALYSIS_CACHE_TTL_SECONDS", "86400")))
+    if SHARED_STORE_PATH else None
+)
+worker_leases = WorkerLeases(shared_store, SHARED_LEASE_SECONDS) if shared_store else None
+job_snapshots = JobSnapshotWriter(
+    shared_store, on_error=lambda e: shared_store_errors.inc(operation="put_job", error_class=error_class(e))
+) if shared_store else None
+
+# 분석 결과 캐시 설정
+ANALYSIS_CACHE_ENABLED = os.environ.get("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+analysis_cache = AnalysisCache(
+    max_entries=int(os.environ.get("ANALYSIS_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.environ.get("ANALYSIS_CACHE_TTL_SECONDS", "86400")),
+    disk_dir=os.environ.get("ANALYSIS_CACHE_DIR") or None,
+    shared_store=shared_store,
+)
+
+# 동일 콘텐츠 키의 진행 중 LLM 호출 공유 (프로세스 내)
+inflight_analyses = SingleFlight()
+
+# 거래내역서 템플릿 지문 인덱스 (/templates/refresh로 갱신)
+template_index = TemplateIndex()
+
+# 분류 규칙/중요 거래 키워드 오토마톤 캐시 (규칙 집합 내용이 바뀔 때만 다시 컴파일)
+keyword_rule_sets = RuleSetCache(max_entries=int(os.environ.get("KEYWORD_RULE_SET_CACHE_SIZE", "8")))
+
+# 비동기 작업 설정 (POST /jobs, 결과는 TTL 동안 보관)
+job_queue = JobQueue(
+    workers=int(os.environ.get("JOB_WORKERS", "4")),
+    max_queue=int(os.environ.get("JOB_QUEUE_SIZE", "100")),
+    result_ttl_seconds=float(os.environ.get("JOB_RESULT_TTL_SECONDS", "3600")),
+    on_change=lambda job: share_job_snapshot(job),
+)
+# 대기열이 가득 찼을 때 재시도 권장 간격 (초)
+JOB_RETRY_AFTER_SECONDS = int(os.environ.get("JOB_RETRY_AFTER_SECONDS", "5"))
+
+# Prometheus 메트릭 (/metrics)
+metrics = MetricsRegistry("column_analyzer")
+http_requests = metrics.counter("http_requests_total", "HTTP 요청 수", ("method", "path", "status"))
+http_latency = metrics.histogram("http_request_duration_seconds", "HTTP 요청 처리 시간 (스트리밍은 응답 시작까지)", ("method", "path"))
+http_in_flight = metrics.gauge("http_requests_in_flight", "처리 중인 HTTP 요청 수", ("path",))
+stage_latency = metrics.histogram("stage_duration_seconds", "처리 단계별 소요 시간", ("stage",), STAGE_BUCKETS)
+llm_latency = metrics.histogram("llm_request_duration_seconds", "LLM 왕복 시간", ("kind", "outcome"), LLM_BUCKETS)
+llm_in_flight = metrics.gauge("llm_requests_in_flight", "진행 중인 LLM 호출 수")
+error_count = metrics.counter("errors_total", "에러 수 (result: success=false 등 응답에 담긴 에러, unhandled: 500)", ("source", "error_class"))
+analysis_outcomes = metrics.counter("analysis_results_total", "분석 결과 출처별 수 (cache/rule_mapper/llm/error)", ("kind", "source"))
+prompt_tokens = metrics.counter("llm_prompt_tokens_estimated_total", "LLM 프롬프트 추정 토큰 수 (첨부 파일 제외)", ("kind",))
+transfer_bytes = metrics.counter("bytes_total", "전송 바이트 수 (upload/llm_request/llm_response)", ("direction",))
+page_prune_failures = metrics.counter(
+    "page_prune_failures_total", "거래내역 페이지 선별 실패 수 (원본 PDF 전체를 LLM에 전송)", ("error_class",)
+)
+metrics.callback(
+    "analysis_cache_lookups_total", "분석 캐시 조회 수",
+    lambda: {("hit",): analysis_cache.hits, ("miss",): analysis_cache.misses}, ("result",), kind="counter",
+)
+metrics.callback("analysis_cache_entries", "분석 캐시 메모리 항목 수", lambda: {(): analysis_cache.stats()["entries"]})
+metrics.callback("analysis_cache_hit_ratio", "분석 캐시 히트 비율", lambda: {(): analysis_cache.stats()["hitRatio"]})
+metrics.callback(
+    "single_flight_calls_total", "동일 키 LLM 호출 (started: 실제 호출, coalesced: 공유 대기)",
+    lambda: {("started",): inflight_analyses.stats()["started"], ("coalesced",): inflight_analyses.stats()["coalesced"]},
+    ("result",), kind="counter",
+)
+metrics.callback("single_flight_in_flight", "진행 중인 공유 LLM 호출 수", lambda: {(): inflight_analyses.stats()["inFlight"]})
+metrics.callback("job_queue_depth", "대기 중인 작업 수", lambda: {(): job_queue.stats()["queued"]})
+metrics.callback("jobs_running", "실행 중인 작업 수", lambda: {(): job_queue.running})
+metrics.callback(
+    "jobs_submitted_total", "작업 등록 요청 수 (accepted/rejected)",
+    lambda: {("accepted",): job_queue.submitted, ("rejected",): job_queue.rejected}, ("result",), kind="counter",
+)
+metrics.callback(
+    "worker_lease_calls_total", "워커 간 임대 (acquired: 직접 실행, waited: 다른 워커 대기, shared_hit: 공유 결과 사용)",
+    lambda: {
+        ("acquired",): worker_leases.acquired, ("waited",): worker_leases.waited, ("shared_hit",): worker_leases.shared_hits,
+    } if worker_leases is not None else {},
+    ("result",), kind="counter",
+)
+shared_store_errors = metrics.counter(
+    "shared_store_errors_total", "워커 간 공유 저장소 기록 실패 수 (요청은 계속 처리)", ("operation", "error_class")
+)
+tier_attempts = metrics.counter(
+    "analysis_tier_attempts_total", "단계별 분석 실행 수 (accepted/low_confidence/timeout/error/overloaded)", ("kind", "tier", "outcome")
+)
+table_segments_total = metrics.counter(
+    "table_segments_total", "다중 테이블 모드에서 찾은 테이블 수 (kind: transactions/summary/account_info/other)",
+    ("source", "kind"),
+)
+llm_stream_early_stops = metrics.counter(
+    "llm_stream_early_stops_total", "JSON 객체 완성 후 읽지 않은 조각이 남은 응답 스트림을 닫은 LLM 호출 수", ("kind",)
+)
+pdf_chunks_total = metrics.counter(
+    "pdf_chunks_total", "청크 단위 PDF 추출에서 LLM으로 인식한 페이지 묶음 수 (success/failed)", ("outcome",)
+)
+pdf_chunk_retries = metrics.counter("pdf_chunk_retries_total", "페이지 묶음 인식 재시도 수", ("error_class",))
+llm_retries = metrics.counter("llm_retries_total", "LLM 호출 재시도 수 (throttled: 429, transient: 5xx/연결 오류)", ("kind", "reason"))
+metrics.callback("llm_concurrency_limit", "LLM 적응형 동시 호출 한도", lambda: {(): llm_limiter.concurrency.limit})
+metrics.callback("llm_waiting", "LLM 호출 슬롯 대기 수", lambda: {(): llm_limiter.concurrency.waiting})
+metrics.callback("llm_pacing", "LLM 호출 RPM/TPM 대기 수", lambda: {(): llm_limiter.pacing})
+metrics.callback(
+    "llm_rejected_total", "LLM 대기열 초과로 거절된 요청 수 (429)", lambda: {(): llm_limiter.rejected}, kind="counter"
+)
+metrics.callback(
+    "llm_paced_seconds_total", "RPM/TPM 제한으로 대기한 시간 합계", lambda: {(): llm_limiter.paced_seconds}, kind="counter"
+)
+metrics.callback("service_ready", "워밍업 완료 여부 (1: 트래픽 수신 가능)", lambda: {(): float(startup.ready)})
+metrics.callback(
+    "startup_step_duration_seconds", "시작 단계별 소요 시간 (import/SDK 로드/워밍업)",
+    lambda: {(step.name,): step.seconds for step in startup.steps}, ("step",),
+)
+metrics.callback(
+    "startup_step_failed", "워밍업에 실패한 시작 단계 (1: 실패, 첫 요청에서 재시도)",
+    lambda: {(name,): 1.0 for name in startup.failed_steps()}, ("step",),
+)
+metrics.callback("template_index_size", "템플릿 인덱스 항목 수", lambda: {(): template_index.stats()["templates"]})
+metrics.callback(
+    "keyword_rule_set_lookups_total", "키워드 분류 규칙 집합 조회 수 (built: 새로 컴파일, cached: 캐시 사용)",
+    lambda: {("built",): keyword_rule_sets.stats()["builds"], ("cached",): keyword_rule_sets.stats()["hits"]},
+    ("result",), kind="counter",
+)
+keyword_classified = metrics.counter(
+    "keyword_classified_transactions_total", "키워드 규칙으로 분류한 거래 수 (matched/unmatched)", ("result",)
+)
+
+
+def record_error(error: BaseException, source: str = "result") -> None:
+    """에러 카운트 (응답으로 삼킨 에러 포함)"""
+    error_count.inc(source=source, error_class=error_class(error))
+
+
+def report(progress: Optional[ProgressCallback], stage: str, **info) -> None:
+    """작업 진행 단계 보고 (작업으로 실행될 때만)"""
+    if progress is not None:
+        progress(stage, **info)
+
+
+def record_upload(upload: SpooledUpload) -> None:
+    """업로드 수신 시간/크기 기록"""
+    stage_latency.observe(upload.elapsed, stage="upload")
+    transfer_bytes.inc(upload.size, direction="upload")
+
+# 규칙 기반 매퍼 설정 (신뢰도가 임계값 미만일 때만 LLM 호출)
+RULE_MAPPER_ENABLED = os.environ.get("RULE_MAPPER_ENABLED", "true").lower() == "true"
+RULE_MAPPER_CONFIDENCE_THRESHOLD = float(os.environ.get("RULE_MAPPER_CONFIDENCE_THRESHOLD", "0.85"))
+
+# 단계별 분석 설정 (휴리스틱 → 빠른 모델 → 강한 모델, 신뢰도가 임계값 미만일 때만 다음 단계)
+LLM_FAST_MODEL = os.environ.get("LLM_FAST_MODEL") or llm_client.model
+LLM_STRONG_MODEL = os.environ.get("LLM_STRONG_MODEL", "gemini-2.5-pro")  # 비우면 강한 모델 단계 생략
+CASCADE_CONFIDENCE_THRESHOLD = float(os.environ.get("CASCADE_CONFIDENCE_THRESHOLD", "0.85"))
+CASCADE_MEMO_CONFIDENCE_THRESHOLD = float(os.environ.get("CASCADE_MEMO_CONFIDENCE_THRESHOLD", "0.7"))
+CASCADE_DEFAULT_MAX_TIER = os.environ.get("CASCADE_DEFAULT_MAX_TIER", STRONG)
+llm_tiers = [ModelTier(FAST, LLM_FAST_MODEL, float(os.environ.get("TIER_FAST_TIMEOUT_SECONDS", "30")))]
+if LLM_STRONG_MODEL:
+    llm_tiers.append(ModelTier(STRONG, LLM_STRONG_MODEL, float(os.environ.get("TIER_STRONG_TIMEOUT_SECONDS", "90"))))
+
+# 잔액 검증 설정 (대안 해석이 이 일치율 이상이고 원래 매핑보다 충분히 나을 때만 보정)
+BALANCE_CHECK_ENABLED = os.environ.get("BALANCE_CHECK_ENABLED", "true").lower() == "true"
+BALANCE_CHECK_MIN_RATE = float(os.environ.get("BALANCE_CHECK_MIN_RATE", "0.9"))
+BALANCE_CHECK_MIN_GAIN = float(os.environ.get("BALANCE_CHECK_MIN_GAIN", "0.2"))
+
+# 테이블 프롬프트 압축 설정 (시스템 프롬프트 포함 전체 토큰 예산)
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", "2000"))
+PROMPT_MAX_CELL_CHARS = int(os.environ.get("PROMPT_MAX_CELL_CHARS", "24"))
+
+# 배치 분석 설정
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "100"))
+batch_semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+# 업로드 설정 (UPLOAD_TMP_DIR=/dev/shm 등으로 메모리 기반 tmpfs 사용 가능)
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_MB", "50")) * 1024 * 1024
+# /analyze/batch/pdf 요청 본문 전체 크기 제한
+BATCH_MAX_UPLOAD_BYTES = int(os.environ.get("BATCH_MAX_UPLOAD_MB", "200")) * 1024 * 1024
+UPLOAD_TMP_DIR = os.environ.get("UPLOAD_TMP_DIR") or None
+
+# multipart PDF 업로드 엔드포인트의 요청 본문 스키마 (본문을 직접 스트리밍 파싱하므로 OpenAPI용으로만 선언)
+PDF_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {"file": {"type": "string", "format": "binary"}},
+        }}},
+    },
+}
+PDF_BATCH_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["files"],
+            "properties": {"files": {"type": "array", "items": {"type": "string", "format": "binary"}}},
+        }}},
+    },
+}
+
+
+# PDF 페이지 선별 설정 (헤더가 있는 페이지만 LLM에 전송)
+PDF_PAGE_PRUNING_ENABLED = os.environ.get("PDF_PAGE_PRUNING_ENABLED", "true").lower() == "true"
+PDF_PRUNE_MAX_PAGES = int(os.environ.get("PDF_PRUNE_MAX_PAGES", "2"))
+
+# 청크 단위 PDF 추출 설정 (스캔 페이지를 페이지 묶음으로 나눠 LLM으로 병렬 인식)
+PDF_CHUNK_PAGES = int(os.environ.get("PDF_CHUNK_PAGES", "5"))
+PDF_CHUNK_CONCURRENCY = int(os.environ.get("PDF_CHUNK_CONCURRENCY", "4"))
+PDF_CHUNK_MAX_ATTEMPTS = int(os.environ.get("PDF_CHUNK_MAX_ATTEMPTS", "3"))
+PDF_CHUNK_RETRY_BASE_SECONDS = float(os.environ.get("PDF_CHUNK_RETRY_BASE_SECONDS", "1"))
+
+
+@app.exception_handler(LlmOverloadedError)
+async def llm_overloaded_handler(request: Request, exc: LlmOverloadedError):
+    """LLM 대기열 초과/제공자 제한 지속 시 429 + Retry-After"""
+    record_error(exc, source="overloaded")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "retryAfter": exc.retry_after},
+        headers={"Retry-After": str(int(exc.retry_after))},
+    )
+
+
+@app.middleware("http")
+async def reject_oversized_upload(request: Request, call_next):
+    """Content-Length로 크기 초과 업로드를 본문 수신 전에 413 처리"""
+    limits = {
+        "/analyze/pdf": MAX_UPLOAD_BYTES,
+        "/analyze/batch/pdf": BATCH_MAX_UPLOAD_BYTES,
+        "/extract/pdf": MAX_UPLOAD_BYTES,
+        "/extract/pdf/chunked": MAX_UPLOAD_BYTES,
+        "/jobs": MAX_UPLOAD_BYTES,
+    }
+    limit = limits.get(request.url.path)
+    content_length = request.headers.get("content-length", "")
+    if limit is not None and content_length.isdigit() and int(content_length) > limit + MULTIPART_OVERHEAD_BYTES:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": str(UploadTooLargeError(limit))},
+        )
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """엔드포인트별 요청 수/지연/동시 처리 수 기록 (경로는 라우트 템플릿 기준)
+
+    마지막에 등록하여 가장 바깥에서 실행되므로 413 조기 거절도 포함됩니다.
+    """
+    path = "unmatched"
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            path = route.path
+            break
+
+    status = 500
+    t0 = time.perf_counter()
+    http_in_flight.inc(path=path)
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    except Exception as e:
+        record_error(e, source="unhandled")
+        raise
+    finally:
+        http_in_flight.dec(path=path)
+        http_latency.observe(time.perf_counter() - t0, method=request.method, path=path)
+        http_requests.inc(method=request.method, path=path, status=str(status))
 
 
 class TableData(BaseModel):
@@ -72,6 +467,291 @@ class ColumnAnalysisResult(BaseModel):
     confidence: float
     reasoning: str
     error: Optional[str] = None
+    sourcePageIndices: Optional[list[int]] = None  # LLM에 전송한 원본 페이지 (0부터, 선별 시)
+    balanceMatchRate: Optional[float] = None  # 잔액 연속성 일치율 (테이블 분석 시)
+    estimatedPromptTokens: Optional[int] = None  # LLM에 보낸 프롬프트 추정 토큰 수 (테이블 분석 시)
+    tier: Optional[str] = None  # 답한 단계 (heuristic/fast/strong)
+    tierAttempts: Optional[list[dict]] = None  # 단계별 실행 기록 (tier, outcome, elapsedSeconds, confidence)
+
+
+class TableAnalysisItem(ColumnAnalysisResult):
+    """다중 테이블 LLM 응답 항목"""
+    tableIndex: int
+    pageStart: Optional[int] = None
+    pageEnd: Optional[int] = None
+
+
+class MultiTableLlmResponse(BaseModel):
+    """다중 테이블 LLM 응답"""
+    tables: list[TableAnalysisItem]
+
+
+class DetectedTable(BaseModel):
+    """다중 테이블 모드에서 찾은 테이블"""
+    index: int
+    kind: str                           # transactions / summary / account_info / other
+    headers: list[str] = []
+    rowStart: Optional[int] = None      # 테이블 입력: 헤더 행 번호 (headers가 0번 행)
+    rowEnd: Optional[int] = None        # 테이블 입력: 마지막 행 번호
+    rowCount: int = 0
+    pageStart: Optional[int] = None     # PDF: 시작/끝 페이지 (0부터)
+    pageEnd: Optional[int] = None
+    caption: Optional[str] = None       # 테이블 바로 위 텍스트 (계좌번호, 섹션 제목 등)
+    tableType: Optional[str] = None
+    confidence: float = 0.0
+    analysis: Optional[ColumnAnalysisResult] = None  # 거래내역 테이블만
+    skipReason: Optional[str] = None    # LLM에 보내지 않은 이유 (로컬 분류)
+
+
+class MultiTableAnalysisResult(BaseModel):
+    """다중 테이블 분석 결과"""
+    success: bool
+    tables: list[DetectedTable] = []          # 거래내역 테이블 (분석 결과 포함)
+    skippedTables: list[DetectedTable] = []   # 로컬 분류로 제외한 테이블 (요약, 계좌정보 등)
+    llmCalls: int = 0
+    pageCount: Optional[int] = None
+    scannedPages: list[int] = []
+    error: Optional[str] = None
+
+
+class ExtractedTableResult(BaseModel):
+    """텍스트 레이어 테이블 추출 결과 (headers/rows는 TableData와 동일)"""
+    success: bool
+    headers: list[str] = []
+    rows: list[list[str]] = []
+    pageCount: int = 0
+    headerPageIndex: Optional[int] = None
+    scannedPages: list[int] = []  # 텍스트 레이어가 없어 OCR이 필요한 페이지 (0부터)
+    error: Optional[str] = None
+
+
+class PdfChunkStatus(BaseModel):
+    """LLM으로 인식한 페이지 묶음 처리 결과"""
+    index: int
+    pageStart: int
+    pageEnd: int
+    rowCount: int = 0
+    attempts: int = 0
+    error: Optional[str] = None  # 재시도 후에도 실패한 경우
+
+
+class ChunkedExtractionResult(ExtractedTableResult):
+    """청크 단위 PDF 추출 결과 (텍스트 레이어 + 스캔 페이지 인식, 페이지 순서 유지)"""
+    columnMapping: Optional[ColumnMapping] = None  # 헤더 확정 후 한 번만 계산한 규칙 기반 매핑
+    mappingConfidence: float = 0.0
+    textPages: int = 0                    # 텍스트 레이어로 읽은 페이지 수
+    ocrChunks: list[PdfChunkStatus] = []
+    failedPages: list[int] = []           # 재시도 후에도 읽지 못한 페이지 (0부터)
+    llmCalls: int = 0
+    pageTexts: list[str] = []             # 테이블 밖 텍스트 (페이지 순서, 템플릿 식별자 매칭용)
+
+
+class OcrChunkResponse(BaseModel):
+    """스캔 페이지 묶음 인식 응답"""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    headers: list[str] = []
+    rows: list[list[Optional[str]]]
+    pageTexts: list[Optional[str]] = []
+
+
+class NormalizeRequest(BaseModel):
+    """정규화 요청 (테이블 + 컬럼 분석 결과)"""
+    table: TableData
+    analysis: ColumnAnalysisResult
+    mergeWrappedRows: bool = True  # 여러 줄로 나뉜 거래 행을 정규화 전에 복원
+
+
+class NormalizedTransactionColumns(BaseModel):
+    """컬럼 형식 정규화 거래내역 (각 배열의 i번째가 하나의 거래)"""
+    transactionDate: list[str]
+    type: list[str]               # 입금 | 출금
+    amount: list[float]           # 입금 +, 출금 -
+    balance: list[Optional[float]]
+    memo: list[str]
+    sourceRowIndex: list[int]     # 원본 rows 기준 인덱스
+
+
+class NormalizeResult(BaseModel):
+    """정규화 결과"""
+    success: bool
+    count: int = 0
+    skippedRows: int = 0
+    mergedRows: int = 0  # 앞 거래에 합친 줄 수 (행 복원)
+    columns: Optional[NormalizedTransactionColumns] = None
+    error: Optional[str] = None
+
+
+class BalanceCandidate(BaseModel):
+    """잔액 검증 대안 해석별 점수"""
+    label: str
+    matchRate: float
+    comparedRows: int
+    order: str
+
+
+class MappingCheckResult(BaseModel):
+    """잔액 연속성 매핑 검증 결과"""
+    success: bool
+    matchRate: float = 0          # 가장 잘 맞는 해석의 일치율
+    originalMatchRate: float = 0  # 제안된 매핑의 일치율
+    comparedRows: int = 0
+    order: Optional[str] = None   # ascending | descending
+    corrected: bool = False
+    bestLabel: Optional[str] = None
+    analysis: Optional[ColumnAnalysisResult] = None  # 가장 잘 맞는 매핑
+    candidates: list[BalanceCandidate] = []
+    error: Optional[str] = None
+
+
+class TemplateRecord(BaseModel):
+    """인덱싱할 TransactionTemplate (columnSchema는 { columns: {...}, parseRules: {...} })"""
+    id: str
+    name: str
+    bankName: Optional[str] = None
+    identifiers: list[str] = []
+    columnSchema: dict = {}
+    isActive: bool = True
+    priority: int = 0
+
+
+class TemplateRefreshRequest(BaseModel):
+    """템플릿 인덱스 갱신 요청"""
+    templates: list[TemplateRecord] = []
+    removedIds: list[str] = []
+    replace: bool = False  # True면 templates에 없는 기존 템플릿 제거 (전체 동기화)
+
+
+class TemplateRefreshResult(BaseModel):
+    """템플릿 인덱스 갱신 결과"""
+    added: int
+    updated: int
+    unchanged: int
+    removed: int
+    total: int
+    version: int
+
+
+class TemplateMatchRequest(BaseModel):
+    """템플릿 매칭 요청"""
+    headers: list[str]
+    pageText: Optional[str] = None  # 문서 상단 텍스트 (identifiers 비교용)
+    topK: int = 5
+
+
+class TemplateMatchItem(BaseModel):
+    """템플릿 매칭 후보"""
+    id: str
+    name: str
+    bankName: Optional[str] = None
+    score: float
+    headerScore: float
+    identifierScore: Optional[float] = None
+    priority: int = 0
+
+
+class TemplateMatchResponse(BaseModel):
+    """템플릿 매칭 결과 (score 내림차순)"""
+    matches: list[TemplateMatchItem]
+    indexSize: int
+    elapsedMicros: int
+
+
+class KeywordRule(BaseModel):
+    """활성 분류 규칙 (patternType: KEYWORD/AMOUNT_RANGE/CREDITOR, AMOUNT_RANGE 패턴은 "MIN-MAX")"""
+    id: str
+    pattern: str
+    patternType: str
+    category: str
+    subcategory: Optional[str] = None
+    confidence: float = 0.0
+
+
+class KeywordTransaction(BaseModel):
+    """키워드 분류할 거래"""
+    id: str
+    memo: Optional[str] = None
+    depositAmount: Optional[float] = None
+    withdrawalAmount: Optional[float] = None
+    creditorName: Optional[str] = None
+
+
+class KeywordClassifyRequest(BaseModel):
+    """키워드 분류 요청 (importantKeywords를 생략하면 기본 중요 거래 키워드 사용)"""
+    rules: list[KeywordRule] = []
+    importantKeywords: Optional[dict[str, list[str]]] = None
+    transactions: list[KeywordTransaction] = []
+
+
+class KeywordClassification(BaseModel):
+    """거래 하나의 키워드 분류 결과 (규칙 id 목록은 confidence 내림차순)"""
+    transactionId: str
+    matched: bool
+    appliedRuleId: Optional[str] = None
+    patternType: Optional[str] = None
+    category: Optional[str] = None
+    subcategory: Optional[str] = None
+    confidence: Optional[float] = None
+    keywordRuleIds: list[str] = []
+    amountRangeRuleIds: list[str] = []
+    creditorRuleIds: list[str] = []
+    importantType: Optional[str] = None
+    matchedKeywords: list[str] = []
+
+
+class KeywordClassifyResponse(BaseModel):
+    """키워드 분류 결과 (거래 입력 순서)"""
+    success: bool
+    results: list[KeywordClassification] = []
+    matchedCount: int = 0
+    importantCount: int = 0
+    ruleSetVersion: Optional[str] = None  # 규칙 집합 내용 해시 앞부분
+    compiled: bool = False                # 이번 요청에서 규칙 집합을 새로 컴파일했는지
+    invalidRuleIds: list[str] = []        # 형식이 잘못되어 건너뛴 AMOUNT_RANGE 규칙
+    elapsedMicros: int = 0
+    error: Optional[str] = None
+
+
+class JobSubmitResponse(BaseModel):
+    """작업 등록 결과"""
+    jobId: str
+    status: str
+    statusUrl: str
+    eventsUrl: str
+
+
+class JobStatusResponse(BaseModel):
+    """작업 상태 (stage: queued → running → 단계별 진행 → completed/failed)"""
+    jobId: str
+    kind: str                      # pdf | table
+    status: str                    # queued | running | succeeded | failed
+    stage: str
+    createdAt: float
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+    expiresAt: Optional[float] = None
+    result: Optional[ColumnAnalysisResult] = None
+    error: Optional[str] = None
+    events: list[dict] = []
+
+
+class BatchTableRequest(BaseModel):
+    """테이블 일괄 분석 요청"""
+    tables: list[TableData]
+
+
+class BatchItemResult(BaseModel):
+    """배치 항목별 분석 결과"""
+    index: int
+    name: Optional[str] = None
+    result: ColumnAnalysisResult
+
+
+class BatchAnalysisResponse(BaseModel):
+    """배치 분석 결과"""
+    total: int
+    succeeded: int
+    failed: int
+    results: list[BatchItemResult]
 
 
 # LLM 분석 프롬프트
@@ -138,109 +818,1622 @@ COLUMN_ANALYSIS_PROMPT = """당신은 한국 은행 거래내역서 분석 전
 }"""
 
 
-async def analyze_with_llm(content: str, is_pdf: bool = False, file_path: str = None) -> dict:
-    """LLM을 사용하여 컬럼 분석"""
-    from emergentintegrations.llm.chat import LlmChat, UserMessage, FileContentWithMimeType
-    
-    chat = LlmChat(
-        api_key=EMERGENT_LLM_KEY,
-        session_id=f"column-analysis-{os.urandom(8).hex()}",
-        system_message=COLUMN_ANALYSIS_PROMPT
-    ).with_model("gemini", "gemini-2.5-flash")
-    
+PDF_ANALYSIS_INSTRUCTION = "첨부된 PDF 파일의 거래내역 테이블을 분석하고 컬럼 매핑을 JSON 형식으로 반환해주세요. JSON만 반환하고 다른 텍스트는 포함하지 마세요."
+
+TABLE_ANALYSIS_INSTRUCTION = "다음 테이블 데이터를 분석하고 컬럼 매핑을 JSON 형식으로 반환해주세요. 컬럼 통계는 샘플에 없는 행까지 포함한 분포입니다. JSON만 반환하고 다른 텍스트는 포함하지 마세요:"
+
+MULTI_TABLE_RESPONSE_FORMAT = '{"tables": [{"tableIndex": 테이블 번호, ...응답 형식의 나머지 필드}]}'
+
+
+def multi_table_instruction(count: int) -> str:
+    """여러 거래내역 테이블을 한 번에 분석하는 지시문"""
+    return (
+        f"다음은 한 문서에서 찾은 거래내역 테이블 {count}개입니다. 테이블마다 컬럼 매핑을 분석하여 "
+        f"{MULTI_TABLE_RESPONSE_FORMAT} 형식의 JSON 하나로 반환해주세요. "
+        "모든 테이블을 빠짐없이 포함하고 JSON만 반환하세요:"
+    )
+
+
+MULTI_TABLE_PDF_INSTRUCTION = (
+    "첨부된 PDF 파일에서 거래내역 테이블을 모두 찾아(계좌별, 카드 이용내역 등 섹션별로 각각) 컬럼 매핑을 분석해주세요. "
+    "계좌정보, 요약표, 집계표는 제외합니다. 테이블마다 pageStart/pageEnd(0부터 시작하는 페이지)를 포함하여 "
+    f"{MULTI_TABLE_RESPONSE_FORMAT} 형식의 JSON 하나로 반환하고 다른 텍스트는 포함하지 마세요."
+)
+
+PDF_OCR_PROMPT = """당신은 한국 은행/카드 거래내역서 PDF의 거래내역 테이블을 그대로 옮겨 적는 전문가입니다.
+셀 값은 보이는 그대로(날짜 형식, 금액의 쉼표/부호 포함) 문자열로 적고, 해석하거나 계산하지 마세요.
+빈 셀은 빈 문자열로 두고 행 순서는 페이지에 나온 순서를 유지합니다."""
+
+
+def ocr_chunk_instruction(headers: list[str]) -> str:
+    """스캔 페이지 묶음 인식 지시문 (헤더를 이미 알면 그 열 순서로 요청)"""
+    if headers:
+        return (
+            f"첨부된 PDF는 거래내역서의 일부 페이지입니다. 거래내역 테이블의 열은 [{' | '.join(headers)}] 입니다. "
+            "페이지에 헤더 행이 없어도 이 열 순서대로 거래 행을 읽어 "
+            '{"headers": [], "rows": [[셀, ...], ...], "pageTexts": [텍스트, ...]} 형식의 JSON 하나로 반환하세요. '
+            "헤더 행과 페이지 머리글/바닥글은 rows에 넣지 말고, 테이블 밖 텍스트(은행명, 계좌번호, 예금주, 조회기간 등)는 "
+            "한 줄씩 pageTexts에 넣으며 JSON만 반환하세요."
+        )
+    return (
+        "첨부된 PDF는 거래내역서의 일부 페이지입니다. 거래내역 테이블의 헤더 행과 거래 행을 읽어 "
+        '{"headers": [헤더, ...], "rows": [[셀, ...], ...], "pageTexts": [텍스트, ...]} 형식의 JSON 하나로 반환하세요. '
+        "헤더가 없는 페이지면 headers는 빈 배열로 두고, 테이블 밖 텍스트(은행명, 계좌번호, 예금주, 조회기간 등)는 "
+        "한 줄씩 pageTexts에 넣으며 JSON만 반환하세요."
+    )
+
+# 테이블 외 프롬프트(시스템 메시지 + 지시문) 추정 토큰 수
+BASE_PROMPT_TOKENS = estimate_tokens(COLUMN_ANALYSIS_PROMPT) + estimate_tokens(TABLE_ANALYSIS_INSTRUCTION)
+
+
+async def estimate_pdf_tokens(file_path: str) -> int:
+    """PDF 첨부 입력 토큰 추정 (페이지 수 기준, TPM 예약용)"""
+    try:
+        return await asyncio.to_thread(page_count, file_path) * LLM_PDF_TOKENS_PER_PAGE
+    except Exception:
+        return LLM_PDF_TOKENS_PER_PAGE
+
+
+async def analyze_with_llm(
+    content: str,
+    is_pdf: bool = False,
+    file_path: str = None,
+    model: Optional[str] = None,
+    instruction: Optional[str] = None,
+    response_model: type[BaseModel] = ColumnAnalysisResult,
+    system_prompt: str = COLUMN_ANALYSIS_PROMPT,
+) -> dict:
+    """LLM을 사용하여 컬럼 분석 (model 미지정 시 기본 모델)
+
+    Args:
+        instruction: 기본 지시문 대신 사용할 지시문 (다중 테이블 모드 등)
+        response_model: 응답 JSON 검증 모델
+        system_prompt: 시스템 메시지 (스캔 페이지 OCR 등 컬럼 분석 외 작업)
+    """
     if is_pdf and file_path:
         # PDF 파일 첨부
-        pdf_file = FileContentWithMimeType("application/pdf", file_path)
-        response = await chat.send_message(
-            UserMessage(
-                text="첨부된 PDF 파일의 거래내역 테이블을 분석하고 컬럼 매핑을 JSON 형식으로 반환해주세요. JSON만 반환하고 다른 텍스트는 포함하지 마세요.",
-                file_contents=[pdf_file]
-            )
-        )
+        kind = "pdf"
+        text = instruction or PDF_ANALYSIS_INSTRUCTION
     else:
         # 테이블 데이터 텍스트
-        response = await chat.send_message(
-            UserMessage(
-                text=f"다음 테이블 데이터를 분석하고 컬럼 매핑을 JSON 형식으로 반환해주세요. JSON만 반환하고 다른 텍스트는 포함하지 마세요:\n\n{content}"
-            )
-        )
-    
-    # JSON 파싱
-    import re
-    json_match = re.search(r'\{[\s\S]*\}', response)
-    if not json_match:
-        raise ValueError("LLM 응답에서 JSON을 찾을 수 없습니다")
-    
-    return json.loads(json_match.group())
-
-
-@app.post("/analyze/pdf", response_model=ColumnAnalysisResult)
-async def analyze_pdf(file: UploadFile = File(...)):
-    """PDF 파일 분석"""
-    try:
-        # 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
+        kind = "table"
+        text = f"{instruction or TABLE_ANALYSIS_INSTRUCTION}\n\n{content}"
+
+    request_bytes = len(system_prompt.encode("utf-8")) + len(text.encode("utf-8"))
+    text_tokens = estimate_tokens(system_prompt) + estimate_tokens(text)
+    reserved_tokens = text_tokens + LLM_EXPECTED_OUTPUT_TOKENS
+    if is_pdf and file_path:
+        request_bytes += os.path.getsize(file_path)
+        reserved_tokens += await estimate_pdf_tokens(file_path)
+    transfer_bytes.inc(request_bytes, direction="llm_request")
+    prompt_tokens.inc(text_tokens, kind=kind)
+
+    async def send() -> tuple[dict, IncrementalJsonParser]:
+        outcome = "error"
+        t0 = time.perf_counter()
         try:
-            result = await analyze_with_llm("", is_pdf=True, file_path=tmp_path)
-            return ColumnAnalysisResult(**result)
+            with llm_in_flight.track():
+                # 응답을 조각 단위로 파싱, 최상위 객체가 완성되고 검증되면 나머지 스트림은 닫음
+                result, parser = await parse_json_stream(
+                    llm_client.stream(
+                        system_prompt,
+                        text,
+                        file_path=file_path if is_pdf else None,
+                        model=model,
+                    ),
+                    validate=response_model.model_validate,
+                )
+            outcome = "success"
+            return result, parser
+        except TimeoutError:
+            outcome = "timeout"
+            raise
+        except JsonStreamError:
+            outcome = "malformed"
+            raise
+        except Exception as e:
+            if classify_error(e) == THROTTLED:
+                outcome = "throttled"
+            raise
         finally:
-            os.unlink(tmp_path)
-            
+            llm_latency.observe(time.perf_counter() - t0, kind=kind, outcome=outcome)
+
+    # RPM/TPM/동시성 제한 안에서 호출, 일시적 오류는 백오프 후 재시도
+    result, parser = await llm_limiter.call(
+        send,
+        reserved_tokens,
+        on_retry=lambda reason, _: llm_retries.inc(kind=kind, reason=reason),
+        enforce_queue_limit=not llm_queue_exempt.get(),
+    )
+    response = parser.text
+    llm_limiter.tokens.adjust(estimate_tokens(response) - LLM_EXPECTED_OUTPUT_TOKENS)
+    transfer_bytes.inc(len(response.encode("utf-8")), direction="llm_response")
+    stage_latency.observe(parser.parse_seconds, stage="json_extraction")
+    if parser.stopped_early:
+        llm_stream_early_stops.inc(kind=kind)
+    return result
+
+
+def is_confident(result: ColumnAnalysisResult) -> bool:
+    """다음 단계로 올라가지 않아도 될 만큼 신뢰할 수 있는 결과인지"""
+    return (
+        result.success
+        and result.confidence >= CASCADE_CONFIDENCE_THRESHOLD
+        and result.memoAnalysis.confidence >= CASCADE_MEMO_CONFIDENCE_THRESHOLD
+    )
+
+
+def result_rank(result: ColumnAnalysisResult) -> float:
+    """채택할 결과가 없을 때 가장 나은 결과를 고르는 점수"""
+    return min(result.confidence, result.memoAnalysis.confidence) if result.success else -1.0
+
+
+def highest_tier(budget: AnalysisBudget) -> str:
+    """예산과 설정된 모델로 도달할 수 있는 가장 높은 단계"""
+    return min(budget.max_tier, llm_tiers[-1].name, key=TIERS.index)
+
+
+async def get_cached_result(
+    cache_key: str,
+    bypass_cache: bool,
+    budget: Optional[AnalysisBudget] = None,
+) -> Optional[ColumnAnalysisResult]:
+    """캐시된 분석 결과 조회
+
+    예산 부족 등으로 낮은 단계에서 멈춘 저신뢰 결과는, 이번 요청이 더 높은 단계를 허용하면 다시 분석합니다.
+    """
+    if bypass_cache or not ANALYSIS_CACHE_ENABLED:
+        return None
+    cached = await analysis_cache.aget(cache_key)
+    if cached is None:
+        return None
+    result = ColumnAnalysisResult(**cached)
+    return result if satisfies_budget(result, budget) else None
+
+
+def satisfies_budget(result: ColumnAnalysisResult, budget: Optional[AnalysisBudget]) -> bool:
+    """이미 있는 결과로 이번 요청에 답해도 되는지 (신뢰할 수 있거나, 허용된 가장 높은 단계의 결과)"""
+    return not (
+        budget is not None
+        and result.tier in TIERS
+        and not is_confident(result)
+        and TIERS.index(result.tier) < TIERS.index(highest_tier(budget))
+    )
+
+
+def flight_key(cache_key: str, budget: AnalysisBudget) -> str:
+    """진행 중 호출 공유 키 (최대 단계가 다른 요청은 프로세스 안팎 모두 호출을 공유하지 않음)"""
+    return f"{cache_key}:{budget.max_tier}"
+
+
+async def join_flight(
+    cache_key: str,
+    budget: AnalysisBudget,
+    factory,
+    fallback: Optional[ColumnAnalysisResult] = None,
+) -> ColumnAnalysisResult:
+    """진행 중 호출 공유 (이미 답이 있으면 이번 요청의 지연 예산 안에서만 대기)
+
+    지연 예산이 없는 요청이 시작한 호출에 합류해도 예산이 다 되면 fallback(휴리스틱 결과)을 반환합니다.
+    답이 없으면 단계별 분석과 같이 예산을 넘겨서라도 결과를 기다립니다.
+    대기를 포기한 요청이 마지막 대기자였으면 공유 호출도 취소됩니다.
+    """
+    shared = inflight_analyses.do(flight_key(cache_key, budget), factory)
+    remaining = budget.remaining()
+    if fallback is None or remaining is None:
+        return await shared
+    try:
+        return await asyncio.wait_for(shared, timeout=max(remaining, 0))
+    except asyncio.TimeoutError:
+        return fallback
+
+
+async def run_model_cascade(
+    kind: str,
+    attempt,
+    budget: AnalysisBudget,
+    initial: Optional[ColumnAnalysisResult] = None,
+    attempts: Optional[list[TierAttempt]] = None,
+) -> ColumnAnalysisResult:
+    """LLM 단계(빠른 모델 → 강한 모델)를 예산 안에서 실행하고 답한 단계 기록"""
+    cascade = await run_cascade(
+        llm_tiers,
+        attempt,
+        budget,
+        accept=is_confident,
+        rank=result_rank,
+        initial=initial,
+        initial_tier=HEURISTIC if initial is not None else None,
+        attempts=attempts,
+    )
+    for a in cascade.attempts[len(attempts or []):]:
+        tier_attempts.inc(kind=kind, tier=a.tier, outcome=a.outcome)
+    if cascade.result is None:
+        raise ValueError(f"허용된 분석 단계(maxTier={budget.max_tier})에서 결과를 얻지 못했습니다")
+    result = cascade.result
+    result.tier = cascade.tier
+    result.tierAttempts = [a.to_dict() for a in cascade.attempts]
+    return result
+
+
+def lookup_shared_result(cache_key: str, budget: AnalysisBudget) -> Optional[ColumnAnalysisResult]:
+    """다른 워커가 저장한 결과 조회 (임대 대기 중 폴링, 이번 요청의 최대 단계를 만족하는 결과만)"""
+    value = shared_store.get_result(cache_key)
+    if value is None:
+        return None
+    result = ColumnAnalysisResult(**value)
+    return result if satisfies_budget(result, budget) else None
+
+
+async def run_once_across_workers(
+    cache_key: str, budget: AnalysisBudget, factory, cleanup=None
+) -> ColumnAnalysisResult:
+    """같은 키·최대 단계의 분석을 전체 워커에서 한 번만 실행 (단일 프로세스면 바로 실행)
+
+    임대는 SingleFlight와 같은 키를 쓰므로, 한 프로세스에서 최대 단계가 다른 요청이 같은 임대를
+    나눠 갖고 먼저 끝난 쪽이 다른 쪽의 임대를 해제하는 일이 없습니다.
+    """
+    if worker_leases is None:
+        return await factory()
+    return await worker_leases.do(
+        flight_key(cache_key, budget), factory, lambda: lookup_shared_result(cache_key, budget), cleanup
+    )
+
+
+async def store_cached_result(cache_key: str, result: ColumnAnalysisResult) -> None:
+    """성공한 분석 결과만 캐시에 저장"""
+    if ANALYSIS_CACHE_ENABLED and result.success:
+        await analysis_cache.aset(cache_key, result.model_dump())
+
+
+def create_error_result(error: Exception) -> ColumnAnalysisResult:
+    """에러 결과 생성"""
+    record_error(error)
+    return ColumnAnalysisResult(
+        success=False,
+        columnMapping=ColumnMapping(거래일자="", 비고=""),
+        headerRowIndex=0,
+        dataStartRowIndex=1,
+        transactionTypeDetection=TransactionTypeDetection(method="separate_columns"),
+        memoAnalysis=MemoAnalysis(columnName="", contentType="unknown", confidence=0),
+        confidence=0,
+        reasoning="",
+        error=str(error)
+    )
+
+
+async def prune_pdf_pages(file_path: str):
+    """거래내역 테이블 페이지 선별 (실패 시 원본 전체 사용)"""
+    if not PDF_PAGE_PRUNING_ENABLED:
+        return None
+    try:
+        return await asyncio.to_thread(select_table_pages, file_path, PDF_PRUNE_MAX_PAGES, UPLOAD_TMP_DIR)
     except Exception as e:
-        return ColumnAnalysisResult(
-            success=False,
-            columnMapping=ColumnMapping(거래일자="", 비고=""),
-            headerRowIndex=0,
-            dataStartRowIndex=1,
-            transactionTypeDetection=TransactionTypeDetection(method="separate_columns"),
-            memoAnalysis=MemoAnalysis(columnName="", contentType="unknown", confidence=0),
-            confidence=0,
-            reasoning="",
-            error=str(e)
-        )
-
-
-@app.post("/analyze/table", response_model=ColumnAnalysisResult)
-async def analyze_table(data: TableData):
-    """테이블 데이터 분석"""
-    try:
-        # 샘플 데이터 준비
-        sample_rows = data.rows[:10]
-        table_preview = [
-            f"헤더: {' | '.join(data.headers)}",
+        page_prune_failures.inc(error_class=error_class(e))
+        return None
+
+
+async def analyze_pdf_content(
+    file_path: str,
+    cache_key: str,
+    progress: Optional[ProgressCallback] = None,
+    budget: Optional[AnalysisBudget] = None,
+) -> ColumnAnalysisResult:
+    """PDF 파일을 단계별 모델로 분석하고 결과 캐시 (분석 후 파일 삭제)"""
+    selection = None
+    try:
+        report(progress, "page_pruning")
+        with stage_latency.time(stage="pdf_page_selection"):
+            selection = await prune_pdf_pages(file_path)
+        send_path = selection.path if selection else file_path
+
+        async def attempt(tier: ModelTier) -> ColumnAnalysisResult:
+            report(progress, "llm", tier=tier.name, model=tier.model, pages=selection.pages if selection else None)
+            result = await analyze_with_llm("", is_pdf=True, file_path=send_path, model=tier.model)
+            if selection:
+                result["sourcePageIndices"] = selection.pages
+            report(progress, "validation", tier=tier.name)
+            with stage_latency.time(stage="validation"):
+                return ColumnAnalysisResult(**result)
+
+        validated = await run_model_cascade("pdf", attempt, budget or default_budget())
+        await store_cached_result(cache_key, validated)
+        return validated
+    finally:
+        remove_file(file_path)
+        if selection:
+            remove_file(selection.path)
+
+
+def apply_balance_check(data: TableData, result: ColumnAnalysisResult) -> ColumnAnalysisResult:
+    """잔액 연속성으로 매핑 검증, 대안 해석이 확실히 나으면 보정"""
+    if not BALANCE_CHECK_ENABLED or not result.success:
+        return result
+    with stage_latency.time(stage="balance_check"):
+        check = check_balance(data.headers, data.rows, result.model_dump())
+    if check is None:
+        return result
+
+    best, original = check.best, check.original
+    if (
+        check.corrected
+        and best.match_rate >= BALANCE_CHECK_MIN_RATE
+        and best.match_rate - original.match_rate >= BALANCE_CHECK_MIN_GAIN
+    ):
+        corrected = ColumnAnalysisResult(**best.analysis)
+        corrected.balanceMatchRate = best.match_rate
+        corrected.reasoning = (
+            f"{result.reasoning} / 잔액 검증으로 보정: {best.label} "
+            f"(일치율 {original.match_rate:.2f} → {best.match_rate:.2f})"
+        )
+        return corrected
+
+    result.balanceMatchRate = original.match_rate
+    return result
+
+
+async def analyze_table_content(
+    data: TableData,
+    compact: CompactTable,
+    cache_key: str,
+    progress: Optional[ProgressCallback] = None,
+    budget: Optional[AnalysisBudget] = None,
+    heuristic: Optional[ColumnAnalysisResult] = None,
+    attempts: Optional[list[TierAttempt]] = None,
+) -> ColumnAnalysisResult:
+    """압축된 테이블 프롬프트를 단계별 모델로 분석하고 잔액 검증 후 결과 캐시
+
+    Args:
+        heuristic / attempts: 신뢰도가 부족했던 규칙 기반 결과와 그 실행 기록 (예산이 다 되면 그대로 반환)
+    """
+    async def attempt(tier: ModelTier) -> ColumnAnalysisResult:
+        report(progress, "llm", tier=tier.name, model=tier.model, estimatedPromptTokens=compact.estimated_tokens)
+        result = await analyze_with_llm(compact.content, is_pdf=False, model=tier.model)
+        result["estimatedPromptTokens"] = compact.estimated_tokens
+        report(progress, "validation", tier=tier.name)
+        with stage_latency.time(stage="validation"):
+            validated = ColumnAnalysisResult(**result)
+        return apply_balance_check(data, validated)
+
+    validated = await run_model_cascade("table", attempt, budget or default_budget(), heuristic, attempts)
+    await store_cached_result(cache_key, validated)
+    return validated
+
+
+async def run_pdf_analysis(
+    upload: SpooledUpload,
+    bypass_cache: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    budget: Optional[AnalysisBudget] = None,
+) -> ColumnAnalysisResult:
+    """저장된 PDF 업로드 분석 (실패 시 에러 결과 반환)"""
+    budget = budget or default_budget()
+    try:
+        cache_key = pdf_digest_cache_key(upload.sha256)
+        cached = await get_cached_result(cache_key, bypass_cache, budget)
+        if cached is not None:
+            analysis_outcomes.inc(kind="pdf", source="cache")
+            return cached
+
+        # 공유 호출을 시작하는 요청만 파일 소유권을 넘김 (대기자 연결이 끊겨도 파일 유지)
+        def start_analysis():
+            path = upload.detach()
+            return run_once_across_workers(
+                cache_key,
+                budget,
+                lambda: analyze_pdf_content(path, cache_key, progress, budget),
+                cleanup=lambda: remove_file(path),
+            )
+
+        # 최대 단계가 다른 요청은 호출을 공유하지 않음
+        result = await join_flight(cache_key, budget, start_analysis)
+        analysis_outcomes.inc(kind="pdf", source="llm")
+        return result
+
+    except LlmOverloadedError:
+        # 요청 단위 429로 응답 (exception handler)
+        analysis_outcomes.inc(kind="pdf", source="overloaded")
+        raise
+    except Exception as e:
+        analysis_outcomes.inc(kind="pdf", source="error")
+        return create_error_result(e)
+
+
+def run_rule_mapper(data: TableData, kind: str) -> tuple[ColumnAnalysisResult, bool, list[TierAttempt]]:
+    """휴리스틱 단계 실행 (결과, 채택 여부, 실행 기록)"""
+    t0 = time.perf_counter()
+    with stage_latency.time(stage="rule_mapper"):
+        rule_result = ColumnAnalysisResult(**map_columns(data.headers, data.rows))
+    rule_result = apply_balance_check(data, rule_result)
+    accepted = rule_result.success and rule_result.confidence >= RULE_MAPPER_CONFIDENCE_THRESHOLD
+    attempts = [TierAttempt(
+        HEURISTIC, "accepted" if accepted else "low_confidence", time.perf_counter() - t0, rule_result.confidence
+    )]
+    tier_attempts.inc(kind=kind, tier=HEURISTIC, outcome=attempts[-1].outcome)
+    rule_result.tier = HEURISTIC
+    rule_result.tierAttempts = [a.to_dict() for a in attempts]
+    return rule_result, accepted, attempts
+
+
+async def run_table_analysis(
+    data: TableData,
+    bypass_cache: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    budget: Optional[AnalysisBudget] = None,
+) -> ColumnAnalysisResult:
+    """테이블 데이터 분석 (실패 시 에러 결과 반환)"""
+    budget = budget or default_budget()
+    try:
+        report(progress, "prompt_compaction")
+        # 토큰 예산 안에서 컬럼 통계 + 층화 샘플로 프롬프트 구성
+        with stage_latency.time(stage="prompt_compaction"):
+            compact = compact_table(
+                data.headers,
+                data.rows,
+                token_budget=PROMPT_TOKEN_BUDGET,
+                max_cell_chars=PROMPT_MAX_CELL_CHARS,
+                base_tokens=BASE_PROMPT_TOKENS,
+            )
+        cache_key = table_cache_key(data.headers, compact.sample_rows)
+        cached = await get_cached_result(cache_key, bypass_cache, budget)
+        if cached is not None:
+            analysis_outcomes.inc(kind="table", source="cache")
+            return cached
+
+        # 휴리스틱 단계: 규칙 기반 빠른 경로
+        heuristic, attempts = None, []
+        if RULE_MAPPER_ENABLED:
+            report(progress, "rule_mapper")
+            rule_result, accepted, attempts = run_rule_mapper(data, "table")
+            if accepted or not budget.allows(FAST):
+                analysis_outcomes.inc(kind="table", source="rule_mapper")
+                return rule_result
+            if rule_result.success:
+                heuristic = rule_result
+
+        result = await join_flight(
+            cache_key,
+            budget,
+            lambda: run_once_across_workers(
+                cache_key,
+                budget,
+                lambda: analyze_table_content(data, compact, cache_key, progress, budget, heuristic, attempts),
+            ),
+            fallback=heuristic,
+        )
+        analysis_outcomes.inc(kind="table", source="rule_mapper" if result.tier == HEURISTIC else "llm")
+        return result
+
+    except LlmOverloadedError:
+        analysis_outcomes.inc(kind="table", source="overloaded")
+        raise
+    except Exception as e:
+        analysis_outcomes.inc(kind="table", source="error")
+        return create_error_result(e)
+
+
+def to_detected_table(
+    segment: TableSegment,
+    is_pdf: bool,
+    analysis: Optional[ColumnAnalysisResult] = None,
+    skip_reason: Optional[str] = None,
+) -> DetectedTable:
+    """세그먼트 → 응답 항목 (테이블 입력은 행 범위, PDF는 페이지 범위)"""
+    return DetectedTable(
+        index=segment.index,
+        kind=segment.kind,
+        headers=segment.headers,
+        rowStart=None if is_pdf else segment.row_start,
+        rowEnd=None if is_pdf else segment.row_end,
+        rowCount=len(segment.rows),
+        pageStart=segment.page_start,
+        pageEnd=segment.page_end,
+        caption=segment.caption,
+        tableType=analysis.tableType if analysis is not None else None,
+        confidence=analysis.confidence if analysis is not None and analysis.success else 0.0,
+        analysis=analysis,
+        skipReason=skip_reason,
+    )
+
+
+async def analyze_pending_tables(
+    pending: dict[int, tuple[TableData, CompactTable, str, Optional[str]]],
+    heuristics: dict[int, ColumnAnalysisResult],
+    rule_attempts: dict[int, list[TierAttempt]],
+    budget: AnalysisBudget,
+    kind: str,
+) -> tuple[dict[int, ColumnAnalysisResult], int]:
+    """캐시/규칙 매퍼로 해결되지 않은 거래내역 테이블을 LLM 한 번에 분석 (단계별 모델)
+
+    Args:
+        pending: 세그먼트 번호 → (테이블, 압축 프롬프트, 캐시 키, 캡션)
+        heuristics: 신뢰도가 부족했던 규칙 기반 결과 (LLM 결과가 더 나쁘거나 없으면 사용)
+
+    Returns:
+        (세그먼트 번호별 결과, LLM 호출 수)
+    """
+    order = list(pending)
+    sections = []
+    for index in order:
+        _, compact, _, caption = pending[index]
+        title = f"## 테이블 {index}" + (f" (위 텍스트: {caption})" if caption else "")
+        sections.append(f"{title}\n{compact.content}")
+    content = "\n\n".join(sections)
+    instruction = multi_table_instruction(len(order))
+
+    async def attempt(tier: ModelTier) -> dict[int, ColumnAnalysisResult]:
+        response = await analyze_with_llm(
+            content, model=tier.model, instruction=instruction, response_model=MultiTableLlmResponse
+        )
+        resolved: dict[int, ColumnAnalysisResult] = {}
+        with stage_latency.time(stage="validation"):
+            for item in MultiTableLlmResponse(**response).tables:
+                if item.tableIndex not in pending or item.tableIndex in resolved:
+                    continue
+                data, compact, _, _ = pending[item.tableIndex]
+                result = ColumnAnalysisResult(**item.model_dump(exclude={"tableIndex", "pageStart", "pageEnd"}))
+                result.estimatedPromptTokens = compact.estimated_tokens
+                resolved[item.tableIndex] = apply_balance_check(data, result)
+        return resolved
+
+    def rank(results: dict[int, ColumnAnalysisResult]) -> float:
+        return min(result_rank(results[i]) if i in results else -1.0 for i in order)
+
+    def accept(results: dict[int, ColumnAnalysisResult]) -> bool:
+        return all(i in results and is_confident(results[i]) for i in order)
+
+    error: Optional[Exception] = None
+    try:
+        cascade = await run_cascade(
+            llm_tiers, attempt, budget, accept, rank,
+            initial=dict(heuristics) if heuristics else None,
+            initial_tier=HEURISTIC if heuristics else None,
+        )
+    except LlmOverloadedError:
+        raise
+    except Exception as e:
+        error, cascade = e, CascadeResult(None, None, [])
+    for a in cascade.attempts:
+        tier_attempts.inc(kind=kind, tier=a.tier, outcome=a.outcome)
+
+    best = cascade.result or {}
+    resolved: dict[int, ColumnAnalysisResult] = {}
+    for index in order:
+        result, tier = best.get(index), cascade.tier
+        heuristic = heuristics.get(index)
+        if heuristic is not None and (result is None or result_rank(heuristic) > result_rank(result)):
+            result, tier = heuristic, HEURISTIC
+        if result is None:
+            analysis_outcomes.inc(kind=kind, source="error")
+            resolved[index] = create_error_result(error or ValueError(f"테이블 {index}의 분석 결과를 얻지 못했습니다"))
+            continue
+        result.tier = tier
+        result.tierAttempts = [a.to_dict() for a in (*rule_attempts.get(index, []), *cascade.attempts)]
+        await store_cached_result(pending[index][2], result)
+        analysis_outcomes.inc(kind=kind, source="rule_mapper" if tier == HEURISTIC else "llm")
+        resolved[index] = result
+    return resolved, len(cascade.attempts)
+
+
+async def analyze_table_segments(
+    segments: list[TableSegment],
+    kind: str,
+    bypass_cache: bool,
+    budget: AnalysisBudget,
+) -> MultiTableAnalysisResult:
+    """분리된 테이블 중 거래내역 테이블만 분석
+
+    로컬 분류로 거래내역이 아닌 테이블은 건너뛰고, 캐시/규칙 매퍼로 해결되지 않은 테이블만 모아
+    LLM을 한 번 호출합니다.
+    """
+    is_pdf = kind == "pdf"
+    transactions: list[TableSegment] = []
+    skipped: list[DetectedTable] = []
+    results: dict[int, ColumnAnalysisResult] = {}
+    pending: dict[int, tuple[TableData, CompactTable, str, Optional[str]]] = {}
+    heuristics: dict[int, ColumnAnalysisResult] = {}
+    rule_attempts: dict[int, list[TierAttempt]] = {}
+
+    for segment in segments:
+        table_segments_total.inc(source=kind, kind=segment.kind)
+        if segment.kind != TRANSACTIONS:
+            skipped.append(to_detected_table(segment, is_pdf, skip_reason=segment.reason))
+            continue
+        if not segment.headers or not segment.rows:
+            skipped.append(to_detected_table(segment, is_pdf, skip_reason="헤더 또는 데이터 행 없음"))
+            continue
+        transactions.append(segment)
+        data = TableData(headers=segment.headers, rows=segment.rows)
+        with stage_latency.time(stage="prompt_compaction"):
+            compact = compact_table(
+                data.headers,
+                data.rows,
+                token_budget=PROMPT_TOKEN_BUDGET,
+                max_cell_chars=PROMPT_MAX_CELL_CHARS,
+                base_tokens=BASE_PROMPT_TOKENS,
+            )
+        cache_key = table_cache_key(data.headers, compact.sample_rows)
+        cached = await get_cached_result(cache_key, bypass_cache, budget)
+        if cached is not None:
+            analysis_outcomes.inc(kind=kind, source="cache")
+            results[segment.index] = cached
+            continue
+        if RULE_MAPPER_ENABLED:
+            rule_result, accepted, attempts = run_rule_mapper(data, kind)
+            if accepted or not budget.allows(FAST):
+                analysis_outcomes.inc(kind=kind, source="rule_mapper")
+                results[segment.index] = rule_result
+                continue
+            if rule_result.success:
+                heuristics[segment.index] = rule_result
+            rule_attempts[segment.index] = attempts
+        pending[segment.index] = (data, compact, cache_key, segment.caption)
+
+    llm_calls = 0
+    if pending:
+        resolved, llm_calls = await analyze_pending_tables(pending, heuristics, rule_attempts, budget, kind)
+        results.update(resolved)
+
+    tables = [to_detected_table(s, is_pdf, results[s.index]) for s in transactions]
+    return MultiTableAnalysisResult(
+        success=any(t.analysis.success for t in tables),
+        tables=tables,
+        skippedTables=skipped,
+        llmCalls=llm_calls,
+        error=None if tables else "거래내역 테이블을 찾지 못했습니다",
+    )
+
+
+async def analyze_pdf_tables_with_llm(
+    file_path: str,
+    budget: AnalysisBudget,
+    skipped: list[DetectedTable],
+) -> MultiTableAnalysisResult:
+    """텍스트 레이어로 테이블을 나눌 수 없는 PDF(스캔본 등)의 거래내역 테이블을 LLM 한 번에 분석"""
+    async def attempt(tier: ModelTier) -> list[TableAnalysisItem]:
+        response = await analyze_with_llm(
+            "", is_pdf=True, file_path=file_path, model=tier.model,
+            instruction=MULTI_TABLE_PDF_INSTRUCTION, response_model=MultiTableLlmResponse,
+        )
+        return MultiTableLlmResponse(**response).tables
+
+    cascade = await run_cascade(
+        llm_tiers,
+        attempt,
+        budget,
+        accept=lambda items: bool(items) and all(is_confident(t) for t in items),
+        rank=lambda items: min((result_rank(t) for t in items), default=-1.0),
+    )
+    for a in cascade.attempts:
+        tier_attempts.inc(kind="pdf", tier=a.tier, outcome=a.outcome)
+
+    tables = []
+    for n, item in enumerate(cascade.result or []):
+        analysis = ColumnAnalysisResult(**item.model_dump(exclude={"tableIndex", "pageStart", "pageEnd"}))
+        analysis.tier = cascade.tier
+        analysis.tierAttempts = [a.to_dict() for a in cascade.attempts]
+        tables.append(DetectedTable(
+            index=n,
+            kind=TRANSACTIONS,
+            pageStart=item.pageStart,
+            pageEnd=item.pageEnd,
+            tableType=analysis.tableType,
+            confidence=analysis.confidence if analysis.success else 0.0,
+            analysis=analysis,
+        ))
+    analysis_outcomes.inc(kind="pdf", source="llm" if tables else "error")
+    return MultiTableAnalysisResult(
+        success=any(t.analysis.success for t in tables),
+        tables=tables,
+        skippedTables=skipped,
+        llmCalls=len(cascade.attempts),
+        error=None if tables else f"거래내역 테이블을 찾지 못했습니다 (maxTier={budget.max_tier})",
+    )
+
+
+async def run_table_multi_analysis(
+    data: TableData,
+    bypass_cache: bool = False,
+    budget: Optional[AnalysisBudget] = None,
+) -> MultiTableAnalysisResult:
+    """테이블 데이터 안의 여러 테이블 분석 (실패 시 에러 결과 반환)"""
+    try:
+        with stage_latency.time(stage="table_segmentation"):
+            segments = split_table(data.headers, data.rows)
+        return await analyze_table_segments(segments, "table", bypass_cache, budget or default_budget())
+    except LlmOverloadedError:
+        raise
+    except Exception as e:
+        record_error(e)
+        return MultiTableAnalysisResult(success=False, error=str(e))
+
+
+async def run_pdf_multi_analysis(
+    upload: SpooledUpload,
+    bypass_cache: bool = False,
+    budget: Optional[AnalysisBudget] = None,
+) -> MultiTableAnalysisResult:
+    """PDF 안의 여러 테이블 분석 (텍스트 레이어로 분리, 없으면 PDF 전체를 LLM으로)"""
+    budget = budget or default_budget()
+    try:
+        with stage_latency.time(stage="table_segmentation"):
+            segments, scanned, total = await extract_table_segments(upload.path, pdf_extract_pool, PDF_EXTRACT_WINDOW)
+        if any(s.kind == TRANSACTIONS and s.headers and s.rows for s in segments):
+            result = await analyze_table_segments(segments, "pdf", bypass_cache, budget)
+        else:
+            for segment in segments:
+                table_segments_total.inc(source="pdf", kind=segment.kind)
+            skipped = [to_detected_table(s, True, skip_reason=s.reason) for s in segments]
+            result = await analyze_pdf_tables_with_llm(upload.path, budget, skipped)
+        result.pageCount = total
+        result.scannedPages = scanned
+        return result
+    except LlmOverloadedError:
+        raise
+    except Exception as e:
+        record_error(e)
+        return MultiTableAnalysisResult(success=False, error=str(e))
+
+
+def default_budget() -> AnalysisBudget:
+    """예산 미지정 요청의 기본 예산 (지연 제한 없음)"""
+    return AnalysisBudget(max_tier=CASCADE_DEFAULT_MAX_TIER)
+
+
+def analysis_budget(
+    latency_budget: Optional[float] = Query(None, alias="latencyBudgetSeconds", gt=0),
+    max_tier: Optional[str] = Query(None, alias="maxTier", pattern="^(heuristic|fast|strong)$"),
+) -> AnalysisBudget:
+    """요청별 지연/비용 예산 (쿼리 파라미터, 요청 수신 시점부터 계산)"""
+    return AnalysisBudget(latency_seconds=latency_budget, max_tier=max_tier or CASCADE_DEFAULT_MAX_TIER)
+
+
+@app.post(
+    "/analyze/pdf",
+    response_model=Union[ColumnAnalysisResult, MultiTableAnalysisResult],
+    openapi_extra=PDF_UPLOAD_OPENAPI,
+)
+async def analyze_pdf(
+    request: Request,
+    bypass_cache: bool = Query(False, alias="bypassCache"),
+    multi_table: bool = Query(False, alias="multiTable"),
+    budget: AnalysisBudget = Depends(analysis_budget),
+):
+    """PDF 파일 분석 (multiTable=true면 문서 안의 거래내역 테이블 목록 반환)"""
+    try:
+        async with spooled_upload(request, MAX_UPLOAD_BYTES, UPLOAD_TMP_DIR) as upload:
+            record_upload(upload)
+            if multi_table:
+                return await run_pdf_multi_analysis(upload, bypass_cache, budget)
+            return await run_pdf_analysis(upload, bypass_cache, budget=budget)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LlmOverloadedError:
+        raise
+    except Exception as e:
+        return create_error_result(e)
+
+
+@app.post("/analyze/table", response_model=Union[ColumnAnalysisResult, MultiTableAnalysisResult])
+async def analyze_table(
+    data: TableData,
+    bypass_cache: bool = Query(False, alias="bypassCache"),
+    multi_table: bool = Query(False, alias="multiTable"),
+    budget: AnalysisBudget = Depends(analysis_budget),
+):
+    """테이블 데이터 분석 (multiTable=true면 빈 행/헤더 행으로 나눈 테이블 목록 반환)"""
+    if multi_table:
+        return await run_table_multi_analysis(data, bypass_cache, budget)
+    return await run_table_analysis(data, bypass_cache, budget=budget)
+
+
+async def run_batch(analyses: list) -> list[ColumnAnalysisResult]:
+    """배치 항목을 세마포어로 동시 실행 (입력 순서 유지)"""
+    async def run_one(analysis) -> ColumnAnalysisResult:
+        async with batch_semaphore:
+            try:
+                return await analysis
+            except Exception as e:
+                return create_error_result(e)
+
+    return await asyncio.gather(*(run_one(a) for a in analyses))
+
+
+def check_batch_size(count: int) -> None:
+    """배치 항목 수 검증"""
+    if count == 0:
+        raise HTTPException(status_code=400, detail="배치 항목이 비어 있습니다")
+    if count > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"배치 항목은 최대 {BATCH_MAX_ITEMS}개까지 가능합니다 (요청: {count}개)"
+        )
+
+
+def create_batch_response(results: list[ColumnAnalysisResult], names: list[Optional[str]]) -> BatchAnalysisResponse:
+    """배치 응답 생성"""
+    items = [
+        BatchItemResult(index=i, name=name, result=result)
+        for i, (name, result) in enumerate(zip(names, results))
+    ]
+    succeeded = sum(1 for r in results if r.success)
+    return BatchAnalysisResponse(
+        total=len(items),
+        succeeded=succeeded,
+        failed=len(items) - succeeded,
+        results=items,
+    )
+
+
+@app.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(
+    request: BatchTableRequest,
+    bypass_cache: bool = Query(False, alias="bypassCache"),
+    budget: AnalysisBudget = Depends(analysis_budget),
+):
+    """여러 테이블 데이터 일괄 분석 (항목별 결과/에러 반환)"""
+    check_batch_size(len(request.tables))
+    results = await run_batch([run_table_analysis(t, bypass_cache, budget=budget) for t in request.tables])
+    return create_batch_response(results, [None] * len(results))
+
+
+@app.post("/analyze/batch/pdf", response_model=BatchAnalysisResponse, openapi_extra=PDF_BATCH_UPLOAD_OPENAPI)
+async def analyze_batch_pdf(
+    request: Request,
+    bypass_cache: bool = Query(False, alias="bypassCache"),
+    budget: AnalysisBudget = Depends(analysis_budget),
+):
+    """여러 PDF 파일 일괄 분석 (항목별 결과/에러 반환, 본문 전체는 BATCH_MAX_UPLOAD_BYTES 이하)"""
+    try:
+        async with spooled_uploads(
+            request,
+            MAX_UPLOAD_BYTES,
+            UPLOAD_TMP_DIR,
+            field="files",
+            max_files=BATCH_MAX_ITEMS,
+            max_total_bytes=BATCH_MAX_UPLOAD_BYTES,
+        ) as uploads:
+            for upload in uploads:
+                record_upload(upload)
+            results = await run_batch([run_pdf_analysis(u, bypass_cache, budget=budget) for u in uploads])
+            return create_batch_response(results, [u.filename for u in uploads])
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except TooManyFilesError:
+        raise HTTPException(status_code=413, detail=f"배치 항목은 최대 {BATCH_MAX_ITEMS}개까지 가능합니다")
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def stream_extracted_table(file_path: str):
+    """텍스트 레이어 추출 결과를 NDJSON으로 생성 (종료 시 파일 삭제)"""
+    try:
+        total = await asyncio.to_thread(page_count, file_path)
+        assembler = TableAssembler()
+        meta_sent = False
+        row_count = 0
+        async for pages in iter_page_lines(file_path, total, pdf_extract_pool, PDF_EXTRACT_WINDOW):
+            rows = []
+            for page in pages:
+                rows.extend(assembler.feed(page))
+            if assembler.headers and not meta_sent:
+                yield ndjson_line({
+                    "type": "meta",
+                    "headers": assembler.headers,
+                    "pageCount": total,
+                    "headerPageIndex": assembler.header_page_index,
+                })
+                meta_sent = True
+            for start in range(0, len(rows), NDJSON_CHUNK_ROWS):
+                chunk = rows[start:start + NDJSON_CHUNK_ROWS]
+                row_count += len(chunk)
+                yield ndjson_line({"type": "rows", "rows": chunk})
+
+        if not meta_sent:
+            yield ndjson_line({"type": "error", "error": "텍스트 레이어에서 거래내역 헤더를 찾을 수 없습니다"})
+            return
+        yield ndjson_line({"type": "end", "rowCount": row_count, "scannedPages": assembler.scanned_pages})
+    except Exception as e:
+        record_error(e, source="stream")
+        yield ndjson_line({"type": "error", "error": str(e)})
+    finally:
+        remove_file(file_path)
+
+
+@app.post("/extract/pdf", response_model=ExtractedTableResult, openapi_extra=PDF_UPLOAD_OPENAPI)
+async def extract_pdf(
+    request: Request,
+    stream: bool = Query(False),
+):
+    """PDF 텍스트 레이어에서 테이블 추출 (LLM/OCR 미사용)"""
+    try:
+        async with spooled_upload(request, MAX_UPLOAD_BYTES, UPLOAD_TMP_DIR) as upload:
+            record_upload(upload)
+            if wants_ndjson(request, stream):
+                # 파일 정리는 스트림 생성기가 담당
+                return ndjson_response(stream_extracted_table(upload.detach()))
+            table = await extract_table(upload.path, pdf_extract_pool, PDF_EXTRACT_WINDOW)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        record_error(e)
+        return ExtractedTableResult(success=False, error=str(e))
+
+    return ExtractedTableResult(
+        success=bool(table.headers),
+        headers=table.headers,
+        rows=table.rows,
+        pageCount=table.page_count,
+        headerPageIndex=table.header_page_index,
+        scannedPages=table.scanned_pages,
+        error=None if table.headers else "텍스트 레이어에서 거래내역 헤더를 찾을 수 없습니다",
+    )
+
+
+async def recognize_pdf_chunk(file_path: str, chunk: PdfChunk, headers: list[str]) -> tuple[list[str], list[list[str]], list[str]]:
+    """페이지 묶음만 담은 PDF를 LLM으로 인식 (청크 헤더, 행, 테이블 밖 텍스트)"""
+    path = await asyncio.to_thread(write_chunk_pdf, file_path, chunk.pages, UPLOAD_TMP_DIR)
+    try:
+        result = await analyze_with_llm(
             "",
-            "샘플 데이터:",
-            *[f"Row {i+1}: {' | '.join(row)}" for i, row in enumerate(sample_rows)]
-        ]
-        content = "\n".join(table_preview)
-        
-        result = await analyze_with_llm(content, is_pdf=False)
-        return ColumnAnalysisResult(**result)
-        
+            is_pdf=True,
+            file_path=path,
+            instruction=ocr_chunk_instruction(headers),
+            response_model=OcrChunkResponse,
+            system_prompt=PDF_OCR_PROMPT,
+        )
+    finally:
+        remove_file(path)
+    cell = lambda value: "" if value is None else str(value)
+    return (
+        [cell(h) for h in result.get("headers") or []],
+        [[cell(c) for c in row] for row in result["rows"]],
+        [cell(t) for t in result.get("pageTexts") or [] if t],
+    )
+
+
+async def run_chunked_extraction(file_path: str, force_ocr: bool = False) -> ChunkedExtractionResult:
+    """청크 단위 PDF 추출
+
+    텍스트 레이어가 있는 페이지는 로컬에서 추출하고, 스캔 페이지(force_ocr면 전체)는 페이지 묶음으로 나눠
+    LLM 호출 제한 안에서 병렬 인식합니다. 헤더와 컬럼 매핑은 한 번만 정하고 모든 행을 그 열 순서에 맞춰
+    페이지 순서대로 합칩니다.
+    """
+    if force_ocr:
+        total = await asyncio.to_thread(page_count, file_path)
+        table = ExtractedTable(headers=[], rows=[], page_count=total, scanned_pages=list(range(total)))
+    else:
+        table = await extract_table(file_path, pdf_extract_pool, PDF_EXTRACT_WINDOW)
+    scanned = set(table.scanned_pages)
+    # (페이지, 순서, 행): 텍스트 레이어 행과 인식한 행을 페이지 순서로 병합
+    entries = [(page, i, row) for i, (row, page) in enumerate(zip(table.rows, table.row_pages)) if page not in scanned]
+    headers, header_page = table.headers, table.header_page_index
+    # 테이블 밖 텍스트도 같은 방식으로 페이지 순서 병합
+    texts = [(page, i, text) for i, (text, page) in enumerate(zip(table.page_texts, table.page_text_pages))
+             if page not in scanned]
+
+    outcomes = []
+    if scanned:
+        def on_retry(chunk: PdfChunk, error: BaseException) -> None:
+            pdf_chunk_retries.inc(error_class=error_class(error))
+
+        with stage_latency.time(stage="pdf_chunks"):
+            headers, outcomes = await run_chunk_pipeline(
+                plan_chunks(sorted(scanned), PDF_CHUNK_PAGES),
+                lambda chunk, known: recognize_pdf_chunk(file_path, chunk, known),
+                headers=headers,
+                concurrency=PDF_CHUNK_CONCURRENCY,
+                max_attempts=PDF_CHUNK_MAX_ATTEMPTS,
+                backoff_base=PDF_CHUNK_RETRY_BASE_SECONDS,
+                backoff_max=llm_limiter.backoff_max,
+                on_retry=on_retry,
+            )
+        for outcome in outcomes:
+            pdf_chunks_total.inc(outcome="failed" if outcome.error else "success")
+            if header_page is None and headers and outcome.headers == headers:
+                header_page = outcome.chunk.pages[0]
+            entries.extend((outcome.chunk.pages[0], i, row) for i, row in enumerate(outcome.rows))
+            texts.extend((outcome.chunk.pages[0], i, text) for i, text in enumerate(outcome.page_texts))
+        entries.sort(key=lambda e: (e[0], e[1]))
+        texts.sort(key=lambda e: (e[0], e[1]))
+
+    rows = [row for _, _, row in entries]
+    failed_pages = [page for o in outcomes if o.error for page in o.chunk.pages]
+    result = ChunkedExtractionResult(
+        success=bool(headers) and not failed_pages,
+        headers=headers,
+        rows=rows,
+        pageCount=table.page_count,
+        headerPageIndex=header_page,
+        scannedPages=sorted(scanned),
+        textPages=table.page_count - len(scanned),
+        ocrChunks=[
+            PdfChunkStatus(
+                index=o.chunk.index,
+                pageStart=o.chunk.pages[0],
+                pageEnd=o.chunk.pages[-1],
+                rowCount=len(o.rows),
+                attempts=o.attempts,
+                error=o.error,
+            )
+            for o in outcomes
+        ],
+        failedPages=failed_pages,
+        llmCalls=sum(o.attempts for o in outcomes),
+        pageTexts=[text for _, _, text in texts],
+    )
+    errors = []
+    if not headers:
+        errors.append("거래내역 헤더를 찾을 수 없습니다")
+    if failed_pages:
+        errors.append(f"{len(failed_pages)}개 페이지를 {PDF_CHUNK_MAX_ATTEMPTS}회 시도 후에도 읽지 못했습니다: {failed_pages}")
+    result.error = "; ".join(errors) or None
+    if headers and rows:
+        # 컬럼 매핑은 확정된 헤더로 한 번만 계산 (청크마다 다시 분석하지 않음)
+        mapping = ColumnAnalysisResult(**map_columns(headers, rows))
+        if mapping.success:
+            result.columnMapping = mapping.columnMapping
+            result.mappingConfidence = mapping.confidence
+    return result
+
+
+@app.post("/extract/pdf/chunked", response_model=ChunkedExtractionResult, openapi_extra=PDF_UPLOAD_OPENAPI)
+async def extract_pdf_chunked(
+    request: Request,
+    force_ocr: bool = Query(False, alias="forceOcr"),
+):
+    """큰 PDF를 페이지 묶음으로 나눠 병렬 추출 (스캔 페이지는 LLM 인식, 헤더/매핑은 한 번만 결정)"""
+    try:
+        async with spooled_upload(request, MAX_UPLOAD_BYTES, UPLOAD_TMP_DIR) as upload:
+            record_upload(upload)
+            result = await run_chunked_extraction(upload.path, force_ocr)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        record_error(e)
+        return ChunkedExtractionResult(success=False, error=str(e))
+    return result
+
+
+def to_transaction_columns(normalized) -> NormalizedTransactionColumns:
+    """정규화 결과를 응답 모델로 변환"""
+    return NormalizedTransactionColumns(
+        transactionDate=normalized.transaction_date,
+        type=normalized.type,
+        amount=normalized.amount,
+        balance=normalized.balance,
+        memo=normalized.memo,
+        sourceRowIndex=normalized.source_row_index,
+    )
+
+
+async def stream_normalized(data: NormalizeRequest):
+    """정규화 결과를 행 묶음 단위 NDJSON으로 생성"""
+    analysis = data.analysis.model_dump()
+    yield ndjson_line({"type": "meta", "totalRows": len(data.table.rows), "chunkRows": NDJSON_CHUNK_ROWS})
+    count = skipped = merged = 0
+    try:
+        chunks = iter_normalized_chunks(
+            data.table.headers, data.table.rows, analysis, NDJSON_CHUNK_ROWS, data.mergeWrappedRows
+        )
+        while True:
+            normalized = await asyncio.to_thread(next, chunks, None)
+            if normalized is None:
+                break
+            count += len(normalized.transaction_date)
+            skipped += normalized.skipped_rows
+            merged += normalized.merged_rows
+            yield ndjson_line({"type": "rows", "columns": to_transaction_columns(normalized).model_dump()})
+    except Exception as e:
+        record_error(e, source="stream")
+        yield ndjson_line({"type": "error", "error": str(e)})
+        return
+    yield ndjson_line({"type": "end", "count": count, "skippedRows": skipped, "mergedRows": merged})
+
+
+@app.post("/normalize", response_model=NormalizeResult)
+async def normalize(
+    request: Request,
+    data: NormalizeRequest,
+    stream: bool = Query(False),
+):
+    """컬럼 매핑을 모든 행에 적용하여 표준 거래내역으로 변환"""
+    if wants_ndjson(request, stream):
+        return ndjson_response(stream_normalized(data))
+
+    try:
+        with stage_latency.time(stage="normalize"):
+            normalized = await asyncio.to_thread(
+                normalize_table, data.table.headers, data.table.rows, data.analysis.model_dump(), data.mergeWrappedRows
+            )
+    except Exception as e:
+        record_error(e)
+        return NormalizeResult(success=False, error=str(e))
+
+    return NormalizeResult(
+        success=True,
+        count=len(normalized.transaction_date),
+        skippedRows=normalized.skipped_rows,
+        mergedRows=normalized.merged_rows,
+        columns=to_transaction_columns(normalized),
+    )
+
+
+@app.post("/validate/mapping", response_model=MappingCheckResult)
+async def validate_mapping(data: NormalizeRequest):
+    """잔액 연속성으로 매핑 검증 및 대안 해석 비교 (LLM 미사용)"""
+    try:
+        check = await asyncio.to_thread(
+            check_balance, data.table.headers, data.table.rows, data.analysis.model_dump()
+        )
+    except Exception as e:
+        record_error(e)
+        return MappingCheckResult(success=False, error=str(e))
+
+    if check is None:
+        return MappingCheckResult(success=False, error="잔액 컬럼이 없거나 비교할 행이 없습니다")
+
+    best = ColumnAnalysisResult(**check.best.analysis)
+    best.balanceMatchRate = check.best.match_rate
+    return MappingCheckResult(
+        success=True,
+        matchRate=check.best.match_rate,
+        originalMatchRate=check.original.match_rate,
+        comparedRows=check.best.compared_rows,
+        order=check.best.order,
+        corrected=check.corrected,
+        bestLabel=check.best.label,
+        analysis=best,
+        candidates=[
+            BalanceCandidate(label=c.label, matchRate=c.match_rate, comparedRows=c.compared_rows, order=c.order)
+            for c in check.candidates
+        ],
+    )
+
+
+@app.post("/templates/refresh", response_model=TemplateRefreshResult)
+async def refresh_templates(data: TemplateRefreshRequest):
+    """템플릿 인덱스 증분 갱신 (내용이 바뀐 템플릿만 서명 재계산)"""
+    templates = [t.model_dump() for t in data.templates]
+    counts = template_index.refresh(templates, removed_ids=data.removedIds, replace=data.replace)
+    if shared_store is not None:
+        # 다른 워커는 다음 매칭 시 버전 변경을 보고 동기화
+        global template_store_version
+        template_store_version = await asyncio.to_thread(
+            shared_store.update_templates, templates, data.removedIds, data.replace
+        )
+    return TemplateRefreshResult(**counts)
+
+
+# 이 워커의 템플릿 인덱스에 반영된 공유 저장소 템플릿 버전
+template_store_version = 0
+
+
+async def sync_shared_templates() -> None:
+    """공유 저장소의 템플릿 목록이 바뀌었으면 인덱스 동기화 (바뀐 템플릿만 재계산)"""
+    global template_store_version
+    if shared_store is None:
+        return
+    version = await asyncio.to_thread(shared_store.templates_version)
+    if version == template_store_version:
+        return
+    version, records = await asyncio.to_thread(shared_store.load_templates)
+    template_index.refresh(records, replace=True)
+    template_store_version = version
+
+
+@app.post("/templates/match", response_model=TemplateMatchResponse)
+async def match_templates(data: TemplateMatchRequest):
+    """헤더 지문이 가장 유사한 템플릿 top-k (LLM 미사용)"""
+    await sync_shared_templates()
+    started = time.perf_counter()
+    matches = template_index.match(data.headers, data.pageText, data.topK)
+    elapsed = int((time.perf_counter() - started) * 1_000_000)
+    return TemplateMatchResponse(
+        matches=[
+            TemplateMatchItem(
+                id=m.id,
+                name=m.name,
+                bankName=m.bank_name,
+                score=m.score,
+                headerScore=m.header_score,
+                identifierScore=m.identifier_score,
+                priority=m.priority,
+            )
+            for m in matches
+        ],
+        indexSize=template_index.stats()["templates"],
+        elapsedMicros=elapsed,
+    )
+
+
+def classify_keywords_sync(data: KeywordClassifyRequest) -> KeywordClassifyResponse:
+    """규칙 집합 컴파일(캐시) 후 거래 메모를 한 번씩 훑어 분류"""
+    rules = [
+        ClassificationRule(r.id, r.pattern, r.patternType, r.category, r.subcategory, r.confidence)
+        for r in data.rules
+    ]
+    rule_set, compiled = keyword_rule_sets.get(rules, data.importantKeywords)
+    matches = rule_set.classify_batch(
+        (tx.memo, tx.depositAmount, tx.withdrawalAmount, tx.creditorName) for tx in data.transactions
+    )
+
+    results = []
+    for tx, match in zip(data.transactions, matches):
+        rule = match.applied
+        results.append(KeywordClassification(
+            transactionId=tx.id,
+            matched=rule is not None,
+            appliedRuleId=rule.id if rule else None,
+            patternType=rule.pattern_type if rule else None,
+            category=rule.category if rule else None,
+            subcategory=rule.subcategory if rule else None,
+            confidence=rule.confidence if rule else None,
+            keywordRuleIds=match.keyword_rule_ids,
+            amountRangeRuleIds=match.amount_range_rule_ids,
+            creditorRuleIds=match.creditor_rule_ids,
+            importantType=match.important_type,
+            matchedKeywords=match.matched_keywords,
+        ))
+    return KeywordClassifyResponse(
+        success=True,
+        results=results,
+        matchedCount=sum(1 for r in results if r.matched),
+        importantCount=sum(1 for r in results if r.importantType),
+        ruleSetVersion=rule_set.digest[:16],
+        compiled=compiled,
+        invalidRuleIds=rule_set.invalid_rule_ids,
+    )
+
+
+@app.post("/classify/keywords", response_model=KeywordClassifyResponse)
+async def classify_keywords(data: KeywordClassifyRequest):
+    """분류 규칙(KEYWORD/AMOUNT_RANGE/CREDITOR)과 중요 거래 키워드를 거래 배치에 일괄 적용 (LLM 미사용)"""
+    started = time.perf_counter()
+    try:
+        with stage_latency.time(stage="classify_keywords"):
+            response = await asyncio.to_thread(classify_keywords_sync, data)
     except Exception as e:
-        return ColumnAnalysisResult(
-            success=False,
-            columnMapping=ColumnMapping(거래일자="", 비고=""),
-            headerRowIndex=0,
-            dataStartRowIndex=1,
-            transactionTypeDetection=TransactionTypeDetection(method="separate_columns"),
-            memoAnalysis=MemoAnalysis(columnName="", contentType="unknown", confidence=0),
-            confidence=0,
-            reasoning="",
-            error=str(e)
+        record_error(e)
+        return KeywordClassifyResponse(success=False, error=str(e))
+
+    keyword_classified.inc(response.matchedCount, result="matched")
+    keyword_classified.inc(len(response.results) - response.matchedCount, result="unmatched")
+    response.elapsedMicros = int((time.perf_counter() - started) * 1_000_000)
+    return response
+
+
+def job_status(job: Job, include_events: bool = True) -> JobStatusResponse:
+    """작업 상태 응답 생성"""
+    return JobStatusResponse(
+        jobId=job.id,
+        kind=job.kind,
+        status=job.status,
+        stage=job.stage,
+        createdAt=job.created_at,
+        startedAt=job.started_at,
+        finishedAt=job.finished_at,
+        expiresAt=job_queue.expires_at(job),
+        result=ColumnAnalysisResult(**job.result) if job.result else None,
+        error=job.error,
+        events=[e.to_dict() for e in job.events] if include_events else [],
+    )
+
+
+def share_job_snapshot(job: Job) -> None:
+    """작업 상태를 공유 저장소에 기록 (다른 워커로 들어온 조회/SSE 요청용, 쓰기는 스레드에서)"""
+    if job_snapshots is None:
+        return
+    expires_at = job_queue.expires_at(job) or (job.created_at + max(job_queue.result_ttl_seconds, 86400))
+    job_snapshots.submit(job.id, job_status(job).model_dump(), expires_at)
+
+
+async def run_analysis_job(analysis, progress: ProgressCallback) -> dict:
+    """작업 워커에서 분석 실행 (분석 실패는 작업 실패로 기록)"""
+    # 작업은 LLM 대기열 한도로 거절하지 않고 슬롯이 날 때까지 기다림
+    llm_queue_exempt.set(True)
+    result = await analysis(progress)
+    if not result.success:
+        raise RuntimeError(result.error or "분석 실패")
+    return result.model_dump()
+
+
+def submit_job(kind: str, analysis, cleanup=None, **info) -> JobSubmitResponse:
+    """작업 등록 (대기열이 가득 차면 429 + Retry-After)"""
+    try:
+        job = job_queue.submit(kind, lambda progress: run_analysis_job(analysis, progress), cleanup, **info)
+    except QueueFullError as e:
+        if cleanup is not None:
+            cleanup()
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(JOB_RETRY_AFTER_SECONDS)},
+        )
+    return JobSubmitResponse(
+        jobId=job.id,
+        status=job.status,
+        statusUrl=f"/jobs/{job.id}",
+        eventsUrl=f"/jobs/{job.id}/events",
+    )
+
+
+@app.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def create_job(
+    request: Request,
+    bypass_cache: bool = Query(False, alias="bypassCache"),
+    budget: AnalysisBudget = Depends(analysis_budget),
+):
+    """분석 작업 등록 후 즉시 작업 id 반환
+
+    multipart/form-data의 file(PDF) 또는 JSON 테이블 데이터({ headers, rows })를 받습니다.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        try:
+            async with spooled_upload(request, MAX_UPLOAD_BYTES, UPLOAD_TMP_DIR) as spooled:
+                record_upload(spooled)
+                # 파일 소유권을 작업으로 이전 (요청이 끝나도 유지)
+                upload = SpooledUpload(spooled.detach(), spooled.sha256, spooled.size, spooled.filename)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except InvalidUploadError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        def cleanup_upload() -> None:
+            if not upload.detached:
+                remove_file(upload.path)
+
+        async def analyze(progress: ProgressCallback) -> ColumnAnalysisResult:
+            try:
+                return await run_pdf_analysis(upload, bypass_cache, progress, budget)
+            finally:
+                cleanup_upload()
+
+        return submit_job(
+            "pdf", analyze, cleanup_upload,
+            uploadBytes=upload.size, uploadSeconds=round(spooled.elapsed, 3), filename=upload.filename,
+        )
+
+    try:
+        data = TableData(**await request.json())
+    except (ValidationError, ValueError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=f"테이블 데이터 형식이 올바르지 않습니다: {e}")
+    return submit_job(
+        "table", lambda progress: run_table_analysis(data, bypass_cache, progress, budget),
+        rows=len(data.rows),
+    )
+
+
+JOB_NOT_FOUND = "작업을 찾을 수 없습니다 (만료되었거나 존재하지 않음)"
+
+
+async def get_shared_job(job_id: str) -> Optional[dict]:
+    """다른 워커가 실행 중인 작업의 상태 스냅샷"""
+    if shared_store is None:
+        return None
+    return await asyncio.to_thread(shared_store.get_job, job_id)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """작업 상태/결과 조회 (폴링)"""
+    job = job_queue.get(job_id)
+    if job is not None:
+        return job_status(job)
+    snapshot = await get_shared_job(job_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=JOB_NOT_FOUND)
+    return JobStatusResponse(**snapshot)
+
+
+async def stream_shared_job_events(job_id: str, after: int):
+    """다른 워커의 작업 이벤트를 스냅샷 폴링으로 SSE 생성"""
+    sent = after
+    idle = 0.0
+    while True:
+        snapshot = await get_shared_job(job_id)
+        if snapshot is None:
+            return
+        for event in snapshot["events"][sent:]:
+            data = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+            yield f"id: {event['seq']}\nevent: progress\ndata: {data}\n\n".encode("utf-8")
+            idle = 0.0
+        sent = max(sent, len(snapshot["events"]))
+        if snapshot["status"] in TERMINAL_STATUSES:
+            snapshot["events"] = []
+            yield f"event: done\ndata: {json.dumps(snapshot, ensure_ascii=False)}\n\n".encode("utf-8")
+            return
+        await asyncio.sleep(0.5)
+        idle += 0.5
+        if idle >= 15:
+            idle = 0.0
+            yield b": keep-alive\n\n"
+
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    request: Request,
+    job_id: str,
+    last_event_id: int = Query(0, alias="lastEventId"),
+):
+    """작업 진행 이벤트 SSE 스트림 (재연결 시 Last-Event-ID 이후부터 재전송)
+
+    event: progress (단계별) → event: done (최종 상태/결과)
+    """
+    header_id = request.headers.get("last-event-id", "")
+    after = int(header_id) if header_id.isdigit() else last_event_id
+    job = job_queue.get(job_id)
+    if job is None:
+        if await get_shared_job(job_id) is None:
+            raise HTTPException(status_code=404, detail=JOB_NOT_FOUND)
+        return StreamingResponse(
+            stream_shared_job_events(job_id, after),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
         )
 
+    async def events():
+        async for event in job_queue.events(job, after):
+            if event is None:
+                yield b": keep-alive\n\n"
+                continue
+            yield sse_event(event)
+        data = json.dumps(job_status(job, include_events=False).model_dump(), ensure_ascii=False)
+        yield f"event: done\ndata: {data}\n\n".encode("utf-8")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus 텍스트 형식 메트릭"""
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+# 워밍업용 샘플 테이블 (규칙 매퍼/프롬프트 압축/잔액 검증 경로)
+WARMUP_TABLE = TableData(
+    headers=["거래일자", "적요", "출금금액", "입금금액", "잔액"],
+    rows=[
+        ["2024-01-02", "급여", "", "1,000,000", "1,500,000"],
+        ["2024-01-03", "카드대금", "300,000", "", "1,200,000"],
+        ["2024-01-05", "관리비", "150,000", "", "1,050,000"],
+    ],
+)
+
+
+def write_warmup_pdf() -> str:
+    """워밍업용 1페이지 PDF 임시 파일 생성"""
+    import tempfile
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    writer.add_blank_page(width=595, height=842)
+    fd, path = tempfile.mkstemp(prefix="column-analyzer-warmup-", suffix=".pdf", dir=UPLOAD_TMP_DIR)
+    with os.fdopen(fd, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def warm_analysis_path() -> None:
+    """규칙 매퍼, 프롬프트 압축, 잔액 검증, 응답 파싱/검증 경로 실행"""
+    data = WARMUP_TABLE
+    compact_table(data.headers, data.rows, token_budget=PROMPT_TOKEN_BUDGET, base_tokens=BASE_PROMPT_TOKENS)
+    result = apply_balance_check(data, ColumnAnalysisResult(**map_columns(data.headers, data.rows)))
+    parser = IncrementalJsonParser(validate=ColumnAnalysisResult.model_validate)
+    parser.feed(f"```json\n{result.model_dump_json()}\n```")
+    parser.finish()
+
+
+async def warm_up() -> None:
+    """무거운 의존성 로드/초기화를 단계별로 실행하고 준비 상태로 전환
+
+    실패한 단계는 기록만 하고 계속 진행합니다 (해당 기능은 첫 요청에서 다시 초기화).
+    """
+    with startup.step("llm_sdk"):
+        llm_client.start()
+    if LLM_WARMUP_URL:
+        async with startup.async_step("llm_connection"):
+            await llm_client.warm_up(LLM_WARMUP_URL)
+
+    pdf_path = None
+    with startup.step("pdf_sample"):
+        pdf_path = write_warmup_pdf()
+    if pdf_path is not None:
+        try:
+            async with startup.async_step("pdf_parser"):
+                await asyncio.to_thread(extract_page_lines, pdf_path, [0])
+            if pdf_extract_pool is not None:
+                # 워커 수만큼 동시에 제출해 모든 워커 프로세스를 띄우고 pypdf를 로드
+                async with startup.async_step("pdf_extract_pool"):
+                    loop = asyncio.get_running_loop()
+                    await asyncio.gather(*(
+                        loop.run_in_executor(pdf_extract_pool, extract_page_lines, pdf_path, [0])
+                        for _ in range(PDF_EXTRACT_WORKERS)
+                    ))
+        finally:
+            remove_file(pdf_path)
+
+    with startup.step("analysis_path"):
+        warm_analysis_path()
+    if shared_store is not None:
+        with startup.step("shared_store"):
+            shared_store.stats()
+
+    startup.mark_ready()
+    if STARTUP_PROFILE_PATH:
+        startup.dump(STARTUP_PROFILE_PATH)
+
+
+@app.get("/livez")
+async def liveness():
+    """프로세스 생존 확인 (워밍업 여부와 무관)"""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readiness():
+    """워밍업 완료 여부 (완료 전/종료 중에는 503, 트래픽 라우팅 기준)"""
+    profile = startup.to_dict()
+    if not startup.ready:
+        return JSONResponse(status_code=503, content={"status": "draining" if startup.draining else "starting", **profile})
+    return {"status": "ready", **profile}
+
 
 @app.get("/health")
 async def health_check():
     """헬스 체크"""
-    return {"status": "healthy", "service": "column-analyzer"}
+    return {
+        "status": "healthy",
+        "service": "column-analyzer",
+        "ready": startup.ready,
+        "cache": {"enabled": ANALYSIS_CACHE_ENABLED, **analysis_cache.stats()},
+        "inflight": inflight_analyses.stats(),
+        "llm": llm_client.stats(),
+        "llmLimiter": llm_limiter.stats(),
+        "templates": template_index.stats(),
+        "keywordRuleSets": keyword_rule_sets.stats(),
+        "jobs": job_queue.stats(),
+        "sharedStore": (
+            {**shared_store.stats(), "leases": worker_leases.stats(), "pid": os.getpid()}
+            if shared_store is not None else None
+        ),
+    }
 
 
 if __name__ == "__main__":
+    import sys
+    import tempfile
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+
+    if "--startup-profile" in sys.argv:
+        # 워밍업만 실행하고 단계별 시작 시간(JSON)을 출력한 뒤 종료
+        async def profile_startup() -> None:
+            async with lifespan(app):
+                await startup.wait_ready()
+                json.dump(startup.to_dict(), sys.stdout, ensure_ascii=False, indent=2)
+                sys.stdout.write("\n")
+
+        asyncio.run(profile_startup())
+        sys.exit(0)
+
+    # SERVICE_WORKERS > 1이면 멀티 워커 모드 (워커 간 공유 저장소 필수)
+    service_workers = int(os.environ.get("SERVICE_WORKERS", "1"))
+    if service_workers > 1:
+        # 워커 프로세스는 환경 변수를 상속하므로 여기서 기본값을 정함
+        os.environ.setdefault("SHARED_STORE_PATH", os.path.join(tempfile.gettempdir(), "column-analyzer-shared.db"))
+        # 워커마다 PDF 추출 프로세스 풀을 만들므로 코어 수를 나눠 사용
+        os.environ.setdefault("PDF_EXTRACT_WORKERS", str(max((os.cpu_count() or 1) // service_workers, 1)))
+        uvicorn.run("column_analyzer_service:app", host="0.0.0.0", port=8002, workers=service_workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8002)
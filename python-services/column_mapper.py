@@ -0,0 +1,250 @@
+"""
+Column Mapper - 규칙 기반 컬럼 매핑 (LLM 이전 빠른 경로)
+
+COLUMN_ANALYSIS_PROMPT가 설명하는 일반적인 한국 은행 거래내역서 레이아웃을
+동의어 카탈로그와 셀 내용 프로파일로 직접 매핑합니다.
+신뢰도가 임계값 이상이면 LLM 호출 없이 결과를 반환합니다.
+
+행 인덱스 규칙: headers를 0번 행, rows[i]를 i+1번 행으로 봅니다.
+(헤더가 headers에 그대로 있으면 headerRowIndex=0, dataStartRowIndex=1)
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from column_profile import ColumnProfile, is_date, profile_columns
+
+# 표준 필드별 동의어 (앞쪽일수록 우선)
+SYNONYM_CATALOG: dict[str, list[str]] = {
+    "거래일자": ["거래일자", "거래일시", "거래일", "거래날짜", "거래시간", "날짜", "일자", "일시", "년월일",
+                "date", "transactiondate", "datetime"],
+    "입금금액": ["입금금액", "입금액", "맡기신금액", "입금", "받은금액", "수입금액", "수입",
+                "deposit", "credit"],
+    "출금금액": ["출금금액", "출금액", "지급금액", "찾으신금액", "출금", "지급액", "지급", "보낸금액", "지출",
+                "withdrawal", "debit"],
+    "금액": ["거래금액", "이체금액", "금액", "amount"],
+    "구분": ["거래구분", "입출금구분", "입지구분", "입출구분", "구분", "거래유형", "유형", "type"],
+    "잔액": ["거래후잔액", "거래후잔고", "잔액", "잔고", "balance"],
+    "비고": ["비고", "적요", "메모", "거래내용", "내용", "계좌정보/결제정보", "계좌정보", "결제정보",
+            "거래처", "상대방", "받는분", "보낸분", "memo", "description", "remark"],
+}
+
+# 헤더 탐색 범위 (메타데이터 행 이후 헤더가 나오는 경우)
+MAX_HEADER_SCAN_ROWS = 20
+# 프로파일링에 사용할 최대 데이터 행 수
+MAX_PROFILE_ROWS = 200
+
+_HEADER_NOISE_RE = re.compile(r"\s+|\(.*?\)|\[.*?\]")
+
+
+def normalize_header(name: str) -> str:
+    """헤더 정규화 (공백/괄호 내용 제거, 소문자)"""
+    return _HEADER_NOISE_RE.sub("", str(name or "")).lower()
+
+
+@dataclass
+class HeaderMatch:
+    """헤더-필드 매칭 후보"""
+    field: str
+    column: int
+    score: float      # 완전 일치 1.0, 부분 일치 0.8
+    rank: int         # 동의어 목록 내 순서 (작을수록 우선)
+
+
+def match_header(name: str) -> list[HeaderMatch]:
+    """헤더 하나에 대한 필드 후보 목록"""
+    normalized = normalize_header(name)
+    if not normalized:
+        return []
+
+    matches = []
+    for field_name, synonyms in SYNONYM_CATALOG.items():
+        for rank, synonym in enumerate(synonyms):
+            if normalized == synonym:
+                matches.append(HeaderMatch(field_name, -1, 1.0, rank))
+                break
+            if len(synonym) >= 2 and synonym in normalized:
+                matches.append(HeaderMatch(field_name, -1, 0.8, rank))
+                break
+    return matches
+
+
+def _header_row_score(row: list[str]) -> tuple[int, bool]:
+    """헤더 후보 행 점수 (매칭된 서로 다른 필드 수, 날짜 필드 포함 여부)"""
+    fields = set()
+    for cell in row:
+        if is_date(cell):
+            # 실제 날짜 값이 있는 행은 데이터 행
+            return 0, False
+        for m in match_header(cell):
+            fields.add(m.field)
+    return len(fields), "거래일자" in fields
+
+
+def find_header_row(headers: list[str], rows: list[list[str]]) -> int:
+    """헤더 행 위치 탐색 (0 = headers, i+1 = rows[i])"""
+    best_index, best_score = 0, -1
+    candidates = [headers, *rows[:MAX_HEADER_SCAN_ROWS]]
+    for i, row in enumerate(candidates):
+        score, has_date = _header_row_score(row)
+        if has_date and score > best_score:
+            best_index, best_score = i, score
+    return best_index
+
+
+def _assign_fields(header_row: list[str]) -> dict[str, HeaderMatch]:
+    """헤더 매칭 후보를 필드별 하나의 컬럼으로 확정 (점수 → 동의어 순서 → 컬럼 순서)"""
+    candidates = []
+    for column, name in enumerate(header_row):
+        for m in match_header(name):
+            m.column = column
+            candidates.append(m)
+
+    # 같은 헤더에 여러 필드가 걸리면 가장 구체적인 매칭만 남김
+    best_per_column: dict[int, HeaderMatch] = {}
+    for m in candidates:
+        current = best_per_column.get(m.column)
+        if current is None or (m.score, -m.rank) > (current.score, -current.rank):
+            best_per_column[m.column] = m
+
+    assigned: dict[str, HeaderMatch] = {}
+    for m in sorted(best_per_column.values(), key=lambda m: (-m.score, m.rank, m.column)):
+        if m.field not in assigned:
+            assigned[m.field] = m
+    return assigned
+
+
+def _infer_memo_column(profiles: list[ColumnProfile], used: set[int]) -> Optional[ColumnProfile]:
+    """헤더로 비고 컬럼을 못 찾은 경우 텍스트 비율이 가장 높은 컬럼 선택"""
+    candidates = [
+        p for p in profiles
+        if p.index not in used and p.non_empty and p.text_ratio >= 0.5 and p.distinct_count > 1
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: (p.text_ratio * (1 - p.empty_ratio), p.avg_length))
+
+
+def _numeric_fit(profile: Optional[ColumnProfile]) -> float:
+    """금액 컬럼 적합도 (빈 값을 제외한 숫자 비율)"""
+    if profile is None or not profile.non_empty:
+        return 0.0
+    return profile.number_ratio
+
+
+def map_columns(headers: list[str], rows: list[list[str]]) -> dict:
+    """규칙 기반 컬럼 매핑
+
+    Returns:
+        ColumnAnalysisResult 형식의 dict (confidence로 LLM 호출 여부 판단)
+    """
+    header_index = find_header_row(headers, rows)
+    header_row = headers if header_index == 0 else rows[header_index - 1]
+    data_rows = rows[header_index:header_index + MAX_PROFILE_ROWS]
+    # 데이터 구간의 빈 행/반복 헤더 행은 프로파일에서 제외
+    data_rows = [r for r in data_rows if any(c and c.strip() for c in r) and r != header_row]
+
+    profiles = profile_columns(header_row, data_rows)
+    assigned = _assign_fields(header_row)
+
+    def column_name(field_name: str) -> Optional[str]:
+        m = assigned.get(field_name)
+        return header_row[m.column] if m else None
+
+    def profile_of(field_name: str) -> Optional[ColumnProfile]:
+        m = assigned.get(field_name)
+        return profiles[m.column] if m and m.column < len(profiles) else None
+
+    notes = []
+    components: dict[str, float] = {}
+
+    # 거래일자
+    date_profile = profile_of("거래일자")
+    if date_profile is not None:
+        components["거래일자"] = assigned["거래일자"].score * date_profile.date_ratio
+    else:
+        components["거래일자"] = 0.0
+        notes.append("거래일자 컬럼 없음")
+
+    # 입출금 구분 방식
+    deposit, withdrawal = profile_of("입금금액"), profile_of("출금금액")
+    amount, type_col = profile_of("금액"), profile_of("구분")
+    method, details = "separate_columns", None
+
+    if deposit is not None and withdrawal is not None:
+        method = "separate_columns"
+        details = f"입금/출금 별도 컬럼 ({column_name('입금금액')}, {column_name('출금금액')})"
+        fits = [_numeric_fit(deposit), _numeric_fit(withdrawal)]
+        components["금액"] = sum(fits) / 2
+        if min(fits) < 0.9:
+            # 금액 컬럼 중 빈 쪽에 비고가 들어가는 특이 케이스 - LLM 판단에 맡김
+            notes.append("금액 컬럼에 텍스트 혼재 (비고 혼합 가능성)")
+    elif amount is not None and type_col is not None and type_col.sign_bracket_ratio >= 0.5:
+        method = "sign_in_type"
+        details = f"{column_name('구분')} 컬럼의 [+]/[-] 기호"
+        components["금액"] = _numeric_fit(amount) * type_col.sign_bracket_ratio
+    elif amount is not None and type_col is not None and type_col.type_word_ratio >= 0.5:
+        method = "type_column"
+        details = f"{column_name('구분')} 컬럼의 입금/출금 텍스트"
+        components["금액"] = _numeric_fit(amount) * type_col.type_word_ratio
+    elif amount is not None and amount.negative_ratio > 0:
+        method = "amount_sign"
+        details = f"{column_name('금액')} 컬럼의 +/- 부호"
+        components["금액"] = _numeric_fit(amount)
+    else:
+        components["금액"] = 0.0
+        notes.append("입출금 구분 방식 판별 불가")
+
+    # 잔액
+    balance = profile_of("잔액")
+    components["잔액"] = _numeric_fit(balance) if balance is not None else 0.5
+
+    # 비고
+    memo_name = column_name("비고")
+    memo_confidence = 0.0
+    if memo_name is not None:
+        memo_profile = profile_of("비고")
+        memo_confidence = assigned["비고"].score * (0.7 + 0.3 * memo_profile.text_ratio)
+    else:
+        used = {m.column for m in assigned.values()}
+        inferred = _infer_memo_column(profiles, used)
+        if inferred is not None:
+            memo_name = inferred.name
+            memo_confidence = 0.7 * inferred.text_ratio
+            notes.append(f"비고 컬럼을 내용으로 추정 ({memo_name})")
+        else:
+            notes.append("비고 컬럼 없음")
+    components["비고"] = memo_confidence
+
+    scores = list(components.values())
+    confidence = round(0.6 * min(scores) + 0.4 * sum(scores) / len(scores), 4)
+
+    uses_amount_column = method != "separate_columns"
+    reasoning = "규칙 기반 매핑: " + ", ".join(f"{k}={v:.2f}" for k, v in components.items())
+    if notes:
+        reasoning += " / " + "; ".join(notes)
+
+    return {
+        "success": date_profile is not None,
+        "tableType": "은행 거래내역서",
+        "columnMapping": {
+            "거래일자": column_name("거래일자") or "",
+            "구분": column_name("구분") if uses_amount_column else None,
+            "입금금액": None if uses_amount_column else column_name("입금금액"),
+            "출금금액": None if uses_amount_column else column_name("출금금액"),
+            "금액": column_name("금액") if uses_amount_column else None,
+            "잔액": column_name("잔액"),
+            "비고": memo_name or "",
+        },
+        "headerRowIndex": header_index,
+        "dataStartRowIndex": header_index + 1,
+        "transactionTypeDetection": {"method": method, "details": details},
+        "memoAnalysis": {
+            "columnName": memo_name or "",
+            "contentType": "입금자명/거래처/계좌정보/거래설명",
+            "confidence": round(memo_confidence, 4),
+        },
+        "confidence": confidence,
+        "reasoning": reasoning,
+    }
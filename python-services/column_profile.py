@@ -0,0 +1,106 @@
+"""
+Column Profile - 셀 내용 기반 컬럼 프로파일링
+
+각 컬럼의 값 분포(날짜/숫자/빈 값/부호 패턴 비율 등)를 계산합니다.
+규칙 기반 컬럼 매퍼(column_mapper.py)와 프롬프트 압축(prompt_compactor.py)에서 사용합니다.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+DATE_RE = re.compile(
+    r"^\s*(\d{4}[-./년]\s?\d{1,2}[-./월]\s?\d{1,2}|\d{2}[-./]\d{1,2}[-./]\d{1,2}|(19|20)\d{2}(0[1-9]|1[0-2])(0[1-9]|[12]\d|3[01])(?!\d))"
+)
+NUMBER_RE = re.compile(r"^[+\-△▲]?\(?\s*[+-]?[\d,]*\d(\.\d+)?\s*\)?\s*(원|KRW)?$")
+SIGNED_NUMBER_RE = re.compile(r"^\s*[+\-△▲]\s*[\d,]*\d")
+SIGN_BRACKET_RE = re.compile(r"^\s*\[\s*[+-]\s*\]")
+TYPE_WORD_RE = re.compile(r"(입금|출금|지급|이체입금|이체출금)")
+
+
+def is_date(value: str) -> bool:
+    """날짜 형식 여부 (2024-07-01, 2024.07.01 13:22, 20240701 등)"""
+    return bool(DATE_RE.match(value))
+
+
+def is_number(value: str) -> bool:
+    """금액 형식 여부 (1,000 / -1,000 / +1,000원 / (1,000) / △1,000)"""
+    return bool(NUMBER_RE.match(value.strip()))
+
+
+@dataclass
+class ColumnProfile:
+    """컬럼 값 분포 통계
+
+    비율은 빈 값을 제외한 셀 기준입니다 (empty_ratio 제외).
+    """
+    index: int
+    name: str
+    total: int = 0
+    non_empty: int = 0
+    date_ratio: float = 0.0
+    number_ratio: float = 0.0
+    signed_ratio: float = 0.0
+    negative_ratio: float = 0.0
+    sign_bracket_ratio: float = 0.0
+    type_word_ratio: float = 0.0
+    text_ratio: float = 0.0
+    distinct_count: int = 0
+    avg_length: float = 0.0
+    examples: list[str] = field(default_factory=list)
+
+    @property
+    def empty_ratio(self) -> float:
+        return 1 - self.non_empty / self.total if self.total else 1.0
+
+
+def profile_column(index: int, name: str, values: list[str], max_examples: int = 3) -> ColumnProfile:
+    """단일 컬럼 프로파일 계산"""
+    profile = ColumnProfile(index=index, name=name, total=len(values))
+    cells = [v.strip() for v in values if v and v.strip()]
+    profile.non_empty = len(cells)
+    if not cells:
+        return profile
+
+    dates = numbers = signed = negatives = brackets = type_words = 0
+    length_sum = 0
+    distinct: set[str] = set()
+    for cell in cells:
+        length_sum += len(cell)
+        distinct.add(cell)
+        if is_date(cell):
+            dates += 1
+        elif is_number(cell):
+            numbers += 1
+            if SIGNED_NUMBER_RE.match(cell):
+                signed += 1
+            if cell.startswith(("-", "(", "△", "▲")):
+                negatives += 1
+        if SIGN_BRACKET_RE.match(cell):
+            brackets += 1
+        if TYPE_WORD_RE.search(cell):
+            type_words += 1
+        if len(profile.examples) < max_examples and cell not in profile.examples:
+            profile.examples.append(cell)
+
+    n = len(cells)
+    profile.date_ratio = dates / n
+    profile.number_ratio = numbers / n
+    profile.signed_ratio = signed / n
+    profile.negative_ratio = negatives / n
+    profile.sign_bracket_ratio = brackets / n
+    profile.type_word_ratio = type_words / n
+    profile.text_ratio = (n - dates - numbers) / n
+    profile.distinct_count = len(distinct)
+    profile.avg_length = length_sum / n
+    return profile
+
+
+def profile_columns(headers: list[str], rows: list[list[str]], max_examples: int = 3) -> list[ColumnProfile]:
+    """모든 컬럼 프로파일 계산 (행 길이가 헤더와 달라도 허용)"""
+    width = max([len(headers), *(len(r) for r in rows)]) if rows else len(headers)
+    profiles = []
+    for i in range(width):
+        name = headers[i] if i < len(headers) else ""
+        values = [row[i] if i < len(row) else "" for row in rows]
+        profiles.append(profile_column(i, name, values, max_examples))
+    return profiles
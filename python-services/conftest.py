@@ -0,0 +1,18 @@
+"""
+테스트 공통 fixture
+"""
+
+import pytest
+
+
+@pytest.fixture
+def analysis():
+    """컬럼 분석 결과(dict) 생성 함수 (거래일자/잔액/비고는 같은 이름의 헤더로 매핑)"""
+    def make(method: str, header_row: int = 0, data_start: int = 1, **mapping) -> dict:
+        return {
+            "columnMapping": {"거래일자": "거래일자", "잔액": "잔액", "비고": "비고", **mapping},
+            "transactionTypeDetection": {"method": method},
+            "headerRowIndex": header_row,
+            "dataStartRowIndex": data_start,
+        }
+    return make
@@ -0,0 +1,233 @@
+"""
+Fake LLM Client - 오프라인 벤치마크/개발용 가짜 LLM 제공자
+
+LlmClientManager와 같은 인터페이스(start/warm_up/close/send/stream/stats)를 제공하며
+LLM_PROVIDER=fake로 켭니다. 실제 API 호출 없이
+- 설정한 지연 시간(평균 + 지터)만큼 기다린 뒤
+- 프롬프트의 헤더/샘플 행을 규칙 기반 매퍼로 분석한 JSON을 반환하고
+- 스캔 페이지 인식 요청에는 첨부 PDF의 텍스트 레이어를 읽은 행을 반환하며
+- 설정한 비율로 요청 제한(429)/일시적 오류(503)를 발생시킵니다.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from typing import AsyncIterator, Optional
+
+from column_mapper import map_columns
+from pdf_table_extractor import TableAssembler, extract_page_lines, page_count
+
+# PDF 첨부 시 반환할 기본 분석 결과 (텍스트 레이어를 읽지 않음)
+_PDF_RESULT = {
+    "success": True,
+    "tableType": "은행 거래내역서",
+    "columnMapping": {"거래일자": "거래일자", "입금금액": "입금금액", "출금금액": "출금금액", "잔액": "잔액", "비고": "적요"},
+    "headerRowIndex": 0,
+    "dataStartRowIndex": 1,
+    "transactionTypeDetection": {"method": "separate_columns"},
+    "memoAnalysis": {"columnName": "적요", "contentType": "거래설명", "confidence": 0.9},
+    "confidence": 0.9,
+    "reasoning": "fake provider",
+}
+
+
+# 다중 테이블 프롬프트의 테이블 구역 머리 ("## 테이블 N")
+_TABLE_SECTION_RE = re.compile(r"^## 테이블 ", re.MULTILINE)
+
+
+class FakeProviderError(Exception):
+    """가짜 제공자 오류 (status_code로 429/503 구분)"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_table_prompt(text: str) -> tuple[list[str], list[list[str]]]:
+    """압축된 테이블 프롬프트에서 헤더와 샘플 행 복원 (prompt_compactor 형식)"""
+    headers: list[str] = []
+    rows: list[list[str]] = []
+    for line in text.splitlines():
+        if line.startswith("헤더: ") and not headers:
+            headers = line[len("헤더: "):].split(" | ")
+        elif line.startswith("Row ") and ": " in line:
+            rows.append(line.split(": ", 1)[1].split(" | "))
+    return headers, rows
+
+
+class FakeLlmClient:
+    """로컬 가짜 LLM 클라이언트 (지연/오류율 설정 가능)"""
+
+    def __init__(
+        self,
+        model: str = "fake-model",
+        latency_ms: float = 800.0,
+        jitter_ms: float = 200.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        confidence: float = 0.9,
+        seed: Optional[int] = None,
+        trailing_chars: int = 0,
+        chunk_chars: int = 256,
+    ):
+        self.provider = "fake"
+        self.model = model
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.confidence = confidence
+        self.trailing_chars = trailing_chars
+        self.chunk_chars = chunk_chars
+        self._random = random.Random(seed)
+        self.started_at: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+        self.last_latency: Optional[float] = None
+
+    @classmethod
+    def from_env(cls, model: str) -> "FakeLlmClient":
+        """FAKE_LLM_* 환경 변수로 생성"""
+        seed = os.environ.get("FAKE_LLM_SEED")
+        return cls(
+            model=model,
+            latency_ms=float(os.environ.get("FAKE_LLM_LATENCY_MS", "800")),
+            jitter_ms=float(os.environ.get("FAKE_LLM_JITTER_MS", "200")),
+            error_rate=float(os.environ.get("FAKE_LLM_ERROR_RATE", "0")),
+            throttle_rate=float(os.environ.get("FAKE_LLM_THROTTLE_RATE", "0")),
+            confidence=float(os.environ.get("FAKE_LLM_CONFIDENCE", "0.9")),
+            seed=int(seed) if seed else None,
+            trailing_chars=int(os.environ.get("FAKE_LLM_TRAILING_CHARS", "0")),
+        )
+
+    @property
+    def ready(self) -> bool:
+        return True
+
+    def start(self) -> None:
+        self.started_at = self.started_at or time.time()
+
+    async def warm_up(self, url: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def _analysis(self, text: str, file_path: Optional[str]) -> dict:
+        if '"rows"' in text and file_path:
+            return self._recognize_pages(file_path)
+        if '"tables"' in text:
+            return self._multi_table_analysis(text, file_path)
+        if file_path:
+            return dict(_PDF_RESULT)
+        headers, rows = parse_table_prompt(text)
+        if not headers:
+            return dict(_PDF_RESULT)
+        return self._table_analysis(headers, rows)
+
+    def _multi_table_analysis(self, text: str, file_path: Optional[str]) -> dict:
+        """다중 테이블 지시문 응답 (## 테이블 N 구역마다 분석, PDF는 첫 페이지 테이블 하나)"""
+        if file_path:
+            return {"tables": [{"tableIndex": 0, "pageStart": 0, "pageEnd": 0, **_PDF_RESULT}]}
+        tables = []
+        for section in _TABLE_SECTION_RE.split(text)[1:]:
+            index, _, body = section.partition("\n")
+            headers, rows = parse_table_prompt(body)
+            if headers:
+                tables.append({"tableIndex": int(index.split()[0]), **self._table_analysis(headers, rows)})
+        return {"tables": tables}
+
+    def _recognize_pages(self, file_path: str) -> dict:
+        """스캔 페이지 인식 응답 (첨부 PDF의 텍스트 레이어로 흉내, 헤더가 없는 페이지는 셀을 순서대로)"""
+        pages = extract_page_lines(file_path, list(range(page_count(file_path))))
+        assembler = TableAssembler()
+        rows = [row for page in pages for row in assembler.feed(page)]
+        if assembler.headers:
+            return {"headers": assembler.headers, "rows": rows, "pageTexts": [text for _, text in assembler.page_texts]}
+        return {"headers": [], "rows": [[cell[2] for cell in line] for page in pages for line in page.lines]}
+
+    def _table_analysis(self, headers: list[str], rows: list[list[str]]) -> dict:
+        result = map_columns(headers, rows)
+        # 실제 모델처럼 규칙 매퍼가 놓친 경우도 답을 내는 것으로 가정
+        result["success"] = True
+        result["error"] = None
+        result["confidence"] = self.confidence
+        result["memoAnalysis"]["confidence"] = self.confidence
+        result["reasoning"] = "fake provider"
+        return result
+
+    async def stream(
+        self,
+        system_message: str,
+        text: str,
+        file_path: Optional[str] = None,
+        mime_type: str = "application/pdf",
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """응답을 조각 단위로 반환 (첫 조각까지 지연의 30%, 나머지는 글자 수에 비례해 분배)
+
+        trailing_chars만큼 JSON 뒤에 중괄호가 섞인 설명 텍스트를 덧붙입니다 (장황한 응답 재현).
+        """
+        self.requests += 1
+        t0 = time.perf_counter()
+        try:
+            delay = max(self._random.gauss(self.latency_ms, self.jitter_ms), 0.0) / 1000
+            roll = self._random.random()
+            if roll < self.throttle_rate:
+                # 제한 응답은 보통 빠르게 돌아옴
+                await asyncio.sleep(delay / 10)
+                self.throttled += 1
+                self.failures += 1
+                raise FakeProviderError(429, "429 Too Many Requests (fake)")
+            if roll < self.throttle_rate + self.error_rate:
+                await asyncio.sleep(delay)
+                self.failures += 1
+                raise FakeProviderError(503, "503 Service Unavailable (fake)")
+
+            payload = json.dumps(self._analysis(text, file_path), ensure_ascii=False)
+            body = f"```json\n{payload}\n```"
+            if self.trailing_chars:
+                note = "\n\n참고: 매핑 근거는 {컬럼명: 역할} 형식으로 정리했습니다. "
+                body += (note * (self.trailing_chars // len(note) + 1))[:self.trailing_chars]
+
+            # JSON까지의 지연이 latency_ms가 되도록 글자당 시간 계산
+            per_char = delay * 0.7 / max(len(payload) + 8, 1)
+            await asyncio.sleep(delay * 0.3)
+            for start in range(0, len(body), self.chunk_chars):
+                chunk = body[start:start + self.chunk_chars]
+                await asyncio.sleep(per_char * len(chunk))
+                yield chunk
+        finally:
+            self.last_latency = time.perf_counter() - t0
+
+    async def send(
+        self,
+        system_message: str,
+        text: str,
+        file_path: Optional[str] = None,
+        mime_type: str = "application/pdf",
+        model: Optional[str] = None,
+    ) -> str:
+        """설정한 지연 후 전체 응답 텍스트 반환 (설정 비율로 429/503 발생)"""
+        return "".join([chunk async for chunk in self.stream(system_message, text, file_path, mime_type, model)])
+
+    def stats(self) -> dict:
+        """클라이언트 상태"""
+        return {
+            "ready": True,
+            "provider": self.provider,
+            "model": self.model,
+            "latencyMs": self.latency_ms,
+            "jitterMs": self.jitter_ms,
+            "errorRate": self.error_rate,
+            "throttleRate": self.throttle_rate,
+            "trailingChars": self.trailing_chars,
+            "requests": self.requests,
+            "failures": self.failures,
+            "throttled": self.throttled,
+            "lastLatencySeconds": round(self.last_latency, 4) if self.last_latency is not None else None,
+        }
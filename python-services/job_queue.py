@@ -0,0 +1,254 @@
+"""
+Job Queue - 비동기 분석 작업 대기열
+
+요청은 작업 id만 받고 바로 반환하며, 고정 개수의 워커가 제한된 크기의 대기열에서 작업을 처리합니다.
+진행 단계는 이벤트(순번 포함)로 기록되어 폴링(GET /jobs/{id}) 또는
+Server-Sent Events 구독으로 확인할 수 있고, 재연결 시 Last-Event-ID 이후 이벤트부터 다시 받습니다.
+완료된 작업 결과는 TTL 동안 보관합니다.
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+# SSE 연결 유지용 주석 전송 간격 (초)
+SSE_KEEPALIVE_SECONDS = 15.0
+
+ProgressCallback = Callable[..., None]
+JobRunner = Callable[[ProgressCallback], Awaitable[dict]]
+
+
+class QueueFullError(Exception):
+    """작업 대기열 가득 참"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"작업 대기열이 가득 찼습니다 (최대 {max_size}개)")
+        self.max_size = max_size
+
+
+@dataclass
+class JobEvent:
+    """작업 진행 이벤트"""
+    seq: int
+    stage: str
+    status: str
+    at: float
+    info: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {"seq": self.seq, "stage": self.stage, "status": self.status, "at": self.at, **self.info}
+
+
+@dataclass
+class Job:
+    """분석 작업"""
+    id: str
+    kind: str
+    runner: Optional[JobRunner] = field(repr=False, default=None)
+    cleanup: Optional[Callable[[], None]] = field(repr=False, default=None)
+    status: str = QUEUED
+    stage: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    events: list[JobEvent] = field(default_factory=list)
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    listener: Optional[Callable[["Job"], None]] = field(repr=False, default=None)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def emit(self, stage: str, **info: Any) -> None:
+        """진행 이벤트 기록 후 구독자 깨우기"""
+        self.stage = stage
+        self.events.append(JobEvent(len(self.events) + 1, stage, self.status, time.time(), info))
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+        if self.listener is not None:
+            self.listener(self)
+
+
+class JobQueue:
+    """제한된 대기열 + 워커 풀 기반 작업 실행기"""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queue: int = 100,
+        result_ttl_seconds: float = 3600,
+        on_change: Optional[Callable[[Job], None]] = None,
+    ):
+        """
+        Args:
+            on_change: 작업 이벤트마다 호출 (다른 워커 프로세스와 상태 공유 등)
+        """
+        self.workers = max(workers, 1)
+        self.max_queue = max(max_queue, 1)
+        self.result_ttl_seconds = result_ttl_seconds
+        self.on_change = on_change
+        self._jobs: dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self.running = 0
+        self.submitted = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        """워커/만료 정리 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweeper()))
+
+    async def close(self) -> None:
+        """워커 종료, 실행되지 못한 작업의 자원 정리"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self._jobs.values():
+            if job.status == QUEUED:
+                self._fail(job, "서비스 종료로 작업이 취소되었습니다")
+                self._run_cleanup(job)
+
+    def submit(self, kind: str, runner: JobRunner, cleanup: Optional[Callable[[], None]] = None, **info: Any) -> Job:
+        """작업 등록 (대기열이 가득 차면 QueueFullError, 이 경우 cleanup은 호출자가 처리)
+
+        Args:
+            runner: progress(stage, **info) 콜백을 받아 결과 dict를 반환하는 코루틴 함수
+            cleanup: 작업이 실행되지 못하고 버려질 때 호출 (임시 파일 삭제 등)
+        """
+        if self._queue is None:
+            raise RuntimeError("작업 대기열이 시작되지 않았습니다")
+        job = Job(id=os.urandom(12).hex(), kind=kind, runner=runner, cleanup=cleanup, listener=self.on_change)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError(self.max_queue)
+        self._jobs[job.id] = job
+        self.submitted += 1
+        job.emit(QUEUED, queuePosition=self._queue.qsize(), **info)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회 (만료된 작업은 None)"""
+        job = self._jobs.get(job_id)
+        if job is not None and self._expired(job):
+            self._jobs.pop(job_id, None)
+            return None
+        return job
+
+    def expires_at(self, job: Job) -> Optional[float]:
+        """결과 만료 시각 (완료 전이면 None)"""
+        if job.finished_at is None or self.result_ttl_seconds <= 0:
+            return None
+        return job.finished_at + self.result_ttl_seconds
+
+    def _expired(self, job: Job) -> bool:
+        expires_at = self.expires_at(job)
+        return expires_at is not None and time.time() > expires_at
+
+    async def events(self, job: Job, after_seq: int = 0) -> AsyncIterator[Optional[JobEvent]]:
+        """after_seq 이후 이벤트를 순서대로 생성, 완료되면 종료
+
+        일정 시간 새 이벤트가 없으면 None을 생성합니다 (연결 유지용).
+        """
+        sent = after_seq
+        while True:
+            changed = job.changed
+            while sent < len(job.events):
+                sent += 1
+                yield job.events[sent - 1]
+            if job.done:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield None
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.emit(RUNNING, waitedSeconds=round(job.started_at - job.created_at, 3))
+        self.running += 1
+        try:
+            job.result = await job.runner(job.emit)
+            job.status = SUCCEEDED
+            job.finished_at = time.time()
+            job.emit("completed", elapsedSeconds=round(job.finished_at - job.started_at, 3))
+        except asyncio.CancelledError:
+            self._fail(job, "서비스 종료로 작업이 중단되었습니다")
+            raise
+        except Exception as e:
+            self._fail(job, str(e))
+        finally:
+            self.running -= 1
+            job.runner = None
+            job.cleanup = None
+
+    def _fail(self, job: Job, error: str) -> None:
+        job.status = FAILED
+        job.error = error
+        job.finished_at = time.time()
+        job.emit("failed", error=error)
+
+    @staticmethod
+    def _run_cleanup(job: Job) -> None:
+        if job.cleanup is not None:
+            try:
+                job.cleanup()
+            finally:
+                job.cleanup = None
+
+    async def _sweeper(self) -> None:
+        """만료된 완료 작업 주기적 삭제"""
+        interval = min(max(self.result_ttl_seconds / 4, 1.0), 60.0)
+        while True:
+            await asyncio.sleep(interval)
+            for job_id in [j.id for j in self._jobs.values() if self._expired(j)]:
+                self._jobs.pop(job_id, None)
+
+    def stats(self) -> dict:
+        """대기열 통계"""
+        statuses = [j.status for j in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "maxQueue": self.max_queue,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "retained": len(statuses),
+            "succeeded": statuses.count(SUCCEEDED),
+            "failed": statuses.count(FAILED),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "resultTtlSeconds": self.result_ttl_seconds,
+        }
+
+
+def sse_event(event: JobEvent, name: str = "progress") -> bytes:
+    """SSE 이벤트 직렬화 (id로 재연결 위치 지정)"""
+    data = json.dumps(event.to_dict(), ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event.seq}\nevent: {name}\ndata: {data}\n\n".encode("utf-8")
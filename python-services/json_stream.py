@@ -0,0 +1,204 @@
+"""
+JSON Stream - LLM 응답 스트림의 점진적 JSON 파싱
+
+응답 조각(chunk)을 받는 대로 최상위 JSON 객체의 괄호 깊이와 문법을 추적하고
+객체가 닫히는 즉시 파싱을 끝냅니다. (뒤따르는 설명 텍스트는 읽지 않음)
+- 앞쪽의 ```json 펜스나 안내 문구는 길이에 관계없이 건너뜀 (전체 길이만 max_chars로 제한)
+- 작은따옴표, 주석, 따옴표 없는 키, 끝 쉼표, 괄호 불일치 등은 스트리밍 중에 바로 오류
+- validate가 거부한 객체는 건너뛰고 다음 최상위 객체를 계속 찾음
+"""
+
+import asyncio
+import json
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Optional
+
+# 문자열 밖에서 허용하는 값 문자 (숫자, true/false/null)
+_LITERAL_CHARS = frozenset("0123456789+-.eEtrufalsn")
+_WHITESPACE = frozenset(" \t\r\n")
+_CLOSERS = {"}": "{", "]": "["}
+
+
+class JsonStreamError(ValueError):
+    """스트림에서 올바른 JSON 객체를 얻지 못함"""
+
+
+class IncrementalJsonParser:
+    """조각 단위로 입력받아 첫 번째 완성된 최상위 객체를 반환하는 파서
+
+    Args:
+        validate: 완성된 객체 검증 함수 (예외를 올리면 그 객체는 건너뜀)
+        max_chars: 전체 응답 최대 길이
+    """
+
+    def __init__(
+        self,
+        validate: Optional[Callable[[dict], Any]] = None,
+        max_chars: int = 200_000,
+    ):
+        self.validate = validate
+        self.max_chars = max_chars
+        self._buffer: list[str] = []
+        self._length = 0
+        self._start: Optional[int] = None  # 현재 객체 시작 위치 (전체 응답 기준)
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._last = ""                    # 문자열 밖의 마지막 유효 문자 ('"'는 문자열 끝)
+        self.rejected: Optional[Exception] = None
+        self.result: Optional[dict] = None
+        self.stopped_early = False         # 객체를 얻은 뒤 아직 남은 조각이 있는 스트림을 닫음
+        self.parse_seconds = 0.0           # 파싱에 쓴 시간 (스트림 대기 제외)
+
+    @property
+    def text(self) -> str:
+        """지금까지 읽은 응답"""
+        return "".join(self._buffer)
+
+    def _fail(self, message: str) -> None:
+        if self.rejected is not None:
+            # 검증에 실패한 객체 뒤의 설명 텍스트일 가능성이 높으므로 검증 오류를 알림
+            raise JsonStreamError(f"LLM 응답 검증 실패: {self.rejected}") from self.rejected
+        raise JsonStreamError(f"LLM 응답 JSON 형식 오류 ({self._length}자): {message}")
+
+    def _check_value_char(self, c: str) -> None:
+        """문자열 밖 문자의 문법 검사 (객체 안)"""
+        top = self._stack[-1]
+        last = self._last
+        if top == "{" and (last == "{" or last == ","):
+            if c == '"' or (c == "}" and last == "{"):
+                return
+            self._fail(f"키는 큰따옴표 문자열이어야 합니다: {c!r}")
+        if c in _CLOSERS:
+            if _CLOSERS[c] != top:
+                self._fail(f"괄호 불일치: {c!r}")
+            if last in (",", ":"):
+                self._fail(f"{c!r} 앞에 값이 없습니다")
+            return
+        if c == ":":
+            if top != "{" or last != '"':
+                self._fail("잘못된 위치의 ':'")
+            return
+        if c == ",":
+            if last in (",", ":", "{", "["):
+                self._fail("잘못된 위치의 ','")
+            return
+        if c in "{[\"":
+            return
+        if c not in _LITERAL_CHARS:
+            self._fail(f"허용되지 않는 문자: {c!r}")
+
+    def _complete(self, end: int) -> Optional[dict]:
+        text = self.text[self._start:end]
+        self._start = None
+        try:
+            obj = json.loads(text, strict=False)
+        except json.JSONDecodeError as e:
+            self._fail(str(e))
+        try:
+            if self.validate is not None:
+                self.validate(obj)
+        except Exception as e:
+            self.rejected = e
+            return None
+        self.rejected = None
+        self.result = obj
+        return obj
+
+    def feed(self, chunk: str) -> Optional[dict]:
+        """조각 입력, 최상위 객체가 완성되고 검증을 통과하면 반환 (이후 입력은 무시)"""
+        if self.result is not None:
+            return self.result
+        offset = self._length
+        self._buffer.append(chunk)
+        self._length += len(chunk)
+        if self._length > self.max_chars:
+            self._fail(f"응답이 너무 깁니다 (최대 {self.max_chars}자)")
+
+        for i, c in enumerate(chunk):
+            if self._start is None:
+                if c == "{":
+                    self._start = offset + i
+                    self._stack = ["{"]
+                    self._last = "{"
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._last = '"'
+                continue
+
+            if c in _WHITESPACE:
+                continue
+            self._check_value_char(c)
+            if c == '"':
+                self._in_string = True
+            elif c in "{[":
+                self._stack.append(c)
+            elif c in _CLOSERS:
+                self._stack.pop()
+                if not self._stack:
+                    self._last = ""
+                    if self._complete(offset + i + 1) is not None:
+                        return self.result
+                    continue
+            self._last = c
+        return None
+
+    def finish(self) -> dict:
+        """스트림 종료 시 호출, 완성된 객체가 없으면 오류"""
+        if self.result is not None:
+            return self.result
+        if self.rejected is not None:
+            raise JsonStreamError(f"LLM 응답 검증 실패: {self.rejected}") from self.rejected
+        if self._start is not None:
+            raise JsonStreamError(f"LLM 응답 JSON이 완성되지 않았습니다 ({self._length}자에서 종료)")
+        raise JsonStreamError("LLM 응답에서 JSON을 찾을 수 없습니다")
+
+
+async def _has_pending_chunk(stream: AsyncIterator[str]) -> bool:
+    """기다리지 않고 받을 수 있는 다음 조각이 있거나 스트림이 아직 끝나지 않았는지
+
+    한 번에 전체 응답을 주는 제공자는 바로 끝나므로 False, 스트리밍 제공자는 다음 조각을
+    기다리는 중이거나 이미 받은 조각이 있으므로 True입니다. (기다리던 조각은 취소)
+    """
+    probe = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    if probe.done():
+        return probe.cancelled() or not isinstance(probe.exception(), StopAsyncIteration)
+    probe.cancel()
+    try:
+        await probe
+    except (asyncio.CancelledError, StopAsyncIteration):
+        pass
+    return True
+
+
+async def parse_json_stream(
+    chunks: AsyncIterator[str],
+    validate: Optional[Callable[[dict], Any]] = None,
+) -> tuple[dict, IncrementalJsonParser]:
+    """응답 스트림에서 첫 번째 유효한 최상위 객체를 읽고 나머지 스트림은 닫음
+
+    Returns:
+        (객체, 파서) - 파서의 text/stopped_early로 실제 읽은 응답과 조기 종료 여부 확인
+        (stopped_early는 객체 완성 시점에 스트림에 읽지 않은 조각이 남아 있었던 경우만 True)
+    """
+    parser = IncrementalJsonParser(validate)
+    async with aclosing(chunks) as stream:
+        async for chunk in stream:
+            t0 = time.perf_counter()
+            try:
+                done = parser.feed(chunk) is not None
+            finally:
+                parser.parse_seconds += time.perf_counter() - t0
+            if done:
+                parser.stopped_early = await _has_pending_chunk(stream)
+                break
+    return parser.finish(), parser
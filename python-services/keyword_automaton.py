@@ -0,0 +1,332 @@
+"""
+Keyword Automaton - 분류 규칙/중요 거래 키워드 다중 패턴 매칭
+
+rule-based-classifier.ts(KEYWORD/AMOUNT_RANGE/CREDITOR 규칙)와 important-keywords.ts의 키워드 검사를
+거래마다 모든 키워드를 includes로 반복하는 대신, 규칙 집합을 한 번 컴파일해 메모를 한 번씩만 훑어 처리합니다.
+- KEYWORD 규칙과 중요 거래 키워드는 메모용 Aho-Corasick 오토마톤 하나로, CREDITOR 규칙은 채권자명 오토마톤으로 매칭
+- AMOUNT_RANGE 규칙은 경계값으로 나눈 구간마다 해당 규칙을 미리 계산해 두고 이진 탐색
+- 컴파일 결과는 규칙 집합 내용의 해시로 캐시하므로 규칙이 바뀔 때만 다시 만듦
+- 한 배치 안에서 같은 메모/채권자명은 한 번만 훑음
+
+매칭은 TS와 같이 소문자 부분 일치이고, 적용 규칙은 KEYWORD → AMOUNT_RANGE → CREDITOR 순서로
+각 유형 안에서 confidence 내림차순(같으면 입력 순서) 첫 규칙입니다.
+"""
+
+import bisect
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+KEYWORD = "KEYWORD"
+AMOUNT_RANGE = "AMOUNT_RANGE"
+CREDITOR = "CREDITOR"
+
+# 중요 거래 유형별 키워드 (important-keywords.ts의 IMPORTANT_TRANSACTION_KEYWORDS와 동일, 유형 순서 유지)
+IMPORTANT_TRANSACTION_KEYWORDS: dict[str, list[str]] = {
+    "LOAN_EXECUTION": ["대출 실행", "대출금", "실행"],
+    "REPAYMENT": ["변제", "상환", "갚음"],
+    "COLLATERAL": ["담보제공", "담보설정", "저당권"],
+    "SEIZURE": ["압류", "가압류"],
+}
+
+# 캐시할 컴파일 규칙 집합 수
+RULE_SET_CACHE_SIZE = 8
+
+_AMOUNT_RANGE_RE = re.compile(r"^(\d+)-(\d+)$")
+
+
+@dataclass(frozen=True)
+class ClassificationRule:
+    """활성 분류 규칙 (ClassificationRule)"""
+    id: str
+    pattern: str
+    pattern_type: str
+    category: str
+    subcategory: Optional[str] = None
+    confidence: float = 0.0
+
+
+@dataclass
+class KeywordMatch:
+    """거래 하나의 매칭 결과 (규칙 id 목록은 적용 우선순위 순, 같은 결과의 거래끼리 공유)"""
+    applied: Optional[ClassificationRule] = None
+    keyword_rule_ids: tuple[str, ...] = ()
+    amount_range_rule_ids: tuple[str, ...] = ()
+    creditor_rule_ids: tuple[str, ...] = ()
+    important_type: Optional[str] = None
+    matched_keywords: tuple[str, ...] = ()
+
+
+# 메모 매칭 결과: (KEYWORD 규칙 id, 첫 규칙, 중요 거래 유형, 중요 거래 키워드)
+_MemoHits = tuple[tuple[str, ...], Optional[ClassificationRule], Optional[str], tuple[str, ...]]
+
+
+class AhoCorasick:
+    """다중 패턴 부분 일치 오토마톤 (find는 텍스트를 한 번 훑어 일치한 패턴 번호 집합 반환)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        self._empty: tuple[int, ...] = ()  # 빈 패턴 (비어 있지 않은 모든 텍스트에 포함)
+        empty = []
+        for number, pattern in enumerate(patterns):
+            if not pattern:
+                empty.append(number)
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (number,)
+        self._empty = tuple(empty)
+        self._link()
+
+    def _link(self) -> None:
+        """실패 링크 계산, 실패 링크 쪽 출력을 미리 합쳐 둠"""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                target = goto[link].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] += out[fail[nxt]]
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def find(self, text: str) -> set[int]:
+        """text에 포함된 패턴 번호"""
+        found = set(self._empty) if text else set()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+def _patterns_index(patterns: list[str]) -> tuple[AhoCorasick, list[list[int]]]:
+    """중복을 합친 소문자 패턴 오토마톤 + 패턴 번호 → 원래 항목 번호 목록"""
+    numbers: dict[str, int] = {}
+    targets: list[list[int]] = []
+    for item, pattern in enumerate(patterns):
+        number = numbers.setdefault(pattern.lower(), len(numbers))
+        if number == len(targets):
+            targets.append([])
+        targets[number].append(item)
+    return AhoCorasick(numbers), targets
+
+
+def rule_set_digest(rules: list[ClassificationRule], important_keywords: dict[str, list[str]]) -> str:
+    """규칙 집합 내용 해시 (내용이 같으면 컴파일 결과 재사용)"""
+    payload = {
+        "rules": [
+            [r.id, r.pattern, r.pattern_type, r.category, r.subcategory, r.confidence] for r in rules
+        ],
+        "important": list(important_keywords.items()),
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class CompiledRuleSet:
+    """컴파일된 규칙 집합 (생성 후 변경하지 않으므로 여러 요청이 동시에 사용 가능)"""
+
+    def __init__(
+        self,
+        rules: list[ClassificationRule],
+        important_keywords: Optional[dict[str, list[str]]] = None,
+        digest: Optional[str] = None,
+    ):
+        important_keywords = IMPORTANT_TRANSACTION_KEYWORDS if important_keywords is None else important_keywords
+        self.digest = digest or rule_set_digest(rules, important_keywords)
+        self.rule_count = len(rules)
+        self.invalid_rule_ids: list[str] = []
+
+        def ranked(pattern_type: str) -> list[ClassificationRule]:
+            # confidence 내림차순, 같으면 입력 순서 (TS의 안정 정렬과 동일)
+            return sorted((r for r in rules if r.pattern_type == pattern_type), key=lambda r: -r.confidence)
+
+        # 메모 오토마톤: KEYWORD 규칙 패턴 + 중요 거래 키워드 (항목 번호 < 규칙 수면 규칙)
+        self._keyword_rules = ranked(KEYWORD)
+        self._important: list[tuple[str, str]] = [
+            (kind, keyword) for kind, keywords in important_keywords.items() for keyword in keywords
+        ]
+        self._memo_automaton, self._memo_targets = _patterns_index(
+            [r.pattern for r in self._keyword_rules] + [keyword for _, keyword in self._important]
+        )
+
+        self._creditor_rules = ranked(CREDITOR)
+        self._creditor_automaton, self._creditor_targets = _patterns_index([r.pattern for r in self._creditor_rules])
+
+        self._amount_rules: list[tuple[ClassificationRule, int, int]] = []
+        for rule in ranked(AMOUNT_RANGE):
+            match = _AMOUNT_RANGE_RE.match(rule.pattern)
+            if match is None:
+                self.invalid_rule_ids.append(rule.id)
+                continue
+            self._amount_rules.append((rule, int(match.group(1)), int(match.group(2))))
+        self._build_amount_segments()
+
+    def _build_amount_segments(self) -> None:
+        """경계값 목록과 구간별 (해당 규칙 id, 첫 규칙) (2i: points[i] 바로 아래 열린 구간, 2i+1: points[i])"""
+        self._points = sorted({v for _, low, high in self._amount_rules for v in (low, high)})
+
+        def hits(covered) -> tuple[tuple[str, ...], Optional[ClassificationRule]]:
+            rules = [rule for rule, low, high in self._amount_rules if covered(low, high)]
+            return tuple(r.id for r in rules), rules[0] if rules else None
+
+        segments = []
+        for i, point in enumerate(self._points):
+            below = self._points[i - 1] if i else None
+            segments.append(hits(lambda low, high: below is not None and low <= below and high >= point))
+            segments.append(hits(lambda low, high: low <= point <= high))
+        segments.append(((), None))
+        self._segments = segments
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "rules": self.rule_count,
+            "keywordRules": len(self._keyword_rules),
+            "amountRangeRules": len(self._amount_rules),
+            "creditorRules": len(self._creditor_rules),
+            "importantKeywords": len(self._important),
+            "states": self._memo_automaton.states + self._creditor_automaton.states,
+        }
+
+    def amount_hits(self, amount: Optional[float]) -> tuple[tuple[str, ...], Optional[ClassificationRule]]:
+        """금액이 범위에 드는 AMOUNT_RANGE 규칙 (id 목록, 적용할 첫 규칙)"""
+        if not amount or not self._points:
+            return (), None
+        i = bisect.bisect_left(self._points, amount)
+        if i < len(self._points) and self._points[i] == amount:
+            return self._segments[2 * i + 1]
+        return self._segments[2 * i]
+
+    def _memo_hits(self, found: frozenset[int]) -> _MemoHits:
+        """메모에서 찾은 패턴 번호 → (KEYWORD 규칙 id, 첫 규칙, 중요 거래 유형, 중요 거래 키워드)"""
+        split = len(self._keyword_rules)
+        items = sorted(item for number in found for item in self._memo_targets[number])
+        cut = bisect.bisect_left(items, split)
+        rules = [self._keyword_rules[n] for n in items[:cut]]
+        # 중요 거래 유형: 정의 순서상 가장 앞에 매칭된 키워드의 유형 (detectImportantTransactionType과 동일)
+        keywords = [self._important[n - split] for n in items[cut:]]
+        return (
+            tuple(r.id for r in rules),
+            rules[0] if rules else None,
+            keywords[0][0] if keywords else None,
+            tuple(keyword for _, keyword in keywords),
+        )
+
+    def _creditor_hits(self, found: frozenset[int]) -> tuple[tuple[str, ...], Optional[ClassificationRule]]:
+        """채권자명에서 찾은 패턴 번호 → (CREDITOR 규칙 id, 첫 규칙)"""
+        rules = [self._creditor_rules[n] for n in sorted(i for number in found for i in self._creditor_targets[number])]
+        return tuple(r.id for r in rules), rules[0] if rules else None
+
+    def classify_batch(
+        self,
+        transactions: Iterable[tuple[Optional[str], Optional[float], Optional[float], Optional[str]]],
+    ) -> list[KeywordMatch]:
+        """(memo, depositAmount, withdrawalAmount, creditorName) 목록을 분류
+
+        같은 메모/채권자명은 한 번만 훑고, 찾은 패턴 조합이 같은 메모는 결과를 공유합니다.
+        """
+        memo_cache: dict[str, _MemoHits] = {}
+        memo_hits: dict[frozenset[int], _MemoHits] = {}
+        creditor_cache: dict[str, tuple[tuple[str, ...], Optional[ClassificationRule]]] = {}
+        creditor_hits: dict[frozenset[int], tuple[tuple[str, ...], Optional[ClassificationRule]]] = {}
+        results = []
+        for memo, deposit, withdrawal, creditor_name in transactions:
+            match = KeywordMatch()
+            if memo:
+                hits = memo_cache.get(memo)
+                if hits is None:
+                    found = frozenset(self._memo_automaton.find(memo.lower()))
+                    hits = memo_hits.get(found)
+                    if hits is None:
+                        hits = memo_hits[found] = self._memo_hits(found)
+                    memo_cache[memo] = hits
+                match.keyword_rule_ids, match.applied, important_type, matched_keywords = hits
+                if important_type is not None and memo.strip():
+                    match.important_type, match.matched_keywords = important_type, matched_keywords
+
+            # TS와 같이 입금액이 있으면(0 포함) 입금액, 없으면 출금액
+            match.amount_range_rule_ids, rule = self.amount_hits(deposit if deposit is not None else withdrawal)
+            if match.applied is None:
+                match.applied = rule
+
+            if creditor_name and self._creditor_rules:
+                hits = creditor_cache.get(creditor_name)
+                if hits is None:
+                    found = frozenset(self._creditor_automaton.find(creditor_name.lower()))
+                    hits = creditor_hits.get(found)
+                    if hits is None:
+                        hits = creditor_hits[found] = self._creditor_hits(found)
+                    creditor_cache[creditor_name] = hits
+                match.creditor_rule_ids, rule = hits
+                if match.applied is None:
+                    match.applied = rule
+            results.append(match)
+        return results
+
+
+class RuleSetCache:
+    """내용 해시별 컴파일 규칙 집합 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = RULE_SET_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CompiledRuleSet] = OrderedDict()
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.hits = 0
+
+    def get(
+        self, rules: list[ClassificationRule], important_keywords: Optional[dict[str, list[str]]] = None
+    ) -> tuple[CompiledRuleSet, bool]:
+        """(컴파일 결과, 이번 호출에서 새로 만들었는지)"""
+        important_keywords = IMPORTANT_TRANSACTION_KEYWORDS if important_keywords is None else important_keywords
+        digest = rule_set_digest(rules, important_keywords)
+        with self._lock:
+            compiled = self._entries.get(digest)
+            if compiled is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return compiled, False
+
+        # 컴파일은 잠금 밖에서 (동시에 같은 규칙이 컴파일되면 나중 결과로 덮어씀)
+        compiled = CompiledRuleSet(rules, important_keywords, digest)
+        with self._lock:
+            self._entries[digest] = compiled
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.builds += 1
+        return compiled, True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "builds": self.builds, "hits": self.hits}
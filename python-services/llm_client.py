@@ -0,0 +1,181 @@
+"""
+LLM Client Manager - 장기 유지 LLM 클라이언트
+
+애플리케이션 시작 시 emergentintegrations를 한 번만 로드하고,
+하위 litellm 전송 계층에 공유 HTTP 커넥션 풀(keep-alive)을 설정합니다.
+요청마다 import/클라이언트 구성 비용을 지불하지 않도록 합니다.
+"""
+
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Optional
+
+
+class LlmClientManager:
+    """LLM 클라이언트 수명 주기 관리 (시작/종료/상태)"""
+
+    def __init__(
+        self,
+        api_key: str,
+        provider: str = "gemini",
+        model: str = "gemini-2.5-flash",
+        request_timeout: float = 120.0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+    ):
+        self.api_key = api_key
+        self.provider = provider
+        self.model = model
+        self.request_timeout = request_timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+
+        self._chat_cls = None
+        self._message_cls = None
+        self._file_cls = None
+        self._http_client = None
+        self.started_at: Optional[float] = None
+        self.startup_seconds: Optional[float] = None
+        self.pooled = False
+        self.error: Optional[str] = None
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.last_latency: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._chat_cls is not None
+
+    def start(self) -> None:
+        """SDK 로드 및 공유 커넥션 풀 설정 (실패해도 첫 요청 시 재시도)"""
+        if self.ready:
+            return
+        t0 = time.perf_counter()
+        try:
+            from emergentintegrations.llm.chat import LlmChat, UserMessage, FileContentWithMimeType
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            raise
+
+        self._chat_cls = LlmChat
+        self._message_cls = UserMessage
+        self._file_cls = FileContentWithMimeType
+        self.pooled = self._configure_pool()
+        self.started_at = time.time()
+        self.startup_seconds = time.perf_counter() - t0
+        self.error = None
+
+    def _configure_pool(self) -> bool:
+        """litellm 전역 비동기 세션에 keep-alive 커넥션 풀 지정
+
+        SDK가 litellm을 사용하지 않는 버전이면 기본 전송 계층을 그대로 사용합니다.
+        """
+        try:
+            import httpx
+            import litellm
+        except ImportError:
+            return False
+
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(self.request_timeout, connect=self.connect_timeout),
+        )
+        litellm.aclient_session = self._http_client
+        return True
+
+    async def warm_up(self, url: str) -> None:
+        """공유 커넥션 풀로 제공자 엔드포인트에 미리 연결 (DNS/TLS 핸드셰이크를 첫 요청 전에 처리)
+
+        응답 상태는 무시하며, 연결 자체가 실패하면 예외를 올립니다.
+        """
+        if not self.ready:
+            self.start()
+        if self._http_client is None:
+            return
+        await self._http_client.head(url, timeout=self.connect_timeout)
+
+    async def close(self) -> None:
+        """커넥션 풀 종료"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self.pooled = False
+
+    async def send(
+        self,
+        system_message: str,
+        text: str,
+        file_path: Optional[str] = None,
+        mime_type: str = "application/pdf",
+        model: Optional[str] = None,
+    ) -> str:
+        """메시지 전송 후 응답 텍스트 반환 (요청 타임아웃 적용, model 미지정 시 기본 모델)"""
+        if not self.ready:
+            self.start()
+
+        # 세션마다 대화 이력이 누적되므로 요청별 session_id 사용 (구성 비용은 작음)
+        chat = self._chat_cls(
+            api_key=self.api_key,
+            session_id=f"column-analysis-{os.urandom(8).hex()}",
+            system_message=system_message
+        ).with_model(self.provider, model or self.model)
+
+        file_contents = [self._file_cls(mime_type, file_path)] if file_path else None
+        message = (
+            self._message_cls(text=text, file_contents=file_contents)
+            if file_contents else self._message_cls(text=text)
+        )
+
+        self.requests += 1
+        t0 = time.perf_counter()
+        try:
+            return await asyncio.wait_for(chat.send_message(message), timeout=self.request_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failures += 1
+            raise TimeoutError(f"LLM 응답 시간 초과 ({self.request_timeout:.0f}초)")
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.last_latency = time.perf_counter() - t0
+
+    async def stream(
+        self,
+        system_message: str,
+        text: str,
+        file_path: Optional[str] = None,
+        mime_type: str = "application/pdf",
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """응답 텍스트를 조각 단위로 반환
+
+        emergentintegrations의 LlmChat은 완성된 응답만 돌려주므로 전체 응답을 한 조각으로 반환합니다.
+        호출 측은 조각 단위로 파싱하므로 스트리밍 제공자로 바꿔도 그대로 동작합니다.
+        """
+        yield await self.send(system_message, text, file_path, mime_type, model)
+
+    def stats(self) -> dict:
+        """클라이언트 상태"""
+        return {
+            "ready": self.ready,
+            "provider": self.provider,
+            "model": self.model,
+            "pooled": self.pooled,
+            "maxConnections": self.max_connections,
+            "requestTimeoutSeconds": self.request_timeout,
+            "startupSeconds": round(self.startup_seconds, 4) if self.startup_seconds is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "lastLatencySeconds": round(self.last_latency, 4) if self.last_latency is not None else None,
+            "error": self.error,
+        }
@@ -0,0 +1,147 @@
+"""
+Model Cascade - 지연/비용 예산 기반 단계별 분석
+
+요청마다 지연 예산(초)과 최대 단계를 받아
+로컬 휴리스틱(규칙 기반 매퍼) → 빠른 모델 → 강한 모델 순으로 올라갑니다.
+이전 단계의 신뢰도(confidence, memoAnalysis.confidence)가 임계값 이상이면 거기서 멈추고,
+각 단계는 단계별 타임아웃과 남은 예산 중 작은 값 안에서 실행됩니다.
+예산이 다 되면 지금까지 가장 나은 결과를 반환합니다.
+LLM 호출 대기열이 가득 찬 경우(LlmOverloadedError)는 상위 단계도 같은 대기열을 거치므로 올라가지 않고,
+지금까지 가장 나은 결과를 반환하거나 (없으면) 예외를 그대로 올립니다.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+from rate_limiter import LlmOverloadedError
+
+T = TypeVar("T")
+
+# 단계 (낮은 단계부터)
+HEURISTIC = "heuristic"
+FAST = "fast"
+STRONG = "strong"
+TIERS = (HEURISTIC, FAST, STRONG)
+
+
+@dataclass
+class ModelTier:
+    """LLM 단계 (모델 + 타임아웃)"""
+    name: str
+    model: str
+    timeout: float
+
+
+@dataclass
+class AnalysisBudget:
+    """요청별 지연/비용 예산"""
+    latency_seconds: Optional[float] = None  # None이면 지연 예산 없음
+    max_tier: str = STRONG                    # 비용 상한 (이 단계까지만 사용)
+    started: float = field(default_factory=time.monotonic)
+
+    def remaining(self) -> Optional[float]:
+        """남은 지연 예산 (초, 예산이 없으면 None)"""
+        if self.latency_seconds is None:
+            return None
+        return self.latency_seconds - (time.monotonic() - self.started)
+
+    def allows(self, tier: str) -> bool:
+        return TIERS.index(tier) <= TIERS.index(self.max_tier)
+
+
+@dataclass
+class TierAttempt:
+    """단계 실행 기록"""
+    tier: str
+    outcome: str  # accepted / low_confidence / timeout / error / overloaded
+    elapsed: float
+    confidence: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "tier": self.tier,
+            "outcome": self.outcome,
+            "elapsedSeconds": round(self.elapsed, 3),
+            "confidence": self.confidence,
+        }
+
+
+@dataclass
+class CascadeResult(Generic[T]):
+    """단계별 분석 결과 (result는 채택된 결과, 없으면 None)"""
+    result: Optional[T]
+    tier: Optional[str]
+    attempts: list[TierAttempt]
+
+
+async def run_cascade(
+    tiers: list[ModelTier],
+    attempt: Callable[[ModelTier], Awaitable[T]],
+    budget: AnalysisBudget,
+    accept: Callable[[T], bool],
+    rank: Callable[[T], float],
+    initial: Optional[T] = None,
+    initial_tier: Optional[str] = None,
+    attempts: Optional[list[TierAttempt]] = None,
+) -> CascadeResult[T]:
+    """신뢰도가 충분한 결과가 나올 때까지 단계를 올라가며 실행
+
+    Args:
+        attempt: 단계 하나를 실행하는 코루틴 함수 (타임아웃은 여기서 적용)
+        accept: 결과가 충분히 신뢰할 만한지
+        rank: 채택 결과가 없을 때 가장 나은 결과를 고르는 점수
+        initial / initial_tier: 이미 얻은 하위 단계 결과 (휴리스틱 등)
+
+    모든 단계가 실패하고 이전 결과도 없으면 마지막 예외를 그대로 올립니다.
+    LlmOverloadedError는 다음 단계로 넘어가지 않습니다 (이전 결과가 있으면 반환, 없으면 예외).
+    """
+    attempts = list(attempts or [])
+    best, best_tier = initial, initial_tier
+    last_error: Optional[BaseException] = None
+
+    for tier in tiers:
+        if not budget.allows(tier.name):
+            break
+        timeout = tier.timeout
+        remaining = budget.remaining()
+        if remaining is not None and best is not None:
+            # 이미 답이 있으면 예산 안에서만 더 올라감 (답이 없으면 예산을 넘겨서라도 실행)
+            if remaining <= 0:
+                break
+            timeout = min(timeout, remaining)
+
+        t0 = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(attempt(tier), timeout=timeout)
+        except LlmOverloadedError:
+            attempts.append(TierAttempt(tier.name, "overloaded", time.perf_counter() - t0))
+            if best is None:
+                raise
+            break
+        except asyncio.TimeoutError as e:
+            attempts.append(TierAttempt(tier.name, "timeout", time.perf_counter() - t0))
+            last_error = TimeoutError(f"{tier.name} 단계 시간 초과 ({timeout:.1f}초)")
+            last_error.__cause__ = e
+            continue
+        except Exception as e:
+            attempts.append(TierAttempt(tier.name, "error", time.perf_counter() - t0))
+            last_error = e
+            continue
+
+        accepted = accept(result)
+        attempts.append(TierAttempt(
+            tier.name,
+            "accepted" if accepted else "low_confidence",
+            time.perf_counter() - t0,
+            round(rank(result), 4),
+        ))
+        if accepted:
+            return CascadeResult(result, tier.name, attempts)
+        if best is None or rank(result) >= rank(best):
+            best, best_tier = result, tier.name
+
+    if best is None and last_error is not None:
+        raise last_error
+    return CascadeResult(best, best_tier, attempts)
@@ -0,0 +1,38 @@
+"""
+NDJSON - 줄 단위 JSON 스트리밍 응답 도우미
+
+Accept: application/x-ndjson 헤더 또는 stream=true 쿼리로 스트리밍 모드를 선택합니다.
+첫 줄은 메타데이터(type=meta), 이후 행 묶음(type=rows), 마지막 줄은 요약(type=end)입니다.
+오류 발생 시 type=error 줄로 종료합니다.
+"""
+
+import json
+from typing import AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request, stream: bool) -> bool:
+    """스트리밍 응답 요청 여부"""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_line(payload: dict) -> bytes:
+    """JSON 한 줄 직렬화"""
+    return (json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def ndjson_response(lines: AsyncIterator[bytes]) -> StreamingResponse:
+    """NDJSON 스트리밍 응답
+
+    각 줄은 클라이언트로 전송이 끝난 뒤 다음 줄을 생성하므로
+    느린 클라이언트에서는 생성도 함께 늦춰집니다 (버퍼 누적 없음).
+    """
+    return StreamingResponse(
+        lines,
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
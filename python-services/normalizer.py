@@ -0,0 +1,301 @@
+"""
+Normalizer - 컬럼 매핑을 전체 행에 적용하는 벡터화 정규화
+
+ColumnAnalysisResult의 매핑과 transactionTypeDetection 방식(4가지)에 따라
+거래일자/구분/금액/잔액/비고를 NumPy 문자열 ufunc와 배열 연산으로 컬럼 단위 처리합니다.
+(transaction-normalizer.ts의 normalizeTransactions와 동일한 규칙)
+
+벡터 경로에서 해석하지 못한 날짜(예: "2024년 7월 1일")만 행 단위 정규식으로 보완합니다.
+merge_wrapped면 정규화 전에 여러 줄로 나뉜 거래 행을 먼저 복원합니다 (row_reconstruction).
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+import numpy as np
+
+from column_mapper import normalize_header
+from row_reconstruction import ReconstructedRows, reconstruct_rows
+
+DEPOSIT = "입금"
+WITHDRAWAL = "출금"
+
+# 거래구분 텍스트에서 입금으로 보는 키워드 (transaction-normalizer.ts와 동일)
+DEPOSIT_TYPE_KEYWORDS = ("+", "입금", "충전", "받기", "적립")
+
+# 금액 문자열에서 제거할 문자
+AMOUNT_NOISE = (",", "₩", "W", "원", " ", "+")
+# 음수 표시 접두어 ("△1,000"은 회계 표기의 -1,000)
+NEGATIVE_PREFIXES = ("-", "△", "▲")
+# 날짜 문자열에서 제거할 구분자
+DATE_SEPARATORS = ("-", ".", "/", ":", " ")
+
+_LOOSE_DATE_RE = re.compile(r"(\d{2,4})\s*[-./년]\s*(\d{1,2})\s*[-./월]\s*(\d{1,2})")
+
+
+@dataclass
+class NormalizedColumns:
+    """컬럼 형식 정규화 결과 (각 리스트의 i번째가 하나의 거래)"""
+    transaction_date: list[str] = field(default_factory=list)
+    type: list[str] = field(default_factory=list)
+    amount: list[float] = field(default_factory=list)
+    balance: list[Optional[float]] = field(default_factory=list)
+    memo: list[str] = field(default_factory=list)
+    source_row_index: list[int] = field(default_factory=list)  # 원본 rows 기준 인덱스
+    skipped_rows: int = 0
+    merged_rows: int = 0  # 앞 거래에 합친 줄 수 (행 복원)
+
+
+def find_column_index(header_row: list[str], name: Optional[str]) -> int:
+    """매핑된 컬럼명의 인덱스 (정확히 일치 우선, 없으면 포함 관계, 미발견 시 -1)"""
+    if not name:
+        return -1
+    target = normalize_header(name)
+    normalized = [normalize_header(h) for h in header_row]
+    if target in normalized:
+        return normalized.index(target)
+    for i, h in enumerate(normalized):
+        if h and (target in h or h in target):
+            return i
+    return -1
+
+
+def column_array(rows: list[list[str]], index: int) -> np.ndarray:
+    """행 목록에서 한 컬럼을 공백 제거된 문자열 배열로 추출 (없는 컬럼은 빈 문자열)"""
+    if index < 0:
+        return np.full(len(rows), "", dtype="U1")
+    values = [row[index] if index < len(row) and row[index] is not None else "" for row in rows]
+    return np.strings.strip(np.array(values, dtype=str)) if values else np.array([], dtype="U1")
+
+
+def parse_amounts(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """금액 문자열 배열 → (부호 포함 float 배열, 숫자 여부 마스크)
+
+    "1,000" / "-1,000" / "+1,000원" / "(1,000)" / "△1,000" 형식을 처리합니다.
+    """
+    if len(values) == 0:
+        return np.zeros(0), np.zeros(0, dtype=bool)
+
+    cleaned = values
+    for noise in AMOUNT_NOISE:
+        cleaned = np.strings.replace(cleaned, noise, "")
+    negative = np.strings.startswith(cleaned, "(") & np.strings.endswith(cleaned, ")")
+    for prefix in NEGATIVE_PREFIXES:
+        negative |= np.strings.startswith(cleaned, prefix)
+    for sign in (*NEGATIVE_PREFIXES, "(", ")"):
+        cleaned = np.strings.replace(cleaned, sign, "")
+
+    # 소수점 하나까지 허용한 숫자 여부
+    digits_only = np.strings.replace(cleaned, ".", "", count=1)
+    valid = np.strings.isdecimal(digits_only) & (np.strings.str_len(digits_only) > 0)
+    parsed = np.where(valid, cleaned, "0").astype(np.float64)
+    return np.where(negative, -parsed, parsed), valid
+
+
+def parse_dates(values: np.ndarray) -> np.ndarray:
+    """날짜 문자열 배열 → "YYYY-MM-DD" 배열 (해석 실패는 빈 문자열)
+
+    구분자를 제거한 앞 8자리(YYYYMMDD) 또는 6자리(YYMMDD)를 정수로 바꿔
+    datetime64 연산으로 검증/포맷합니다.
+    """
+    n = len(values)
+    result = np.full(n, "", dtype="U10")
+    if n == 0:
+        return result
+
+    compact = values
+    for sep in DATE_SEPARATORS:
+        compact = np.strings.replace(compact, sep, "")
+
+    # 첫 구분자가 2번째 위치면 2자리 연도 (24.07.01)
+    first_sep = np.full(n, np.iinfo(np.int64).max)
+    for sep in ("-", ".", "/"):
+        pos = np.strings.find(values, sep)
+        first_sep = np.where((pos >= 0) & (pos < first_sep), pos, first_sep)
+    short_year = first_sep == 2
+
+    head8 = compact.astype("U8")
+    head6 = compact.astype("U6")
+    digits = np.where(short_year, head6, head8)
+    ok = np.strings.isdecimal(digits) & (np.strings.str_len(digits) == np.where(short_year, 6, 8))
+    number = np.where(ok, digits, "0").astype(np.int64)
+    year = np.where(short_year, 2000 + number // 10000, number // 10000)
+    month = (number // 100) % 100
+    day = number % 100
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31) & (year >= 1900)
+
+    safe_year = np.where(ok, year, 1970)
+    safe_month = np.where(ok, month, 1)
+    safe_day = np.where(ok, day, 1)
+    months = (safe_year - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (safe_month - 1).astype("timedelta64[M]")
+    dates = months.astype("datetime64[D]") + (safe_day - 1).astype("timedelta64[D]")
+    # 2월 30일 등 월을 넘어간 날짜 제외
+    ok &= dates.astype("datetime64[M]") == months
+
+    result[ok] = dates[ok].astype("U10")
+
+    # 벡터 경로로 처리하지 못한 비어있지 않은 값만 정규식 보완
+    for i in np.flatnonzero(~ok & (np.strings.str_len(values) > 0)):
+        match = _LOOSE_DATE_RE.match(str(values[i]))
+        if not match:
+            continue
+        y, m, d = (int(g) for g in match.groups())
+        y = y + 2000 if y < 100 else y
+        try:
+            result[i] = str(np.datetime64(f"{y:04d}-{m:02d}-{d:02d}"))
+        except ValueError:
+            pass
+    return result
+
+
+def _contains_any(values: np.ndarray, keywords: tuple[str, ...]) -> np.ndarray:
+    mask = np.zeros(len(values), dtype=bool)
+    for keyword in keywords:
+        mask |= np.strings.find(values, keyword) >= 0
+    return mask
+
+
+def resolve_layout(headers: list[str], rows: list[list[str]], analysis: dict) -> tuple[list[str], int]:
+    """헤더 행과 데이터 시작 위치 (headerRowIndex/dataStartRowIndex는 headers를 0번 행으로 본 기준)
+
+    Returns:
+        (헤더 행, 데이터가 시작하는 rows 인덱스)
+    """
+    header_index = analysis.get("headerRowIndex", 0) or 0
+    data_start = max(analysis.get("dataStartRowIndex", 1) or 1, header_index + 1)
+    header_row = headers if header_index == 0 else rows[header_index - 1]
+    return header_row, data_start - 1
+
+
+def reconstruct_table_rows(header_row: list[str], rows: list[list[str]], row_offset: int, analysis: dict) -> ReconstructedRows:
+    """rows[row_offset:]의 여러 줄 거래 행 복원 (거래일자 컬럼을 찾지 못하면 그대로)"""
+    mapping = analysis["columnMapping"]
+    date_column = find_column_index(header_row, mapping.get("거래일자"))
+    if date_column < 0:
+        return ReconstructedRows(rows[row_offset:], list(range(row_offset, len(rows))))
+    mapped = tuple(find_column_index(header_row, mapping.get(f)) for f in ("입금금액", "출금금액", "금액", "잔액"))
+    return reconstruct_rows(rows, date_column, mapped, row_offset, header_row)
+
+
+def normalize_table(
+    headers: list[str],
+    rows: list[list[str]],
+    analysis: dict,
+    merge_wrapped: bool = False,
+) -> NormalizedColumns:
+    """테이블 전체에 컬럼 매핑 적용
+
+    Args:
+        headers: 테이블 헤더
+        rows: 데이터 행
+        analysis: ColumnAnalysisResult dict
+        merge_wrapped: 여러 줄로 나뉜 거래 행을 먼저 복원
+    """
+    header_row, row_offset = resolve_layout(headers, rows, analysis)
+    if not merge_wrapped:
+        return normalize_rows(header_row, rows[row_offset:], analysis, row_offset)
+    rebuilt = reconstruct_table_rows(header_row, rows, row_offset, analysis)
+    if not rebuilt.merged_rows:
+        # 병합이 없으면 행 인덱스가 연속이므로 row_offset으로 계산
+        return normalize_rows(header_row, rebuilt.rows, analysis, row_offset)
+    normalized = normalize_rows(header_row, rebuilt.rows, analysis, source_index=rebuilt.source_row_index)
+    normalized.merged_rows = rebuilt.merged_rows
+    return normalized
+
+
+def iter_normalized_chunks(
+    headers: list[str],
+    rows: list[list[str]],
+    analysis: dict,
+    chunk_rows: int,
+    merge_wrapped: bool = False,
+) -> Iterator[NormalizedColumns]:
+    """행 묶음 단위로 정규화 결과 생성 (스트리밍 응답용, 행 복원 시 병합 수는 첫 묶음에 기록)"""
+    header_row, row_offset = resolve_layout(headers, rows, analysis)
+    if merge_wrapped:
+        rebuilt = reconstruct_table_rows(header_row, rows, row_offset, analysis)
+        for start in range(0, len(rebuilt.rows), chunk_rows):
+            normalized = normalize_rows(
+                header_row,
+                rebuilt.rows[start:start + chunk_rows],
+                analysis,
+                start + row_offset,
+                rebuilt.source_row_index[start:start + chunk_rows] if rebuilt.merged_rows else None,
+            )
+            normalized.merged_rows = rebuilt.merged_rows if start == 0 else 0
+            yield normalized
+        return
+    for start in range(row_offset, len(rows), chunk_rows):
+        yield normalize_rows(header_row, rows[start:start + chunk_rows], analysis, start)
+
+
+def normalize_rows(
+    header_row: list[str],
+    data_rows: list[list[str]],
+    analysis: dict,
+    row_offset: int = 0,
+    source_index: Optional[list[int]] = None,
+) -> NormalizedColumns:
+    """데이터 행 묶음에 컬럼 매핑 적용
+
+    Args:
+        row_offset: data_rows[0]의 원본 rows 인덱스
+        source_index: data_rows[i]의 원본 rows 인덱스 (행 복원 후처럼 연속이 아닐 때, 지정 시 row_offset 무시)
+    """
+    mapping = analysis["columnMapping"]
+    method = analysis["transactionTypeDetection"]["method"]
+
+    def col(field_name: str) -> np.ndarray:
+        return column_array(data_rows, find_column_index(header_row, mapping.get(field_name)))
+
+    dates = parse_dates(col("거래일자"))
+    memo = col("비고")
+
+    if method == "separate_columns":
+        deposit_raw, withdrawal_raw = col("입금금액"), col("출금금액")
+        deposit, deposit_ok = parse_amounts(deposit_raw)
+        withdrawal, withdrawal_ok = parse_amounts(withdrawal_raw)
+        deposit, withdrawal = np.abs(deposit), np.abs(withdrawal)
+        is_deposit = deposit > 0
+        amount = np.where(is_deposit, deposit, -withdrawal)
+
+        # 특이점: 금액 컬럼 중 빈 쪽에 비고가 들어가는 경우 (숫자가 아닌 텍스트)
+        memo_from_amount = np.where(is_deposit, withdrawal_raw, deposit_raw)
+        memo_from_amount_ok = ~np.where(is_deposit, withdrawal_ok, deposit_ok) & (np.strings.str_len(memo_from_amount) > 0)
+        memo = np.where((np.strings.str_len(memo) == 0) & memo_from_amount_ok, memo_from_amount, memo)
+    else:
+        signed, _ = parse_amounts(col("금액"))
+        magnitude = np.abs(signed)
+        if method in ("type_column", "sign_in_type"):
+            type_values = col("구분")
+            if method == "sign_in_type":
+                is_deposit = np.strings.find(type_values, "+") >= 0
+            else:
+                is_deposit = _contains_any(type_values, DEPOSIT_TYPE_KEYWORDS)
+        else:  # amount_sign
+            is_deposit = signed > 0
+        amount = np.where(is_deposit, magnitude, -magnitude)
+    # -0.0 → 0.0
+    amount = amount + 0.0
+
+    balance_index = find_column_index(header_row, mapping.get("잔액"))
+    if balance_index >= 0:
+        balance_values, balance_ok = parse_amounts(column_array(data_rows, balance_index))
+    else:
+        balance_values, balance_ok = np.zeros(len(data_rows)), np.zeros(len(data_rows), dtype=bool)
+
+    keep = np.strings.str_len(dates) > 0
+    kept = np.flatnonzero(keep)
+    balance_list = np.where(balance_ok, balance_values, np.nan)[kept].tolist()
+    sources = np.asarray(source_index, dtype=np.int64)[kept] if source_index is not None else kept + row_offset
+
+    return NormalizedColumns(
+        transaction_date=dates[kept].tolist(),
+        type=np.where(is_deposit, DEPOSIT, WITHDRAWAL)[kept].tolist(),
+        amount=amount[kept].tolist(),
+        balance=[None if b != b else b for b in balance_list],
+        memo=memo[kept].tolist(),
+        source_row_index=sources.tolist(),
+        skipped_rows=int(len(data_rows) - len(kept)),
+    )
@@ -0,0 +1,195 @@
+"""
+PDF Chunks - 페이지 묶음 단위 병렬 추출 파이프라인
+
+큰 PDF(주로 스캔 페이지)를 페이지 묶음(청크)으로 나눠 병렬로 처리하고 원래 순서대로 합칩니다.
+- 헤더는 한 번만 정함: 이미 알면(텍스트 레이어) 그대로, 모르면 앞 청크부터 순서대로 처리해 헤더를 찾음
+- 헤더를 정한 뒤 나머지 청크는 동시에 concurrency개까지 처리 (LLM 호출 속도 제한은 호출 쪽에서 적용)
+- 헤더가 없는 뒤쪽 페이지의 행은 정해진 헤더의 열 순서에 맞춰 정렬
+- 실패한 청크는 지터 백오프 후 재시도하고, 끝까지 실패하면 건너뛰지 않고 오류로 보고
+- 테이블 밖 텍스트(은행명/계좌 정보 등)도 청크별로 받아 템플릿 식별자 매칭에 쓸 수 있게 보존
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from pypdf import PdfReader, PdfWriter
+
+from rate_limiter import LlmOverloadedError, backoff_delay
+from table_segments import is_transaction_header
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+@dataclass
+class PdfChunk:
+    """연속된 페이지 묶음"""
+    index: int
+    pages: list[int]  # 원본 PDF 페이지 번호 (0부터)
+
+
+@dataclass
+class ChunkOutcome:
+    """청크 처리 결과 (headers는 청크에서 읽은 헤더, 없으면 빈 목록)"""
+    chunk: PdfChunk
+    headers: list[str] = field(default_factory=list)
+    rows: list[list[str]] = field(default_factory=list)
+    page_texts: list[str] = field(default_factory=list)  # 테이블 밖 텍스트
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+# 청크 처리 함수: (청크, 지금까지 정해진 헤더) → (청크 헤더, 행, 테이블 밖 텍스트)
+ChunkProcessor = Callable[[PdfChunk, list[str]], Awaitable[tuple[list[str], list[list[str]], list[str]]]]
+
+
+def plan_chunks(pages: list[int], pages_per_chunk: int) -> list[PdfChunk]:
+    """페이지 목록을 연속 구간별로, 구간 안에서는 pages_per_chunk개씩 묶음"""
+    chunks: list[PdfChunk] = []
+    current: list[int] = []
+    for page in sorted(pages):
+        if current and (page != current[-1] + 1 or len(current) >= pages_per_chunk):
+            chunks.append(PdfChunk(len(chunks), current))
+            current = []
+        current.append(page)
+    if current:
+        chunks.append(PdfChunk(len(chunks), current))
+    return chunks
+
+
+def write_chunk_pdf(file_path: str, pages: list[int], tmp_dir: Optional[str] = None) -> str:
+    """원본 PDF에서 지정 페이지만 담은 임시 PDF 생성 (호출자가 삭제)"""
+    reader = PdfReader(file_path)
+    writer = PdfWriter()
+    for index in pages:
+        writer.add_page(reader.pages[index])
+
+    fd, path = tempfile.mkstemp(suffix=".pdf", dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            writer.write(out)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _header_key(text: str) -> str:
+    return _SPACES_RE.sub("", text or "")
+
+
+def column_order(headers: list[str], chunk_headers: list[str]) -> Optional[list[Optional[int]]]:
+    """기준 헤더의 각 열이 청크 헤더의 몇 번째 열인지 (절반 이상 이름이 맞지 않으면 None)"""
+    positions = {}
+    for i, header in enumerate(chunk_headers):
+        positions.setdefault(_header_key(header), i)
+    order = [positions.get(_header_key(h)) for h in headers]
+    if sum(o is not None for o in order) * 2 < len(headers):
+        return None
+    return order
+
+
+def align_rows(headers: list[str], chunk_headers: list[str], rows: list[list[str]]) -> list[list[str]]:
+    """청크 행을 기준 헤더의 열 순서/개수에 맞춤
+
+    - 청크 헤더 이름이 기준 헤더와 맞으면 이름으로 열 재배치
+    - 청크 "헤더"가 실제로는 데이터 행(헤더 없는 페이지)이면 첫 행으로 되돌림
+    - 그 외에는 위치 그대로 두고 부족한 열은 빈 값, 넘치는 열은 마지막 열에 합침
+    반복된 헤더 행은 제외합니다.
+    """
+    if not headers:
+        return [list(chunk_headers), *rows] if chunk_headers and not is_transaction_header(chunk_headers) else rows
+
+    order = column_order(headers, chunk_headers) if chunk_headers else None
+    if chunk_headers and order is None and not is_transaction_header(chunk_headers):
+        rows = [list(chunk_headers), *rows]
+
+    width = len(headers)
+    header_key = _header_key("".join(headers))
+    aligned = []
+    for row in rows:
+        if order is not None:
+            row = [row[i] if i is not None and i < len(row) else "" for i in order]
+        elif len(row) > width:
+            row = [*row[:width - 1], " ".join(c for c in row[width - 1:] if c)]
+        elif len(row) < width:
+            row = [*row, *[""] * (width - len(row))]
+        if not any(row) or _header_key("".join(row)) == header_key:
+            continue
+        aligned.append(row)
+    return aligned
+
+
+async def _process_with_retry(
+    chunk: PdfChunk,
+    headers: list[str],
+    process: ChunkProcessor,
+    max_attempts: int,
+    backoff_base: float,
+    backoff_max: float,
+    on_retry: Optional[Callable[[PdfChunk, BaseException], None]],
+) -> ChunkOutcome:
+    outcome = ChunkOutcome(chunk)
+    for attempt in range(1, max_attempts + 1):
+        outcome.attempts = attempt
+        try:
+            outcome.headers, outcome.rows, outcome.page_texts = await process(chunk, headers)
+            outcome.error = None
+            return outcome
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            outcome.error = f"{type(e).__name__}: {e}"
+            if attempt >= max_attempts:
+                break
+            if on_retry is not None:
+                on_retry(chunk, e)
+            hint = e.retry_after if isinstance(e, LlmOverloadedError) else None
+            await asyncio.sleep(backoff_delay(attempt, backoff_base, backoff_max, hint))
+    return outcome
+
+
+async def run_chunk_pipeline(
+    chunks: list[PdfChunk],
+    process: ChunkProcessor,
+    headers: Optional[list[str]] = None,
+    concurrency: int = 4,
+    max_attempts: int = 3,
+    backoff_base: float = 1.0,
+    backoff_max: float = 30.0,
+    on_retry: Optional[Callable[[PdfChunk, BaseException], None]] = None,
+) -> tuple[list[str], list[ChunkOutcome]]:
+    """청크를 처리하고 (정해진 헤더, 청크 순서대로의 결과) 반환
+
+    headers를 모르면 헤더가 나올 때까지 앞 청크를 하나씩 처리한 뒤, 나머지를 병렬 처리합니다.
+    각 결과의 rows는 정해진 헤더에 맞춰 정렬되어 있습니다.
+    """
+    headers = list(headers or [])
+    outcomes: dict[int, ChunkOutcome] = {}
+
+    def retry(chunk: PdfChunk) -> Awaitable[ChunkOutcome]:
+        return _process_with_retry(chunk, headers, process, max_attempts, backoff_base, backoff_max, on_retry)
+
+    remaining = list(chunks)
+    while remaining and not headers:
+        outcome = await retry(remaining.pop(0))
+        outcomes[outcome.chunk.index] = outcome
+        if outcome.headers and is_transaction_header(outcome.headers):
+            headers = list(outcome.headers)
+
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def limited(chunk: PdfChunk) -> ChunkOutcome:
+        async with semaphore:
+            return await retry(chunk)
+
+    for outcome in await asyncio.gather(*(limited(c) for c in remaining)):
+        outcomes[outcome.chunk.index] = outcome
+
+    ordered = [outcomes[c.index] for c in chunks]
+    for outcome in ordered:
+        outcome.rows = align_rows(headers, outcome.headers, outcome.rows)
+    return headers, ordered
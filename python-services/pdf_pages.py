@@ -0,0 +1,102 @@
+"""
+PDF Pages - 거래내역 테이블 페이지 선별
+
+PDF 텍스트 레이어에서 거래내역 테이블 헤더가 있는 페이지를 찾아
+해당 페이지만 담은 작은 PDF를 만듭니다. (LLM 업로드 크기/토큰/지연 절감)
+텍스트 레이어가 없거나(스캔본) 헤더를 찾지 못하면 원본 전체를 사용합니다.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+from pypdf import PdfReader, PdfWriter
+
+from column_mapper import SYNONYM_CATALOG, normalize_header
+from column_profile import is_date
+
+# 헤더 행으로 인정할 최소 표준 필드 수 (거래일자 포함)
+MIN_HEADER_FIELDS = 3
+# 헤더 페이지에 데이터 행이 이보다 적으면 다음 페이지도 포함
+MIN_SAMPLE_ROWS = 5
+
+
+@dataclass
+class PageSelection:
+    """선별된 페이지 정보"""
+    path: str               # 선별 페이지만 담은 PDF 경로 (호출 측에서 삭제)
+    pages: list[int]        # 원본 기준 0부터 시작하는 페이지 인덱스
+    total_pages: int
+
+
+def score_header_line(line: str) -> tuple[int, bool]:
+    """텍스트 한 줄의 헤더 점수 (매칭된 표준 필드 수, 거래일자 포함 여부)"""
+    if is_date(line):
+        return 0, False
+    normalized = normalize_header(line)
+    fields = {
+        field_name
+        for field_name, synonyms in SYNONYM_CATALOG.items()
+        if any(len(s) >= 2 and s in normalized for s in synonyms)
+    }
+    return len(fields), "거래일자" in fields
+
+
+def page_text(page) -> str:
+    """페이지 텍스트 (좌표 기반 layout 모드로 같은 행의 셀을 한 줄로 유지)"""
+    try:
+        return page.extract_text(extraction_mode="layout") or ""
+    except Exception:
+        return page.extract_text() or ""
+
+
+def _count_rows_after_header(lines: list[str], header_line: int) -> int:
+    """헤더 이후 날짜로 시작하는 (데이터) 행 수"""
+    return sum(1 for line in lines[header_line + 1:] if is_date(line))
+
+
+def find_table_pages(reader: PdfReader, max_pages: int = 2) -> list[int]:
+    """거래내역 헤더가 있는 페이지(+ 샘플 행 보충용 다음 페이지) 인덱스"""
+    for index, page in enumerate(reader.pages):
+        text = page_text(page)
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        for i, line in enumerate(lines):
+            score, has_date = score_header_line(line)
+            if not has_date or score < MIN_HEADER_FIELDS:
+                continue
+            pages = [index]
+            if (
+                max_pages > 1
+                and index + 1 < len(reader.pages)
+                and _count_rows_after_header(lines, i) < MIN_SAMPLE_ROWS
+            ):
+                pages.append(index + 1)
+            return pages
+    return []
+
+
+def select_table_pages(file_path: str, max_pages: int = 2, tmp_dir: Optional[str] = None) -> Optional[PageSelection]:
+    """테이블 페이지만 담은 PDF 생성
+
+    Returns:
+        PageSelection, 선별이 의미 없으면(헤더 미발견/이미 충분히 작음) None
+    """
+    reader = PdfReader(file_path)
+    total_pages = len(reader.pages)
+    pages = find_table_pages(reader, max_pages)
+    if not pages or len(pages) >= total_pages:
+        return None
+
+    writer = PdfWriter()
+    for index in pages:
+        writer.add_page(reader.pages[index])
+
+    fd, path = tempfile.mkstemp(suffix=".pdf", dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            writer.write(out)
+    except Exception:
+        os.unlink(path)
+        raise
+    return PageSelection(path=path, pages=pages, total_pages=total_pages)
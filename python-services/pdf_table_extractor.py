@@ -0,0 +1,346 @@
+"""
+PDF Table Extractor - 텍스트 레이어 기반 로컬 테이블 추출
+
+디지털 생성(born-digital) PDF의 텍스트 레이어에서 글리프 좌표로 행/열을 복원합니다.
+페이지 파싱은 프로세스 풀에 분산하고, 헤더 탐지/열 정렬은 메인 프로세스에서 수행합니다.
+텍스트가 없는 페이지는 스캔 페이지로 보고하여 해당 페이지만 OCR로 보낼 수 있게 합니다.
+
+반환 형식은 TableData와 동일한 headers/rows 입니다.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+from pypdf import PdfReader
+
+from pdf_pages import MIN_HEADER_FIELDS, score_header_line
+from table_segments import TableSegment, finalize_segments, is_transaction_header, trailing_rows_without_date
+
+# 한 작업(프로세스 풀 태스크)이 처리할 페이지 수
+PAGES_PER_TASK = 8
+# 이 글자 수 미만의 페이지는 스캔 페이지로 간주
+MIN_TEXT_CHARS = 20
+
+# (x0, x1, text) 형태의 셀
+Cell = tuple[float, float, str]
+
+
+@dataclass
+class PageLines:
+    """페이지별 복원된 텍스트 행 (위→아래, 각 행은 왼쪽→오른쪽 셀)"""
+    index: int
+    lines: list[list[Cell]]
+    char_count: int
+
+
+@dataclass
+class ExtractedTable:
+    """추출된 테이블"""
+    headers: list[str]
+    rows: list[list[str]]
+    page_count: int
+    header_page_index: Optional[int] = None
+    scanned_pages: list[int] = field(default_factory=list)
+    row_pages: list[int] = field(default_factory=list)  # rows[i]가 나온 페이지
+    # 테이블 밖 텍스트 행 (문서 상단 은행명/계좌 정보, 페이지 머리글 등)과 각 행이 나온 페이지
+    page_texts: list[str] = field(default_factory=list)
+    page_text_pages: list[int] = field(default_factory=list)
+
+
+def _mult(m: list[float], n: list[float]) -> list[float]:
+    """PDF 변환 행렬 곱"""
+    return [
+        m[0] * n[0] + m[1] * n[2],
+        m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2],
+        m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4],
+        m[4] * n[1] + m[5] * n[3] + n[5],
+    ]
+
+
+def _text_width(text: str, font_size: float) -> float:
+    """글리프 폭 추정 (CJK 전각, 그 외 반각)"""
+    return sum(font_size if ord(ch) >= 0x2E80 else font_size * 0.55 for ch in text)
+
+
+def _group_lines(fragments: list[tuple[float, float, float, str]]) -> list[list[Cell]]:
+    """조각을 y 좌표로 행 그룹화 후, 가까운 조각을 셀로 병합"""
+    if not fragments:
+        return []
+
+    # PDF 좌표는 아래→위이므로 y 내림차순이 위→아래
+    fragments.sort(key=lambda f: (-f[1], f[0]))
+    lines: list[list[tuple[float, float, float, str]]] = []
+    current_y = None
+    for frag in fragments:
+        x, y, size, _ = frag
+        if current_y is None or abs(current_y - y) > max(size * 0.5, 1.0):
+            lines.append([])
+            current_y = y
+        lines[-1].append(frag)
+
+    result = []
+    for line in lines:
+        line.sort(key=lambda f: f[0])
+        cells: list[Cell] = []
+        for x, _, size, text in line:
+            x1 = x + _text_width(text, size)
+            if cells and x - cells[-1][1] < size * 0.6:
+                x0, _, prev = cells[-1]
+                cells[-1] = (x0, x1, f"{prev} {text}" if x - cells[-1][1] > size * 0.2 else prev + text)
+            else:
+                cells.append((x, x1, text))
+        result.append(cells)
+    return result
+
+
+def extract_page_lines(file_path: str, page_indices: list[int]) -> list[PageLines]:
+    """페이지 텍스트 조각을 좌표와 함께 읽어 행 단위로 복원 (프로세스 풀 작업 단위)"""
+    reader = PdfReader(file_path)
+    pages = []
+    for index in page_indices:
+        fragments: list[tuple[float, float, float, str]] = []
+
+        def visitor(text, cm, tm, font_dict, font_size):
+            text = text.strip()
+            if not text:
+                return
+            m = _mult(tm, cm)
+            scale = (m[0] ** 2 + m[1] ** 2) ** 0.5 or 1.0
+            fragments.append((m[4], m[5], (font_size or 10) * scale, text))
+
+        reader.pages[index].extract_text(visitor_text=visitor)
+        char_count = sum(len(f[3]) for f in fragments)
+        pages.append(PageLines(index=index, lines=_group_lines(fragments), char_count=char_count))
+    return pages
+
+
+def _column_bounds(header: list[Cell]) -> list[float]:
+    """헤더 셀 사이 중간점을 열 경계로 사용"""
+    return [(header[i][1] + header[i + 1][0]) / 2 for i in range(len(header) - 1)]
+
+
+def _assign_columns(line: list[Cell], bounds: list[float]) -> list[str]:
+    """셀 중심 좌표로 열 배정 (같은 열의 셀은 공백으로 연결)"""
+    row = [""] * (len(bounds) + 1)
+    for x0, x1, text in line:
+        center = (x0 + x1) / 2
+        column = sum(1 for b in bounds if center > b)
+        row[column] = f"{row[column]} {text}" if row[column] else text
+    return row
+
+
+class TableAssembler:
+    """페이지를 순서대로 받아 헤더를 찾고 열 정렬된 행을 생성 (스트리밍 가능)"""
+
+    def __init__(self):
+        self.headers: list[str] = []
+        self.header_page_index: Optional[int] = None
+        self.scanned_pages: list[int] = []
+        self.page_texts: list[tuple[int, str]] = []  # (페이지, 테이블 밖 텍스트 행)
+        self._bounds: list[float] = []
+        self._header_key = ""
+
+    def _keep_text(self, page: PageLines, lines: list[list[Cell]]) -> None:
+        for line in lines:
+            text = " ".join(c[2] for c in line if c[2]).strip()
+            if text:
+                self.page_texts.append((page.index, text))
+
+    def _locate_header(self, page: PageLines) -> Optional[int]:
+        for i, line in enumerate(page.lines):
+            score, has_date = score_header_line(" ".join(c[2] for c in line))
+            if has_date and score >= MIN_HEADER_FIELDS:
+                return i
+        return None
+
+    def feed(self, page: PageLines) -> list[list[str]]:
+        """페이지 하나를 처리하고 새로 만들어진 행 반환 (헤더 이전 페이지는 빈 목록)"""
+        if page.char_count < MIN_TEXT_CHARS:
+            self.scanned_pages.append(page.index)
+
+        if not self.headers:
+            header_line = self._locate_header(page)
+            if header_line is None:
+                self._keep_text(page, page.lines)
+                return []
+            self._keep_text(page, page.lines[:header_line])
+            header = page.lines[header_line]
+            self.headers = [c[2] for c in header]
+            self.header_page_index = page.index
+            self._bounds = _column_bounds(header)
+            self._header_key = "".join(self.headers)
+            lines = page.lines[header_line + 1:]
+        else:
+            lines = page.lines
+            # 페이지마다 반복되는 헤더가 있으면 그 위(페이지 머리글)는 제외
+            for i, line in enumerate(lines):
+                if "".join(c[2] for c in line) == self._header_key:
+                    self._keep_text(page, lines[:i])
+                    lines = lines[i + 1:]
+                    break
+
+        rows = []
+        for line in lines:
+            row = _assign_columns(line, self._bounds)
+            if any(row):
+                rows.append(row)
+        return rows
+
+
+class MultiTableAssembler:
+    """페이지를 순서대로 받아 여러 테이블로 분리 (거래내역 헤더가 나올 때마다 새 테이블)
+
+    테이블 밖의 텍스트 행(계좌정보, 요약 등)은 헤더 없는 블록으로 모아 별도 세그먼트로 반환합니다.
+    """
+
+    def __init__(self):
+        self.scanned_pages: list[int] = []
+        self._segments: list[TableSegment] = []
+        self._table: Optional[TableSegment] = None
+        self._loose = TableSegment(0, [], [])
+        self._bounds: list[float] = []
+        self._header_key = ""
+
+    def _flush_loose(self) -> None:
+        if self._loose.rows:
+            self._segments.append(self._loose)
+        self._loose = TableSegment(0, [], [])
+
+    def _close_table(self) -> None:
+        table, self._table = self._table, None
+        if table is None:
+            return
+        # 끝의 날짜 없는 행(합계, 다음 계좌 정보 등)은 테이블 밖 블록으로 넘김
+        tail = trailing_rows_without_date(table.rows)
+        if tail:
+            self._loose.rows.extend(table.rows[-tail:])
+            self._loose.row_pages.extend(table.row_pages[-tail:])
+            del table.rows[-tail:]
+            del table.row_pages[-tail:]
+        self._segments.append(table)
+
+    def feed(self, page: PageLines) -> None:
+        if page.char_count < MIN_TEXT_CHARS:
+            self.scanned_pages.append(page.index)
+        page_mark = len(self._table.rows) if self._table is not None else 0
+
+        for line in page.lines:
+            cells = [c[2] for c in line]
+            if is_transaction_header(cells):
+                if self._table is not None and "".join(cells) == self._header_key:
+                    # 페이지마다 반복되는 헤더: 그 위(페이지 머리글)는 제외
+                    del self._table.rows[page_mark:]
+                    del self._table.row_pages[page_mark:]
+                    continue
+                self._close_table()
+                self._flush_loose()
+                self._table = TableSegment(0, cells, [], header_page=page.index)
+                self._bounds = _column_bounds(line)
+                self._header_key = "".join(cells)
+                page_mark = 0
+                continue
+            if self._table is None:
+                self._loose.rows.append(cells)
+                self._loose.row_pages.append(page.index)
+                continue
+            row = _assign_columns(line, self._bounds)
+            if any(row):
+                self._table.rows.append(row)
+                self._table.row_pages.append(page.index)
+
+    def finish(self) -> list[TableSegment]:
+        """남은 테이블/블록을 닫고 번호, 분류, 캡션을 붙여 반환"""
+        self._close_table()
+        self._flush_loose()
+        return finalize_segments(self._segments)
+
+
+def build_table(pages: list[PageLines], page_count: int) -> ExtractedTable:
+    """페이지 행 목록에서 헤더를 찾고 열을 정렬해 테이블 구성"""
+    assembler = TableAssembler()
+    table = ExtractedTable(headers=[], rows=[], page_count=page_count)
+    for page in pages:
+        rows = assembler.feed(page)
+        table.rows.extend(rows)
+        table.row_pages.extend([page.index] * len(rows))
+    table.headers = assembler.headers
+    table.header_page_index = assembler.header_page_index
+    table.scanned_pages = assembler.scanned_pages
+    table.page_text_pages = [page for page, _ in assembler.page_texts]
+    table.page_texts = [text for _, text in assembler.page_texts]
+    return table
+
+
+def page_count(file_path: str) -> int:
+    """PDF 페이지 수"""
+    return len(PdfReader(file_path).pages)
+
+
+def _page_chunks(total: int) -> list[list[int]]:
+    return [list(range(i, min(i + PAGES_PER_TASK, total))) for i in range(0, total, PAGES_PER_TASK)]
+
+
+async def iter_page_lines(
+    file_path: str,
+    total: int,
+    executor: Optional[Executor] = None,
+    window: int = 4,
+) -> AsyncIterator[list[PageLines]]:
+    """페이지 묶음을 executor에서 파싱하여 원래 순서대로 생성
+
+    동시에 진행하는 묶음은 window개로 제한하여, 소비자가 느리면 파싱도 멈춥니다.
+    """
+    loop = asyncio.get_running_loop()
+    pending: deque = deque()
+    chunks = iter(_page_chunks(total))
+
+    def submit_next() -> None:
+        chunk = next(chunks, None)
+        if chunk is None:
+            return
+        if executor is None:
+            pending.append(asyncio.ensure_future(asyncio.to_thread(extract_page_lines, file_path, chunk)))
+        else:
+            pending.append(loop.run_in_executor(executor, extract_page_lines, file_path, chunk))
+
+    try:
+        for _ in range(max(window, 1)):
+            submit_next()
+        while pending:
+            pages = await pending.popleft()
+            submit_next()
+            yield pages
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def extract_table_segments(
+    file_path: str,
+    executor: Optional[Executor] = None,
+    window: int = 4,
+) -> tuple[list[TableSegment], list[int], int]:
+    """PDF 텍스트 레이어에서 여러 테이블 분리 (세그먼트, 스캔 페이지, 전체 페이지 수)"""
+    total = await asyncio.to_thread(page_count, file_path)
+    assembler = MultiTableAssembler()
+    async for chunk_pages in iter_page_lines(file_path, total, executor, window):
+        for page in chunk_pages:
+            assembler.feed(page)
+    return assembler.finish(), assembler.scanned_pages, total
+
+
+async def extract_table(file_path: str, executor: Optional[Executor] = None, window: int = 4) -> ExtractedTable:
+    """PDF 텍스트 레이어에서 테이블 추출 (페이지 묶음 단위로 executor에 분산)
+
+    executor가 없으면 스레드에서 처리합니다.
+    """
+    total = await asyncio.to_thread(page_count, file_path)
+    pages = []
+    async for chunk_pages in iter_page_lines(file_path, total, executor, window):
+        pages.extend(chunk_pages)
+    return await asyncio.to_thread(build_table, pages, total)
@@ -0,0 +1,161 @@
+"""
+Prompt Compactor - 토큰 예산 기반 테이블 프롬프트 압축
+
+앞 10행을 그대로 보내는 대신
+- 컬럼별 통계(날짜/숫자/빈 값/부호 비율, 고유값 수, 예시 값)를 로컬에서 계산해 요약하고
+- 헤더 영역(앞 몇 행)과 테이블 전체에서 고른 층화 샘플 행을 토큰 예산 안에서 담으며
+- 긴 셀(주로 비고)은 잘라서 보냅니다.
+"""
+
+from dataclasses import dataclass, field
+
+from column_profile import ColumnProfile, profile_columns
+
+# 헤더 탐지를 위해 항상 포함하는 앞쪽 행 수
+HEAD_ROWS = 5
+# 통계 계산에 사용할 최대 행 수
+MAX_PROFILE_ROWS = 1000
+# 셀 최대 길이 (초과분은 …로 표시)
+MAX_CELL_CHARS = 24
+# 예시 값 최대 길이
+MAX_EXAMPLE_CHARS = 20
+
+
+@dataclass
+class CompactTable:
+    """압축된 테이블 프롬프트"""
+    content: str
+    estimated_tokens: int
+    sample_row_indices: list[int] = field(default_factory=list)  # 포함된 rows 인덱스
+    sample_rows: list[list[str]] = field(default_factory=list)   # 잘린 셀 기준 샘플 (캐시 키용)
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (ASCII 약 4자당 1토큰, 한글 등 비ASCII는 1자당 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def truncate_cell(value: str, max_chars: int = MAX_CELL_CHARS) -> str:
+    """긴 셀 자르기"""
+    value = " ".join(str(value or "").split())
+    return value if len(value) <= max_chars else value[:max_chars - 1] + "…"
+
+
+def _percent(ratio: float) -> str:
+    return f"{round(ratio * 100)}%"
+
+
+def describe_profile(profile: ColumnProfile) -> str:
+    """컬럼 통계 한 줄 요약"""
+    parts = [f"빈값 {_percent(profile.empty_ratio)}"]
+    for label, ratio in (
+        ("날짜", profile.date_ratio),
+        ("숫자", profile.number_ratio),
+        ("부호", profile.signed_ratio),
+        ("음수", profile.negative_ratio),
+        ("[+/-]", profile.sign_bracket_ratio),
+        ("입출금어", profile.type_word_ratio),
+        ("텍스트", profile.text_ratio),
+    ):
+        if ratio > 0:
+            parts.append(f"{label} {_percent(ratio)}")
+    parts.append(f"고유값 {profile.distinct_count}")
+    parts.append(f"평균길이 {profile.avg_length:.0f}")
+    if profile.examples:
+        parts.append("예: " + " / ".join(truncate_cell(e, MAX_EXAMPLE_CHARS) for e in profile.examples))
+    return f"[{profile.index}] {profile.name or '(이름 없음)'}: " + ", ".join(parts)
+
+
+def _row_shape(row: list[str]) -> tuple[bool, ...]:
+    """빈 셀 위치 패턴 (입금 행/출금 행처럼 모양이 다른 행을 구분)"""
+    return tuple(bool(cell and str(cell).strip()) for cell in row)
+
+
+def stratified_order(rows: list[list[str]], start: int) -> list[int]:
+    """샘플 우선순위 (행 모양 그룹을 번갈아, 그룹 안에서는 테이블 전체에 고르게)
+
+    예산이 허락하는 만큼 앞에서부터 담으면 다양한 모양과 위치의 행이 포함됩니다.
+    """
+    groups: dict[tuple[bool, ...], list[int]] = {}
+    for i in range(start, len(rows)):
+        groups.setdefault(_row_shape(rows[i]), []).append(i)
+
+    spread: list[list[int]] = []
+    for members in groups.values():
+        # 첫/끝/중간을 번갈아 고르는 이분 순서
+        ordered, seen = [], set()
+        step = len(members)
+        while step >= 1 and len(ordered) < len(members):
+            for j in range(0, len(members), step):
+                if j not in seen:
+                    seen.add(j)
+                    ordered.append(members[j])
+            if len(members) - 1 not in seen:
+                seen.add(len(members) - 1)
+                ordered.append(members[-1])
+            step //= 2
+        spread.append(ordered)
+
+    order = []
+    for depth in range(max((len(s) for s in spread), default=0)):
+        for members in spread:
+            if depth < len(members):
+                order.append(members[depth])
+    return order
+
+
+def compact_table(
+    headers: list[str],
+    rows: list[list[str]],
+    token_budget: int,
+    head_rows: int = HEAD_ROWS,
+    max_cell_chars: int = MAX_CELL_CHARS,
+    base_tokens: int = 0,
+) -> CompactTable:
+    """토큰 예산 안에서 헤더 + 컬럼 통계 + 샘플 행으로 프롬프트 구성
+
+    Args:
+        token_budget: 시스템 프롬프트 등을 포함한 전체 예산
+        base_tokens: 테이블 외 프롬프트(시스템 메시지/지시문) 토큰 수
+    """
+    def render(index: int) -> tuple[str, list[str]]:
+        cells = [truncate_cell(c, max_cell_chars) for c in rows[index]]
+        # 행 번호는 원본 기준 (headers가 0번 행)
+        return f"Row {index + 1}: {' | '.join(cells)}", cells
+
+    profiles = profile_columns(headers, rows[:MAX_PROFILE_ROWS])
+    lines = [
+        f"헤더: {' | '.join(headers)}",
+        f"전체 데이터 행 수: {len(rows)}",
+        "",
+        f"컬럼 통계 (앞 {min(len(rows), MAX_PROFILE_ROWS)}행 기준, 비율은 빈 값 제외):",
+        *[describe_profile(p) for p in profiles],
+        "",
+        "샘플 데이터 (행 번호는 원본 기준, 긴 셀은 …로 생략):",
+    ]
+    tokens = base_tokens + estimate_tokens("\n".join(lines))
+
+    head = list(range(min(head_rows, len(rows))))
+    candidates = head + stratified_order(rows, len(head))
+    picked: dict[int, tuple[str, list[str]]] = {}
+    for i, index in enumerate(candidates):
+        line, cells = render(index)
+        cost = estimate_tokens(line) + 1
+        # 헤더 영역은 예산과 관계없이 포함
+        if i >= len(head) and tokens + cost > token_budget:
+            break
+        picked[index] = (line, cells)
+        tokens += cost
+
+    indices = sorted(picked)
+    lines.extend(picked[i][0] for i in indices)
+    if len(indices) < len(rows):
+        lines.append(f"... (나머지 {len(rows) - len(indices)}행 생략)")
+    content = "\n".join(lines)
+    return CompactTable(
+        content=content,
+        estimated_tokens=base_tokens + estimate_tokens(content),
+        sample_row_indices=indices,
+        sample_rows=[picked[i][1] for i in indices],
+    )
@@ -0,0 +1,337 @@
+"""
+Rate Limiter - LLM 호출 속도 제한 / 적응형 동시성 / 재시도
+
+제공자(provider)가 요청을 제한(429)해도 요청을 바로 실패시키지 않고 대기열로 흡수합니다.
+- 분당 요청 수(RPM), 분당 토큰 수(TPM) 토큰 버킷으로 호출 속도 조절
+- 동시 호출 한도를 관측된 429/지연 시간에 따라 조절 (AIMD: 성공 시 천천히 늘리고, 제한 시 절반으로)
+- 일시적 오류(429, 5xx, 연결 오류)는 지터가 있는 지수 백오프로 재시도
+- 대기 중인 호출이 한도를 넘으면 LlmOverloadedError(retry_after) → 서비스에서 429 + Retry-After
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 오류 분류
+THROTTLED = "throttled"
+TRANSIENT = "transient"
+
+# 재시도할 HTTP 상태 코드 (429 제외)
+RETRYABLE_STATUS_CODES = {408, 500, 502, 503, 504, 529}
+# 예외 클래스 이름으로 판별하는 일시적 오류 (litellm/httpx 등)
+_TRANSIENT_NAMES = ("serviceunavailable", "apiconnection", "internalserver", "overloaded", "connecterror", "readerror")
+_THROTTLED_MARKERS = ("rate limit", "ratelimit", "resource_exhausted", "resource exhausted", "too many requests", " 429")
+
+
+class LlmOverloadedError(Exception):
+    """LLM 호출 대기열 초과 또는 제공자 제한 지속 (retry_after 초 후 재시도 권장)"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """예외에 담긴 HTTP 상태 코드 (없으면 None)"""
+    for attr in ("status_code", "status", "http_status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    value = getattr(getattr(error, "response", None), "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """재시도 대상 오류 분류 (THROTTLED/TRANSIENT, 재시도하지 않으면 None)"""
+    status = error_status(error)
+    name = type(error).__name__.lower()
+    message = f" {error}".lower()
+    if status == 429 or "ratelimit" in name or any(m in message for m in _THROTTLED_MARKERS):
+        return THROTTLED
+    if status in RETRYABLE_STATUS_CODES or any(n in name for n in _TRANSIENT_NAMES):
+        return TRANSIENT
+    if isinstance(error, ConnectionError):
+        return TRANSIENT
+    return None
+
+
+def retry_after_hint(error: BaseException) -> Optional[float]:
+    """제공자가 알려준 재시도 대기 시간 (retry_after 속성 또는 Retry-After 헤더)"""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            value = headers.get("retry-after")
+        except AttributeError:
+            value = None
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float, hint: Optional[float] = None) -> float:
+    """지수 백오프 + 전체 지터 (제공자 힌트가 있으면 그 이상 대기)"""
+    delay = random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+    return max(delay, min(hint, cap)) if hint is not None else delay
+
+
+class TokenBucket:
+    """분당 보충 토큰 버킷 (예약 방식: 잔량이 부족하면 사용 가능해질 때까지의 대기 시간 반환)"""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_minute > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """amount 예약 후 대기 시간(초) 반환 (먼저 예약한 호출이 먼저 통과)"""
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        # 한 번에 분당 한도보다 큰 요청도 언젠가는 통과하도록 상한 적용
+        self.tokens -= min(amount, self.capacity)
+        return max(-self.tokens / self.rate, 0.0)
+
+    def adjust(self, amount: float) -> None:
+        """예약량 보정 (양수: 추가 사용, 음수: 반환)"""
+        if self.enabled:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+    def wait_estimate(self, amount: float = 1.0) -> float:
+        """지금 amount를 예약하면 기다릴 시간 (예약하지 않음)"""
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        return max((min(amount, self.capacity) - self.tokens) / self.rate, 0.0)
+
+
+class AdaptiveConcurrency:
+    """AIMD 동시성 한도 (성공: +1/한도, 429: 절반, 목표 지연 초과: 10% 감소)"""
+
+    def __init__(
+        self,
+        maximum: int,
+        minimum: int = 1,
+        latency_target: float = 30.0,
+        cooldown: float = 5.0,
+    ):
+        self.maximum = max(maximum, 1)
+        self.minimum = min(max(minimum, 1), self.maximum)
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.limit = float(self.maximum)
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.active < int(self.limit) and not self._waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 슬롯을 받은 직후 취소된 경우 반납
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.active < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        # 같은 혼잡 구간의 연속 신호로 한도가 바닥까지 떨어지지 않도록 쿨다운 적용
+        if now - self._last_decrease >= self.cooldown:
+            self.limit = max(float(self.minimum), self.limit * factor)
+            self._last_decrease = now
+
+    def on_success(self, latency: float) -> None:
+        if self.latency_target > 0 and latency > self.latency_target:
+            self._decrease(0.9)
+        else:
+            self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def on_throttled(self) -> None:
+        self._decrease(0.5)
+
+
+class LlmRateLimiter:
+    """RPM/TPM 버킷 + 적응형 동시성 + 재시도를 묶은 LLM 호출 제한기"""
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 20,
+        min_concurrency: int = 1,
+        latency_target: float = 30.0,
+        max_waiting: int = 100,
+        max_attempts: int = 4,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+    ):
+        """
+        Args:
+            requests_per_minute / tokens_per_minute: 0이면 제한 없음
+            max_waiting: 슬롯 또는 RPM/TPM을 기다리는 호출 최대 수 (초과 시 LlmOverloadedError)
+            max_attempts: 일시적 오류 시 최대 시도 횟수 (첫 시도 포함)
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrency(max_concurrency, min_concurrency, latency_target)
+        self.max_waiting = max_waiting
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._latency: Optional[float] = None
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.paced_seconds = 0.0
+        self.pacing = 0  # RPM/TPM 예약 후 대기 중인 호출 수
+
+    def retry_after(self) -> int:
+        """지금 대기열에 들어가면 슬롯을 얻기까지 걸릴 대략적인 시간 (초, Retry-After용)"""
+        latency = self._latency or self.concurrency.latency_target or 10.0
+        queued = self.concurrency.waiting / max(int(self.concurrency.limit), 1) * latency
+        return max(math.ceil(max(queued, self.requests.wait_estimate(), self.tokens.wait_estimate())), 1)
+
+    @asynccontextmanager
+    async def slot(self, tokens: int, enforce_queue_limit: bool = True) -> AsyncIterator[None]:
+        """동시성 슬롯 + RPM/TPM 예약 (대기열 초과 시 LlmOverloadedError)"""
+        if enforce_queue_limit and self.concurrency.waiting + self.pacing >= self.max_waiting:
+            self.rejected += 1
+            raise LlmOverloadedError(
+                f"LLM 호출 대기열이 가득 찼습니다 (최대 {self.max_waiting}개)", self.retry_after()
+            )
+        # RPM/TPM 대기는 슬롯을 잡기 전에 (대기 중인 호출이 동시성 슬롯을 차지하지 않도록)
+        delay = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        if delay > 0:
+            self.paced_seconds += delay
+            self.pacing += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # 호출하지 않았으므로 예약 반환
+                self.requests.adjust(-1)
+                self.tokens.adjust(-tokens)
+                raise
+            finally:
+                self.pacing -= 1
+        await self.concurrency.acquire()
+        try:
+            yield
+        finally:
+            self.concurrency.release()
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        tokens: int,
+        on_retry: Optional[Callable[[str, BaseException], None]] = None,
+        enforce_queue_limit: bool = True,
+    ) -> T:
+        """제한 안에서 fn 실행, 일시적 오류는 백오프 후 재시도
+
+        제한(429)이 재시도 후에도 계속되면 LlmOverloadedError로 바꿔 올립니다.
+
+        Args:
+            tokens: TPM 버킷에서 예약할 토큰 수 (입력 + 예상 출력)
+            enforce_queue_limit: False면 대기열이 가득 차도 거절하지 않고 기다림
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            async with self.slot(tokens, enforce_queue_limit):
+                self.calls += 1
+                t0 = time.perf_counter()
+                try:
+                    result = await fn()
+                except TimeoutError:
+                    # 응답 시간 초과는 혼잡 신호로만 반영 (이미 오래 기다렸으므로 재시도하지 않음)
+                    self.concurrency.on_throttled()
+                    raise
+                except Exception as e:
+                    kind = classify_error(e)
+                    if kind == THROTTLED:
+                        self.throttled += 1
+                        self.concurrency.on_throttled()
+                    if kind is None:
+                        raise
+                    hint = retry_after_hint(e)
+                    if attempt >= self.max_attempts:
+                        if kind == THROTTLED:
+                            raise LlmOverloadedError(
+                                f"LLM 제공자 요청 제한이 계속됩니다: {e}",
+                                max(math.ceil(hint or 0), self.retry_after()),
+                            ) from e
+                        raise
+                    error = e
+                else:
+                    latency = time.perf_counter() - t0
+                    self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+                    self.concurrency.on_success(latency)
+                    return result
+
+            # 재시도 대기 중에는 슬롯을 반납
+            self.retries += 1
+            if on_retry is not None:
+                on_retry(kind, error)
+            await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max, hint))
+
+    def stats(self) -> dict:
+        """제한기 상태"""
+        return {
+            "requestsPerMinute": self.requests.per_minute,
+            "tokensPerMinute": self.tokens.per_minute,
+            "concurrencyLimit": round(self.concurrency.limit, 2),
+            "maxConcurrency": self.concurrency.maximum,
+            "active": self.concurrency.active,
+            "waiting": self.concurrency.waiting,
+            "pacing": self.pacing,
+            "maxWaiting": self.max_waiting,
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "pacedSeconds": round(self.paced_seconds, 3),
+            "avgLatencySeconds": round(self._latency, 3) if self._latency is not None else None,
+        }
@@ -0,0 +1,103 @@
+"""
+Row Reconstruction - 여러 줄로 나뉜 거래 행 복원
+
+PDF 추출 시 한 거래가 두 줄 이상으로 나뉘는 경우(비고/시간이 다음 줄에 오는 경우 등)
+거래일자 컬럼에 날짜가 있는 행을 새 거래의 시작으로 보고, 이어지는 줄을 앞 거래에 합칩니다.
+- 텍스트 컬럼: 공백으로 이어 붙임 (날짜 컬럼의 시간도 "2024.07.01 13:22"처럼 붙음)
+- 숫자 컬럼(금액/잔액 등)에 값이 있는 줄은 이어지는 줄로 보지 않음 (합계 행이 금액을 바꾸지 않도록)
+- 이어지는 줄이 아닌 행(합계, 반복 헤더, 빈 행)은 그대로 두고 병합을 끊음
+
+행 목록을 한 번만 순회하며, 병합되지 않은 행은 복사하지 않고 원본 리스트를 그대로 사용합니다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from column_profile import is_date, is_number
+
+# 숫자 컬럼 판별에 사용할 행 수 / 숫자 비율
+PROFILE_ROWS = 200
+NUMERIC_COLUMN_RATIO = 0.8
+
+
+@dataclass
+class ReconstructedRows:
+    """복원된 행 (source_row_index[i]: rows[i]가 시작된 원본 행 인덱스)"""
+    rows: list[list[str]] = field(default_factory=list)
+    source_row_index: list[int] = field(default_factory=list)
+    merged_rows: int = 0  # 앞 거래에 합친 줄 수
+
+
+def numeric_columns(rows: list[list[str]], mapped: tuple[int, ...] = ()) -> frozenset[int]:
+    """숫자 컬럼 인덱스 (매핑된 금액/잔액 컬럼 + 샘플에서 비어 있지 않은 셀 대부분이 숫자인 컬럼)"""
+    sample = rows[:PROFILE_ROWS]
+    numeric = {i for i in mapped if i >= 0}
+    for column in range(max(map(len, sample), default=0)):
+        if column in numeric:
+            continue
+        cells = [row[column] for row in sample if column < len(row) and row[column] and not row[column].isspace()]
+        if cells and sum(map(is_number, cells)) >= len(cells) * NUMERIC_COLUMN_RATIO:
+            numeric.add(column)
+    return frozenset(numeric)
+
+
+def reconstruct_rows(
+    rows: list[list[str]],
+    date_column: int,
+    mapped_numeric: tuple[int, ...] = (),
+    start: int = 0,
+    header_row: Optional[list[str]] = None,
+) -> ReconstructedRows:
+    """rows[start:]의 이어지는 줄을 앞 거래 행에 병합
+
+    Args:
+        date_column: 거래일자 컬럼 인덱스 (날짜가 있으면 새 거래)
+        mapped_numeric: 매핑된 금액/잔액 컬럼 인덱스 (그 외 숫자 컬럼은 셀 내용으로 판별)
+        header_row: 데이터 중간에 반복되는 헤더 행 판별용
+    """
+    result = ReconstructedRows()
+    out_rows, sources = result.rows, result.source_row_index
+    numeric_order: Optional[tuple[int, ...]] = None  # 이어지는 줄 후보가 처음 나올 때 판별
+    current: Optional[list[str]] = None  # 병합 대상 (out_rows[-1])
+    copied = False                       # current가 원본 행의 복사본인지
+
+    for index in range(start, len(rows)):
+        row = rows[index]
+        width = len(row)
+        date = row[date_column] if date_column < width else None
+        if date and is_date(date):
+            current, copied = row, False
+            out_rows.append(row)
+            sources.append(index)
+            continue
+
+        continuation = current is not None and row != header_row
+        if continuation:
+            if numeric_order is None:
+                numeric = numeric_columns(rows[start:start + PROFILE_ROWS], mapped_numeric) - {date_column}
+                numeric_order = tuple(sorted(numeric))
+            for column in numeric_order:
+                if column < width and row[column] and not row[column].isspace():
+                    continuation = False
+                    break
+            else:
+                continuation = any(c and not c.isspace() for c in row)
+        if not continuation:
+            current = None
+            out_rows.append(row)
+            sources.append(index)
+            continue
+
+        if not copied:
+            # 처음 병합할 때 한 번만 복사 (원본 행은 수정하지 않음)
+            current = [c or "" for c in current]
+            out_rows[-1] = current
+            copied = True
+        if width > len(current):
+            current.extend([""] * (width - len(current)))
+        for column, value in enumerate(row):
+            if value and not value.isspace():
+                value = value.strip()
+                current[column] = f"{current[column]} {value}" if current[column] else value
+        result.merged_rows += 1
+    return result
@@ -0,0 +1,305 @@
+"""
+Shared Store - 워커 프로세스 간 공유 저장소 (SQLite WAL)
+
+멀티 워커(uvicorn --workers N) 실행 시 같은 호스트의 워커들이
+- 분석 결과 (한 워커에서 분석한 내역서가 다른 워커에서도 캐시 히트)
+- 진행 중 분석 임대(lease) (같은 키의 LLM 호출은 전체 워커에서 하나만)
+- 비동기 작업 상태 스냅샷, 템플릿 목록
+을 공유하도록 합니다.
+
+WAL 모드에서는 읽기가 쓰기를 막지 않으므로 조회 지연이 작습니다.
+임대는 만료 시각을 가지며, 보유 워커가 주기적으로 연장합니다. (워커가 죽으면 만료 후 다른 워커가 인수)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, expires_at REAL NOT NULL, snapshot TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS templates (id TEXT PRIMARY KEY, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+# 이 횟수의 쓰기마다 만료 항목 정리
+PURGE_EVERY_WRITES = 256
+
+
+class SharedStore:
+    """SQLite(WAL) 기반 프로세스 간 공유 저장소 (스레드별 연결)"""
+
+    def __init__(self, path: str, ttl_seconds: float = 86400):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _after_write(self) -> None:
+        self._writes += 1
+        if self._writes % PURGE_EVERY_WRITES == 0:
+            self.purge()
+
+    # 분석 결과
+
+    def get_result(self, key: str) -> Optional[dict]:
+        """저장된 결과 조회 (없거나 만료되면 None)"""
+        row = self._connect().execute("SELECT stored_at, value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        stored_at, value = row
+        if self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    def set_result(self, key: str, value: dict) -> None:
+        """결과 저장"""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO results (key, stored_at, value) VALUES (?, ?, ?)",
+            (key, time.time(), json.dumps(value, ensure_ascii=False)),
+        )
+        self._after_write()
+
+    # 진행 중 분석 임대
+
+    def acquire_lease(self, key: str, owner: str, lease_seconds: float) -> bool:
+        """임대 획득 (없거나 만료되었거나 이미 보유 중이면 성공)"""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] != owner and row[1] > now:
+                conn.execute("COMMIT")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, owner, now + lease_seconds),
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def renew_lease(self, key: str, owner: str, lease_seconds: float) -> bool:
+        """보유 중인 임대 연장"""
+        cursor = self._connect().execute(
+            "UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?",
+            (time.time() + lease_seconds, key, owner),
+        )
+        return cursor.rowcount > 0
+
+    def release_lease(self, key: str, owner: str) -> None:
+        """임대 반납"""
+        self._connect().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    # 비동기 작업 스냅샷
+
+    def put_job(self, job_id: str, snapshot: dict, expires_at: float) -> None:
+        """작업 상태 스냅샷 저장"""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO jobs (id, expires_at, snapshot) VALUES (?, ?, ?)",
+            (job_id, expires_at, json.dumps(snapshot, ensure_ascii=False)),
+        )
+        self._after_write()
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """작업 상태 스냅샷 조회 (만료되면 None)"""
+        row = self._connect().execute(
+            "SELECT snapshot FROM jobs WHERE id = ? AND expires_at > ?", (job_id, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # 템플릿 목록
+
+    def templates_version(self) -> int:
+        """템플릿 목록 변경 버전"""
+        row = self._connect().execute("SELECT value FROM meta WHERE name = 'templates_version'").fetchone()
+        return row[0] if row else 0
+
+    def update_templates(self, upserts: list[dict], removed_ids: list[str], replace: bool = False) -> int:
+        """템플릿 추가/변경/삭제 후 새 버전 반환"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if replace:
+                conn.execute("DELETE FROM templates")
+            conn.executemany("DELETE FROM templates WHERE id = ?", [(i,) for i in removed_ids])
+            conn.executemany(
+                "INSERT OR REPLACE INTO templates (id, record) VALUES (?, ?)",
+                [(str(t["id"]), json.dumps(t, ensure_ascii=False)) for t in upserts],
+            )
+            conn.execute(
+                "INSERT INTO meta (name, value) VALUES ('templates_version', 1) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+            )
+            version = conn.execute("SELECT value FROM meta WHERE name = 'templates_version'").fetchone()[0]
+            conn.execute("COMMIT")
+            return version
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def load_templates(self) -> tuple[int, list[dict]]:
+        """(버전, 전체 템플릿) 조회"""
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            version = self.templates_version()
+            records = [json.loads(r[0]) for r in conn.execute("SELECT record FROM templates")]
+        finally:
+            conn.execute("COMMIT")
+        return version, records
+
+    def purge(self) -> None:
+        """만료된 결과/임대/작업 삭제"""
+        now = time.time()
+        conn = self._connect()
+        if self.ttl_seconds > 0:
+            conn.execute("DELETE FROM results WHERE stored_at < ?", (now - self.ttl_seconds,))
+        conn.execute("DELETE FROM leases WHERE expires_at < ?", (now,))
+        conn.execute("DELETE FROM jobs WHERE expires_at < ?", (now,))
+
+    def stats(self) -> dict:
+        """저장소 통계"""
+        conn = self._connect()
+        return {
+            "path": self.path,
+            "results": conn.execute("SELECT COUNT(*) FROM results").fetchone()[0],
+            "leases": conn.execute("SELECT COUNT(*) FROM leases WHERE expires_at > ?", (time.time(),)).fetchone()[0],
+            "templatesVersion": self.templates_version(),
+        }
+
+
+class JobSnapshotWriter:
+    """작업 상태 스냅샷을 스레드에서 기록 (이벤트 루프를 막지 않음)
+
+    작업마다 기록 태스크 하나가 가장 최근 스냅샷만 순서대로 씁니다.
+    기록 중에 들어온 중간 스냅샷은 건너뛰므로 오래된 상태가 새 상태를 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, store: SharedStore, on_error: Optional[Callable[[BaseException], None]] = None):
+        self.store = store
+        self.on_error = on_error
+        self._pending: dict[str, tuple[dict, float]] = {}
+        self._writers: dict[str, asyncio.Task] = {}
+
+    def submit(self, job_id: str, snapshot: dict, expires_at: float) -> None:
+        """스냅샷 기록 예약 (이벤트 루프 안에서 호출)"""
+        self._pending[job_id] = (snapshot, expires_at)
+        if job_id not in self._writers:
+            self._writers[job_id] = asyncio.get_running_loop().create_task(self._drain(job_id))
+
+    async def _drain(self, job_id: str) -> None:
+        try:
+            while (pending := self._pending.pop(job_id, None)) is not None:
+                try:
+                    await asyncio.to_thread(self.store.put_job, job_id, *pending)
+                except Exception as e:
+                    if self.on_error is not None:
+                        self.on_error(e)
+        finally:
+            self._writers.pop(job_id, None)
+
+    async def flush(self) -> None:
+        """예약된 스냅샷을 모두 기록할 때까지 대기"""
+        while self._writers:
+            await asyncio.gather(*list(self._writers.values()), return_exceptions=True)
+
+
+class WorkerLeases:
+    """키 단위 워커 간 중복 실행 억제
+
+    임대를 얻은 워커만 분석을 실행하고, 나머지는 공유 저장소에 결과가 생길 때까지 기다립니다.
+    보유 워커가 결과 없이 끝나면(실패) 대기 중인 워커 하나가 임대를 얻어 직접 실행합니다.
+    """
+
+    def __init__(self, store: SharedStore, lease_seconds: float = 30.0, poll_interval: float = 0.2):
+        self.store = store
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.owner = f"{os.getpid()}-{os.urandom(4).hex()}"
+        self.acquired = 0
+        self.waited = 0
+        self.shared_hits = 0
+
+    async def _keep_alive(self, key: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(self.store.renew_lease, key, self.owner, self.lease_seconds)
+
+    async def do(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        lookup: Callable[[], Optional[T]],
+        cleanup: Optional[Callable[[], None]] = None,
+    ) -> T:
+        """임대를 얻으면 factory 실행, 아니면 다른 워커의 결과를 lookup으로 기다림
+
+        factory를 실행하지 않고 끝나면 cleanup을 호출합니다 (넘겨받은 임시 파일 삭제 등).
+        """
+        started = False
+        waiting = False
+        try:
+            while True:
+                if await asyncio.to_thread(self.store.acquire_lease, key, self.owner, self.lease_seconds):
+                    keep_alive = asyncio.create_task(self._keep_alive(key))
+                    try:
+                        # 직전 보유 워커가 결과를 저장하고 반납한 경우
+                        result = await asyncio.to_thread(lookup) if waiting else None
+                        if result is not None:
+                            self.shared_hits += 1
+                            return result
+                        self.acquired += 1
+                        started = True
+                        return await factory()
+                    finally:
+                        keep_alive.cancel()
+                        await asyncio.to_thread(self.store.release_lease, key, self.owner)
+
+                if not waiting:
+                    waiting = True
+                    self.waited += 1
+                result = await asyncio.to_thread(lookup)
+                if result is not None:
+                    self.shared_hits += 1
+                    return result
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            if not started and cleanup is not None:
+                cleanup()
+
+    def stats(self) -> dict:
+        """임대 통계"""
+        return {
+            "owner": self.owner,
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "sharedHits": self.shared_hits,
+        }
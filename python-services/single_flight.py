@@ -0,0 +1,60 @@
+"""
+Single Flight - 동일 요청의 진행 중 호출 공유
+
+같은 콘텐츠 키(파일 바이트 또는 헤더+샘플 해시)로 동시에 들어온 분석 요청이
+하나의 LLM 호출을 공유하도록 합니다.
+공유 호출은 모든 대기자가 취소(연결 종료)된 경우에만 취소됩니다.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class _Flight:
+    """진행 중인 공유 호출"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키 단위 진행 중 호출 병합"""
+
+    def __init__(self):
+        self._flights: dict[str, _Flight] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """키에 해당하는 호출이 진행 중이면 결과를 공유하고, 없으면 새로 시작"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: 대기자 하나의 취소가 공유 호출을 취소하지 않도록 함
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def stats(self) -> dict:
+        """병합 통계"""
+        return {
+            "inFlight": len(self._flights),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,108 @@
+"""
+Startup Profile - 시작 단계별 소요 시간 기록과 준비 상태
+
+서비스 시작 시 무거운 의존성 로드/초기화(워밍업)를 단계별로 실행하고 소요 시간을 기록합니다.
+- 모든 워밍업 단계가 끝나야 준비(ready) 상태가 됨 (/readyz)
+- 실패한 단계는 오류로 기록하고 계속 진행 (해당 기능은 첫 요청에서 다시 초기화)
+- 종료가 시작되면 다시 준비되지 않음 상태로 바뀜
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional
+
+
+@dataclass
+class StartupStep:
+    """시작 단계 기록"""
+    name: str
+    seconds: float
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "seconds": round(self.seconds, 4), "error": self.error}
+
+
+class StartupProfile:
+    """시작 단계 소요 시간 + 준비 상태"""
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.steps: list[StartupStep] = []
+        self.ready_seconds: Optional[float] = None  # 시작부터 준비 완료까지
+        self.draining = False
+        self._ready = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready and not self.draining
+
+    def record(self, name: str, seconds: float, error: Optional[BaseException] = None) -> None:
+        self.steps.append(StartupStep(name, seconds, f"{type(error).__name__}: {error}" if error else None))
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """동기 단계 측정 (예외는 기록 후 삼킴)"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(name, time.perf_counter() - t0, e)
+        else:
+            self.record(name, time.perf_counter() - t0)
+
+    @asynccontextmanager
+    async def async_step(self, name: str) -> AsyncIterator[None]:
+        """비동기 단계 측정 (예외는 기록 후 삼킴)"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(name, time.perf_counter() - t0, e)
+        else:
+            self.record(name, time.perf_counter() - t0)
+
+    def mark_ready(self) -> None:
+        self.ready_seconds = time.perf_counter() - self.started
+        self._ready = True
+
+    async def wait_ready(self, timeout: Optional[float] = None, interval: float = 0.05) -> bool:
+        """준비 완료까지 대기 (timeout 초과 시 False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.ready:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+        return True
+
+    def failed_steps(self) -> list[str]:
+        return [s.name for s in self.steps if s.error]
+
+    def to_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "draining": self.draining,
+            "readySeconds": round(self.ready_seconds, 4) if self.ready_seconds is not None else None,
+            "elapsedSeconds": round(time.perf_counter() - self.started, 4),
+            "failedSteps": self.failed_steps(),
+            "steps": [s.to_dict() for s in self.steps],
+        }
+
+    def format(self) -> str:
+        """사람이 읽는 표 (느린 단계부터)"""
+        lines = [f"[Startup] 준비 완료 {self.ready_seconds or 0:.3f}초 (pid {os.getpid()})"]
+        for s in sorted(self.steps, key=lambda s: s.seconds, reverse=True):
+            lines.append(f"  {s.seconds * 1000:>9.1f}ms  {s.name}" + (f"  ! {s.error}" if s.error else ""))
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """프로파일 출력 ("-"이면 표준 출력에 표, 그 외는 JSON 파일, {pid}는 프로세스 ID로 치환)"""
+        if path == "-":
+            print(self.format(), flush=True)
+            return
+        with open(path.replace("{pid}", str(os.getpid())), "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), **self.to_dict()}, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,170 @@
+"""
+Table Segments - 문서 안의 여러 테이블 분리와 로컬 분류
+
+한 문서(테이블 데이터 또는 PDF 텍스트 레이어)에 들어 있는 여러 테이블을 나누고
+거래내역 / 요약 / 계좌정보 / 기타로 분류합니다. (LLM 미사용)
+다중 테이블 분석에서는 거래내역 테이블만 LLM으로 보냅니다.
+
+테이블 경계:
+- 거래내역 헤더 행 (표준 필드 3개 이상 + 거래일자)
+- 빈 행 다음의 첫 행 (새 테이블의 헤더로 간주)
+- 같은 헤더가 다시 나오면 (페이지 머리글) 새 테이블로 보지 않고 건너뜀
+- 거래내역 테이블 끝의 날짜 없는 행(합계, 다음 계좌 정보 등)은 별도 블록으로 분리
+
+행 번호는 column_mapper와 같이 headers를 0번 행, rows[i]를 i+1번 행으로 봅니다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from column_profile import is_date, is_number
+from pdf_pages import MIN_HEADER_FIELDS, score_header_line
+
+TRANSACTIONS = "transactions"
+SUMMARY = "summary"
+ACCOUNT_INFO = "account_info"
+OTHER = "other"
+
+# 헤더 없이 날짜+금액 행만으로 거래내역으로 볼 최소 비율
+MIN_TRANSACTION_ROW_RATIO = 0.6
+
+_SUMMARY_KEYWORDS = ("합계", "소계", "총계", "누계", "월계", "건수", "요약", "집계", "총입금", "총출금", "총액")
+_ACCOUNT_KEYWORDS = (
+    "계좌번호", "예금주", "고객명", "성명", "조회기간", "조회일", "상품명", "계좌명", "발급일", "카드번호", "신규일",
+)
+
+
+@dataclass
+class TableSegment:
+    """문서 안의 테이블 하나"""
+    index: int
+    headers: list[str]
+    rows: list[list[str]]
+    row_start: int = 0                  # 헤더 행 번호 (테이블 입력 기준)
+    row_pages: list[int] = field(default_factory=list)  # PDF: rows[i]가 나온 페이지
+    header_page: Optional[int] = None   # PDF: 헤더가 있는 페이지
+    caption: Optional[str] = None       # 테이블 바로 위 텍스트 (계좌번호, 섹션 제목 등)
+    kind: str = OTHER
+    reason: str = ""
+
+    @property
+    def row_end(self) -> int:
+        """마지막 행 번호"""
+        return self.row_start + len(self.rows)
+
+    @property
+    def page_start(self) -> Optional[int]:
+        if self.header_page is not None:
+            return self.header_page
+        return self.row_pages[0] if self.row_pages else None
+
+    @property
+    def page_end(self) -> Optional[int]:
+        return self.row_pages[-1] if self.row_pages else self.header_page
+
+
+def is_transaction_header(cells: list[str]) -> bool:
+    """거래내역 헤더 행 여부"""
+    score, has_date = score_header_line(" ".join(c for c in cells if c))
+    return has_date and score >= MIN_HEADER_FIELDS
+
+
+def _has_date(row: list[str]) -> bool:
+    return any(is_date(c) for c in row if c)
+
+
+def _keyword_hits(texts: list[str], keywords: tuple[str, ...]) -> int:
+    joined = "".join(t.replace(" ", "") for t in texts)
+    return sum(1 for k in keywords if k in joined)
+
+
+def classify_table(headers: list[str], rows: list[list[str]]) -> tuple[str, str]:
+    """테이블 종류와 판단 근거 (거래내역/요약/계좌정보/기타)"""
+    if headers and is_transaction_header(headers):
+        return TRANSACTIONS, "거래내역 헤더"
+    if rows:
+        transaction_rows = sum(
+            1 for row in rows if _has_date(row) and any(is_number(c) for c in row if c and not is_date(c))
+        )
+        if len(rows) >= 2 and transaction_rows / len(rows) >= MIN_TRANSACTION_ROW_RATIO:
+            return TRANSACTIONS, f"날짜+금액 행 {transaction_rows}/{len(rows)}"
+
+    texts = [*headers, *(c for row in rows for c in row[:2])]
+    account_hits = _keyword_hits(texts, _ACCOUNT_KEYWORDS)
+    summary_hits = _keyword_hits(texts, _SUMMARY_KEYWORDS)
+    if account_hits and account_hits >= summary_hits:
+        return ACCOUNT_INFO, f"계좌정보 키워드 {account_hits}개"
+    if summary_hits:
+        return SUMMARY, f"요약 키워드 {summary_hits}개"
+    return OTHER, "거래내역 헤더/날짜 행 없음"
+
+
+def trailing_rows_without_date(rows: list[list[str]]) -> int:
+    """끝에서부터 날짜가 없는 연속 행 수 (날짜 행이 하나도 없으면 0)"""
+    count = 0
+    for row in reversed(rows):
+        if _has_date(row):
+            return count
+        count += 1
+    return 0
+
+
+def caption_of(rows: list[list[str]]) -> Optional[str]:
+    """블록 마지막 비어 있지 않은 행 텍스트 (다음 테이블의 제목/계좌 정보)"""
+    for row in reversed(rows):
+        text = " ".join(c for c in row if c).strip()
+        if text:
+            return text
+    return None
+
+
+def split_table(headers: list[str], rows: list[list[str]]) -> list[TableSegment]:
+    """테이블 데이터 하나를 여러 테이블로 분리하고 분류
+
+    헤더가 없는 블록(빈 행으로 끝나는 블록 등)은 headers=[]로 반환됩니다.
+    """
+    segments: list[TableSegment] = []
+    current = TableSegment(0, list(headers), [], row_start=0)
+    after_blank = False
+
+    def close(segment: TableSegment) -> None:
+        if not segment.headers and not any(any(r) for r in segment.rows):
+            return
+        if segment.headers and is_transaction_header(segment.headers):
+            # 끝의 날짜 없는 행은 합계/다음 계좌 정보로 보고 분리
+            tail = trailing_rows_without_date(segment.rows)
+            if tail:
+                block = TableSegment(0, [], segment.rows[-tail:], row_start=segment.row_end - tail)
+                segment.rows = segment.rows[:-tail]
+                segments.append(segment)
+                segments.append(block)
+                return
+        segments.append(segment)
+
+    for number, row in enumerate(rows, start=1):
+        if not any(c.strip() for c in row):
+            after_blank = True
+            continue
+        if current.headers and is_transaction_header(current.headers) and row == current.headers:
+            # 반복 헤더
+            continue
+        if after_blank or is_transaction_header(row):
+            close(current)
+            current = TableSegment(0, list(row), [], row_start=number)
+            after_blank = False
+            continue
+        current.rows.append(row)
+    close(current)
+    return finalize_segments(segments)
+
+
+def finalize_segments(segments: list[TableSegment]) -> list[TableSegment]:
+    """번호 부여, 분류, 바로 앞 블록 텍스트를 캡션으로 연결"""
+    previous: Optional[TableSegment] = None
+    for index, segment in enumerate(segments):
+        segment.index = index
+        segment.kind, segment.reason = classify_table(segment.headers, segment.rows)
+        if segment.caption is None and previous is not None and previous.kind != TRANSACTIONS:
+            segment.caption = caption_of([previous.headers, *previous.rows])
+        previous = segment
+    return segments
@@ -0,0 +1,240 @@
+"""
+Template Index - 거래내역서 템플릿 지문(fingerprint) 인덱스
+
+TransactionTemplate의 컬럼 헤더를 문자 n-gram 집합으로 만들고 MinHash 서명을 저장합니다.
+조회 시 전체 템플릿 서명 행렬과 한 번에 비교해 후보를 고른 뒤,
+후보만 정확한 Jaccard 유사도와 identifiers 포함 비율로 점수를 매깁니다.
+(template-classifier.ts의 Layer 2 LLM 유사도 매칭 대체)
+
+템플릿 변경 시 바뀐 항목만 서명을 다시 계산합니다.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from column_mapper import normalize_header
+
+# MinHash 서명 길이
+NUM_PERMUTATIONS = 128
+# 헤더 문자 n-gram 크기
+NGRAM_SIZE = 2
+# 정확한 점수를 계산할 후보 수 (top_k 배수)
+CANDIDATE_FACTOR = 4
+# identifiers가 있을 때 최종 점수에서 헤더 유사도의 비중
+HEADER_WEIGHT = 0.7
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 고정 시드의 해시 계수 (프로세스/재시작 간 서명 호환)
+_rng = np.random.default_rng(20240701)
+_HASH_A = _rng.integers(1, 2**63 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.integers(0, 2**63 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def normalize_text(text: str) -> str:
+    """공백 제거 + 소문자 (template-classifier.ts의 normalizeText와 동일)"""
+    return _WHITESPACE_RE.sub("", str(text or "")).lower()
+
+
+def header_shingles(headers: Iterable[str]) -> frozenset[str]:
+    """헤더 목록 → 문자 n-gram 집합 (헤더 경계 표시 포함)"""
+    shingles = set()
+    for header in headers:
+        normalized = normalize_header(header)
+        if not normalized:
+            continue
+        marked = f"^{normalized}$"
+        for i in range(len(marked) - NGRAM_SIZE + 1):
+            shingles.add(marked[i:i + NGRAM_SIZE])
+    return frozenset(shingles)
+
+
+def minhash_signature(shingles: Iterable[str]) -> np.ndarray:
+    """n-gram 집합의 MinHash 서명 (빈 집합은 최댓값으로 채움)"""
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype=np.uint64,
+    )
+    if hashes.size == 0:
+        return np.full(NUM_PERMUTATIONS, np.iinfo(np.uint64).max, dtype=np.uint64)
+    # uint64 곱셈은 2^64 모듈러로 순환 (multiply-shift 해시)
+    permuted = _HASH_A[:, None] * hashes[None, :] + _HASH_B[:, None]
+    return permuted.min(axis=1)
+
+
+def schema_headers(column_schema: Optional[dict]) -> list[str]:
+    """columnSchema.columns.*.header 목록"""
+    columns = (column_schema or {}).get("columns") or {}
+    return [c["header"] for c in columns.values() if isinstance(c, dict) and c.get("header")]
+
+
+@dataclass
+class IndexedTemplate:
+    """인덱스에 저장된 템플릿"""
+    id: str
+    name: str
+    bank_name: Optional[str]
+    identifiers: list[str]
+    priority: int
+    shingles: frozenset[str]
+    signature: np.ndarray
+    digest: str
+
+
+@dataclass
+class TemplateMatch:
+    """템플릿 매칭 결과"""
+    id: str
+    name: str
+    bank_name: Optional[str]
+    score: float
+    header_score: float
+    identifier_score: Optional[float]
+    priority: int
+
+
+class TemplateIndex:
+    """MinHash 서명 행렬 기반 템플릿 인덱스 (스레드 안전)"""
+
+    def __init__(self):
+        self._templates: dict[str, IndexedTemplate] = {}
+        self._lock = threading.Lock()
+        self._matrix = np.empty((0, NUM_PERMUTATIONS), dtype=np.uint64)
+        self._order: list[IndexedTemplate] = []
+        self._dirty = False
+        self.version = 0
+
+    @staticmethod
+    def _digest(template: dict) -> str:
+        payload = {
+            "name": template.get("name"),
+            "bankName": template.get("bankName"),
+            "identifiers": template.get("identifiers") or [],
+            "headers": schema_headers(template.get("columnSchema")),
+            "priority": template.get("priority", 0),
+        }
+        encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def refresh(self, templates: list[dict], removed_ids: Iterable[str] = (), replace: bool = False) -> dict:
+        """템플릿 추가/변경/삭제 반영 (내용이 같은 템플릿은 서명 재계산 생략)
+
+        Args:
+            templates: TransactionTemplate dict 목록 (isActive=false는 제거)
+            removed_ids: 삭제할 템플릿 id
+            replace: True면 templates에 없는 기존 항목도 제거
+        """
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        prepared: dict[str, IndexedTemplate] = {}
+        inactive: set[str] = set(removed_ids)
+
+        for template in templates:
+            template_id = str(template["id"])
+            if not template.get("isActive", True):
+                inactive.add(template_id)
+                continue
+            digest = self._digest(template)
+            existing = self._templates.get(template_id)
+            if existing is not None and existing.digest == digest:
+                prepared[template_id] = existing
+                continue
+            shingles = header_shingles(schema_headers(template.get("columnSchema")))
+            prepared[template_id] = IndexedTemplate(
+                id=template_id,
+                name=template.get("name", ""),
+                bank_name=template.get("bankName"),
+                identifiers=[i for i in template.get("identifiers") or [] if i],
+                priority=int(template.get("priority", 0) or 0),
+                shingles=shingles,
+                signature=minhash_signature(shingles),
+                digest=digest,
+            )
+
+        with self._lock:
+            if replace:
+                inactive |= set(self._templates) - set(prepared)
+            for template_id in inactive:
+                if self._templates.pop(template_id, None) is not None:
+                    counts["removed"] += 1
+            for template_id, entry in prepared.items():
+                existing = self._templates.get(template_id)
+                if existing is None:
+                    counts["added"] += 1
+                elif existing is entry:
+                    counts["unchanged"] += 1
+                    continue
+                else:
+                    counts["updated"] += 1
+                self._templates[template_id] = entry
+
+            if counts["added"] or counts["updated"] or counts["removed"]:
+                self._dirty = True
+                self.version += 1
+            counts["total"] = len(self._templates)
+            counts["version"] = self.version
+        return counts
+
+    def _snapshot(self) -> tuple[np.ndarray, list[IndexedTemplate]]:
+        """서명 행렬 (변경 후 첫 조회 시에만 다시 쌓음)"""
+        with self._lock:
+            if self._dirty:
+                self._order = list(self._templates.values())
+                self._matrix = (
+                    np.vstack([t.signature for t in self._order])
+                    if self._order
+                    else np.empty((0, NUM_PERMUTATIONS), dtype=np.uint64)
+                )
+                self._dirty = False
+            return self._matrix, self._order
+
+    def match(self, headers: list[str], page_text: Optional[str] = None, top_k: int = 5) -> list[TemplateMatch]:
+        """헤더(+ 페이지 텍스트)와 가장 유사한 템플릿 top_k
+
+        MinHash 추정치로 후보를 좁힌 뒤 정확한 Jaccard로 다시 점수를 매깁니다.
+        """
+        matrix, order = self._snapshot()
+        if not order or top_k <= 0:
+            return []
+
+        shingles = header_shingles(headers)
+        estimates = (matrix == minhash_signature(shingles)[None, :]).mean(axis=1)
+        candidate_count = min(len(order), top_k * CANDIDATE_FACTOR)
+        candidates = np.argpartition(-estimates, candidate_count - 1)[:candidate_count]
+
+        search_text = normalize_text(" ".join([page_text or ""] + list(headers)))
+        matches = []
+        for i in candidates:
+            template = order[int(i)]
+            union = len(shingles | template.shingles)
+            header_score = len(shingles & template.shingles) / union if union else 0.0
+
+            identifier_score = None
+            score = header_score
+            if page_text and template.identifiers:
+                found = sum(1 for ident in template.identifiers if normalize_text(ident) in search_text)
+                identifier_score = found / len(template.identifiers)
+                score = HEADER_WEIGHT * header_score + (1 - HEADER_WEIGHT) * identifier_score
+
+            matches.append(TemplateMatch(
+                id=template.id,
+                name=template.name,
+                bank_name=template.bank_name,
+                score=round(score, 4),
+                header_score=round(header_score, 4),
+                identifier_score=None if identifier_score is None else round(identifier_score, 4),
+                priority=template.priority,
+            ))
+
+        matches.sort(key=lambda m: (-m.score, -m.priority))
+        return matches[:top_k]
+
+    def stats(self) -> dict:
+        """인덱스 통계"""
+        with self._lock:
+            return {"templates": len(self._templates), "version": self.version}
@@ -0,0 +1,136 @@
+"""
+Analysis Cache 테스트
+
+캐시 키 정규화, 메모리 LRU 제거와 TTL 만료(가짜 시계), 인스턴스 간 디스크 유지,
+히트/미스 카운터와 bypassCache 조회 생략을 확인
+"""
+
+import asyncio
+import os
+import types
+
+import pytest
+
+import analysis_cache
+from analysis_cache import AnalysisCache, pdf_cache_key, table_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(analysis_cache, "time", types.SimpleNamespace(time=fake))
+    return fake
+
+
+def result(name: str) -> dict:
+    return {"success": True, "reasoning": name}
+
+
+def test_cache_keys():
+    assert pdf_cache_key(b"%PDF-1.4") == pdf_cache_key(b"%PDF-1.4") != pdf_cache_key(b"%PDF-1.5")
+    # 공백 차이는 같은 키
+    assert table_cache_key(["거래 일자", "금액"], [["2024.07.01", " 1,000 "]]) == table_cache_key(
+        [" 거래  일자", "금액"], [["2024.07.01", "1,000"]]
+    )
+    assert table_cache_key(["거래일자"], [["a"]]) != table_cache_key(["거래일자"], [["b"]])
+
+
+def test_lru_eviction(clock):
+    cache = AnalysisCache(max_entries=2)
+    cache.set("a", result("a"))
+    cache.set("b", result("b"))
+    assert cache.get("a") == result("a")  # a를 최근 사용으로
+    cache.set("c", result("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") == result("a")
+    assert cache.get("c") == result("c")
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.parametrize("ttl, elapsed, hit", [(10, 10, True), (10, 11, False), (0, 10 ** 6, True)])
+def test_ttl_expiry(clock, ttl, elapsed, hit):
+    cache = AnalysisCache(ttl_seconds=ttl)
+    cache.set("k", result("k"))
+    clock.now += elapsed
+    assert (cache.get("k") is not None) is hit
+    assert cache.stats()["entries"] == (1 if hit else 0)
+
+
+def test_disk_persists_across_instances(tmp_path, clock):
+    first = AnalysisCache(disk_dir=str(tmp_path))
+    first.set("k", result("k"))
+
+    # 재시작 후 새 인스턴스: 디스크에서 읽고 메모리에 올림
+    second = AnalysisCache(disk_dir=str(tmp_path))
+    assert second.get("k") == result("k")
+    assert second.get("k") == result("k")
+    stats = second.stats()
+    assert (stats["hits"], stats["diskHits"], stats["misses"], stats["entries"]) == (2, 1, 0, 1)
+
+
+def test_disk_expired_and_corrupt_entries_removed(tmp_path, clock):
+    cache = AnalysisCache(ttl_seconds=10, disk_dir=str(tmp_path))
+    cache.set("old", result("old"))
+    cache.set("broken", result("broken"))
+    with open(cache._disk_path("broken"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+    clock.now += 11
+
+    restarted = AnalysisCache(ttl_seconds=10, disk_dir=str(tmp_path))
+    assert restarted.get("old") is None
+    assert restarted.get("broken") is None
+    assert os.listdir(tmp_path) == []
+    assert restarted.stats()["misses"] == 2
+
+
+def test_async_get_set_use_disk(tmp_path, clock):
+    async def main():
+        await AnalysisCache(disk_dir=str(tmp_path)).aset("k", result("k"))
+        cache = AnalysisCache(disk_dir=str(tmp_path))
+        return await cache.aget("k"), await cache.aget("missing"), cache
+
+    value, missing, cache = asyncio.run(main())
+    assert (value, missing) == (result("k"), None)
+    assert (cache.disk_hits, cache.hits, cache.misses) == (1, 1, 1)
+
+
+def test_counters_and_hit_ratio(clock):
+    cache = AnalysisCache()
+    assert cache.stats()["hitRatio"] == 0.0
+    cache.get("k")
+    cache.set("k", result("k"))
+    cache.get("k")
+    cache.get("k")
+    cache.clear()
+    cache.get("k")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hitRatio"], stats["entries"]) == (2, 2, 0.5, 0)
+
+
+def test_bypass_skips_lookup(monkeypatch):
+    import column_analyzer_service as service
+
+    cache = AnalysisCache()
+    monkeypatch.setattr(service, "analysis_cache", cache)
+    stored = service.create_error_result(ValueError("x")).model_copy(update={"success": True, "confidence": 0.95})
+
+    async def main():
+        await service.store_cached_result("k", stored)
+        return (
+            await service.get_cached_result("k", bypass_cache=True),
+            await service.get_cached_result("k", bypass_cache=False),
+        )
+
+    bypassed, cached = asyncio.run(main())
+    assert bypassed is None
+    assert cached == stored
+    # 우회한 조회는 히트/미스로 세지 않음
+    assert (cache.hits, cache.misses) == (1, 0)
@@ -0,0 +1,127 @@
+"""
+Balance Check 테스트
+
+잔액 연속성 일치율(반올림 허용 오차, 빈 잔액 제외)과 정렬 방향 판별,
+입출금 컬럼 뒤바뀜/구분 방식 오류를 잔액으로 보정하는지와 동점일 때 원래 매핑을 유지하는지 확인
+"""
+
+import numpy as np
+import pytest
+
+from balance_check import balance_match_rate, check_balance
+
+NAN = float("nan")
+
+
+@pytest.mark.parametrize(
+    "amount, balance, expected",
+    [
+        # 과거→최근: balance[i] = balance[i-1] + amount[i]
+        ([1000, -300, 500], [1000, 700, 1200], (1.0, 2, "ascending")),
+        # 최근→과거: balance[i] = balance[i+1] + amount[i]
+        ([500, -300, 1000], [1200, 700, 1000], (1.0, 2, "descending")),
+        # 반올림 오차 허용 (0.5원)
+        ([1000, 100.4], [1000, 1100], (1.0, 1, "ascending")),
+        ([1000, 100.6], [1000, 1100], (0.0, 1, "ascending")),
+        # 한 행만 어긋남
+        ([1000, -300, 500, 100], [1000, 700, 1200, 9999], (0.6667, 3, "ascending")),
+        # 양방향 일치율이 같으면 ascending
+        ([0, 0, 0], [500, 500, 500], (1.0, 2, "ascending")),
+        # 잔액 없는 행은 비교에서 제외
+        ([1000, -300, 500], [1000, NAN, 1200], (0.0, 0, "ascending")),
+        ([1000, -300, 500, 200], [1000, 700, NAN, 1400], (1.0, 1, "ascending")),
+        ([1000], [1000], (0.0, 0, "ascending")),
+    ],
+)
+def test_balance_match_rate(amount, balance, expected):
+    rate, compared, order = balance_match_rate(np.array(amount, dtype=np.float64), np.array(balance, dtype=np.float64))
+    assert (round(rate, 4), compared, order) == expected
+
+
+SEPARATE_HEADERS = ["거래일자", "입금", "출금", "잔액"]
+SEPARATE_ROWS = [
+    ["2024-07-01", "10,000", "", "10,000"],
+    ["2024-07-02", "", "3,000", "7,000"],
+    ["2024-07-03", "", "2,000", "5,000"],
+    ["2024-07-04", "1,500", "", "6,500"],
+]
+TYPE_HEADERS = ["거래일자", "구분", "금액", "잔액"]
+TYPE_ROWS = [
+    ["2024-07-01", "+", "10,000", "10,000"],
+    ["2024-07-02", "-", "3,000", "7,000"],
+    ["2024-07-03", "-", "2,000", "5,000"],
+    ["2024-07-04", "+", "1,500", "6,500"],
+]
+SEPARATE = {"입금금액": "입금", "출금금액": "출금"}
+SWAPPED = {"입금금액": "출금", "출금금액": "입금"}
+TYPE = {"구분": "구분", "금액": "금액"}
+SIGNED_ROWS = [
+    ["2024-07-01", "입금", "+10,000", "10,000"],
+    ["2024-07-02", "출금", "-3,000", "7,000"],
+    ["2024-07-03", "출금", "-2,000", "5,000"],
+    ["2024-07-04", "입금", "1,500", "6,500"],
+]
+
+# (설명, 헤더, 행, 구분 방식, 매핑, 기대 best 레이블, 기대 정렬 방향, 보정 여부)
+CHECK_CASES = [
+    ("correct", SEPARATE_HEADERS, SEPARATE_ROWS, "separate_columns", SEPARATE, "as_is", "ascending", False),
+    ("descending", SEPARATE_HEADERS, SEPARATE_ROWS[::-1], "separate_columns", SEPARATE, "as_is", "descending", False),
+    ("swapped", SEPARATE_HEADERS, SEPARATE_ROWS, "separate_columns", SWAPPED, "swapped_columns", "ascending", True),
+    ("swapped_descending", SEPARATE_HEADERS, SEPARATE_ROWS[::-1],
+     "separate_columns", SWAPPED, "swapped_columns", "descending", True),
+    ("unsigned_amount", TYPE_HEADERS, TYPE_ROWS, "amount_sign", TYPE, "method:sign_in_type", "ascending", True),
+    # sign_in_type / type_column 모두 "+"를 입금으로 보므로 동점 → 원래 매핑 유지
+    ("tie_type_column", TYPE_HEADERS, TYPE_ROWS, "type_column", TYPE, "as_is", "ascending", False),
+    ("tie_sign_in_type", TYPE_HEADERS, TYPE_ROWS, "sign_in_type", TYPE, "as_is", "ascending", False),
+    # 모든 해석이 1.0이 아니더라도 동점이면 as_is
+    ("tie_amount_sign", TYPE_HEADERS, SIGNED_ROWS, "amount_sign", TYPE, "as_is", "ascending", False),
+    ("keyword_type", TYPE_HEADERS, SIGNED_ROWS, "sign_in_type", TYPE, "method:type_column", "ascending", True),
+]
+
+
+@pytest.mark.parametrize(
+    "headers, rows, method, mapping, best, order, corrected",
+    [case[1:] for case in CHECK_CASES],
+    ids=[case[0] for case in CHECK_CASES],
+)
+def test_check_balance(analysis, headers, rows, method, mapping, best, order, corrected):
+    candidate = analysis(method, **mapping)
+    result = check_balance(headers, rows, candidate)
+    assert result.best.label == best
+    assert result.best.match_rate == 1.0
+    assert result.best.order == order
+    assert result.corrected is corrected
+    assert result.original.analysis is candidate
+
+
+def test_tie_keeps_original_when_nothing_matches(analysis):
+    rows = [["2024-07-01", "1,000", "", "50"], ["2024-07-02", "", "1,000", "60"], ["2024-07-03", "5", "", "70"]]
+    result = check_balance(SEPARATE_HEADERS, rows, analysis("separate_columns", **SEPARATE))
+    assert [c.label for c in result.candidates] == ["as_is", "swapped_columns"]
+    assert [c.match_rate for c in result.candidates] == [0.0, 0.0]
+    assert result.best is result.original
+    assert not result.corrected
+
+
+def test_corrected_analysis_records_detection_method(analysis):
+    result = check_balance(TYPE_HEADERS, TYPE_ROWS, analysis("amount_sign", **TYPE))
+    detection = result.best.analysis["transactionTypeDetection"]
+    assert detection["method"] == "sign_in_type"
+    assert "잔액 검증" in detection["details"]
+
+
+@pytest.mark.parametrize(
+    "rows, column_mapping",
+    [
+        # 잔액 컬럼 매핑 없음
+        (SEPARATE_ROWS, {"거래일자": "거래일자"}),
+        # 잔액을 비교할 수 있는 행 없음
+        ([[r[0], r[1], r[2], ""] for r in SEPARATE_ROWS], None),
+        ([], None),
+    ],
+)
+def test_not_checkable(analysis, rows, column_mapping):
+    candidate = analysis("separate_columns", **SEPARATE)
+    if column_mapping is not None:
+        candidate["columnMapping"] = column_mapping
+    assert check_balance(SEPARATE_HEADERS, rows, candidate) is None
@@ -0,0 +1,217 @@
+"""
+Job Queue 테스트
+
+대기열 초과 거절, 진행 이벤트와 결과, 결과 TTL 만료(가짜 시계),
+close() 시 대기 중 작업 정리, events(after_seq)의 Last-Event-ID 재연결을 확인
+"""
+
+import asyncio
+import types
+
+import pytest
+
+import job_queue
+from job_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, QueueFullError, sse_event
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(job_queue, "time", types.SimpleNamespace(time=fake))
+    return fake
+
+
+class Runner:
+    """release될 때까지 실행 중으로 남는 작업"""
+
+    def __init__(self, result: dict = None, error: Exception = None):
+        self.result = result or {"success": True}
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self, progress) -> dict:
+        progress("llm", model="fast-model")
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def stages(job) -> list[str]:
+    return [e.stage for e in job.events]
+
+
+def test_queue_full_rejects():
+    async def main():
+        queue = JobQueue(workers=1, max_queue=1)
+        queue.start()
+        running, queued = Runner(), Runner()
+        first = queue.submit("table", running)
+        await settle()
+        second = queue.submit("table", queued)
+        with pytest.raises(QueueFullError) as info:
+            queue.submit("table", Runner())
+        stats = queue.stats()
+
+        running.release.set()
+        queued.release.set()
+        while not second.done:
+            await settle()
+        await queue.close()
+        return first, second, info.value, stats, queue
+
+    first, second, error, stats, queue = asyncio.run(main())
+    assert error.max_size == 1
+    assert (stats["running"], stats["queued"], stats["submitted"], stats["rejected"]) == (1, 1, 2, 1)
+    assert (first.status, second.status) == (SUCCEEDED, SUCCEEDED)
+    assert queue.stats()["succeeded"] == 2
+
+
+def test_submit_before_start_raises():
+    with pytest.raises(RuntimeError):
+        JobQueue().submit("table", Runner())
+
+
+@pytest.mark.parametrize(
+    "error, status, last_stage",
+    [(None, SUCCEEDED, "completed"), (ValueError("LLM 응답 오류"), FAILED, "failed")],
+)
+def test_job_progress_events(error, status, last_stage):
+    changes = []
+
+    async def main():
+        queue = JobQueue(workers=1, on_change=lambda job: changes.append(job.stage))
+        queue.start()
+        runner = Runner(error=error)
+        job = queue.submit("pdf", runner, fileName="statement.pdf")
+        await settle()
+        assert (job.status, job.stage) == (RUNNING, "llm")
+        runner.release.set()
+        await settle()
+        await queue.close()
+        return job
+
+    job = asyncio.run(main())
+    assert stages(job) == [QUEUED, RUNNING, "llm", last_stage]
+    assert [e.seq for e in job.events] == [1, 2, 3, 4]
+    assert job.events[0].info == {"queuePosition": 1, "fileName": "statement.pdf"}
+    assert job.status == status
+    assert changes == stages(job)
+    if error is None:
+        assert job.result == {"success": True}
+    else:
+        assert (job.result, job.error) == (None, "LLM 응답 오류")
+
+
+@pytest.mark.parametrize("ttl, elapsed, kept", [(10, 10, True), (10, 11, False), (0, 10 ** 6, True)])
+def test_result_ttl_expiry(clock, ttl, elapsed, kept):
+    async def main():
+        queue = JobQueue(workers=1, result_ttl_seconds=ttl)
+        queue.start()
+        runner = Runner()
+        runner.release.set()
+        job = queue.submit("table", runner)
+        await settle()
+        assert job.done
+        assert queue.expires_at(job) == (clock.now + ttl if ttl > 0 else None)
+        clock.now += elapsed
+        found = queue.get(job.id)
+        await queue.close()
+        return found, queue
+
+    found, queue = asyncio.run(main())
+    assert (found is not None) is kept
+    assert queue.stats()["retained"] == (1 if kept else 0)
+
+
+def test_close_cleans_up_queued_jobs():
+    cleaned = []
+
+    async def main():
+        queue = JobQueue(workers=1, max_queue=5)
+        queue.start()
+        running = queue.submit("pdf", Runner(), cleanup=lambda: cleaned.append("running"))
+        await settle()
+        queued = [
+            queue.submit("pdf", Runner(), cleanup=lambda i=i: cleaned.append(f"queued-{i}"))
+            for i in range(2)
+        ]
+        await queue.close()
+        return running, queued
+
+    running, queued = asyncio.run(main())
+    # 실행되지 못한 작업만 자원 정리 (실행 중이던 작업의 자원은 실행 함수가 소유)
+    assert cleaned == ["queued-0", "queued-1"]
+    assert [j.status for j in queued] == [FAILED, FAILED]
+    assert all("취소" in j.error for j in queued)
+    assert (running.status, stages(running)[-1]) == (FAILED, "failed")
+    assert "중단" in running.error
+    assert running.cleanup is None
+
+
+def test_events_resume_after_last_event_id():
+    async def main():
+        queue = JobQueue(workers=1)
+        queue.start()
+        runner = Runner()
+        job = queue.submit("table", runner)
+        await settle()
+
+        # 진행 중 구독: 지금까지의 이벤트를 받은 뒤 새 이벤트를 기다림
+        live = []
+
+        async def subscribe():
+            async for event in queue.events(job):
+                live.append(event.seq)
+
+        subscriber = asyncio.create_task(subscribe())
+        await settle()
+        assert live == [1, 2, 3]
+        runner.release.set()
+        await asyncio.wait_for(subscriber, 1)
+
+        # 재연결: Last-Event-ID 이후만 재전송하고 완료된 작업이면 바로 종료
+        resumed = [event async for event in queue.events(job, after_seq=2)]
+        finished = [event async for event in queue.events(job, after_seq=len(job.events))]
+        await queue.close()
+        return live, resumed, finished
+
+    live, resumed, finished = asyncio.run(main())
+    assert live == [1, 2, 3, 4]
+    assert [(e.seq, e.stage) for e in resumed] == [(3, "llm"), (4, "completed")]
+    assert finished == []
+    assert sse_event(resumed[0]).decode("utf-8").startswith("id: 3\nevent: progress\ndata: {\"seq\":3,")
+
+
+def test_events_keepalive(monkeypatch):
+    monkeypatch.setattr(job_queue, "SSE_KEEPALIVE_SECONDS", 0.01)
+
+    async def main():
+        queue = JobQueue(workers=1)
+        queue.start()
+        runner = Runner()
+        job = queue.submit("table", runner)
+        received = []
+        async for event in queue.events(job):
+            received.append(event)
+            if event is None:
+                runner.release.set()
+        await queue.close()
+        return received
+
+    received = asyncio.run(main())
+    assert None in received
+    assert [e.stage for e in received if e is not None] == [QUEUED, RUNNING, "llm", "completed"]
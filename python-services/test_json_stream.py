@@ -0,0 +1,72 @@
+"""
+JSON Stream 테스트
+
+점진적 파서가 첫 번째 유효한 객체를 반환하는지, 조기 종료(stopped_early)를
+읽지 않은 조각이 남아 있을 때만 기록하는지 확인
+"""
+
+import asyncio
+
+import pytest
+
+from json_stream import JsonStreamError, parse_json_stream
+
+
+async def chunks(parts: list[str], delay: float = 0.0):
+    for part in parts:
+        if delay:
+            await asyncio.sleep(delay)
+        yield part
+
+
+def parse(parts: list[str], delay: float = 0.0, validate=None):
+    return asyncio.run(parse_json_stream(chunks(parts, delay), validate=validate))
+
+
+@pytest.mark.parametrize(
+    "parts, delay, expected",
+    [
+        # 한 번에 전체 응답을 주는 제공자 (LlmChat): 남은 조각이 없으므로 조기 종료 아님
+        (['{"a": 1} 설명 텍스트 {"b": 2}'], 0.0, False),
+        # 객체가 마지막 조각에서 완성
+        (['{"a"', ": 1}"], 0.01, False),
+        # 객체 완성 후에도 스트림이 이어짐
+        (['{"a"', ": 1}", " 설명", " 텍스트"], 0.01, True),
+        # 이미 받아 둔 다음 조각이 있음
+        (['{"a": 1}', " 설명"], 0.0, True),
+    ],
+)
+def test_stopped_early_only_with_unread_chunks(parts, delay, expected):
+    result, parser = parse(parts, delay)
+    assert result == {"a": 1}
+    assert parser.stopped_early is expected
+
+
+def test_long_prose_before_object():
+    result, parser = parse(["설명 " * 2000 + '```json\n{"a": [1, 2]}\n```'])
+    assert result == {"a": [1, 2]}
+
+
+def test_rejected_object_is_skipped():
+    def validate(obj):
+        if "b" not in obj:
+            raise ValueError("b 없음")
+
+    result, _ = parse(['{"a": 1} 다시: {"b": 2}'], validate=validate)
+    assert result == {"b": 2}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "{'a': 1}",
+        '{"a": 1,}',
+        '{a: 1}',
+        '{"a": [1}',
+        '{"a": 1',
+        "JSON 없음",
+    ],
+)
+def test_malformed(text):
+    with pytest.raises(JsonStreamError):
+        parse([text])
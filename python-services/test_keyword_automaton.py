@@ -0,0 +1,138 @@
+"""
+Keyword Automaton 테스트
+
+컴파일된 규칙 집합의 분류 결과가 rule-based-classifier.ts / important-transaction-detector.ts의
+거래별 순차 검사(naive)와 같은지 확인
+"""
+
+import random
+import re
+
+import pytest
+
+from keyword_automaton import (
+    AMOUNT_RANGE,
+    CREDITOR,
+    IMPORTANT_TRANSACTION_KEYWORDS,
+    KEYWORD,
+    AhoCorasick,
+    ClassificationRule,
+    CompiledRuleSet,
+    RuleSetCache,
+)
+
+WORDS = ["급여", "대출금", "상환", "카드", "이자", "압류", "실행", "송금", "보험", "통신", "Bank", "ATM"]
+
+
+def naive_classify(rules, memo, deposit, withdrawal, creditor_name):
+    """TS 구현과 같은 순서의 순차 검사 → (적용 규칙 id, 중요 거래 유형, 중요 거래 키워드)"""
+    def ranked(pattern_type):
+        return sorted((r for r in rules if r.pattern_type == pattern_type), key=lambda r: -r.confidence)
+
+    applied = None
+    if memo:
+        applied = next((r for r in ranked(KEYWORD) if r.pattern.lower() in memo.lower()), None)
+
+    amount = deposit if deposit is not None else withdrawal
+    if applied is None and amount:
+        for rule in ranked(AMOUNT_RANGE):
+            match = re.match(r"^(\d+)-(\d+)$", rule.pattern)
+            if match and int(match.group(1)) <= amount <= int(match.group(2)):
+                applied = rule
+                break
+
+    if applied is None and creditor_name:
+        applied = next((r for r in ranked(CREDITOR) if r.pattern.lower() in creditor_name.lower()), None)
+
+    important_type, keywords = None, []
+    if memo and memo.strip():
+        for kind, kind_keywords in IMPORTANT_TRANSACTION_KEYWORDS.items():
+            for keyword in kind_keywords:
+                if keyword.lower() in memo.lower():
+                    important_type = important_type or kind
+                    keywords.append(keyword)
+    return applied.id if applied else None, important_type, keywords
+
+
+def random_rules(rng: random.Random) -> list[ClassificationRule]:
+    rules = []
+    for i in range(200):
+        pattern = rng.choice(WORDS) + rng.choice(["", "료", "비", " "])
+        rules.append(ClassificationRule(f"k{i}", pattern, KEYWORD, "c", None, rng.choice([0.5, 0.7, 0.9])))
+    for i in range(40):
+        low = rng.randint(0, 10000)
+        rules.append(ClassificationRule(f"a{i}", f"{low}-{low + rng.randint(0, 5000)}", AMOUNT_RANGE, "c", None, rng.random()))
+    rules.append(ClassificationRule("bad", "1만-2만", AMOUNT_RANGE, "c"))
+    for i in range(20):
+        rules.append(ClassificationRule(f"c{i}", rng.choice(WORDS), CREDITOR, "c", None, rng.random()))
+    return rules
+
+
+def random_transactions(rng: random.Random, count: int):
+    for _ in range(count):
+        memo = rng.choice([None, "", "  ", " ".join(rng.choice(WORDS + ["x", "대출 실행"]) for _ in range(3))])
+        deposit = rng.choice([None, 0, rng.randint(0, 16000)])
+        withdrawal = rng.randint(0, 16000)
+        creditor_name = rng.choice([None, rng.choice(WORDS).lower()])
+        yield memo, deposit, withdrawal, creditor_name
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_matches_naive_classification(seed):
+    rng = random.Random(seed)
+    rules = random_rules(rng)
+    transactions = list(random_transactions(rng, 3000))
+    compiled = CompiledRuleSet(rules)
+
+    assert compiled.invalid_rule_ids == ["bad"]
+    for tx, match in zip(transactions, compiled.classify_batch(transactions)):
+        applied, important_type, keywords = naive_classify(rules, *tx)
+        assert (match.applied.id if match.applied else None) == applied, tx
+        assert match.important_type == important_type, tx
+        assert list(match.matched_keywords) == keywords, tx
+
+
+@pytest.mark.parametrize(
+    "amount, expected",
+    [
+        (999, ()),
+        (1000, ("wide", "low")),
+        (2000, ("wide", "low", "high")),
+        (2500, ("wide", "high")),
+        (3000, ("wide", "high")),
+        (3000.5, ("wide",)),
+        (10000, ("wide",)),
+        (10001, ()),
+        (0, ()),
+        (None, ()),
+    ],
+)
+def test_amount_range_boundaries(amount, expected):
+    rules = [
+        ClassificationRule("low", "1000-2000", AMOUNT_RANGE, "c", None, 0.5),
+        ClassificationRule("high", "2000-3000", AMOUNT_RANGE, "c", None, 0.4),
+        ClassificationRule("wide", "1000-10000", AMOUNT_RANGE, "c", None, 0.9),
+    ]
+    ids, rule = CompiledRuleSet(rules).amount_hits(amount)
+    assert ids == expected
+    assert (rule.id if rule else None) == (expected[0] if expected else None)
+
+
+def test_automaton_overlapping_patterns():
+    automaton = AhoCorasick(["he", "she", "his", "hers", ""])
+    assert automaton.find("ushers") == {0, 1, 3, 4}
+    assert automaton.find("") == set()
+
+
+def test_rule_set_cache_rebuilds_only_on_change():
+    cache = RuleSetCache(max_entries=2)
+    rules = [ClassificationRule("k1", "이자", KEYWORD, "c")]
+
+    first, compiled = cache.get(rules)
+    assert compiled
+    again, compiled = cache.get(list(rules))
+    assert again is first and not compiled
+
+    changed, compiled = cache.get([ClassificationRule("k1", "이자", KEYWORD, "c", confidence=0.5)])
+    assert compiled and changed.digest != first.digest
+    assert cache.stats() == {"entries": 2, "builds": 2, "hits": 1}
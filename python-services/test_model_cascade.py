@@ -0,0 +1,132 @@
+"""
+Model Cascade 테스트
+
+단계별 분석의 채택/상향 조건(신뢰도, 타임아웃, 오류), 지연 예산과 최대 단계 제한,
+LLM 대기열 초과 시 상위 단계로 올라가지 않는지 확인
+"""
+
+import asyncio
+
+import pytest
+
+from model_cascade import FAST, HEURISTIC, STRONG, AnalysisBudget, ModelTier, run_cascade
+from rate_limiter import LlmOverloadedError
+
+TIERS = [ModelTier(FAST, "fast-model", 1.0), ModelTier(STRONG, "strong-model", 1.0)]
+
+
+def cascade(behaviour: dict, budget: AnalysisBudget = None, tiers=TIERS, **kwargs):
+    """behaviour[tier]: 신뢰도(float) / 예외 / ("sleep", 초)"""
+    calls = []
+
+    async def attempt(tier: ModelTier) -> dict:
+        calls.append(tier.name)
+        action = behaviour[tier.name]
+        if isinstance(action, BaseException):
+            raise action
+        if isinstance(action, tuple):
+            await asyncio.sleep(action[1])
+            return {"tier": tier.name, "confidence": 0.99}
+        return {"tier": tier.name, "confidence": action}
+
+    result = asyncio.run(run_cascade(
+        tiers, attempt, budget or AnalysisBudget(),
+        accept=lambda r: r["confidence"] >= 0.85,
+        rank=lambda r: r["confidence"],
+        **kwargs,
+    ))
+    return result, calls
+
+
+def outcomes(result) -> list[tuple[str, str]]:
+    return [(a.tier, a.outcome) for a in result.attempts]
+
+
+def test_accepts_first_tier():
+    result, calls = cascade({FAST: 0.9, STRONG: 0.99})
+    assert calls == [FAST]
+    assert result.tier == FAST
+    assert outcomes(result) == [(FAST, "accepted")]
+    assert result.attempts[0].confidence == 0.9
+
+
+def test_escalates_on_low_confidence():
+    result, calls = cascade({FAST: 0.5, STRONG: 0.9})
+    assert calls == [FAST, STRONG]
+    assert (result.tier, result.result["confidence"]) == (STRONG, 0.9)
+    assert outcomes(result) == [(FAST, "low_confidence"), (STRONG, "accepted")]
+
+
+def test_keeps_best_when_nothing_accepted():
+    result, _ = cascade({FAST: 0.6, STRONG: 0.5})
+    assert (result.tier, result.result["confidence"]) == (FAST, 0.6)
+
+
+def test_timeout_then_escalate():
+    tiers = [ModelTier(FAST, "fast-model", 0.05), ModelTier(STRONG, "strong-model", 1.0)]
+    result, calls = cascade({FAST: ("sleep", 1.0), STRONG: 0.9}, tiers=tiers)
+    assert calls == [FAST, STRONG]
+    assert result.tier == STRONG
+    assert outcomes(result) == [(FAST, "timeout"), (STRONG, "accepted")]
+
+
+def test_error_then_escalate():
+    result, _ = cascade({FAST: RuntimeError("503"), STRONG: 0.9})
+    assert outcomes(result) == [(FAST, "error"), (STRONG, "accepted")]
+
+
+def test_all_tiers_fail_without_result_raises_last_error():
+    with pytest.raises(ValueError):
+        cascade({FAST: RuntimeError("503"), STRONG: ValueError("malformed")})
+
+
+def test_budget_cut_off_returns_best_so_far():
+    heuristic = {"tier": HEURISTIC, "confidence": 0.6}
+    result, calls = cascade(
+        {FAST: ("sleep", 1.0), STRONG: 0.9},
+        AnalysisBudget(latency_seconds=0.05),
+        initial=heuristic, initial_tier=HEURISTIC,
+    )
+    # 빠른 모델은 남은 예산 안에서만 실행되고, 예산이 다 되어 강한 모델은 생략
+    assert calls == [FAST]
+    assert result.result is heuristic and result.tier == HEURISTIC
+    assert outcomes(result) == [(FAST, "timeout")]
+    assert result.attempts[0].elapsed < 0.5
+
+
+def test_budget_exceeded_without_result_runs_until_first_result():
+    result, calls = cascade({FAST: 0.5, STRONG: 0.9}, AnalysisBudget(latency_seconds=0.0))
+    # 답이 없으면 예산을 넘겨서라도 실행하고, 답이 생기면 더 올라가지 않음
+    assert calls == [FAST]
+    assert result.tier == FAST
+
+
+def test_max_tier_limits_escalation():
+    result, calls = cascade({FAST: 0.5, STRONG: 0.9}, AnalysisBudget(max_tier=FAST))
+    assert calls == [FAST]
+    assert result.tier == FAST
+
+    heuristic = {"tier": HEURISTIC, "confidence": 0.5}
+    result, calls = cascade(
+        {FAST: 0.9, STRONG: 0.9}, AnalysisBudget(max_tier=HEURISTIC), initial=heuristic, initial_tier=HEURISTIC,
+    )
+    assert calls == [] and result.tier == HEURISTIC
+
+
+def test_overloaded_returns_best_without_escalating():
+    heuristic = {"tier": HEURISTIC, "confidence": 0.6}
+    result, calls = cascade(
+        {FAST: LlmOverloadedError("대기열 초과", 3), STRONG: 0.9}, initial=heuristic, initial_tier=HEURISTIC,
+    )
+    assert calls == [FAST]
+    assert result.result is heuristic
+    assert outcomes(result) == [(FAST, "overloaded")]
+
+    result, calls = cascade({FAST: 0.5, STRONG: LlmOverloadedError("대기열 초과", 3)})
+    assert (result.tier, outcomes(result)[-1]) == (FAST, (STRONG, "overloaded"))
+
+
+def test_overloaded_without_result_raises():
+    with pytest.raises(LlmOverloadedError) as info:
+        cascade({FAST: LlmOverloadedError("대기열 초과", 3), STRONG: 0.9})
+    assert info.value.retry_after == 3
@@ -0,0 +1,186 @@
+"""
+Normalizer 테스트
+
+금액 파싱(쉼표/통화 기호/괄호·△▲ 음수), 날짜 형식 통일, transaction-normalizer.ts와 같은
+입출금 구분 방식 4가지의 부호/비고 처리, 헤더 위에 제목 행이 있는 레이아웃의 원본 행 인덱스를 확인
+"""
+
+import numpy as np
+import pytest
+
+from normalizer import normalize_table, parse_amounts, parse_dates
+
+
+@pytest.mark.parametrize(
+    "text, amount, valid",
+    [
+        ("1,000", 1000.0, True),
+        ("-1,000", -1000.0, True),
+        ("+1,000원", 1000.0, True),
+        ("₩ 2,500.5", 2500.5, True),
+        ("(1,000)", -1000.0, True),
+        ("△1,000", -1000.0, True),
+        ("▲ 3,000원", -3000.0, True),
+        ("0", 0.0, True),
+        ("", 0.0, False),
+        ("이체", 0.0, False),
+        ("1.2.3", 0.0, False),
+        # 닫는 괄호가 없으면 음수로 보지 않음
+        ("(1,000", 1000.0, True),
+    ],
+)
+def test_parse_amounts(text, amount, valid):
+    parsed, ok = parse_amounts(np.array([text]))
+    assert bool(ok[0]) is valid
+    assert parsed[0] == amount
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2024-07-01", "2024-07-01"),
+        ("2024.07.01 13:22:05", "2024-07-01"),
+        ("20240701", "2024-07-01"),
+        ("24.07.01", "2024-07-01"),
+        ("2024/7/1", "2024-07-01"),
+        ("2024년 7월 1일", "2024-07-01"),
+        ("2024-02-30", ""),
+        ("2024-13-01", ""),
+        ("합계", ""),
+        ("", ""),
+    ],
+)
+def test_parse_dates(text, expected):
+    assert parse_dates(np.array([text])).tolist() == [expected]
+
+
+# (방식, 헤더, 행, 추가 매핑, 기대 (구분, 금액, 비고))
+METHOD_CASES = [
+    (
+        "separate_columns",
+        ["거래일자", "입금", "출금", "잔액", "비고"],
+        [
+            ["2024-07-01", "10,000", "", "10,000", "급여"],
+            ["2024-07-02", "", "3,000", "7,000", "카드"],
+            # 부호가 붙은 값도 컬럼 위치로 구분 (절대값)
+            ["2024-07-03", "", "-2,000", "5,000", "이체"],
+            ["2024-07-04", "(500)", "", "5,500", "이자"],
+            # 빈 금액 컬럼에 비고가 들어간 경우
+            ["2024-07-05", "1,000", "ATM입금", "6,500", ""],
+        ],
+        {"입금금액": "입금", "출금금액": "출금"},
+        [
+            ("입금", 10000.0, "급여"),
+            ("출금", -3000.0, "카드"),
+            ("출금", -2000.0, "이체"),
+            ("입금", 500.0, "이자"),
+            ("입금", 1000.0, "ATM입금"),
+        ],
+    ),
+    (
+        "amount_sign",
+        ["거래일자", "금액", "잔액", "비고"],
+        [
+            ["2024-07-01", "+10,000", "10,000", "급여"],
+            ["2024-07-02", "-3,000", "7,000", "카드"],
+            ["2024-07-03", "(2,000)", "5,000", "이체"],
+            ["2024-07-04", "△1,000", "4,000", "수수료"],
+            ["2024-07-05", "0", "4,000", "조회"],
+        ],
+        {"금액": "금액"},
+        [
+            ("입금", 10000.0, "급여"),
+            ("출금", -3000.0, "카드"),
+            ("출금", -2000.0, "이체"),
+            ("출금", -1000.0, "수수료"),
+            ("출금", 0.0, "조회"),
+        ],
+    ),
+    (
+        "type_column",
+        ["거래일자", "구분", "금액", "잔액", "비고"],
+        [
+            ["2024-07-01", "입금", "10,000", "10,000", "급여"],
+            ["2024-07-02", "출금", "3,000", "7,000", "카드"],
+            ["2024-07-03", "포인트적립", "-500", "7,500", "적립"],
+            ["2024-07-04", "결제", "+1,000", "6,500", "쇼핑"],
+        ],
+        {"구분": "구분", "금액": "금액"},
+        [
+            ("입금", 10000.0, "급여"),
+            ("출금", -3000.0, "카드"),
+            ("입금", 500.0, "적립"),
+            ("출금", -1000.0, "쇼핑"),
+        ],
+    ),
+    (
+        "sign_in_type",
+        ["거래일자", "구분", "금액", "잔액", "비고"],
+        [
+            ["2024-07-01", "+", "10,000", "10,000", "급여"],
+            ["2024-07-02", "-", "3,000", "7,000", "카드"],
+            # sign_in_type은 "+"만 입금으로 봄 (키워드 무시)
+            ["2024-07-03", "입금", "500", "6,500", "이체"],
+        ],
+        {"구분": "구분", "금액": "금액"},
+        [
+            ("입금", 10000.0, "급여"),
+            ("출금", -3000.0, "카드"),
+            ("출금", -500.0, "이체"),
+        ],
+    ),
+]
+
+
+@pytest.mark.parametrize("method, headers, rows, mapping, expected", METHOD_CASES, ids=[c[0] for c in METHOD_CASES])
+def test_transaction_type_methods(analysis, method, headers, rows, mapping, expected):
+    normalized = normalize_table(headers, rows, analysis(method, **mapping))
+    assert list(zip(normalized.type, normalized.amount, normalized.memo)) == expected
+    assert normalized.transaction_date == [row[0] for row in rows]
+
+
+def test_amount_has_no_negative_zero(analysis):
+    normalized = normalize_table(
+        ["거래일자", "금액"], [["2024-07-01", "-0"]], analysis("amount_sign", 금액="금액")
+    )
+    assert normalized.amount == [0.0]
+    assert str(normalized.amount[0]) == "0.0"
+
+
+# 헤더 위에 제목/조회 조건 행이 있는 레이아웃 (headers를 0번 행으로 보는 인덱스)
+TITLE_HEADERS = ["거래내역 조회", "", "", ""]
+OFFSET_ROWS = [
+    ["조회기간: 2024.07.01 ~ 2024.07.31", "", "", ""],  # 1
+    ["거래일자", "금액", "잔액", "비고"],               # 2 (헤더)
+    ["", "", "", ""],                                   # 3
+    ["2024.07.01", "1,000", "1,000", "입금"],          # 4
+    ["합계", "1,000", "", ""],                          # 5 (날짜 없음 → 제외)
+    ["2024.07.02", "-500", "500", "출금"],             # 6
+]
+
+
+@pytest.mark.parametrize(
+    "header_row, data_start, sources, skipped",
+    [
+        (2, 3, [3, 5], 2),
+        (2, 4, [3, 5], 1),
+        # dataStartRowIndex가 헤더보다 앞이면 헤더 다음 행부터
+        (2, 1, [3, 5], 2),
+    ],
+)
+def test_header_offset_layout(analysis, header_row, data_start, sources, skipped):
+    normalized = normalize_table(TITLE_HEADERS, OFFSET_ROWS, analysis("amount_sign", header_row, data_start, 금액="금액"))
+    assert normalized.source_row_index == sources
+    assert [OFFSET_ROWS[i][0] for i in normalized.source_row_index] == ["2024.07.01", "2024.07.02"]
+    assert normalized.amount == [1000.0, -500.0]
+    assert normalized.balance == [1000.0, 500.0]
+    assert normalized.skipped_rows == skipped
+
+
+def test_unparsed_balance_is_none(analysis):
+    normalized = normalize_table(
+        ["거래일자", "금액", "잔액"],
+        [["2024-07-01", "1,000", "1,000"], ["2024-07-02", "1,000", "-"]],
+        analysis("amount_sign", 금액="금액"),
+    )
+    assert normalized.balance == [1000.0, None]
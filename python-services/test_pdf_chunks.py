@@ -0,0 +1,154 @@
+"""
+PDF Chunks 테스트
+
+페이지 묶음 계획, 청크 행의 열 정렬(이름 재배치/헤더 없는 페이지/열 수 보정),
+파이프라인의 뒤쪽 청크 헤더 발견과 재시도 후 최종 오류 보고를 확인
+"""
+
+import asyncio
+
+import pytest
+
+from pdf_chunks import PdfChunk, align_rows, plan_chunks, run_chunk_pipeline
+from rate_limiter import LlmOverloadedError
+
+HEADERS = ["거래일자", "적요", "출금", "입금", "잔액"]
+
+
+@pytest.mark.parametrize(
+    "pages, size, expected",
+    [
+        ([0, 1, 2, 3, 4], 2, [[0, 1], [2, 3], [4]]),
+        # 연속 구간이 끊기면 새 청크
+        ([7, 1, 2, 5, 6], 4, [[1, 2], [5, 6, 7]]),
+        ([3], 10, [[3]]),
+        ([], 4, []),
+    ],
+)
+def test_plan_chunks(pages, size, expected):
+    chunks = plan_chunks(pages, size)
+    assert [c.pages for c in chunks] == expected
+    assert [c.index for c in chunks] == list(range(len(expected)))
+
+
+ROW = ["2024.07.01", "타행이체", "", "10,000", "10,000"]
+
+# (설명, 청크 헤더, 청크 행, 기대 행)
+ALIGN_CASES = [
+    ("same_order", HEADERS, [ROW], [ROW]),
+    (
+        # 이름으로 열 재배치 (공백 차이 무시, 없는 열은 빈 값)
+        "reordered_by_name",
+        ["거래 일자", "입금", "출금", "적요"],
+        [["2024.07.01", "10,000", "", "타행이체"]],
+        [["2024.07.01", "타행이체", "", "10,000", ""]],
+    ),
+    (
+        # 헤더 없는 페이지: 청크 "헤더"는 첫 데이터 행
+        "headerless_page",
+        ROW,
+        [["2024.07.02", "카드결제", "3,000", "", "7,000"]],
+        [ROW, ["2024.07.02", "카드결제", "3,000", "", "7,000"]],
+    ),
+    (
+        # 열 수 보정: 넘치는 열은 마지막 열에 합치고 부족한 열은 빈 값
+        "width_fixed",
+        [],
+        [["2024.07.01", "타행이체", "", "10,000", "10,000", "원"], ["2024.07.02", "이자"]],
+        [["2024.07.01", "타행이체", "", "10,000", "10,000 원"], ["2024.07.02", "이자", "", "", ""]],
+    ),
+    # 반복된 헤더 행과 빈 행 제외
+    ("repeated_header", HEADERS, [HEADERS, ["", "", "", "", ""], ROW], [ROW]),
+]
+
+
+@pytest.mark.parametrize("chunk_headers, rows, expected", [c[1:] for c in ALIGN_CASES], ids=[c[0] for c in ALIGN_CASES])
+def test_align_rows(chunk_headers, rows, expected):
+    assert align_rows(HEADERS, chunk_headers, rows) == expected
+
+
+def test_align_rows_without_known_headers():
+    assert align_rows([], ROW, [ROW]) == [ROW, ROW]
+    assert align_rows([], HEADERS, [ROW]) == [ROW]
+
+
+class FakeRecognizer:
+    """청크별 (헤더, 행, 텍스트) 또는 실패 횟수를 정해 둔 인식기"""
+
+    def __init__(self, pages: dict, failures: dict = None, error: Exception = None):
+        self.pages = pages
+        self.failures = dict(failures or {})
+        self.error = error or RuntimeError("503")
+        self.calls: list[tuple[int, list[str]]] = []
+
+    async def __call__(self, chunk: PdfChunk, headers: list[str]):
+        self.calls.append((chunk.index, list(headers)))
+        await asyncio.sleep(0)
+        if self.failures.get(chunk.index, 0) > 0:
+            self.failures[chunk.index] -= 1
+            raise self.error
+        return self.pages[chunk.index]
+
+
+def run(chunks, recognizer, **kwargs):
+    return asyncio.run(run_chunk_pipeline(chunks, recognizer, backoff_base=0.001, backoff_max=0.01, **kwargs))
+
+
+def test_header_found_on_later_chunk():
+    recognizer = FakeRecognizer({
+        0: ([], [], ["거래내역 조회 (표지)"]),
+        1: (["안내"], [["조회 기간: 2024.07"]], []),
+        2: (HEADERS, [ROW], ["KB국민은행"]),
+        3: ([], [["2024.07.02", "카드결제", "3,000", "", "7,000"]], []),
+        4: (["2024.07.03", "이자", "", "5", "7,005"], [], []),
+    })
+    headers, outcomes = run(plan_chunks([0, 1, 2, 3, 4], 1), recognizer)
+
+    assert headers == HEADERS
+    # 헤더를 찾을 때까지 앞 청크를 하나씩, 이후 청크는 찾은 헤더를 넘겨 처리
+    assert recognizer.calls[:3] == [(0, []), (1, []), (2, [])]
+    assert sorted(recognizer.calls[3:]) == [(3, HEADERS), (4, HEADERS)]
+    assert [o.rows for o in outcomes] == [
+        [],
+        # 거래 헤더가 아닌 청크 "헤더"는 행으로 되돌림
+        [["안내", "", "", "", ""], ["조회 기간: 2024.07", "", "", "", ""]],
+        [ROW],
+        [["2024.07.02", "카드결제", "3,000", "", "7,000"]],
+        [["2024.07.03", "이자", "", "5", "7,005"]],
+    ]
+    assert outcomes[2].page_texts == ["KB국민은행"]
+    assert all(o.error is None and o.attempts == 1 for o in outcomes)
+
+
+def test_known_headers_process_all_chunks_in_parallel():
+    recognizer = FakeRecognizer({i: ([], [ROW], []) for i in range(4)})
+    headers, outcomes = run(plan_chunks([0, 1, 2, 3], 1), recognizer, headers=HEADERS, concurrency=2)
+    assert headers == HEADERS
+    assert sorted(recognizer.calls) == [(i, HEADERS) for i in range(4)]
+    assert [o.rows for o in outcomes] == [[ROW]] * 4
+
+
+def test_retry_until_success_and_final_error():
+    retries = []
+    recognizer = FakeRecognizer(
+        {0: (HEADERS, [ROW], []), 1: ([], [ROW], []), 2: ([], [ROW], [])},
+        failures={1: 1, 2: 5},
+        error=LlmOverloadedError("대기열 초과", 0),
+    )
+    headers, outcomes = run(
+        plan_chunks([0, 1, 2], 1), recognizer, max_attempts=3, on_retry=lambda c, e: retries.append(c.index),
+    )
+    assert headers == HEADERS
+    assert [o.attempts for o in outcomes] == [1, 2, 3]
+    assert [o.error for o in outcomes] == [None, None, "LlmOverloadedError: 대기열 초과"]
+    # 끝까지 실패한 청크는 행 없이 오류로 보고 (마지막 시도 뒤에는 재시도 콜백 없음)
+    assert outcomes[2].rows == []
+    assert sorted(retries) == [1, 2, 2]
+
+
+def test_header_chunk_failure_moves_on():
+    recognizer = FakeRecognizer({1: (HEADERS, [ROW], [])}, failures={0: 2})
+    headers, outcomes = run(plan_chunks([0, 1], 1), recognizer, max_attempts=2)
+    assert headers == HEADERS
+    assert outcomes[0].error == "RuntimeError: 503"
+    assert outcomes[1].rows == [ROW]
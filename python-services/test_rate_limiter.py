@@ -0,0 +1,182 @@
+"""
+Rate Limiter 테스트
+
+토큰 버킷 예약/보충, AIMD 동시성 한도 조절(쿨다운 포함),
+대기열 초과 시 LlmOverloadedError(retry_after)와 RPM/TPM 대기 중 슬롯 미점유를 확인
+"""
+
+import asyncio
+
+import pytest
+
+import rate_limiter
+from rate_limiter import AdaptiveConcurrency, LlmOverloadedError, LlmRateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake)
+    return fake
+
+
+def test_token_bucket_reserve(clock):
+    bucket = TokenBucket(60)  # 초당 1개
+    assert bucket.reserve(60) == 0.0
+    # 먼저 예약한 호출이 먼저 통과
+    assert bucket.reserve(1) == 1.0
+    assert bucket.reserve(1) == 2.0
+    assert bucket.wait_estimate() == 3.0
+    clock.now += 2
+    assert bucket.reserve(1) == 1.0
+    # 보충은 용량까지만
+    clock.now += 600
+    assert bucket.wait_estimate(60) == 0.0
+    # 분당 한도보다 큰 요청은 용량만큼만 차감
+    assert bucket.reserve(120) == 0.0
+    assert bucket.reserve(1) == 1.0
+
+
+def test_token_bucket_adjust_and_disabled(clock):
+    bucket = TokenBucket(60)
+    assert bucket.reserve(30) == 0.0
+    assert bucket.reserve(32) == 2.0
+    bucket.adjust(-1)  # 예약량 반환
+    assert bucket.wait_estimate() == 2.0
+    bucket.adjust(-100)
+    assert bucket.tokens == bucket.capacity
+
+    disabled = TokenBucket(0)
+    assert not disabled.enabled
+    assert disabled.reserve(10 ** 6) == 0.0
+    assert disabled.wait_estimate(10 ** 6) == 0.0
+
+
+def test_aimd_decrease_with_cooldown(clock):
+    concurrency = AdaptiveConcurrency(maximum=16, minimum=2, latency_target=10, cooldown=5)
+    concurrency.on_throttled()
+    assert concurrency.limit == 8
+    # 같은 혼잡 구간의 연속 신호는 무시
+    concurrency.on_throttled()
+    assert concurrency.limit == 8
+    clock.now += 5
+    concurrency.on_success(latency=20)  # 목표 지연 초과: 10% 감소
+    assert concurrency.limit == pytest.approx(7.2)
+    for _ in range(5):
+        clock.now += 5
+        concurrency.on_throttled()
+    assert concurrency.limit == 2  # 최솟값 이하로 내려가지 않음
+
+
+def test_aimd_increase_up_to_maximum(clock):
+    concurrency = AdaptiveConcurrency(maximum=4, cooldown=5)
+    concurrency.on_throttled()
+    assert concurrency.limit == 2
+    concurrency.on_success(latency=1)
+    assert concurrency.limit == 2.5
+    concurrency.on_success(latency=1)
+    assert concurrency.limit == pytest.approx(2.9)
+    for _ in range(20):
+        concurrency.on_success(latency=1)
+    assert concurrency.limit == 4
+
+
+def test_increase_wakes_waiters():
+    async def main():
+        concurrency = AdaptiveConcurrency(maximum=2, cooldown=0)
+        concurrency.limit = 1.0
+        await concurrency.acquire()
+        waiter = asyncio.create_task(concurrency.acquire())
+        await asyncio.sleep(0)
+        assert concurrency.waiting == 1
+        concurrency.on_success(latency=1)  # 한도 1 → 2
+        await asyncio.wait_for(waiter, 1)
+        return concurrency.active
+
+    assert asyncio.run(main()) == 2
+
+
+def test_queue_full_raises_with_retry_after():
+    async def main():
+        limiter = LlmRateLimiter(max_concurrency=1, max_waiting=1, latency_target=4)
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(limiter.call(hold, tokens=10))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(limiter.call(hold, tokens=10))
+        await asyncio.sleep(0)
+        assert (limiter.concurrency.active, limiter.concurrency.waiting) == (1, 1)
+
+        with pytest.raises(LlmOverloadedError) as info:
+            await limiter.call(hold, tokens=10)
+        # 대기 1개 / 한도 1 × 지연 목표 4초
+        assert info.value.retry_after == 4
+        assert limiter.rejected == 1
+
+        # enforce_queue_limit=False(비동기 작업)는 거절하지 않고 기다림
+        third = asyncio.create_task(limiter.call(hold, tokens=10, enforce_queue_limit=False))
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(first, second, third), limiter
+
+    results, limiter = asyncio.run(main())
+    assert results == ["ok", "ok", "ok"]
+    assert (limiter.rejected, limiter.concurrency.active) == (1, 0)
+
+
+def test_pacing_does_not_hold_a_slot():
+    async def main():
+        limiter = LlmRateLimiter(requests_per_minute=600, max_concurrency=1)  # 초당 10개
+        limiter.requests.tokens = 0.0
+
+        async def call():
+            return limiter.concurrency.active
+
+        paced = asyncio.create_task(limiter.call(call, tokens=1))
+        await asyncio.sleep(0.02)
+        # RPM 대기 중에는 슬롯을 차지하지 않음
+        assert (limiter.pacing, limiter.concurrency.active) == (1, 0)
+        assert await paced == 1
+        return limiter
+
+    limiter = asyncio.run(main())
+    assert limiter.pacing == 0
+    assert limiter.paced_seconds == pytest.approx(0.1, abs=0.01)
+
+
+def test_pacing_counts_toward_queue_limit_and_refunds_on_cancel():
+    async def main():
+        limiter = LlmRateLimiter(requests_per_minute=60, tokens_per_minute=600, max_waiting=1)
+        limiter.requests.tokens = 0.0
+
+        async def call():
+            return "ok"
+
+        paced = asyncio.create_task(limiter.call(call, tokens=100))
+        await asyncio.sleep(0)
+        with pytest.raises(LlmOverloadedError):
+            await limiter.call(call, tokens=1)
+        tokens_before_cancel = limiter.tokens.tokens
+
+        paced.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await paced
+        return limiter, tokens_before_cancel
+
+    limiter, tokens_before_cancel = asyncio.run(main())
+    assert limiter.pacing == 0
+    # 호출하지 않은 예약은 반환
+    assert limiter.requests.tokens == pytest.approx(0.0, abs=0.01)
+    assert limiter.tokens.tokens == pytest.approx(tokens_before_cancel + 100, abs=0.1)
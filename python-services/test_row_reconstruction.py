@@ -0,0 +1,166 @@
+"""
+Row Reconstruction 테스트
+
+PDF에서 여러 줄로 나뉜 거래 행을 하나로 합치는지(적요 이어 붙이기, 날짜+시간 합치기)와
+합치지 않아야 하는 줄(금액이 있는 줄, 반복 헤더, 빈 행, 첫 거래 앞의 줄), 원본 행을 바꾸지 않는지,
+normalize_table(merge_wrapped=True)가 병합 후에도 첫 줄의 원본 행 인덱스를 남기는지 확인
+"""
+
+import pytest
+
+from normalizer import normalize_table
+from row_reconstruction import numeric_columns, reconstruct_rows
+
+HEADER = ["거래일자", "적요", "출금", "입금", "잔액"]
+AMOUNT_COLUMNS = (2, 3, 4)
+
+# (설명, 행, 기대 행, 기대 원본 인덱스, 기대 병합 수)
+CASES = [
+    (
+        "memo_two_lines",
+        [
+            ["2024.07.01", "타행이체", "", "10,000", "10,000"],
+            ["", "홍길동", "", "", ""],
+            ["2024.07.02", "카드결제", "3,000", "", "7,000"],
+        ],
+        [
+            ["2024.07.01", "타행이체 홍길동", "", "10,000", "10,000"],
+            ["2024.07.02", "카드결제", "3,000", "", "7,000"],
+        ],
+        [0, 2],
+        1,
+    ),
+    (
+        "memo_three_lines_and_time",
+        [
+            ["2024.07.01", "대출금", "", "", ""],
+            ["13:22", "이자", "", "", ""],
+            ["", "  자동이체 ", "", "", ""],
+            ["2024.07.02", "급여", "", "2,000", "11,000"],
+        ],
+        [
+            ["2024.07.01 13:22", "대출금 이자 자동이체", "", "", ""],
+            ["2024.07.02", "급여", "", "2,000", "11,000"],
+        ],
+        [0, 3],
+        2,
+    ),
+    (
+        # 금액이 있는 줄은 이어지는 줄이 아님 (합계 행이 금액을 바꾸지 않도록)
+        "numeric_line_breaks_merge",
+        [
+            ["2024.07.01", "타행이체", "", "10,000", "10,000"],
+            ["합계", "", "3,000", "10,000", ""],
+            ["", "비고", "", "", ""],
+        ],
+        [
+            ["2024.07.01", "타행이체", "", "10,000", "10,000"],
+            ["합계", "", "3,000", "10,000", ""],
+            ["", "비고", "", "", ""],
+        ],
+        [0, 1, 2],
+        0,
+    ),
+    (
+        "repeated_header_and_blank_row",
+        [
+            ["2024.07.01", "타행이체", "", "10,000", "10,000"],
+            HEADER,
+            ["", "홍길동", "", "", ""],
+            ["2024.07.02", "카드결제", "3,000", "", "7,000"],
+            ["", " ", "", "", ""],
+            ["", "가맹점", "", "", ""],
+        ],
+        [
+            ["2024.07.01", "타행이체", "", "10,000", "10,000"],
+            HEADER,
+            ["", "홍길동", "", "", ""],
+            ["2024.07.02", "카드결제", "3,000", "", "7,000"],
+            ["", " ", "", "", ""],
+            ["", "가맹점", "", "", ""],
+        ],
+        [0, 1, 2, 3, 4, 5],
+        0,
+    ),
+    (
+        # 이어지는 줄이 앞 행보다 길면 빈 셀을 늘려 병합
+        "longer_continuation",
+        [
+            ["2024.07.01", "타행이체", "", "10,000"],
+            ["", "", "", "", "", "메모"],
+        ],
+        [["2024.07.01", "타행이체", "", "10,000", "", "메모"]],
+        [0],
+        1,
+    ),
+    (
+        "leading_continuation_kept",
+        [
+            ["", "이월", "", "", ""],
+            ["2024.07.01", "타행이체", "", "10,000", "10,000"],
+        ],
+        [
+            ["", "이월", "", "", ""],
+            ["2024.07.01", "타행이체", "", "10,000", "10,000"],
+        ],
+        [0, 1],
+        0,
+    ),
+]
+
+
+@pytest.mark.parametrize("rows, expected, sources, merged", [c[1:] for c in CASES], ids=[c[0] for c in CASES])
+def test_reconstruct_rows(rows, expected, sources, merged):
+    original = [list(row) for row in rows]
+    result = reconstruct_rows(rows, 0, AMOUNT_COLUMNS, header_row=HEADER)
+    assert result.rows == expected
+    assert result.source_row_index == sources
+    assert result.merged_rows == merged
+    # 원본 행은 수정하지 않음
+    assert rows == original
+
+
+def test_unmerged_rows_are_not_copied():
+    rows = [["2024.07.01", "a", "1"], ["", "b", ""], ["2024.07.02", "c", "2"]]
+    result = reconstruct_rows(rows, 0, (2,))
+    assert result.rows[0] is not rows[0]
+    assert result.rows[1] is rows[2]
+
+
+def test_unmapped_numeric_column_detected_from_cells():
+    rows = [
+        ["2024.07.01", "타행이체", "1,000", "거래점"],
+        ["", "", "(500)", ""],
+        ["2024.07.02", "급여", "△2,000", "본점"],
+    ]
+    assert numeric_columns(rows) == frozenset({2})
+    result = reconstruct_rows(rows, 0)
+    assert result.merged_rows == 0
+    assert result.source_row_index == [0, 1, 2]
+
+
+def test_start_skips_leading_rows():
+    rows = [["조회기간", "2024.07"], ["", "x"], ["2024.07.01", "a"], ["", "b"]]
+    result = reconstruct_rows(rows, 0, start=2)
+    assert result.rows == [["2024.07.01", "a b"]]
+    assert result.source_row_index == [2]
+
+
+@pytest.mark.parametrize("merge_wrapped, memo, sources, merged", [
+    (False, ["타행이체", "카드결제"], [0, 3], 0),
+    (True, ["타행이체 홍길동 급여", "카드결제"], [0, 3], 2),
+])
+def test_normalize_table_merge_wrapped(analysis, merge_wrapped, memo, sources, merged):
+    rows = [
+        ["2024.07.01", "타행이체", "", "10,000", "10,000"],
+        ["", "홍길동", "", "", ""],
+        ["", "급여", "", "", ""],
+        ["2024.07.02", "카드결제", "3,000", "", "7,000"],
+    ]
+    candidate = analysis("separate_columns", 비고="적요", 입금금액="입금", 출금금액="출금")
+    normalized = normalize_table(HEADER, rows, candidate, merge_wrapped=merge_wrapped)
+    assert normalized.memo == memo
+    assert normalized.source_row_index == sources
+    assert normalized.merged_rows == merged
+    assert normalized.amount == [10000.0, -3000.0]
+    assert normalized.skipped_rows == (0 if merge_wrapped else 2)
@@ -0,0 +1,175 @@
+"""
+Shared Store 테스트
+
+같은 SQLite 파일을 연 두 저장소 인스턴스를 워커 프로세스 두 개로 보고
+임대의 배타성/만료 인수, WorkerLeases의 결과 공유와 실패 시 인수, 임대 연장,
+작업 스냅샷 기록 순서를 확인
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from shared_store import JobSnapshotWriter, SharedStore, WorkerLeases
+
+KEY = "v2:table:abc:strong"
+
+
+@pytest.fixture
+def stores(tmp_path):
+    path = str(tmp_path / "shared.db")
+    return SharedStore(path), SharedStore(path)
+
+
+def leases(store: SharedStore, lease_seconds: float = 30.0) -> WorkerLeases:
+    return WorkerLeases(store, lease_seconds=lease_seconds, poll_interval=0.01)
+
+
+def test_lease_is_exclusive(stores):
+    a, b = stores
+    assert a.acquire_lease(KEY, "a", 30)
+    assert not b.acquire_lease(KEY, "b", 30)
+    # 보유 중인 워커는 다시 얻을 수 있음 (연장)
+    assert a.acquire_lease(KEY, "a", 30)
+    assert not b.renew_lease(KEY, "b", 30)
+
+    b.release_lease(KEY, "b")  # 다른 워커의 반납은 무시
+    assert not b.acquire_lease(KEY, "b", 30)
+    a.release_lease(KEY, "a")
+    assert b.acquire_lease(KEY, "b", 30)
+
+
+def test_expired_lease_can_be_stolen(stores):
+    a, b = stores
+    assert a.acquire_lease(KEY, "a", -1)
+    assert b.acquire_lease(KEY, "b", 30)
+    assert not a.renew_lease(KEY, "a", 30)
+    assert not a.acquire_lease(KEY, "a", 30)
+
+
+def test_result_round_trip_and_ttl(tmp_path):
+    a = SharedStore(str(tmp_path / "shared.db"))
+    b = SharedStore(str(tmp_path / "shared.db"), ttl_seconds=0.05)
+    a.set_result("k", {"success": True})
+    assert a.get_result("k") == b.get_result("k") == {"success": True}
+    time.sleep(0.06)
+    assert b.get_result("k") is None
+    assert a.get_result("missing") is None
+
+
+def test_waiter_uses_holder_result(stores):
+    a, b = stores
+    calls = []
+
+    async def holder() -> dict:
+        calls.append("a")
+        await asyncio.sleep(0.1)
+        a.set_result(KEY, {"by": "a"})
+        return {"by": "a"}
+
+    async def waiter() -> dict:
+        calls.append("b")
+        return {"by": "b"}
+
+    async def main():
+        leases_a, leases_b = leases(a), leases(b)
+        first = asyncio.create_task(leases_a.do(KEY, holder, lambda: a.get_result(KEY)))
+        await asyncio.sleep(0.02)
+        cleaned = []
+        second = await leases_b.do(KEY, waiter, lambda: b.get_result(KEY), cleanup=lambda: cleaned.append(True))
+        return await first, second, leases_a, leases_b, cleaned
+
+    first, second, leases_a, leases_b, cleaned = asyncio.run(main())
+    assert first == second == {"by": "a"}
+    assert calls == ["a"]
+    assert (leases_a.acquired, leases_b.waited, leases_b.shared_hits) == (1, 1, 1)
+    # factory를 실행하지 않았으므로 넘겨받은 자원 정리
+    assert cleaned == [True]
+    # 보유 워커가 끝나면 임대 반납
+    assert b.acquire_lease(KEY, "other", 30)
+
+
+def test_waiter_takes_over_after_failed_holder(stores):
+    a, b = stores
+
+    async def holder() -> dict:
+        await asyncio.sleep(0.1)
+        raise RuntimeError("LLM 실패")
+
+    async def waiter() -> dict:
+        return {"by": "b"}
+
+    async def main():
+        leases_a, leases_b = leases(a), leases(b)
+        first = asyncio.create_task(leases_a.do(KEY, holder, lambda: a.get_result(KEY)))
+        await asyncio.sleep(0.02)
+        second = await leases_b.do(KEY, waiter, lambda: b.get_result(KEY))
+        with pytest.raises(RuntimeError):
+            await first
+        return second, leases_b
+
+    second, leases_b = asyncio.run(main())
+    assert second == {"by": "b"}
+    assert (leases_b.waited, leases_b.acquired, leases_b.shared_hits) == (1, 1, 0)
+
+
+def test_waiter_steals_expired_lease(stores):
+    a, b = stores
+    # 임대를 얻은 워커가 연장하지 못하고 죽은 경우
+    assert a.acquire_lease(KEY, "dead-worker", 0.1)
+
+    async def waiter() -> dict:
+        return {"by": "b"}
+
+    leases_b = leases(b)
+    assert asyncio.run(leases_b.do(KEY, waiter, lambda: b.get_result(KEY))) == {"by": "b"}
+    assert (leases_b.waited, leases_b.acquired) == (1, 1)
+
+
+def test_holder_keeps_lease_alive(stores):
+    a, b = stores
+
+    async def slow() -> dict:
+        # 임대 기간(0.15초)보다 오래 실행
+        for _ in range(5):
+            await asyncio.sleep(0.08)
+            assert not b.acquire_lease(KEY, "b", 30)
+        return {"by": "a"}
+
+    assert asyncio.run(leases(a, lease_seconds=0.15).do(KEY, slow, lambda: None)) == {"by": "a"}
+
+
+def test_job_snapshots_keep_latest_state(stores):
+    a, _ = stores
+    errors = []
+
+    async def main():
+        writer = JobSnapshotWriter(a, on_error=errors.append)
+        for stage in ("queued", "running", "llm", "completed"):
+            writer.submit("job-1", {"stage": stage}, expires_at=2e9)
+        writer.submit("job-2", {"stage": "queued"}, expires_at=0)
+        await writer.flush()
+
+    asyncio.run(main())
+    assert a.get_job("job-1") == {"stage": "completed"}
+    assert a.get_job("job-2") is None  # 만료
+    assert errors == []
+
+
+def test_job_snapshot_errors_are_reported(stores):
+    a, _ = stores
+    errors = []
+
+    def broken(*args):
+        raise OSError("disk full")
+
+    a.put_job = broken
+
+    async def main():
+        writer = JobSnapshotWriter(a, on_error=errors.append)
+        writer.submit("job-1", {"stage": "queued"}, expires_at=2e9)
+        await writer.flush()
+
+    asyncio.run(main())
+    assert [type(e) for e in errors] == [OSError]
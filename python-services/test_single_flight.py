@@ -0,0 +1,123 @@
+"""
+Single Flight 테스트
+
+같은 키의 동시 호출 공유, 대기자 일부 취소 시 공유 호출 유지,
+마지막 대기자가 떠날 때만 취소, 예외 전달을 확인
+"""
+
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+class Call:
+    """실행 횟수와 취소 여부를 기록하는 공유 호출"""
+
+    def __init__(self, result="ok", error: BaseException = None):
+        self.result = result
+        self.error = error
+        self.started = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_callers_share_one_execution():
+    async def main():
+        flights, call, other = SingleFlight(), Call(), Call("other")
+        waiters = [asyncio.create_task(flights.do("k", call)) for _ in range(3)]
+        waiters.append(asyncio.create_task(flights.do("other", other)))
+        await settle()
+        assert flights.stats() == {"inFlight": 2, "started": 2, "coalesced": 2}
+        call.release.set()
+        other.release.set()
+        return await asyncio.gather(*waiters), call, flights
+
+    results, call, flights = asyncio.run(main())
+    assert results == ["ok", "ok", "ok", "other"]
+    assert call.started == 1
+    assert flights.stats()["inFlight"] == 0
+
+
+def test_completed_flight_is_not_reused():
+    async def main():
+        flights = SingleFlight()
+        first, second = Call("first"), Call("second")
+        first.release.set()
+        second.release.set()
+        return await flights.do("k", first), await flights.do("k", second)
+
+    assert asyncio.run(main()) == ("first", "second")
+
+
+def test_one_waiter_cancelling_keeps_others():
+    async def main():
+        flights, call = SingleFlight(), Call()
+        leaving = asyncio.create_task(flights.do("k", call))
+        staying = asyncio.create_task(flights.do("k", call))
+        await settle()
+        leaving.cancel()
+        await settle()
+        assert not call.cancelled
+        call.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        return await staying, call
+
+    result, call = asyncio.run(main())
+    assert result == "ok"
+    assert (call.started, call.cancelled) == (1, False)
+
+
+def test_cancelled_only_when_last_waiter_leaves():
+    async def main():
+        flights, call = SingleFlight(), Call()
+        waiters = [asyncio.create_task(flights.do("k", call)) for _ in range(2)]
+        await settle()
+        waiters[0].cancel()
+        await settle()
+        assert not call.cancelled and flights.stats()["inFlight"] == 1
+        waiters[1].cancel()
+        await settle()
+        assert call.cancelled and flights.stats()["inFlight"] == 0
+
+        # 취소된 호출은 재사용하지 않고 새로 시작
+        fresh = Call("fresh")
+        fresh.release.set()
+        return await flights.do("k", fresh), flights
+
+    result, flights = asyncio.run(main())
+    assert result == "fresh"
+    assert flights.stats()["started"] == 2
+
+
+def test_exception_reaches_every_waiter():
+    async def main():
+        flights, call = SingleFlight(), Call(error=RuntimeError("LLM 실패"))
+        waiters = [asyncio.create_task(flights.do("k", call)) for _ in range(3)]
+        await settle()
+        call.release.set()
+        return await asyncio.gather(*waiters, return_exceptions=True), call, flights
+
+    results, call, flights = asyncio.run(main())
+    assert [type(r) for r in results] == [RuntimeError] * 3
+    assert len({id(r) for r in results}) == 1
+    assert call.started == 1
+    assert flights.stats()["inFlight"] == 0
@@ -0,0 +1,113 @@
+"""
+Template Index 테스트
+
+헤더 지문(MinHash) top-k 순위와 identifiers 가중치,
+변경분만 서명을 다시 계산하는 증분 갱신(추가/수정/비활성/삭제/전체 교체)을 확인
+"""
+
+import numpy as np
+import pytest
+
+from template_index import TemplateIndex, header_shingles, minhash_signature
+
+
+def template(template_id: str, headers: list[str], identifiers=(), priority: int = 0, **fields) -> dict:
+    keys = ["date", "deposit", "withdrawal", "balance", "memo", "amount", "transactionType"]
+    return {
+        "id": template_id,
+        "name": fields.pop("name", template_id),
+        "bankName": fields.pop("bankName", None),
+        "identifiers": list(identifiers),
+        "columnSchema": {"columns": {k: {"index": i, "header": h} for i, (k, h) in enumerate(zip(keys, headers))}},
+        "isActive": fields.pop("isActive", True),
+        "priority": priority,
+    }
+
+
+KB = template("kb", ["거래일시", "입금액", "출금액", "잔액", "적요"], identifiers=["KB국민은행"])
+SHINHAN = template("shinhan", ["거래일자", "맡기신금액", "찾으신금액", "거래후잔액", "내용"], identifiers=["신한은행"])
+CARD = template("card", ["이용일자", "가맹점명", "이용금액"])
+
+
+@pytest.fixture
+def index():
+    index = TemplateIndex()
+    index.refresh([KB, SHINHAN, CARD])
+    return index
+
+
+def test_minhash_estimates_jaccard():
+    a = header_shingles(["거래일자", "입금액", "출금액", "잔액"])
+    b = header_shingles(["거래 일자", "입금금액", "출금금액", "잔액"])
+    exact = len(a & b) / len(a | b)
+    estimate = (minhash_signature(a) == minhash_signature(b)).mean()
+    assert abs(estimate - exact) < 0.15
+    assert (minhash_signature(a) == minhash_signature(a)).all()
+    assert minhash_signature([]).tolist() == [np.iinfo(np.uint64).max] * len(minhash_signature(a))
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        (["거래일시", "입금액", "출금액", "잔액", "적요"], ["kb", "shinhan", "card"]),
+        (["거래일자", "맡기신 금액", "찾으신 금액", "거래후 잔액", "내용"], ["shinhan", "kb", "card"]),
+        (["이용일자", "가맹점명", "이용금액"], ["card"]),
+    ],
+)
+def test_top_k_ranking(index, headers, expected):
+    matches = index.match(headers, top_k=3)
+    assert [m.id for m in matches][:len(expected)] == expected
+    assert matches[0].score == matches[0].header_score
+    assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
+    assert len(index.match(headers, top_k=1)) == 1
+
+
+def test_exact_headers_score_one(index):
+    best = index.match(["거래일시", "입금액", "출금액", "잔액", "적요"], top_k=1)[0]
+    assert (best.id, best.score, best.identifier_score) == ("kb", 1.0, None)
+
+
+def test_identifiers_weight_score(index):
+    headers = ["거래일자", "입금액", "출금액", "잔액", "적요"]
+    without = {m.id: m for m in index.match(headers, top_k=3)}
+    with_text = {m.id: m for m in index.match(headers, page_text="신한 은행 거래내역 조회", top_k=3)}
+    assert with_text["shinhan"].identifier_score == 1.0
+    assert with_text["kb"].identifier_score == 0.0
+    assert with_text["shinhan"].score == round(0.7 * without["shinhan"].header_score + 0.3, 4)
+    # identifiers가 없는 템플릿은 헤더 점수 그대로
+    assert with_text["card"].score == with_text["card"].header_score
+
+
+def test_ties_prefer_priority():
+    index = TemplateIndex()
+    index.refresh([template("low", ["거래일자", "금액"], priority=1), template("high", ["거래일자", "금액"], priority=5)])
+    assert [m.id for m in index.match(["거래일자", "금액"], top_k=2)] == ["high", "low"]
+
+
+def test_incremental_refresh(index):
+    unchanged = index._templates["kb"]
+    assert index.stats() == {"templates": 3, "version": 1}
+
+    # 같은 내용은 서명을 다시 계산하지 않고 버전도 그대로
+    counts = index.refresh([KB, SHINHAN, CARD])
+    assert counts == {"added": 0, "updated": 0, "unchanged": 3, "removed": 0, "total": 3, "version": 1}
+    assert index._templates["kb"] is unchanged
+
+    renamed = template("card", ["승인일자", "가맹점", "승인금액"])
+    counts = index.refresh([renamed, template("nh", ["거래일자", "출금", "입금", "잔액"])])
+    assert (counts["added"], counts["updated"], counts["unchanged"], counts["version"]) == (1, 1, 0, 2)
+    assert index._templates["kb"] is unchanged
+    assert index.match(["승인일자", "가맹점", "승인금액"], top_k=1)[0].id == "card"
+
+
+def test_refresh_removes_inactive_and_deleted(index):
+    counts = index.refresh([{**CARD, "isActive": False}], removed_ids=["shinhan", "missing"])
+    assert (counts["removed"], counts["total"]) == (2, 1)
+    assert [m.id for m in index.match(["이용일자", "가맹점명", "이용금액"], top_k=3)] == ["kb"]
+
+
+def test_replace_drops_templates_not_listed(index):
+    counts = index.refresh([KB], replace=True)
+    assert (counts["unchanged"], counts["removed"], counts["total"]) == (1, 2, 1)
+    assert index.refresh([], replace=True)["total"] == 0
+    assert index.match(["거래일시"], top_k=3) == []
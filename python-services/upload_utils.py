@@ -0,0 +1,208 @@
+"""
+Upload Utils - 업로드 파일 스트리밍 저장
+
+multipart 요청 본문을 받는 대로 파싱하여 파일 파트를 고정 크기 조각 그대로 디스크(또는 tmpfs)에
+한 번만 기록하면서 SHA-256을 계산합니다. (프레임워크가 본문을 먼저 임시 파일에 모아 두지 않음)
+- 전체 파일을 메모리에 올리지 않으므로 요청당 메모리 사용량이 파일 크기와 무관
+- 파일별/본문 전체 크기 제한은 받은 바이트 기준으로 적용하므로, Content-Length 없는 요청도
+  제한을 넘는 순간 중단
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, BinaryIO, Optional
+
+from python_multipart import MultipartParser
+from python_multipart.multipart import parse_options_header
+from starlette.requests import Request
+
+# multipart 경계/헤더 오버헤드 여유분
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """업로드 크기 제한 초과"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"업로드 파일이 최대 크기({max_bytes // (1024 * 1024)}MB)를 초과했습니다")
+        self.max_bytes = max_bytes
+
+
+class TooManyFilesError(Exception):
+    """업로드 파일 수 제한 초과"""
+
+    def __init__(self, max_files: int):
+        super().__init__(f"업로드 파일은 최대 {max_files}개까지 가능합니다")
+        self.max_files = max_files
+
+
+class InvalidUploadError(ValueError):
+    """multipart 형식이 아니거나 파일 필드가 없음"""
+
+
+class SpooledUpload:
+    """디스크에 저장된 업로드 파일
+
+    detach()로 파일 소유권을 넘기면 컨텍스트 종료 시 삭제하지 않습니다.
+    (넘겨받은 쪽에서 remove_file()로 정리)
+    """
+
+    def __init__(self, path: str, sha256: str, size: int, filename: Optional[str] = None):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.filename = filename
+        self.detached = False
+        self.elapsed = 0.0  # 수신/저장에 걸린 시간 (초)
+
+    def detach(self) -> str:
+        self.detached = True
+        return self.path
+
+
+def remove_file(path: str) -> None:
+    """파일 삭제 (이미 없으면 무시)"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class _MultipartFileWriter:
+    """multipart 파서 콜백: field 이름의 파일 파트를 각각 임시 파일에 기록 (다른 파트는 버림)"""
+
+    def __init__(self, field: str, max_bytes: int, max_files: int, tmp_dir: Optional[str], suffix: str):
+        self.field = field
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.tmp_dir = tmp_dir
+        self.suffix = suffix
+        self.uploads: list[SpooledUpload] = []
+        self._headers: dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._current: Optional[SpooledUpload] = None
+        self._out: Optional[BinaryIO] = None
+        self._digest = None
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_header_field": self._header_field_data,
+            "on_header_value": self._header_value_data,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+        }
+
+    def _part_begin(self) -> None:
+        self._headers = {}
+
+    def _header_field_data(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _header_value_data(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+        if name != self.field or filename is None:
+            return
+        if len(self.uploads) >= self.max_files:
+            raise TooManyFilesError(self.max_files)
+        fd, path = tempfile.mkstemp(suffix=self.suffix, dir=self.tmp_dir)
+        self._current = SpooledUpload(path, "", 0, filename.decode("utf-8", "replace") or None)
+        self.uploads.append(self._current)
+        self._out = os.fdopen(fd, "wb")
+        self._digest = hashlib.sha256()
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._current is None:
+            return
+        chunk = data[start:end]
+        self._current.size += len(chunk)
+        if self._current.size > self.max_bytes:
+            raise UploadTooLargeError(self.max_bytes)
+        self._digest.update(chunk)
+        self._out.write(chunk)
+
+    def _part_end(self) -> None:
+        if self._current is None:
+            return
+        self.close()
+        self._current.sha256 = self._digest.hexdigest()
+        self._current = None
+
+    def close(self) -> None:
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+
+@asynccontextmanager
+async def spooled_uploads(
+    request: Request,
+    max_bytes: int,
+    tmp_dir: Optional[str] = None,
+    field: str = "file",
+    max_files: int = 1,
+    max_total_bytes: Optional[int] = None,
+    suffix: str = ".pdf",
+) -> AsyncIterator[list[SpooledUpload]]:
+    """multipart 요청 본문을 받는 대로 파싱하여 field의 파일들을 임시 파일에 저장
+
+    파일 하나가 max_bytes를, 본문 전체가 max_total_bytes(+ multipart 여유분)를 넘으면 즉시
+    UploadTooLargeError를 발생시키고, 취소/예외를 포함한 모든 경로에서 임시 파일을 정리합니다.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise InvalidUploadError("multipart/form-data 형식의 업로드가 필요합니다")
+
+    body_limit = (max_total_bytes or max_bytes * max_files) + MULTIPART_OVERHEAD_BYTES
+    writer = _MultipartFileWriter(field, max_bytes, max_files, tmp_dir, suffix)
+    parser = MultipartParser(boundary, writer.callbacks())
+    t0 = time.perf_counter()
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise UploadTooLargeError(max_total_bytes or max_bytes)
+            parser.write(chunk)
+        parser.finalize()
+        writer.close()
+        if not writer.uploads or any(not u.sha256 for u in writer.uploads):
+            raise InvalidUploadError(f"{field} 필드에 PDF 파일이 필요합니다")
+        elapsed = time.perf_counter() - t0
+        for upload in writer.uploads:
+            upload.elapsed = elapsed
+        yield writer.uploads
+    finally:
+        writer.close()
+        for upload in writer.uploads:
+            if not upload.detached:
+                remove_file(upload.path)
+
+
+@asynccontextmanager
+async def spooled_upload(
+    request: Request,
+    max_bytes: int,
+    tmp_dir: Optional[str] = None,
+    field: str = "file",
+    suffix: str = ".pdf",
+) -> AsyncIterator[SpooledUpload]:
+    """업로드 파일 하나를 청크 단위로 임시 파일에 저장 (spooled_uploads 참고)"""
+    async with spooled_uploads(request, max_bytes, tmp_dir, field, suffix=suffix) as uploads:
+        yield uploads[0]
@@ -36,6 +36,7 @@ export const ColumnAnalysisResultSchema = z.object({
   confidence: z.number(),
   reasoning: z.string(),
   error: z.string().optional().nullable(),
+  tier: z.enum(["heuristic", "fast", "strong"]).optional().nullable(),
 });
 
 export type ColumnAnalysisResult = z.infer<typeof ColumnAnalysisResultSchema>;
@@ -45,19 +46,61 @@ export type ColumnAnalysisResult = z.infer<typeof ColumnAnalysisResultSchema>;
  */
 const ANALYZER_SERVICE_URL = process.env.COLUMN_ANALYZER_URL || "http://localhost:8002";
 
+/**
+ * 분석 예산 (지연 예산 초과 시 지금까지 가장 나은 결과, maxTier까지만 모델 사용)
+ */
+export interface AnalysisBudgetOptions {
+  latencyBudgetSeconds?: number;
+  maxTier?: "heuristic" | "fast" | "strong";
+}
+
+function budgetQuery(options?: AnalysisBudgetOptions): string {
+  const params = new URLSearchParams();
+  if (options?.latencyBudgetSeconds) params.set("latencyBudgetSeconds", String(options.latencyBudgetSeconds));
+  if (options?.maxTier) params.set("maxTier", options.maxTier);
+  const query = params.toString();
+  return query ? `?${query}` : "";
+}
+
+/**
+ * 429 응답 시 최대 재시도 횟수 / 최대 대기 시간(초)
+ */
+const OVERLOAD_MAX_RETRIES = 3;
+const OVERLOAD_MAX_WAIT_SECONDS = 30;
+
+/**
+ * 서비스가 429(LLM 대기열 초과/제공자 제한)를 반환하면 Retry-After만큼 기다린 후 재요청
+ */
+async function fetchWithRetryAfter(url: string, init?: RequestInit): Promise<Response> {
+  for (let attempt = 0; ; attempt++) {
+    const response = await fetch(url, init);
+    if (response.status !== 429 || attempt >= OVERLOAD_MAX_RETRIES) {
+      return response;
+    }
+    const retryAfter = Number(response.headers.get("Retry-After")) || 1;
+    await new Promise((resolve) =>
+      setTimeout(resolve, Math.min(retryAfter, OVERLOAD_MAX_WAIT_SECONDS) * 1000 * (0.5 + Math.random()))
+    );
+  }
+}
+
 /**
  * PDF 파일로부터 컬럼 분석
  *
  * @param pdfBuffer - PDF 파일 버퍼
+ * @param options - 지연/비용 예산 (미지정 시 서비스 기본값)
  * @returns 컬럼 분석 결과
  */
-export async function analyzeColumnsFromPdf(pdfBuffer: Buffer): Promise<ColumnAnalysisResult> {
+export async function analyzeColumnsFromPdf(
+  pdfBuffer: Buffer,
+  options?: AnalysisBudgetOptions
+): Promise<ColumnAnalysisResult> {
   try {
     const formData = new FormData();
     const blob = new Blob([new Uint8Array(pdfBuffer)], { type: "application/pdf" });
     formData.append("file", blob, "transaction.pdf");
 
-    const response = await fetch(`${ANALYZER_SERVICE_URL}/analyze/pdf`, {
+    const response = await fetchWithRetryAfter(`${ANALYZER_SERVICE_URL}/analyze/pdf${budgetQuery(options)}`, {
       method: "POST",
       body: formData,
     });
@@ -79,14 +122,16 @@ export async function analyzeColumnsFromPdf(pdfBuffer: Buffer): Promise<ColumnAn
  *
  * @param headers - 헤더 배열
  * @param rows - 데이터 행 배열
+ * @param options - 지연/비용 예산 (예: 대화형 업로드는 { latencyBudgetSeconds: 1 })
  * @returns 컬럼 분석 결과
  */
 export async function analyzeColumnsFromTableData(
   headers: string[],
-  rows: string[][]
+  rows: string[][],
+  options?: AnalysisBudgetOptions
 ): Promise<ColumnAnalysisResult> {
   try {
-    const response = await fetch(`${ANALYZER_SERVICE_URL}/analyze/table`, {
+    const response = await fetchWithRetryAfter(`${ANALYZER_SERVICE_URL}/analyze/table${budgetQuery(options)}`, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -106,6 +151,251 @@ export async function analyzeColumnsFromTableData(
   }
 }
 
+/**
+ * 청크 단위 PDF 추출 결과 스키마 (텍스트 레이어 + 스캔 페이지 인식, 페이지 순서 유지)
+ */
+export const ChunkedExtractionResultSchema = z.object({
+  success: z.boolean(),
+  headers: z.array(z.string()),
+  rows: z.array(z.array(z.string())),
+  pageCount: z.number(),
+  headerPageIndex: z.number().optional().nullable(),
+  scannedPages: z.array(z.number()),
+  columnMapping: ColumnAnalysisResultSchema.shape.columnMapping.optional().nullable(),
+  mappingConfidence: z.number(),
+  textPages: z.number(),
+  ocrChunks: z.array(
+    z.object({
+      index: z.number(),
+      pageStart: z.number(),
+      pageEnd: z.number(),
+      rowCount: z.number(),
+      attempts: z.number(),
+      error: z.string().optional().nullable(),
+    })
+  ),
+  failedPages: z.array(z.number()),
+  llmCalls: z.number(),
+  pageTexts: z.array(z.string()),
+  error: z.string().optional().nullable(),
+});
+
+export type ChunkedExtractionResult = z.infer<typeof ChunkedExtractionResultSchema>;
+
+/**
+ * 큰 PDF를 서비스에서 페이지 묶음 단위로 병렬 추출
+ *
+ * 헤더는 한 번만 찾고 헤더 없는 뒤쪽 페이지의 행도 같은 열 순서로 맞춰 페이지 순서대로 반환합니다.
+ * 실패한 묶음은 서비스에서 재시도하며, 끝까지 실패한 페이지는 failedPages로 알려줍니다.
+ * 테이블 밖 텍스트(은행명/계좌 정보 등)는 페이지 순서대로 pageTexts로 반환합니다.
+ *
+ * @param pdfBuffer - PDF 파일 버퍼
+ * @param forceOcr - 텍스트 레이어가 있어도 모든 페이지를 인식
+ */
+export async function extractPdfInChunks(
+  pdfBuffer: Buffer,
+  forceOcr = false
+): Promise<ChunkedExtractionResult> {
+  const formData = new FormData();
+  const blob = new Blob([new Uint8Array(pdfBuffer)], { type: "application/pdf" });
+  formData.append("file", blob, "transaction.pdf");
+
+  const query = forceOcr ? "?forceOcr=true" : "";
+  const response = await fetchWithRetryAfter(`${ANALYZER_SERVICE_URL}/extract/pdf/chunked${query}`, {
+    method: "POST",
+    body: formData,
+  });
+
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}: ${await response.text()}`);
+  }
+
+  return ChunkedExtractionResultSchema.parse(await response.json());
+}
+
+/**
+ * 템플릿 매칭 결과 스키마
+ */
+export const TemplateMatchResponseSchema = z.object({
+  matches: z.array(
+    z.object({
+      id: z.string(),
+      name: z.string(),
+      bankName: z.string().optional().nullable(),
+      score: z.number(),
+      headerScore: z.number(),
+      identifierScore: z.number().optional().nullable(),
+      priority: z.number(),
+    })
+  ),
+  indexSize: z.number(),
+  elapsedMicros: z.number(),
+});
+
+export type TemplateMatchResponse = z.infer<typeof TemplateMatchResponseSchema>;
+
+/**
+ * 템플릿 지문 인덱스 갱신
+ *
+ * 서비스는 내용이 바뀐 템플릿만 다시 인덱싱하므로 전체 목록을 보내도 비용이 작습니다.
+ *
+ * @param templates - 인덱싱할 템플릿 (isActive=false는 제거됨)
+ * @param options.removedIds - 삭제된 템플릿 id
+ * @param options.replace - true면 목록에 없는 기존 템플릿 제거 (전체 동기화)
+ */
+export async function refreshTemplateIndex(
+  templates: {
+    id: string;
+    name: string;
+    bankName: string | null;
+    identifiers: string[];
+    columnSchema: unknown;
+    isActive: boolean;
+    priority: number;
+  }[],
+  options: { removedIds?: string[]; replace?: boolean } = {}
+): Promise<boolean> {
+  try {
+    const response = await fetch(`${ANALYZER_SERVICE_URL}/templates/refresh`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({
+        templates,
+        removedIds: options.removedIds ?? [],
+        replace: options.replace ?? false,
+      }),
+    });
+
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}: ${await response.text()}`);
+    }
+    return true;
+  } catch (error) {
+    console.error("[Column Analyzer Client] 템플릿 인덱스 갱신 실패:", error);
+    return false;
+  }
+}
+
+/**
+ * 헤더 지문으로 유사 템플릿 조회 (LLM 미사용)
+ *
+ * @param headers - 헤더 배열
+ * @param pageText - 문서 상단 텍스트 (identifiers 비교용)
+ * @param topK - 반환할 후보 수
+ * @returns score 내림차순 후보, 서비스 호출 실패 시 null
+ */
+export async function matchTemplates(
+  headers: string[],
+  pageText?: string,
+  topK = 5
+): Promise<TemplateMatchResponse | null> {
+  try {
+    const response = await fetch(`${ANALYZER_SERVICE_URL}/templates/match`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ headers, pageText, topK }),
+    });
+
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}: ${await response.text()}`);
+    }
+
+    return TemplateMatchResponseSchema.parse(await response.json());
+  } catch (error) {
+    console.error("[Column Analyzer Client] 템플릿 매칭 실패:", error);
+    return null;
+  }
+}
+
+/**
+ * 키워드 분류 결과 스키마 (거래 입력 순서)
+ */
+export const KeywordClassifyResponseSchema = z.object({
+  success: z.boolean(),
+  results: z.array(
+    z.object({
+      transactionId: z.string(),
+      matched: z.boolean(),
+      appliedRuleId: z.string().optional().nullable(),
+      patternType: z.string().optional().nullable(),
+      category: z.string().optional().nullable(),
+      subcategory: z.string().optional().nullable(),
+      confidence: z.number().optional().nullable(),
+      keywordRuleIds: z.array(z.string()),
+      amountRangeRuleIds: z.array(z.string()),
+      creditorRuleIds: z.array(z.string()),
+      importantType: z.string().optional().nullable(),
+      matchedKeywords: z.array(z.string()),
+    })
+  ),
+  matchedCount: z.number(),
+  importantCount: z.number(),
+  ruleSetVersion: z.string().optional().nullable(),
+  compiled: z.boolean(),
+  invalidRuleIds: z.array(z.string()),
+  elapsedMicros: z.number(),
+  error: z.string().optional().nullable(),
+});
+
+export type KeywordClassifyResponse = z.infer<typeof KeywordClassifyResponseSchema>;
+
+/**
+ * 분류 규칙과 중요 거래 키워드를 거래 배치에 일괄 적용 (LLM 미사용)
+ *
+ * 서비스는 규칙 집합을 다중 패턴 오토마톤으로 컴파일해 캐시하고(규칙이 바뀔 때만 다시 컴파일)
+ * 메모를 한 번씩만 훑으므로, 규칙 수 × 거래 수만큼 includes를 반복하지 않습니다.
+ *
+ * @param rules - 활성 분류 규칙 (KEYWORD/AMOUNT_RANGE/CREDITOR)
+ * @param transactions - 분류할 거래
+ * @param importantKeywords - 중요 거래 유형별 키워드 (생략 시 서비스 기본값)
+ * @returns 분류 결과, 서비스 호출 실패 시 null
+ */
+export async function classifyByKeywords(
+  rules: {
+    id: string;
+    pattern: string;
+    patternType: string;
+    category: string;
+    subcategory: string | null;
+    confidence: number;
+  }[],
+  transactions: {
+    id: string;
+    memo: string | null;
+    depositAmount: number | null;
+    withdrawalAmount: number | null;
+    creditorName?: string | null;
+  }[],
+  importantKeywords?: Record<string, string[]>
+): Promise<KeywordClassifyResponse | null> {
+  try {
+    const response = await fetch(`${ANALYZER_SERVICE_URL}/classify/keywords`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ rules, transactions, importantKeywords }),
+    });
+
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}: ${await response.text()}`);
+    }
+
+    const result = KeywordClassifyResponseSchema.parse(await response.json());
+    if (!result.success) {
+      throw new Error(result.error ?? "keyword classification failed");
+    }
+    return result;
+  } catch (error) {
+    console.error("[Column Analyzer Client] 키워드 분류 실패:", error);
+    return null;
+  }
+}
+
 /**
  * 에러 결과 생성
  */
@@ -177,11 +467,11 @@ export function convertToColumnIndices(
 }
 
 /**
- * 서비스 헬스 체크
+ * 서비스 헬스 체크 (워밍업이 끝나 요청을 받을 수 있을 때만 true)
  */
 export async function checkServiceHealth(): Promise<boolean> {
   try {
-    const response = await fetch(`${ANALYZER_SERVICE_URL}/health`);
+    const response = await fetch(`${ANALYZER_SERVICE_URL}/readyz`);
     return response.ok;
   } catch {
     return false;
@@ -16,6 +16,7 @@
 
 import { env } from "~/env";
 import { inferColumnType, ColumnType } from "~/lib/column-mapping";
+import { extractPdfInChunks } from "~/lib/column-analyzer-client";
 import { PDFDocument } from "pdf-lib";
 
 interface UpstageDocumentParseResponse {
@@ -88,6 +89,10 @@ export async function parsePdfWithUpstage(
   // 파일 크기가 제한을 초과하면 청크 분할 처리
   if (pdfBuffer.length > UPSTAGE_SIZE_LIMIT) {
     console.log(`[PDF Chunking] 파일 크기 ${(pdfBuffer.length / 1024 / 1024).toFixed(2)}MB가 제한(${UPSTAGE_SIZE_LIMIT / 1024 / 1024}MB)을 초과합니다. 청크 분할 처리 시작...`);
+    const chunked = await parsePdfWithChunkService(pdfBuffer);
+    if (chunked) {
+      return chunked;
+    }
     return await parsePdfInChunks(pdfBuffer, finalApiKey, PAGES_PER_CHUNK);
   }
 
@@ -96,7 +101,37 @@ export async function parsePdfWithUpstage(
 }
 
 /**
- * PDF를 청크로 분할하여 처리
+ * 컬럼 분석 서비스의 청크 병렬 추출 사용
+ *
+ * 서비스가 페이지 묶음을 병렬로 처리하고(헤더/컬럼 매핑은 한 번만 결정, 실패한 묶음은 재시도)
+ * 페이지 순서대로 합친 결과를 반환합니다. 테이블 밖 텍스트(pageTexts)도 함께 받아 템플릿 식별자 매칭에 씁니다.
+ * 서비스를 사용할 수 없으면 null (순차 처리로 대체)
+ */
+async function parsePdfWithChunkService(pdfBuffer: Buffer): Promise<TableData | null> {
+  try {
+    const result = await extractPdfInChunks(pdfBuffer);
+    if (result.failedPages.length > 0) {
+      console.warn(`[PDF Chunking] 재시도 후에도 읽지 못한 페이지: ${result.failedPages.map(p => p + 1).join(", ")}`);
+    }
+    if (!result.headers.length) {
+      console.warn(`[PDF Chunking] 서비스에서 헤더를 찾지 못함: ${result.error ?? ""}`);
+      return null;
+    }
+    console.log(`[PDF Chunking] 서비스 청크 추출 완료: 헤더 ${result.headers.length}개, 행 ${result.rows.length}개 (텍스트 ${result.textPages}페이지, 인식 묶음 ${result.ocrChunks.length}개)`);
+    return {
+      headers: result.headers,
+      rows: result.rows,
+      totalRows: result.rows.length,
+      pageTexts: result.pageTexts,
+    };
+  } catch (error) {
+    console.error("[PDF Chunking] 서비스 청크 추출 실패, 순차 처리로 대체:", error);
+    return null;
+  }
+}
+
+/**
+ * PDF를 청크로 분할하여 처리 (컬럼 분석 서비스를 사용할 수 없을 때)
  */
 async function parsePdfInChunks(
   pdfBuffer: Buffer,
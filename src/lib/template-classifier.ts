@@ -3,12 +3,20 @@
  * 
  * 3단계 분류 파이프라인:
  * Layer 1: 템플릿 키워드 매칭 (identifiers 기반 정확 매칭 - 페이지 텍스트 사용)
- * Layer 2: LLM 유사도 분류 (템플릿 description과 헤더 비교)
+ * Layer 2: 헤더 지문 유사도 매칭 (Python 서비스 템플릿 인덱스, 서비스 불가 시 LLM 유사도 분류)
  * Layer 3: 기존 LLM 컬럼 매핑 (현재 방식)
  */
 
 import { PrismaClient } from "@prisma/client";
 import { env } from "~/env";
+import { matchTemplates, refreshTemplateIndex } from "./column-analyzer-client";
+
+// 헤더 지문 매칭 최소 점수 (0~1)
+const FINGERPRINT_MATCH_THRESHOLD = 0.6;
+
+// 서비스 템플릿 인덱스가 DB와 어긋났을 수 있음 (프로세스 시작 직후, 변경분 반영 실패 후)
+// → 다음 Layer 2 매칭에서 인덱스 크기와 관계없이 전체 동기화
+let templateIndexStale = true;
 
 /**
  * 문자열 정규화 - 띄어쓰기 제거 및 소문자 변환
@@ -127,7 +135,109 @@ export function matchByIdentifiers(
 }
 
 /**
- * Layer 2: LLM 유사도 매칭
+ * 템플릿 생성/수정 후 서비스 템플릿 인덱스에 반영 (비활성 템플릿은 인덱스에서 제거됨)
+ *
+ * 실패하면 인덱스를 어긋난 것으로 표시해 다음 Layer 2 매칭에서 전체 동기화합니다.
+ * (수정은 인덱스 크기를 바꾸지 않으므로 크기 비교만으로는 알 수 없음)
+ */
+export async function syncTemplateToIndex(template: {
+  id: string;
+  name: string;
+  bankName: string | null;
+  identifiers: string[];
+  columnSchema: unknown;
+  isActive: boolean;
+  priority: number;
+}): Promise<boolean> {
+  const synced = await refreshTemplateIndex([
+    {
+      id: template.id,
+      name: template.name,
+      bankName: template.bankName,
+      identifiers: template.identifiers,
+      columnSchema: template.columnSchema,
+      isActive: template.isActive,
+      priority: template.priority,
+    },
+  ]);
+  if (!synced) {
+    templateIndexStale = true;
+    console.warn(`[Template Classifier] Template "${template.name}" not synced to index, full resync on next match`);
+  }
+  return synced;
+}
+
+/**
+ * 템플릿 삭제 후 서비스 템플릿 인덱스에서 제거 (실패 시 다음 Layer 2 매칭에서 전체 동기화)
+ */
+export async function removeTemplateFromIndex(templateId: string): Promise<boolean> {
+  const synced = await refreshTemplateIndex([], { removedIds: [templateId] });
+  if (!synced) {
+    templateIndexStale = true;
+    console.warn(`[Template Classifier] Template ${templateId} not removed from index, full resync on next match`);
+  }
+  return synced;
+}
+
+/**
+ * Layer 2: 헤더 지문 유사도 매칭
+ * 인덱스는 템플릿 변경 시 동기화되므로 매칭만 호출하고, 인덱스가 어긋났을 때만
+ * (프로세스 시작 직후, 변경분 반영 실패, 서비스 재시작으로 크기가 다름) 전체 동기화 후 다시 매칭합니다.
+ * 헤더 n-gram 유사도 top-1을 사용
+ *
+ * @returns 매칭 결과, 확실한 후보가 없으면 null, 서비스 호출 실패 시 undefined
+ */
+export async function matchByFingerprint(
+  headers: string[],
+  templates: TransactionTemplate[],
+  pageTexts?: string[]
+): Promise<{ template: TransactionTemplate; confidence: number } | null | undefined> {
+  const activeTemplates = templates.filter(t => t.isActive);
+  if (activeTemplates.length === 0) {
+    return null;
+  }
+
+  const pageText = pageTexts?.join(" ");
+  let result = await matchTemplates(headers, pageText, 1);
+  if (!result) {
+    return undefined;
+  }
+
+  if (templateIndexStale || result.indexSize !== activeTemplates.length) {
+    console.log(`[Template Classifier] Layer 2: Template index out of sync (${result.indexSize}/${activeTemplates.length}, stale: ${templateIndexStale}), resyncing...`);
+    // 동기화 중 다른 변경이 실패하면 다시 표시되도록 먼저 해제
+    templateIndexStale = false;
+    const synced = await refreshTemplateIndex(activeTemplates, { replace: true });
+    if (!synced) {
+      templateIndexStale = true;
+      return undefined;
+    }
+    result = await matchTemplates(headers, pageText, 1);
+    if (!result) {
+      return undefined;
+    }
+  }
+
+  const best = result.matches[0];
+  if (!best || best.score < FINGERPRINT_MATCH_THRESHOLD) {
+    console.log(`[Template Classifier] Layer 2: No confident fingerprint match (score: ${best?.score ?? 0})`);
+    return null;
+  }
+
+  const matchedTemplate = activeTemplates.find(t => t.id === best.id);
+  if (!matchedTemplate) {
+    return null;
+  }
+
+  console.log(`[Template Classifier] Layer 2 MATCH: "${matchedTemplate.name}" (score: ${best.score}, ${result.elapsedMicros}µs)`);
+  return {
+    template: matchedTemplate,
+    confidence: best.score,
+  };
+}
+
+/**
+ * Layer 2 (폴백): LLM 유사도 매칭
  * 템플릿의 description과 현재 헤더/샘플 데이터를 비교
  */
 export async function matchBySimilarity(
@@ -374,9 +484,13 @@ export async function classifyTransaction(
     };
   }
 
-  // Layer 2: LLM 유사도 매칭
-  console.log("[Template Classifier] Layer 2: LLM similarity matching...");
-  const similarityMatch = await matchBySimilarity(headers, sampleRows, parsedTemplates);
+  // Layer 2: 헤더 지문 유사도 매칭 (서비스 불가 시 LLM 유사도 매칭)
+  console.log("[Template Classifier] Layer 2: Fingerprint similarity matching...");
+  let similarityMatch = await matchByFingerprint(headers, parsedTemplates, pageTexts);
+  if (similarityMatch === undefined) {
+    console.log("[Template Classifier] Layer 2: Template index unavailable, using LLM similarity matching...");
+    similarityMatch = await matchBySimilarity(headers, sampleRows, parsedTemplates);
+  }
   
   if (similarityMatch) {
     const { columnMapping, memoInAmountColumn } = convertSchemaToMapping(
@@ -16,6 +16,11 @@ import {
   matchCreditorRule,
 } from "./rule-based-classifier";
 import type { RuleBasedTransactionInput } from "./rule-based-classifier";
+import { classifyByKeywords } from "~/lib/column-analyzer-client";
+
+vi.mock("~/lib/column-analyzer-client", () => ({
+  classifyByKeywords: vi.fn(),
+}));
 
 describe("Rule-Based Classifier", () => {
   let mockDb: PrismaClient;
@@ -311,4 +316,98 @@ describe("Rule-Based Classifier", () => {
       expect(results.get("1")?.matched).toBe(false);
     });
   });
+
+  describe("classifyWithRules (keyword service path)", () => {
+    const rules = [
+      { id: "kw-low", pattern: "이자", patternType: "KEYWORD", category: "출금", subcategory: "이자", confidence: 0.6 },
+      { id: "kw-high", pattern: "대출", patternType: "KEYWORD", category: "출금", subcategory: "대출", confidence: 0.9 },
+      { id: "amount", pattern: "1000-5000", patternType: "AMOUNT_RANGE", category: "입금", subcategory: null, confidence: 0.7 },
+      { id: "creditor", pattern: "국민", patternType: "CREDITOR", category: "출금", subcategory: "채권자", confidence: 0.8 },
+    ];
+    const memos = ["대출 이자", "예금 이자", "급여", "", "카드 결제"];
+
+    // 서비스 경로 기준(1000건) 이상
+    const transactions: RuleBasedTransactionInput[] = Array.from({ length: 1200 }, (_, i) => ({
+      id: `tx-${i}`,
+      memo: memos[i % memos.length] || null,
+      depositAmount: i % 3 === 0 ? (i * 37) % 7000 : null,
+      withdrawalAmount: i % 3 === 0 ? null : (i * 53) % 7000,
+      creditorName: i % 4 === 0 ? "국민은행" : null,
+    }));
+
+    const loadRules = () =>
+      vi.mocked(mockDb.classificationRule.findMany).mockResolvedValue(
+        rules.map((rule) => ({ ...rule, applyCount: 0, successCount: 0, isActive: true })) as any
+      );
+
+    // 규칙별 applyCount 증가량 합계
+    const incrementsByRule = () => {
+      const totals = new Map<string, number>();
+      for (const [args] of vi.mocked(mockDb.classificationRule.update).mock.calls) {
+        const { where, data } = args as any;
+        totals.set(where.id, (totals.get(where.id) ?? 0) + data.applyCount.increment);
+        expect(data.successCount.increment).toBe(data.applyCount.increment);
+      }
+      return totals;
+    };
+
+    it("should return the same results and rule statistics as the local path", async () => {
+      loadRules();
+      vi.mocked(mockDb.classificationRule.update).mockResolvedValue({} as any);
+      vi.mocked(classifyByKeywords).mockClear();
+
+      // 로컬 경로 (서비스 호출 실패)
+      vi.mocked(classifyByKeywords).mockResolvedValueOnce(null);
+      const local = await classifyWithRules(mockDb, transactions);
+      const localIncrements = incrementsByRule();
+      vi.mocked(mockDb.classificationRule.update).mockClear();
+
+      // 서비스 경로: 로컬 결과와 같은 매칭을 거래 순서대로 돌려주는 응답
+      vi.mocked(classifyByKeywords).mockImplementationOnce(async (_rules, txs) => ({
+        success: true,
+        results: txs.map((tx) => {
+          const expected = local.get(tx.id)!;
+          const rule = rules.find((r) => r.id === expected.appliedRuleId);
+          return {
+            transactionId: tx.id,
+            matched: expected.matched,
+            appliedRuleId: rule?.id ?? null,
+            patternType: rule?.patternType ?? null,
+            category: rule?.category ?? null,
+            subcategory: rule?.subcategory ?? null,
+            confidence: rule?.confidence ?? null,
+            keywordRuleIds: [],
+            amountRangeRuleIds: [],
+            creditorRuleIds: [],
+            importantType: null,
+            matchedKeywords: [],
+          };
+        }),
+        matchedCount: 0,
+        importantCount: 0,
+        ruleSetVersion: "test",
+        compiled: false,
+        invalidRuleIds: [],
+        elapsedMicros: 0,
+      }));
+      loadRules();
+      const viaService = await classifyWithRules(mockDb, transactions);
+
+      expect(classifyByKeywords).toHaveBeenCalledTimes(2);
+      expect(Array.from(viaService.entries())).toEqual(Array.from(local.entries()));
+      expect(incrementsByRule()).toEqual(localIncrements);
+      // 서비스 경로는 규칙별로 한 번씩만 갱신
+      expect(mockDb.classificationRule.update).toHaveBeenCalledTimes(localIncrements.size);
+    });
+
+    it("should not call the service for small batches", async () => {
+      loadRules();
+      vi.mocked(mockDb.classificationRule.update).mockResolvedValue({} as any);
+      vi.mocked(classifyByKeywords).mockClear();
+
+      await classifyWithRules(mockDb, transactions.slice(0, 10));
+
+      expect(classifyByKeywords).not.toHaveBeenCalled();
+    });
+  });
 });
@@ -16,12 +16,22 @@
  * 성능 최적화:
  * - 활성 규칙만 로드 (isActive = true)
  * - 규칙 적용 순서: confidence 내림차순 (신뢰도 높은 규칙 우선)
+ * - 대량 거래는 서비스의 키워드 오토마톤으로 일괄 매칭 (규칙 수 × 거래 수 반복 없음)
  *
  * @module server/ai/rule-based-classifier
  */
 
 import { PrismaClient, ClassificationRulePatternType } from "@prisma/client";
 import type { ClassificationResult } from "./types";
+import { classifyByKeywords } from "~/lib/column-analyzer-client";
+
+/**
+ * 이 건수 이상이면 Python 서비스의 키워드 오토마톤(/classify/keywords)으로 일괄 분류
+ * (서비스 호출 실패 시 아래 로컬 루프로 처리)
+ */
+const SERVICE_CLASSIFY_MIN_TRANSACTIONS = Number(
+  process.env.RULE_CLASSIFY_SERVICE_MIN_TRANSACTIONS ?? "1000"
+);
 
 /**
  * 분류할 거래 입력
@@ -228,7 +238,15 @@ export async function classifyWithRules(
     (rule) => rule.patternType === "CREDITOR"
   );
 
-  // 3. 각 거래에 대해 규칙 매칭 시도
+  // 3. 대량 거래는 서비스에서 컴파일된 규칙 집합으로 한 번에 매칭
+  if (transactions.length >= SERVICE_CLASSIFY_MIN_TRANSACTIONS) {
+    const serviceResults = await classifyWithKeywordService(db, activeRules, transactions);
+    if (serviceResults) {
+      return serviceResults;
+    }
+  }
+
+  // 각 거래에 대해 규칙 매칭 시도
   for (const transaction of transactions) {
     let match: RuleMatch | null = null;
 
@@ -278,6 +296,61 @@ export async function classifyWithRules(
   return results;
 }
 
+/**
+ * 서비스(/classify/keywords)로 규칙 기반 분류
+ *
+ * 매칭 순서와 우선순위는 로컬 루프와 같고, 규칙 적용 통계는 규칙별로 합산해 한 번씩 갱신합니다.
+ *
+ * @returns 규칙 기반 분류 결과 맵, 서비스 호출 실패 시 null
+ */
+async function classifyWithKeywordService(
+  db: PrismaClient,
+  activeRules: ActiveClassificationRule[],
+  transactions: RuleBasedTransactionInput[]
+): Promise<Map<string, RuleBasedClassificationResult> | null> {
+  const response = await classifyByKeywords(activeRules, transactions);
+  if (!response) {
+    return null;
+  }
+
+  const results = new Map<string, RuleBasedClassificationResult>();
+  const appliedCounts = new Map<string, number>();
+  for (const item of response.results) {
+    if (item.matched && item.appliedRuleId && item.category) {
+      results.set(item.transactionId, {
+        transactionId: item.transactionId,
+        matched: true,
+        result: {
+          category: item.category,
+          subcategory: item.subcategory ?? "",
+          confidenceScore: item.confidence ?? 0,
+        },
+        appliedRuleId: item.appliedRuleId,
+      });
+      appliedCounts.set(item.appliedRuleId, (appliedCounts.get(item.appliedRuleId) ?? 0) + 1);
+    } else {
+      results.set(item.transactionId, {
+        transactionId: item.transactionId,
+        matched: false,
+      });
+    }
+  }
+
+  // 규칙 적용 통계 업데이트 (비동기)
+  for (const [ruleId, count] of Array.from(appliedCounts.entries())) {
+    void db.classificationRule.update({
+      where: { id: ruleId },
+      data: {
+        applyCount: { increment: count },
+        successCount: { increment: count },
+        lastAppliedAt: new Date(),
+      },
+    });
+  }
+
+  return results;
+}
+
 /**
  * 단일 거래를 규칙으로 분류 (헬퍼 함수)
  *
@@ -8,6 +8,7 @@ import { z } from "zod";
 import { TRPCError } from "@trpc/server";
 import { createTRPCRouter, protectedProcedure, adminProcedure } from "../trpc";
 import { uploadFile } from "~/lib/storage";
+import { removeTemplateFromIndex, syncTemplateToIndex } from "~/lib/template-classifier";
 
 // 컬럼 정의 스키마
 const columnDefinitionSchema = z.object({
@@ -132,6 +133,9 @@ export const templateRouter = createTRPCRouter({
         },
       });
 
+      // 서비스 템플릿 인덱스에 반영 (변경분만 재인덱싱, 실패 시 다음 매칭에서 전체 동기화)
+      await syncTemplateToIndex(template);
+
       return {
         ...template,
         columnSchema: template.columnSchema as object,
@@ -197,6 +201,8 @@ export const templateRouter = createTRPCRouter({
         data: updateData,
       });
 
+      await syncTemplateToIndex(template);
+
       return {
         ...template,
         columnSchema: template.columnSchema as object,
@@ -226,6 +232,8 @@ export const templateRouter = createTRPCRouter({
         where: { id: input.id },
       });
 
+      await removeTemplateFromIndex(input.id);
+
       return { success: true };
     }),
 